@@ -2,9 +2,15 @@
 MinCoinBot - 업비트 멀티 종목 듀얼 타임프레임 가상 매매 시뮬레이션 봇
 매도 체크: 1분봉 / 매수 체크: 5분봉
 config.json의 symbols 배열에 나열된 종목을 전부 돌림
+현재가는 전 종목 ticker 1회, 5분봉은 커넥션 풀 세션으로 종목 동시 조회 (upbit_quotes.py)
+MINCOIN_STREAM=1 이면 업비트 WebSocket 스트리밍 모드 (체결마다 익절 판단, 5분봉 마감 시 매수 판단)
+상태는 매수/매도마다 저널(state.journal)에 추가 기록, state.json은 주기적 원자적 스냅샷 (state_store.py)
+총평가액은 시세 마크 캐시(price_marks.py)로 계산 (ticker 일괄 조회 / 스트리밍 체결로 갱신, 추가 API 호출 없음)
+구글시트/슬랙은 전송 큐(services/OutboxService)에 넣기만 하고 워커 스레드가 전송 (매매 루프는 네트워크 대기 없음)
 """
 
 import requests
+import asyncio
 import json
 import logging
 import time
@@ -14,8 +20,13 @@ from datetime import datetime
 
 # 상위 디렉토리 경로 추가 (services import용)
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from services.SimpleGoogleSheetService import Send
+from services.OutboxService import create_outbox
 from services.SlackService.simple_slack import SimpleSlack
+from upbit_quotes import UpbitQuotes
+from upbit_feed import UpbitMarketFeed
+from state_store import StateStore
+from price_marks import PriceMarks
+import virtual_account
 
 # 현재 파일 기준 디렉토리
 BOT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -27,12 +38,24 @@ class MinCoinBot:
 
     def __init__(self):
         self.config = self.load_config()
+        self.store = StateStore(STATE_PATH, checkpoint_every=self.config.get("checkpoint_every", 200))
         self.state = self.load_state()
         self.slack = SimpleSlack()
         self.logger = self.setup_logging()
         self.symbols = self.config["symbols"]
+        self.quotes = UpbitQuotes(
+            max_workers=self.config.get("max_workers", 8),
+            per_second=self.config.get("requests_per_second", 10),
+            logger=self.logger
+        )
+        self.feed = None  # 스트리밍 모드 시세 피드
+        self.marks = PriceMarks()  # 종목별 최근 시세 (총평가액용)
+        # 구글시트/슬랙은 전송 큐에 넣기만 (워커 스레드가 모아서 전송, 미전송분은 outbox.spill에 보관)
+        self.outbox = create_outbox(os.path.join(os.path.dirname(STATE_PATH), "outbox.spill"),
+                                    slack=self.slack, logger=self.logger)
 
         # state에 새 종목이 추가된 경우 자동 초기화
+        added = False
         for symbol in self.symbols:
             if symbol not in self.state["symbols"]:
                 self.state["symbols"][symbol] = {
@@ -42,6 +65,9 @@ class MinCoinBot:
                     "is_first_candle": True,
                 }
                 self.logger.info(f"새 종목 추가: {symbol}")
+                added = True
+        if added:
+            self.save_state()
 
         self.start_time = datetime.now()
         self.start_balance = self.state["balance"]
@@ -79,125 +105,101 @@ class MinCoinBot:
             return json.load(f)
 
     def load_state(self) -> dict:
-        with open(STATE_PATH, "r") as f:
-            return json.load(f)
+        """state.json 스냅샷 + 저널 재생"""
+        return self.store.load()
 
     def save_state(self):
-        with open(STATE_PATH, "w") as f:
-            json.dump(self.state, f, indent=2, ensure_ascii=False)
+        """스냅샷 저장 (원자적 교체) 후 저널 비움 - 매매 기록은 record로 이미 저장됨"""
+        self.store.checkpoint(self.state)
 
     def get_candle_data(self, symbol: str, interval: int) -> dict:
         """업비트 API로 종목의 직전 봉 데이터 조회"""
-        market = f"KRW-{symbol}"
-        url = f"https://api.upbit.com/v1/candles/minutes/{interval}"
-        params = {"market": market, "count": 2}
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # data[0] = 현재(진행중) 봉, data[1] = 직전(완성된) 봉
-        current_price = float(data[0]["trade_price"])
-        prev_open = float(data[1]["opening_price"])
-        prev_close = float(data[1]["trade_price"])
-
-        return {
-            "current_price": current_price,
-            "prev_open": prev_open,
-            "prev_close": prev_close,
-            "is_prev_bearish": prev_close < prev_open,
-            "is_prev_bullish": prev_close > prev_open,
-        }
+        return self.quotes.get_candle(symbol, interval)
 
-    def calculate_profit_rate(self, symbol: str, current_price: float) -> float:
-        """평단 대비 수익률(%) 계산"""
-        avg_price = self.state["symbols"][symbol]["holding_avg_price"]
-        if avg_price <= 0:
-            return 0.0
-        return (current_price - avg_price) / avg_price * 100
+    def poll_market(self, loop_count: int) -> tuple:
+        """
+        루프 1회분 시세 조회
+        - 현재가: 전 종목 ticker 1번 (config에서 빠졌지만 보유중인 종목 포함) → 시세 마크 갱신
+        - 매수 체크 분: 매수 판단이 필요한 종목(보유중 + 익절 미달)의 5분봉 동시 조회
 
-    def virtual_buy(self, symbol: str, current_price: float):
-        """가상 매수 (buy_amount원어치)"""
-        buy_amount = self.config["buy_amount"]
-        sym_state = self.state["symbols"][symbol]
+        Returns: (종목별 현재가, 종목별 5분봉 데이터)
+        """
+        prices = self.quotes.get_prices(self.symbols + self.unlisted_holdings())
+        self.marks.update(prices)
+        candles_5m = {}
 
-        # 잔고 부족 체크
-        if self.state["balance"] < buy_amount:
-            self.logger.warning(f"[{symbol}] 잔고 부족! 잔고={self.state['balance']:,.0f}원, 필요={buy_amount:,}원")
-            return
+        buy_interval = self.config["buy_check_interval"]
+        if loop_count % buy_interval == 0:
+            targets = [
+                symbol for symbol in self.symbols
+                if symbol in prices
+                and not self.state["symbols"][symbol]["is_first_candle"]
+                and self.calculate_profit_rate(symbol, prices[symbol]) < self.config["take_profit_rate"]
+            ]
+            candles_5m = self.quotes.get_candles(targets, buy_interval)
+
+        return prices, candles_5m
+
+    def unlisted_holdings(self) -> list:
+        """config symbols에는 없지만 보유 수량이 남은 종목 (평가용 시세만 조회)"""
+        return [symbol for symbol, sym_state in self.state["symbols"].items()
+                if symbol not in self.symbols and sym_state["holding_qty"] > 0]
 
-        # 수수료 차감 후 실투자금
-        fee = buy_amount * (self.config["buy_fee_rate"] / 100)
-        actual_invest = buy_amount - fee
-        buy_qty = actual_invest / current_price
+    def calculate_profit_rate(self, symbol: str, current_price: float) -> float:
+        """평단 대비 수익률(%) 계산"""
+        return virtual_account.profit_rate(self.state["symbols"][symbol], current_price)
 
-        # 평단 재계산 (가중평균)
-        prev_qty = sym_state["holding_qty"]
-        prev_total = sym_state["total_buy_amount"]
-        new_qty = prev_qty + buy_qty
-        new_total = prev_total + buy_amount
+    def virtual_buy(self, symbol: str, current_price: float) -> bool:
+        """가상 매수 (buy_amount원어치) → 체결 여부"""
+        fill = virtual_account.buy(self.state, symbol, current_price, self.config)
+        if fill is None:
+            self.logger.warning(f"[{symbol}] 잔고 부족! 잔고={self.state['balance']:,.0f}원, "
+                                f"필요={self.config['buy_amount']:,}원")
+            return False
 
-        if new_qty > 0:
-            sym_state["holding_avg_price"] = (prev_qty * sym_state["holding_avg_price"] + actual_invest) / new_qty
-        sym_state["holding_qty"] = new_qty
-        sym_state["total_buy_amount"] = new_total
-        self.state["balance"] -= buy_amount
+        sym_state = self.state["symbols"][symbol]
+        self.store.record("buy", symbol, self.state, price=current_price, **fill)
 
         self.logger.info(
             f"[{symbol} 매수] 가격={current_price:,.0f}원 | "
-            f"수량={buy_qty:.8f} | 수수료={fee:.1f}원 | "
+            f"수량={fill['qty']:.8f} | 수수료={fill['fee']:.1f}원 | "
             f"평단={sym_state['holding_avg_price']:,.0f}원 | "
-            f"총보유={new_qty:.8f} | 잔고={self.state['balance']:,.0f}원"
+            f"총보유={sym_state['holding_qty']:.8f} | 잔고={self.state['balance']:,.0f}원"
         )
 
         # 구글시트 기록
         now = datetime.now()
-        eval_amount = self.state["balance"] + self.get_total_eval(current_price, symbol)
+        self.marks.set(symbol, current_price)
+        eval_amount = self.state["balance"] + self.get_total_eval()
         profit_rate = self.calculate_profit_rate(symbol, current_price)
-        symbol_eval = new_qty * current_price
+        symbol_eval = sym_state["holding_qty"] * current_price
         self.write_sheet(
             now, symbol, current_price,
-            buy_amount, 0,
-            eval_amount, self.state["balance"], new_total, profit_rate,
+            fill["amount"], 0,
+            eval_amount, self.state["balance"], sym_state["total_buy_amount"], profit_rate,
             symbol_eval, 0
         )
+        return True
 
     def virtual_sell(self, symbol: str, current_price: float, reason: str):
-        """가상 전량 매도"""
-        sym_state = self.state["symbols"][symbol]
-        holding_qty = sym_state["holding_qty"]
-        total_buy_amount = sym_state["total_buy_amount"]
-
-        # 매도 금액 및 수수료
-        gross_sell = holding_qty * current_price
-        fee = gross_sell * (self.config["sell_fee_rate"] / 100)
-        net_sell = gross_sell - fee
-
-        # 손익 계산
-        profit = net_sell - total_buy_amount
-        profit_rate = self.calculate_profit_rate(symbol, current_price)
-
-        # 잔고 반영
-        self.state["balance"] += net_sell
-        self.state["total_realized_profit"] = self.state.get("total_realized_profit", 0) + profit
+        """가상 전량 매도 (종목 state는 리셋 → 다시 첫 봉부터)"""
+        fill = virtual_account.sell(self.state, symbol, current_price, self.config)
+        net_sell, profit, profit_rate = fill["amount"], fill["profit"], fill["profit_rate"]
+        self.store.record("sell", symbol, self.state, price=current_price, reason=reason, **fill)
 
         self.logger.info(
             f"[{symbol} {reason}] 가격={current_price:,.0f}원 | "
-            f"매도금={net_sell:,.0f}원 | 수수료={fee:.1f}원 | "
+            f"매도금={net_sell:,.0f}원 | 수수료={fill['fee']:.1f}원 | "
             f"손익={profit:+,.0f}원 ({profit_rate:+.2f}%) | "
             f"누적실현익={self.state['total_realized_profit']:+,.0f}원 | "
             f"잔고={self.state['balance']:,.0f}원"
         )
 
-        # state 리셋 → 다시 첫 봉부터 (시트/슬랙 계산 전에 리셋해야 이중계산 방지)
-        sym_state["holding_qty"] = 0.0
-        sym_state["holding_avg_price"] = 0.0
-        sym_state["total_buy_amount"] = 0.0
-        sym_state["is_first_candle"] = True
-
-        # 구글시트 기록
+        # 구글시트 기록 (리셋 후 계산해야 이중계산 방지)
         now = datetime.now()
         symbol_eval = 0  # 전량 매도 후 해당 종목 평가금 = 0
-        eval_amount = self.state["balance"] + self.get_total_eval(current_price, symbol)
+        self.marks.set(symbol, current_price)
+        eval_amount = self.state["balance"] + self.get_total_eval()
         self.write_sheet(
             now, symbol, current_price,
             0, net_sell,
@@ -206,7 +208,7 @@ class MinCoinBot:
         )
 
         # 슬랙 알림
-        self.slack.send(
+        self.outbox.send_slack(
             f"[Argos-MinCoinBot] {symbol} {reason} | "
             f"수익률: {profit_rate:+.2f}% | "
             f"수익금: {profit:+,.0f}원 | "
@@ -219,23 +221,16 @@ class MinCoinBot:
         minutes = remainder // 60
         net_profit = eval_amount - self.start_balance
         net_profit_rate = (net_profit / self.start_balance) * 100
-        self.slack.send(
+        self.outbox.send_slack(
             f"[민코인봇 결산]\n"
             f"총평가: {eval_amount:,.0f}원\n"
             f"순수익: {net_profit:+,.0f}원 ({net_profit_rate:+.2f}%)\n"
             f"경과시간: {hours}시간 {minutes}분"
         )
 
-    def get_total_eval(self, current_price: float, current_symbol: str) -> float:
-        """전체 보유 종목의 평가금액 합산 (현재 처리중인 종목은 current_price 사용)"""
-        total = 0.0
-        for symbol, sym_state in self.state["symbols"].items():
-            if sym_state["holding_qty"] > 0:
-                if symbol == current_symbol:
-                    total += sym_state["holding_qty"] * current_price
-                else:
-                    total += sym_state["holding_qty"] * sym_state["holding_avg_price"]
-        return total
+    def get_total_eval(self) -> float:
+        """전체 보유 종목의 평가금액 합산 (시세 마크 캐시의 최근 시세 기준)"""
+        return self.marks.holdings_value(self.state["symbols"])
 
     def write_sheet(self, now: datetime, symbol: str, current_price: float,
                      buy_amount: float, sell_amount: float,
@@ -244,7 +239,7 @@ class MinCoinBot:
         """구글시트 기록 (날짜/시간/종목이름/현재가/매수액/매도액/총평가액/현금/투자금액/수익률/종목평가금/순이익)"""
         sheet_name = os.getenv("GOOGLE_SHEET_NAME_4", "민코인봇")
         try:
-            Send(
+            self.outbox.send_sheet(
                 sheet_name,
                 now.strftime("%Y-%m-%d"),
                 now.strftime("%H:%M:%S"),
@@ -262,52 +257,66 @@ class MinCoinBot:
         except Exception as e:
             self.logger.error(f"구글시트 기록 실패: {e}")
 
-    def process_symbol(self, symbol: str, loop_count: int):
-        """개별 종목 처리"""
-        sell_interval = self.config["sell_check_interval"]
+    def buy_first_candle(self, symbol: str, current_price: float):
+        """첫 봉: 무조건 매수"""
+        self.logger.info(f"--- [{symbol}] 첫 봉 진입 (현재가: {current_price:,.0f}원) ---")
+        self.state["symbols"][symbol]["is_first_candle"] = False  # 매수 저널 기록에 같이 반영
+        if not self.virtual_buy(symbol, current_price):
+            # 잔고 부족으로 매수 기록이 없음 → 첫 봉 처리만 따로 저널에 남김 (재시작해도 유지, 시뮬레이터와 동일)
+            self.store.record("first_candle", symbol, self.state)
+
+    def check_take_profit(self, symbol: str, current_price: float) -> bool:
+        """매도 체크: 수익률 ≥ +1.5% 이면 즉시 전량 매도 → 매도 여부"""
+        if self.state["symbols"][symbol]["is_first_candle"]:
+            return False
+        if self.calculate_profit_rate(symbol, current_price) >= self.config["take_profit_rate"]:
+            self.virtual_sell(symbol, current_price, "익절")
+            return True
+        return False
+
+    def check_averaging_buy(self, symbol: str, current_price: float, is_prev_bearish: bool) -> bool:
+        """매수 체크: 직전 5분봉 음봉 AND 현재가 < 평단 이면 추가 매수 → 매수 여부"""
+        avg_price = self.state["symbols"][symbol]["holding_avg_price"]
+        profit_rate = self.calculate_profit_rate(symbol, current_price)
+        candle_type = "음봉" if is_prev_bearish else "양봉"
+
+        self.logger.info(
+            f"[{symbol} 매수체크] 현재가={current_price:,.0f}원 | "
+            f"평단={avg_price:,.0f}원 | "
+            f"수익률={profit_rate:+.2f}% | "
+            f"직전5분봉={candle_type}"
+        )
+
+        if is_prev_bearish and current_price < avg_price:
+            self.virtual_buy(symbol, current_price)
+            return True
+        self.logger.info(f"[{symbol} 대기] 매수 조건 미충족")
+        return False
+
+    def process_symbol(self, symbol: str, loop_count: int, current_price: float, candle_5m: dict = None):
+        """개별 종목 처리 (시세는 poll_market에서 미리 조회)"""
         buy_interval = self.config["buy_check_interval"]
         sym_state = self.state["symbols"][symbol]
 
-        # 1분봉 데이터 조회 (매도 체크용)
-        candle_1m = self.get_candle_data(symbol, sell_interval)
-        current_price = candle_1m["current_price"]
-
         if sym_state["is_first_candle"]:
-            # 첫 봉: 무조건 매수
-            self.logger.info(f"--- [{symbol}] 첫 봉 진입 (현재가: {current_price:,.0f}원) ---")
-            self.virtual_buy(symbol, current_price)
-            sym_state["is_first_candle"] = False
-        else:
-            profit_rate = self.calculate_profit_rate(symbol, current_price)
-            avg_price = sym_state["holding_avg_price"]
+            self.buy_first_candle(symbol, current_price)
 
-            # 매도 체크 (매 1분): 수익률 ≥ +1.5% 이면 즉시 매도
-            if profit_rate >= self.config["take_profit_rate"]:
-                self.virtual_sell(symbol, current_price, "익절")
+        # 매도 체크 (매 1분)
+        elif self.check_take_profit(symbol, current_price):
+            pass
 
-            # 매수 체크 (매 5분)
-            elif loop_count % buy_interval == 0:
+        # 매수 체크 (매 5분)
+        elif loop_count % buy_interval == 0:
+            if candle_5m is None:
                 candle_5m = self.get_candle_data(symbol, buy_interval)
-                candle_type = "음봉" if candle_5m["is_prev_bearish"] else "양봉"
-
-                self.logger.info(
-                    f"[{symbol} 매수체크] 현재가={current_price:,.0f}원 | "
-                    f"평단={avg_price:,.0f}원 | "
-                    f"수익률={profit_rate:+.2f}% | "
-                    f"직전5분봉={candle_type}"
-                )
-
-                if candle_5m["is_prev_bearish"] and current_price < avg_price:
-                    self.virtual_buy(symbol, current_price)
-                else:
-                    self.logger.info(f"[{symbol} 대기] 매수 조건 미충족")
-
-            else:
-                self.logger.debug(
-                    f"[{symbol}] 현재가={current_price:,.0f}원 | "
-                    f"수익률={profit_rate:+.2f}% | "
-                    f"매수체크까지 {buy_interval - (loop_count % buy_interval)}분"
-                )
+            self.check_averaging_buy(symbol, current_price, candle_5m["is_prev_bearish"])
+
+        else:
+            self.logger.debug(
+                f"[{symbol}] 현재가={current_price:,.0f}원 | "
+                f"수익률={self.calculate_profit_rate(symbol, current_price):+.2f}% | "
+                f"매수체크까지 {buy_interval - (loop_count % buy_interval)}분"
+            )
 
     def run(self):
         """메인 실행 루프 (1분마다 매도 체크, 5분마다 매수 체크) - 전 종목 순회"""
@@ -318,7 +327,7 @@ class MinCoinBot:
         self.logger.info(f"MinCoinBot 시작 (종목: {', '.join(self.symbols)} | "
                          f"매도체크: {sell_interval}분봉, 매수체크: {buy_interval}분봉)")
 
-        self.slack.send(
+        self.outbox.send_slack(
             f"[민코인봇 세션 시작]\n"
             f"시작 운영금: {self.start_balance:,.0f}원\n"
             f"시작시간: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}"
@@ -327,16 +336,27 @@ class MinCoinBot:
         while True:
             try:
                 loop_count += 1
+                loop_start = time.time()
 
+                prices, candles_5m = self.poll_market(loop_count)
                 for symbol in self.symbols:
-                    self.process_symbol(symbol, loop_count)
+                    if symbol not in prices:
+                        self.logger.warning(f"[{symbol}] 현재가 없음 (마켓 코드 확인 필요)")
+                        continue
+                    try:
+                        self.process_symbol(symbol, loop_count, prices[symbol], candles_5m.get(symbol))
+                    except requests.exceptions.RequestException as e:
+                        self.logger.error(f"[{symbol}] API 호출 실패: {e}")
 
-                self.save_state()
-                time.sleep(sell_interval * 60)  # 1분마다 루프
+                # 1분마다 루프 (조회/처리에 걸린 시간만큼 덜 쉼)
+                time.sleep(max(0.0, sell_interval * 60 - (time.time() - loop_start)))
 
             except KeyboardInterrupt:
                 self.logger.info("사용자 중단 (Ctrl+C)")
                 self.save_state()
+                self.store.close()
+                self.quotes.close()
+                self.outbox.close()
                 break
             except requests.exceptions.RequestException as e:
                 self.logger.error(f"API 호출 실패: {e}")
@@ -345,7 +365,93 @@ class MinCoinBot:
                 self.logger.error(f"오류 발생: {e}", exc_info=True)
                 time.sleep(10)
 
+    # ==================== 스트리밍 모드 ====================
+    async def on_market_event(self, event: dict):
+        """
+        시세 피드 이벤트 처리
+        - 가격(체결/현재가)마다: 익절 체크
+        - 1분봉 마감: 첫 봉 매수
+        - 5분봉 마감: 추가 매수 체크 (마감된 5분봉이 음봉인지)
+        """
+        symbol = event["symbol"]
+        sym_state = self.state["symbols"].get(symbol)
+        if sym_state is None:
+            return
+
+        if event["type"] == "price":
+            self.marks.set(symbol, event["price"], event["time"] / 1000)
+            self.check_take_profit(symbol, event["price"])
+            return
+
+        candle = event["candle"]  # [timestamp, open, high, low, close, volume]
+        current_price = self.feed.last_prices.get(symbol, candle[4])
+
+        if event["minutes"] == self.config["sell_check_interval"] and sym_state["is_first_candle"]:
+            self.buy_first_candle(symbol, current_price)
+        elif event["minutes"] == self.config["buy_check_interval"] and not sym_state["is_first_candle"]:
+            self.check_averaging_buy(symbol, current_price, candle[4] < candle[1])
+
+    async def run_streaming(self, feed: UpbitMarketFeed = None):
+        """
+        WebSocket 스트리밍 실행 루프 (REST 폴링 없음)
+        feed: 사용할 시세 피드 (없으면 업비트 실서버 피드를 만들고 REST로 진행중 캔들 초기화,
+              테스트 시 리플레이 서버 주소로 만든 피드 전달)
+        """
+        sell_interval = self.config["sell_check_interval"]
+        buy_interval = self.config["buy_check_interval"]
+
+        if feed is None:
+            feed = UpbitMarketFeed(self.symbols, url=self.config.get("stream_url") or None,
+                                   intervals=(sell_interval, buy_interval))
+            now_ms = int(time.time() * 1000)
+            for symbol in self.symbols:
+                for minutes in (sell_interval, buy_interval):
+                    try:
+                        feed.seed(symbol, minutes, self.quotes.get_candle_rows(symbol, minutes), now_ms)
+                    except requests.exceptions.RequestException as e:
+                        self.logger.warning(f"[{symbol}] {minutes}분봉 초기화 실패: {e}")
+        self.feed = feed
+        feed.add_handler(self.on_market_event)
+
+        self.logger.info(f"MinCoinBot 시작 (streaming) (종목: {', '.join(self.symbols)} | "
+                         f"매도체크: 체결마다, 매수체크: {buy_interval}분봉 마감)")
+        self.outbox.send_slack(
+            f"[민코인봇 세션 시작 (streaming)]\n"
+            f"시작 운영금: {self.start_balance:,.0f}원\n"
+            f"시작시간: {self.start_time.strftime('%Y-%m-%d %H:%M:%S')}"
+        )
+
+        feed_task = asyncio.create_task(feed.run())
+        try:
+            while True:
+                await asyncio.sleep(sell_interval * 60)
+                unlisted = self.unlisted_holdings()
+                if unlisted:  # 피드 구독 밖의 보유 종목은 ticker로 시세 마크 갱신
+                    try:
+                        self.marks.update(await asyncio.to_thread(self.quotes.get_prices, unlisted))
+                    except requests.exceptions.RequestException as e:
+                        self.logger.warning(f"보유 종목 시세 조회 실패: {e}")
+                if feed_task.done():
+                    self.logger.error("시세 피드 종료됨 - 재시작")
+                    feed_task = asyncio.create_task(feed.run())
+        except asyncio.CancelledError:
+            # 정리는 finally에서 하고 취소는 호출자(asyncio.run)에게 그대로 전달
+            self.logger.info("사용자 중단 요청")
+            raise
+        finally:
+            feed.stop()
+            feed_task.cancel()
+            self.save_state()
+            self.store.close()
+            self.outbox.close()
+
 
 if __name__ == "__main__":
     bot = MinCoinBot()
-    bot.run()
+    if os.getenv("MINCOIN_STREAM", "").lower() in ("1", "true", "yes"):
+        try:
+            asyncio.run(bot.run_streaming())
+        except KeyboardInterrupt:
+            bot.logger.info("사용자 중단 (Ctrl+C)")
+    else:
+        bot.run()
@@ -6,6 +6,7 @@ import os
 BOT_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_PATH = os.path.join(BOT_DIR, "config.json")
 STATE_PATH = os.path.join(BOT_DIR, "state.json")
+JOURNAL_PATH = os.path.join(BOT_DIR, "state.journal")
 
 with open(CONFIG_PATH, "r") as f:
     config = json.load(f)
@@ -29,4 +30,8 @@ for symbol in symbols:
 with open(STATE_PATH, "w") as f:
     json.dump(initial_state, f, indent=2, ensure_ascii=False)
 
+# 이전 세션 저널 삭제 (남아 있으면 시작 시 새 state 위에 재생됨)
+if os.path.exists(JOURNAL_PATH):
+    os.remove(JOURNAL_PATH)
+
 print(f"MinCoinBot 초기화 완료 (잔고: 10,000,000원, 종목: {', '.join(symbols)})")
@@ -0,0 +1,155 @@
+"""
+TEST_SIMULATOR - 이벤트 점프 시뮬레이터 vs 1분씩 도는 기준 재생 비교
+봇 판단 순서(첫 봉 매수 → 익절 체크 → 5분봉 음봉 마감 + 평단 아래 추가 매수)를 1분봉마다 그대로 돌린 결과와
+simulator.py의 매매 내역/잔고가 정확히 같은지 확인 (tick / close 익절 모드 모두, 네트워크 불필요)
+
+- 꼬리 케이스: 1000원 횡보 중 고가만 1030원인 1분봉 1개 → 익절 1회 (평단 × 1.015 부동소수 오차로 건너뛰면 안 됨)
+- 랜덤 워크 3종목 × 3일 (잔고 공유, 같은 분은 종목 순서대로)
+
+사용법:
+    python TEST_SIMULATOR.py
+"""
+
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+import virtual_account
+from simulator import MinCoinSimulator, MINUTE_MS, FIVE_MINUTES_MS
+
+CONFIG = {"buy_amount": 5000, "take_profit_rate": 1.5, "buy_fee_rate": 0.05, "sell_fee_rate": 0.05}
+
+
+def min_take_profit_price(sym_state: dict, rate: float) -> float:
+    """profit_rate(price) >= rate 인 가장 낮은 가격 (1 ulp씩 탐색)"""
+    price = sym_state["holding_avg_price"] * (1 + rate / 100)
+    while virtual_account.profit_rate(sym_state, price) < rate:
+        price = float(np.nextafter(price, np.inf))
+    while virtual_account.profit_rate(sym_state, float(np.nextafter(price, -np.inf))) >= rate:
+        price = float(np.nextafter(price, -np.inf))
+    return price
+
+
+def reference_replay(candles: Dict[str, pd.DataFrame], mode: str, initial_balance: float = 10_000_000):
+    """1분봉마다 봇 루프 1회 (tick: 봉 안에서 기준을 처음 넘는 가격에 매도 / close: 종가로만)"""
+    rate = CONFIG["take_profit_rate"]
+    state = {"balance": float(initial_balance), "total_realized_profit": 0.0, "symbols": {
+        symbol: {"holding_qty": 0.0, "holding_avg_price": 0.0, "total_buy_amount": 0.0, "is_first_candle": True}
+        for symbol in candles
+    }}
+    bars = {symbol: (df.index.asi8 // 1_000_000, df[['open', 'high', 'close']].to_numpy())
+            for symbol, df in candles.items()}
+    rows = {symbol: {int(t): i for i, t in enumerate(ts)} for symbol, (ts, _) in bars.items()}
+    grid = np.unique(np.concatenate([ts for ts, _ in bars.values()]))
+    trades = []
+
+    for ts in grid:
+        for symbol, (_, values) in bars.items():
+            i = rows[symbol].get(int(ts))
+            if i is None:
+                continue
+            bar_open, bar_high, bar_close = values[i]
+            sym_state = state["symbols"][symbol]
+
+            if sym_state["is_first_candle"]:
+                sym_state["is_first_candle"] = False
+                if virtual_account.buy(state, symbol, bar_close, CONFIG) is not None:
+                    trades.append((ts, symbol, 'buy', bar_close))
+                continue
+            if sym_state["holding_avg_price"] <= 0:
+                continue
+
+            # 익절 체크
+            sell_price = None
+            if mode == 'close':
+                if virtual_account.profit_rate(sym_state, bar_close) >= rate:
+                    sell_price = bar_close
+            elif virtual_account.profit_rate(sym_state, bar_open) >= rate:
+                sell_price = bar_open
+            elif virtual_account.profit_rate(sym_state, bar_high) >= rate:
+                sell_price = min_take_profit_price(sym_state, rate)
+            if sell_price is not None:
+                virtual_account.sell(state, symbol, float(sell_price), CONFIG)
+                trades.append((ts, symbol, 'sell', float(sell_price)))
+                continue
+
+            # 5분봉 마감 분: 음봉 + 현재가 < 평단 이면 추가 매수
+            if (ts + MINUTE_MS) % FIVE_MINUTES_MS == 0:
+                first = rows[symbol].get(int(ts + MINUTE_MS - FIVE_MINUTES_MS))
+                bearish = first is not None and bar_close < values[first][0]
+                if bearish and bar_close < sym_state["holding_avg_price"]:
+                    if virtual_account.buy(state, symbol, bar_close, CONFIG) is not None:
+                        trades.append((ts, symbol, 'buy', bar_close))
+
+    return trades, state
+
+
+def make_wick() -> Dict[str, pd.DataFrame]:
+    index = pd.date_range("2026-01-01", periods=60, freq="1min")
+    df = pd.DataFrame({"open": 1000.0, "high": 1000.0, "low": 1000.0, "close": 1000.0, "volume": 1.0}, index=index)
+    df.iloc[30, df.columns.get_loc("high")] = 1030.0
+    return {"BTC": df}
+
+
+def make_random_walk(seed: int = 7, minutes: int = 3 * 1440) -> Dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-01-01", periods=minutes, freq="1min")
+    candles = {}
+    for symbol, start in [("BTC", 150_000_000.0), ("ETH", 5_000_000.0), ("XRP", 1_234.0)]:
+        close = start * np.exp(np.cumsum(rng.normal(0, 0.0015, minutes)))
+        open_ = np.r_[start, close[:-1]]
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.002, minutes)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.002, minutes)))
+        candles[symbol] = pd.DataFrame({"open": open_, "high": high, "low": low, "close": close,
+                                        "volume": 1.0}, index=index)
+    return candles
+
+
+def compare(name: str, candles: Dict[str, pd.DataFrame], mode: str) -> bool:
+    expected, state = reference_replay(candles, mode)
+    result = MinCoinSimulator(CONFIG, take_profit_mode=mode).run(candles)
+    trades = result.trades
+    actual = list(zip(trades['time'].astype('int64') // 1_000_000, trades['symbol'], trades['side'],
+                      trades['price']))
+    actual = [(int(ts), symbol, side, float(price)) for ts, symbol, side, price in actual]
+    expected = [(int(ts), symbol, side, float(price)) for ts, symbol, side, price in expected]
+
+    same = actual == expected and result.summary['final_cash'] == state["balance"]
+    sells = sum(1 for trade in expected if trade[2] == 'sell')
+    print(f"  {'✅' if same else '❌'} {name} [{mode}] 매매 {len(expected)}건 (익절 {sells}회) / "
+          f"시뮬레이터 {len(actual)}건, 잔고 {result.summary['final_cash']:,.2f}원")
+    if not same:
+        diff = next((i for i, (a, e) in enumerate(zip(actual, expected)) if a != e), min(len(actual), len(expected)))
+        print(f"     첫 차이 #{diff}: 시뮬레이터 {actual[diff:diff + 1]} / 기준 {expected[diff:diff + 1]}")
+    return same
+
+
+def main():
+    print("=" * 60)
+    print("🧪 시뮬레이터 vs 1분 단위 기준 재생")
+    print("=" * 60)
+
+    ok = True
+    wick = make_wick()
+    for mode in ('tick', 'close'):
+        ok &= compare("꼬리 1030원", wick, mode)
+
+    # 꼬리 케이스는 tick 모드에서 매수 1회 → 익절 1회 (익절 뒤 첫 봉 재매수)
+    trades = MinCoinSimulator(CONFIG, take_profit_mode='tick').run(wick).trades
+    sides = trades['side'].tolist()
+    wick_ok = sides[:2] == ['buy', 'sell']
+    ok &= wick_ok
+    print(f"  {'✅' if wick_ok else '❌'} 꼬리 익절가 {trades['price'].iloc[1] if len(trades) > 1 else None}")
+
+    walk = make_random_walk()
+    for mode in ('tick', 'close'):
+        ok &= compare("랜덤 워크 3종목", walk, mode)
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 일치!" if ok else "❌ 불일치 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
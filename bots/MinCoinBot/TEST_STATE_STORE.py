@@ -0,0 +1,142 @@
+"""
+TEST_STATE_STORE - 상태 저널/스냅샷 kill -9 테스트
+자식 프로세스가 정해진 순서의 가상 매수/매도를 실행하는 도중 SIGKILL로 여러 번 강제 종료하고
+다시 띄워서 이어서 실행 → 최종 state가 한 번도 죽지 않은 실행과 정확히 같은지 확인
++ 잔고 부족으로 첫 봉 매수가 안 된 경우에도 첫 봉 처리 여부가 재시작 후 유지되는지 확인
+(매매 누락/중복 반영 없음, 구글시트/슬랙/네트워크 불필요)
+
+사용법:
+    python TEST_STATE_STORE.py
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import signal
+import tempfile
+import subprocess
+
+import MinCoinBotStarter
+
+SYMBOLS = ["BTC", "ETH", "XRP"]
+TOTAL_OPS = 600
+CHECKPOINT_EVERY = 7  # 스냅샷 교체 중 종료되는 경우도 자주 나오도록 작게
+
+
+def make_bot(work_dir: str, fresh: bool) -> MinCoinBotStarter.MinCoinBot:
+    """work_dir의 config/state로 봇 생성 (구글시트/슬랙 전송 끔)"""
+    MinCoinBotStarter.BOT_DIR = work_dir  # 로그 파일도 work_dir에 (봇 폴더에 남지 않게)
+    MinCoinBotStarter.CONFIG_PATH = os.path.join(work_dir, "config.json")
+    MinCoinBotStarter.STATE_PATH = os.path.join(work_dir, "state.json")
+    if fresh:
+        config = {"symbols": SYMBOLS, "sell_check_interval": 1, "buy_check_interval": 5, "buy_amount": 5000,
+                  "take_profit_rate": 1.5, "buy_fee_rate": 0.05, "sell_fee_rate": 0.05,
+                  "checkpoint_every": CHECKPOINT_EVERY}
+        state = {"balance": 10_000_000, "total_realized_profit": 0, "symbols": {}}
+        for path, data in [(MinCoinBotStarter.CONFIG_PATH, config), (MinCoinBotStarter.STATE_PATH, state)]:
+            with open(path, "w") as f:
+                json.dump(data, f)
+
+    bot = MinCoinBotStarter.MinCoinBot()
+    bot.logger.handlers.clear()
+    bot.write_sheet = lambda *args, **kwargs: None
+    bot.slack.send = lambda message: False
+    return bot
+
+
+def apply_op(bot: MinCoinBotStarter.MinCoinBot, i: int):
+    """i번째 매매 (매매 1건 = 저널 1줄, 가격은 i로 결정)"""
+    symbol = SYMBOLS[i % len(SYMBOLS)]
+    price = 1000.0 * (1 + 0.01 * ((i * 37) % 11 - 5))
+    if i % 9 == 8:
+        bot.virtual_sell(symbol, price, "익절")
+    else:
+        bot.virtual_buy(symbol, price)
+
+
+def child(work_dir: str):
+    """저장된 seq부터 이어서 실행 (매매마다 번호 출력)"""
+    bot = make_bot(work_dir, fresh=False)
+    for i in range(bot.store.seq, TOTAL_OPS):
+        apply_op(bot, i)
+        print(i, flush=True)
+        time.sleep(0.001)
+    bot.save_state()
+
+
+def run_reference() -> dict:
+    work_dir = tempfile.mkdtemp(prefix="mincoin_ref_")
+    bot = make_bot(work_dir, fresh=True)
+    for i in range(TOTAL_OPS):
+        apply_op(bot, i)
+    return bot.state
+
+
+def check_first_candle_flag() -> bool:
+    """잔고 부족으로 첫 봉 매수가 안 돼도 첫 봉 처리(is_first_candle=False)는 재시작 후 유지"""
+    work_dir = tempfile.mkdtemp(prefix="mincoin_first_")
+    bot = make_bot(work_dir, fresh=True)
+    bot.state["balance"] = 1000  # buy_amount(5000) 미만
+    bot.buy_first_candle("BTC", 1000.0)
+    bot.store.close()
+
+    reloaded = make_bot(work_dir, fresh=False)
+    reloaded.store.close()
+    sym_state = reloaded.state["symbols"]["BTC"]
+    ok = not sym_state["is_first_candle"] and sym_state["holding_qty"] == 0 and reloaded.state["balance"] == 1000
+    print(f"  {'✅' if ok else '❌'} 잔고 부족 첫 봉: 매수 없이 첫 봉 처리만 저널 기록 → 재시작 후 유지")
+    return ok
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "child":
+        child(sys.argv[2])
+        return
+
+    print("=" * 60)
+    print("💥 상태 저널 kill -9 테스트")
+    print("=" * 60)
+
+    work_dir = tempfile.mkdtemp(prefix="mincoin_wal_")
+    make_bot(work_dir, fresh=True).store.close()
+    rng = random.Random(11)
+    kills = 0
+
+    while True:
+        proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), "child", work_dir],
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        target = rng.randint(20, 120)
+        last = None
+        count = 0
+        for line in proc.stdout:
+            if not line.strip().isdigit():
+                continue  # 슬랙 미설정 안내 등
+            last, count = int(line), count + 1
+            if count >= target and kills < 8:
+                proc.send_signal(signal.SIGKILL)
+                kills += 1
+                break
+        proc.wait()
+        print(f"  {'🔪 kill -9' if proc.returncode == -signal.SIGKILL else '🏁 완료'} (마지막 매매 #{last})")
+        if proc.returncode != -signal.SIGKILL:
+            break
+
+    with open(os.path.join(work_dir, "state.json")) as f:
+        actual = json.load(f)
+    actual.pop("seq", None)
+    expected = run_reference()
+
+    same = json.dumps(actual, sort_keys=True) == json.dumps(expected, sort_keys=True)
+    print(f"\n  강제 종료 {kills}회 후 잔고 {actual['balance']:,.2f}원 / 정답 {expected['balance']:,.2f}원")
+    print(f"  누적실현익 {actual['total_realized_profit']:+,.2f}원 / 정답 {expected['total_realized_profit']:+,.2f}원")
+    same &= check_first_candle_flag()
+
+    print("\n" + "=" * 60)
+    print("✨ 누락/중복 없이 일치!" if same else "❌ 불일치 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+TEST_UPBIT_FEED - 업비트 WebSocket 피드 + 스트리밍 모드 오프라인 테스트
+업비트 형식의 합성 체결/현재가 메시지를 로컬 가짜 WebSocket 서버로 재생해서
+1. 피드가 만든 종목별 1분/5분봉이 체결 기준 정답 캔들과 같은지
+2. 분 사이 잠깐 튄 가격(+3%)에서 틱 단위로 익절하는지 (1분 폴링이면 놓치는 구간)
+3. 5분봉 음봉 마감 + 현재가 < 평단에서 추가 매수하는지
+확인 (네트워크/API 키/구글시트/슬랙 불필요, state는 임시 폴더 사용)
+
+사용법:
+    python TEST_UPBIT_FEED.py
+"""
+
+import os
+import json
+import asyncio
+import tempfile
+import numpy as np
+import pandas as pd
+
+import MinCoinBotStarter
+from upbit_feed import UpbitMarketFeed, serve_replay
+
+PORT = 18766
+SYMBOLS = ["BTC", "ETH", "DOGE"]
+START_MS = 1_700_000_000_000 - 1_700_000_000_000 % 3_600_000
+MINUTES = 30
+SPIKE_MS = START_MS + 12 * 60_000 + 25_000  # 12분 25초에 10초간 +3%
+
+
+def make_trades(seed: int = 3) -> pd.DataFrame:
+    """
+    종목별 합성 체결 (BTC/ETH 평균 0.5초 간격, DOGE는 20초 간격 + 4분 공백)
+    BTC: 0~10분 하락 (5분봉 음봉 + 평단 아래 → 추가 매수), 12분 25초에 10초간 +3% 급등 후 복귀
+    """
+    rng = np.random.default_rng(seed)
+    frames = []
+    for symbol, base, mean_gap in [("BTC", 50_000_000.0, 500), ("ETH", 3_000_000.0, 500), ("DOGE", 150.0, 20_000)]:
+        gaps = rng.exponential(mean_gap, size=MINUTES * 60_000 // mean_gap * 2).astype(np.int64) + 1
+        times = START_MS + np.cumsum(gaps)
+        times = times[times < START_MS + MINUTES * 60_000]
+        if symbol == "DOGE":
+            times = times[(times < START_MS + 8 * 60_000) | (times >= START_MS + 12 * 60_000)]
+
+        minutes = (times - START_MS) / 60_000
+        if symbol == "BTC":
+            trend = np.where(minutes < 10, -0.001 * minutes, -0.01)
+            spike = (times >= SPIKE_MS) & (times < SPIKE_MS + 10_000)
+            prices = np.round(base * (1 + trend + np.where(spike, 0.03, 0.0)), -3)
+        else:
+            prices = np.round(base * (1 + np.cumsum(rng.normal(0, 0.0002, size=len(times)))), 2)
+        qtys = np.round(rng.exponential(0.01, size=len(times)) + 0.0001, 6)
+        frames.append(pd.DataFrame({'symbol': symbol, 'time': times, 'price': prices, 'qty': qtys}))
+
+    return pd.concat(frames).sort_values('time', kind='stable').reset_index(drop=True)
+
+
+def write_messages(trades: pd.DataFrame, path: str):
+    """업비트 DEFAULT 형식 체결 메시지 (체결 10건마다 현재가 메시지 1개)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, (symbol, t, p, q) in enumerate(zip(trades['symbol'], trades['time'], trades['price'], trades['qty'])):
+            message = {'type': 'trade', 'code': f'KRW-{symbol}', 'trade_price': float(p), 'trade_volume': float(q),
+                       'ask_bid': 'BID', 'trade_timestamp': int(t), 'timestamp': int(t) + 3,
+                       'sequential_id': int(t) * 10 + i % 10, 'stream_type': 'REALTIME'}
+            f.write(json.dumps(message) + '\n')
+            if i % 10 == 9:
+                ticker = {'type': 'ticker', 'code': f'KRW-{symbol}', 'trade_price': float(p),
+                          'trade_timestamp': int(t), 'timestamp': int(t) + 5, 'stream_type': 'REALTIME'}
+                f.write(json.dumps(ticker) + '\n')
+    print(f"💾 합성 메시지 생성: 체결 {len(trades)}건 → {path}")
+
+
+def expected_candles(trades: pd.DataFrame, symbol: str, minutes: int, clock_ms: int) -> np.ndarray:
+    """체결로 직접 만든 정답 마감 캔들 (첫 체결 봉부터 clock_ms 직전 봉까지, 체결 없는 봉은 직전 종가)"""
+    interval_ms = minutes * 60_000
+    sub = trades[trades['symbol'] == symbol]
+    bucket = sub['time'] - sub['time'] % interval_ms
+    grouped = sub.groupby(bucket)
+    df = pd.DataFrame({
+        'open': grouped['price'].first(), 'high': grouped['price'].max(),
+        'low': grouped['price'].min(), 'close': grouped['price'].last(), 'volume': grouped['qty'].sum()
+    }).reindex(range(int(bucket.iloc[0]), clock_ms - clock_ms % interval_ms, interval_ms))
+    df['close'] = df['close'].ffill()
+    for column in ['open', 'high', 'low']:
+        df[column] = df[column].fillna(df['close'])
+    df['volume'] = df['volume'].fillna(0.0)
+    return df.reset_index().to_numpy(dtype=np.float64)
+
+
+def check_candles(feed: UpbitMarketFeed, trades: pd.DataFrame) -> bool:
+    ok = True
+    for symbol in SYMBOLS:
+        for minutes, candles in feed.candles[symbol].items():
+            actual = np.array(list(candles.closed), dtype=np.float64)
+            expected = expected_candles(trades, symbol, minutes, feed.clock_ms)
+            same = actual.shape == expected.shape and np.allclose(actual, expected, rtol=0, atol=1e-6)
+            ok &= same
+            print(f"  {'✅' if same else '❌'} {symbol} {minutes}분봉 마감 {len(actual)}개 "
+                  f"{'일치' if same else f'불일치 (정답 {len(expected)}개)'}")
+    return ok
+
+
+def make_bot(work_dir: str) -> MinCoinBotStarter.MinCoinBot:
+    """임시 config/state로 봇 생성 (구글시트/슬랙 전송 끔)"""
+    config = {"symbols": SYMBOLS, "sell_check_interval": 1, "buy_check_interval": 5, "buy_amount": 5000,
+              "take_profit_rate": 1.5, "buy_fee_rate": 0.05, "sell_fee_rate": 0.05}
+    state = {"balance": 10_000_000, "total_realized_profit": 0, "symbols": {}}
+    MinCoinBotStarter.BOT_DIR = work_dir  # 로그 파일도 work_dir에 (봇 폴더에 남지 않게)
+    MinCoinBotStarter.CONFIG_PATH = os.path.join(work_dir, "config.json")
+    MinCoinBotStarter.STATE_PATH = os.path.join(work_dir, "state.json")
+    for path, data in [(MinCoinBotStarter.CONFIG_PATH, config), (MinCoinBotStarter.STATE_PATH, state)]:
+        with open(path, 'w') as f:
+            json.dump(data, f)
+
+    bot = MinCoinBotStarter.MinCoinBot()
+    bot.write_sheet = lambda *args, **kwargs: None
+    bot.slack.send = lambda message: False
+    return bot
+
+
+async def run_bot(path: str, bot: MinCoinBotStarter.MinCoinBot) -> tuple:
+    """로컬 가짜 서버에 접속해서 스트리밍 모드 실행, 매매 기록"""
+    runner = await serve_replay(path, port=PORT)
+    feed = UpbitMarketFeed(SYMBOLS, url=f"ws://127.0.0.1:{PORT}")
+
+    trades_log = []
+    original_buy, original_sell = bot.virtual_buy, bot.virtual_sell
+    bot.virtual_buy = lambda symbol, price: (trades_log.append(('buy', symbol, price, feed.clock_ms)),
+                                             original_buy(symbol, price))[1]
+    bot.virtual_sell = lambda symbol, price, reason: (trades_log.append(('sell', symbol, price, feed.clock_ms)),
+                                                      original_sell(symbol, price, reason))
+
+    with open(path, encoding='utf-8') as f:
+        total = sum(1 for _ in f)
+
+    task = asyncio.create_task(bot.run_streaming(feed))
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    while feed.message_count < total and loop.time() - start < 60:
+        await asyncio.sleep(0.05)
+    elapsed = loop.time() - start
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await runner.cleanup()
+    return feed, trades_log, elapsed, task.cancelled()
+
+
+def main():
+    print("=" * 60)
+    print("📡 업비트 WebSocket 피드 / 스트리밍 모드 오프라인 테스트")
+    print("=" * 60)
+
+    work_dir = tempfile.mkdtemp(prefix="mincoin_feed_")
+    path = os.path.join(work_dir, "upbit_synthetic.jsonl")
+    trades = make_trades()
+    write_messages(trades, path)
+
+    bot = make_bot(work_dir)
+    feed, trades_log, elapsed, cancelled = asyncio.run(run_bot(path, bot))
+    print(f"\n🔌 가짜 서버 재생: 메시지 {feed.message_count}개 / {elapsed:.2f}초")
+
+    all_ok = check_candles(feed, trades)
+
+    print("\n💹 스트리밍 매매")
+    for side, symbol, price, clock in trades_log:
+        print(f"  {side:4s} {symbol:4s} {price:>14,.2f}원 @ {(clock - START_MS) / 60_000:6.2f}분")
+
+    btc = trades[trades['symbol'] == "BTC"]
+    spike_sells = [t for t in trades_log if t[0] == 'sell' and t[1] == "BTC"
+                   and SPIKE_MS <= t[3] < SPIKE_MS + 10_000]
+    ok = len(spike_sells) == 1
+    all_ok &= ok
+    print(f"  {'✅' if ok else '❌'} 급등 10초 안에 BTC 익절")
+
+    # 1분 폴링(매 분 첫 체결가)이었다면 익절 기준에 닿았는지 (평단 ≥ 최저 매수가)
+    btc_buys = [t for t in trades_log if t[0] == 'buy' and t[1] == "BTC"]
+    first_buy = btc_buys[0]
+    minute_prices = btc.groupby(btc['time'] // 60_000)['price'].first()
+    polled_hit = bool((minute_prices >= min(t[2] for t in btc_buys) * 1.015).any())
+    print(f"  {'✅' if not polled_hit else '❌'} 1분 폴링 가격으로는 익절 기준 미도달 (틱 단위에서만 포착)")
+    all_ok &= not polled_hit
+
+    averaging = [t for t in btc_buys if t is not first_buy and t[3] < SPIKE_MS]
+    ok = len(averaging) > 0 and all((t[3] - t[3] % 60_000) % 300_000 == 0 for t in averaging)
+    all_ok &= ok
+    print(f"  {'✅' if ok else '❌'} BTC 추가 매수 {len(averaging)}회 (모두 5분봉 마감 시점)")
+
+    with open(MinCoinBotStarter.STATE_PATH) as f:
+        saved = json.load(f)
+    ok = abs(saved["balance"] - bot.state["balance"]) < 1e-6
+    all_ok &= ok
+    print(f"  {'✅' if ok else '❌'} state 저장 (잔고 {saved['balance']:,.0f}원, "
+          f"누적실현익 {saved['total_realized_profit']:+,.0f}원)")
+    all_ok &= cancelled
+    print(f"  {'✅' if cancelled else '❌'} 중단 요청은 정리 후 취소로 전달 (삼키지 않음)")
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 일치!" if all_ok else "❌ 불일치 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+TEST_UPBIT_QUOTES - 업비트 현재가 일괄 조회 오프라인 테스트
+업비트 규칙(없는 마켓이 하나라도 섞이면 /ticker 요청 전체 404)을 흉내낸 로컬 가짜 서버로
+상장폐지 종목이 섞여도 나머지 종목 현재가는 받아오는지, 다음 조회부터는 요청 1번인지 확인 (네트워크 불필요)
+
+사용법:
+    python TEST_UPBIT_QUOTES.py
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from upbit_quotes import UpbitQuotes
+
+PRICES = {"KRW-BTC": 150_000_000.0, "KRW-ETH": 5_000_000.0, "KRW-XRP": 1_234.0, "KRW-DOGE": 321.0}
+requests_seen = []
+
+
+class FakeUpbit(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        markets = parse_qs(url.query).get("markets", [""])[0].split(",")
+        requests_seen.append(markets)
+        if url.path != "/v1/ticker" or any(market not in PRICES for market in markets):
+            body, status = {"error": {"name": 404, "message": "Code not found"}}, 404
+        else:
+            body, status = [{"market": market, "trade_price": PRICES[market]} for market in markets], 200
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    print("=" * 60)
+    print("💱 업비트 현재가 일괄 조회 테스트")
+    print("=" * 60)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeUpbit)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    quotes = UpbitQuotes(base_url=f"http://127.0.0.1:{server.server_port}/v1", per_second=100)
+    ok = True
+
+    # 1. 정상 종목만 → 요청 1번
+    prices = quotes.get_prices(["BTC", "ETH"])
+    case = prices == {"BTC": 150_000_000.0, "ETH": 5_000_000.0} and len(requests_seen) == 1
+    ok &= case
+    print(f"  {'✅' if case else '❌'} 정상 종목 {len(prices)}개, 요청 {len(requests_seen)}번")
+
+    # 2. 상장폐지(LUNA) / 오타(BTCC) 섞임 → 나머지 현재가는 반환
+    requests_seen.clear()
+    prices = quotes.get_prices(["BTC", "ETH", "LUNA", "XRP", "DOGE", "BTCC"])
+    expected = {"BTC": 150_000_000.0, "ETH": 5_000_000.0, "XRP": 1_234.0, "DOGE": 321.0}
+    case = prices == expected and quotes.invalid_symbols == {"LUNA", "BTCC"}
+    ok &= case
+    print(f"  {'✅' if case else '❌'} 거부 종목 {sorted(quotes.invalid_symbols)} 제외, 현재가 {len(prices)}개 "
+          f"(요청 {len(requests_seen)}번)")
+
+    # 3. 다음 조회는 거부 종목을 빼고 요청 1번
+    requests_seen.clear()
+    prices = quotes.get_prices(["BTC", "ETH", "LUNA", "XRP", "DOGE", "BTCC"])
+    case = prices == expected and len(requests_seen) == 1
+    ok &= case
+    print(f"  {'✅' if case else '❌'} 다음 조회 요청 {len(requests_seen)}번")
+
+    quotes.close()
+    server.shutdown()
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+MinCoinBot 시세 마크 캐시 - 종목별 최근 시세 (총평가액 계산용)
+- 폴링 모드: 루프마다 전 종목 ticker 1번 결과로 갱신 / 스트리밍 모드: 체결/현재가 메시지마다 갱신
+- 매수/매도 시 총평가액은 캐시만 읽어서 계산 (종목 수만큼 메모리 순회, 추가 API 호출 없음)
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class PriceMarks:
+    """종목별 최근 시세 + 갱신 시각"""
+
+    def __init__(self):
+        self.prices: Dict[str, float] = {}
+        self.updated: Dict[str, float] = {}
+
+    def set(self, symbol: str, price: float, ts: Optional[float] = None):
+        """종목 하나 갱신 (ts: 초 단위, 없으면 현재 시각)"""
+        self.prices[symbol] = price
+        self.updated[symbol] = ts if ts is not None else time.time()
+
+    def update(self, prices: Dict[str, float], ts: Optional[float] = None):
+        """여러 종목 한번에 갱신 (ticker 일괄 조회 결과)"""
+        ts = ts if ts is not None else time.time()
+        self.prices.update(prices)
+        self.updated.update(dict.fromkeys(prices, ts))
+
+    def get(self, symbol: str, default: Optional[float] = None) -> Optional[float]:
+        return self.prices.get(symbol, default)
+
+    def age(self, symbol: str) -> Optional[float]:
+        """마지막 갱신 후 경과 초 (시세가 없으면 None)"""
+        updated = self.updated.get(symbol)
+        return None if updated is None else time.time() - updated
+
+    def holdings_value(self, symbols_state: dict) -> float:
+        """
+        보유 종목 평가금액 합계 (수량 × 최근 시세)
+        시세를 아직 못 받은 종목만 평단으로 평가
+        """
+        total = 0.0
+        for symbol, sym_state in symbols_state.items():
+            qty = sym_state["holding_qty"]
+            if qty > 0:
+                total += qty * self.prices.get(symbol, sym_state["holding_avg_price"])
+        return total
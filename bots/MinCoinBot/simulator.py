@@ -0,0 +1,380 @@
+"""
+MinCoinBot 시뮬레이터 - 저장된 업비트 1분봉으로 여러 종목 전략을 한 번에 재생
+- 5분봉은 1분봉을 리샘플링해서 생성 (UTC 기준 5분 경계)
+- 매수/매도 회계는 실시간 봇과 같은 virtual_account.buy / sell 사용 (수수료 포함, 잔고 전 종목 공유)
+- 매 분을 돌지 않고 다음 이벤트(익절 도달 / 음봉 마감 + 평단 아래 / 첫 봉)까지 넘파이로 바로 찾아서 이동
+  → 1년치 1분봉 × 전 종목도 매매 횟수만큼만 파이썬 루프 (수 초)
+- 익절 판단: tick = 1분봉 고가가 익절가에 닿으면 익절가(시가가 이미 위면 시가)에 매도 (스트리밍 모드)
+             close = 1분봉 종가 기준 (1분 폴링 모드)
+
+사용법:
+    python simulator.py                                   # config.json 종목, MarketDataService 저장소 (upbit {종목}/KRW 1m)
+    python simulator.py BTC,ETH 2025-01-01 2025-12-31     # 종목/기간 지정
+    python simulator.py BTC=btc_1m.csv,ETH=eth_1m.csv     # 캔들 CSV (timestamp ms, open, high, low, close, volume)
+    python simulator.py BTC,ETH 2025-01-01 2025-12-31 close trades.csv   # 1분 폴링 기준, 거래 내역 저장
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import virtual_account
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_PATH = os.path.join(BOT_DIR, "config.json")
+
+MINUTE_MS = 60_000
+FIVE_MINUTES_MS = 300_000
+NO_EVENT = np.iinfo(np.int64).max
+
+
+def load_candles(path: str) -> pd.DataFrame:
+    """1분봉 CSV(timestamp ms) → DataFrame (index: 캔들 시작 시각)"""
+    df = pd.read_csv(path)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df[['open', 'high', 'low', 'close', 'volume']].astype('float64')
+
+
+def load_store_candles(symbols: List[str], start=None, end=None, root: Optional[str] = None) -> Dict[str, pd.DataFrame]:
+    """MarketDataService 저장소의 업비트 1분봉 (memmap, backfill.py upbit {종목}/KRW 1m 으로 수집)"""
+    from services.MarketDataService import MarketDataStore
+
+    store = MarketDataStore(root)
+    return {symbol: store.frame('upbit', f"{symbol}/KRW", '1m', start, end) for symbol in symbols}
+
+
+def resample_5m(ts: np.ndarray, open_: np.ndarray, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    1분봉 → 5분봉 마감 시점
+    Returns: (5분봉 마지막 1분봉 위치, 5분봉 음봉 여부) - 끝에 덜 찬 5분봉은 제외
+    """
+    bucket = ts - ts % FIVE_MINUTES_MS
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:] - 1, len(ts) - 1]
+    bearish = close[ends] < open_[starts]
+
+    if len(ends) and (ts[-1] + MINUTE_MS) % FIVE_MINUTES_MS != 0:
+        ends, bearish = ends[:-1], bearish[:-1]
+    return ends, bearish
+
+
+class BlockIndex:
+    """
+    "start 이후 처음으로 threshold 이상/미만인 위치" 검색용 블록 최대/최소값
+    → 검색 한 번 = 시작 블록 나머지 + 블록 요약 + 찾은 블록 1개만 확인 (먼 익절 지점도 재스캔 없음)
+    """
+
+    def __init__(self, values: np.ndarray, block: int = 1024):
+        self.values = values
+        self.block = block
+        starts = np.arange(0, len(values), block)
+        self.block_max = np.maximum.reduceat(values, starts) if len(values) else values
+        self.block_min = np.minimum.reduceat(values, starts) if len(values) else values
+
+    def _search(self, start: int, threshold: float, above: bool) -> int:
+        n = len(self.values)
+        if start >= n:
+            return NO_EVENT
+        b = start // self.block
+        stop = min(n, (b + 1) * self.block)
+        seg = self.values[start:stop]
+        hits = seg >= threshold if above else seg < threshold
+        k = int(hits.argmax())
+        if hits[k]:
+            return start + k
+
+        summary = self.block_max[b + 1:] >= threshold if above else self.block_min[b + 1:] < threshold
+        k = int(summary.argmax()) if len(summary) else 0
+        if not len(summary) or not summary[k]:
+            return NO_EVENT
+        start = (b + 1 + k) * self.block
+        seg = self.values[start:start + self.block]
+        return start + int((seg >= threshold if above else seg < threshold).argmax())
+
+    def first_at_or_above(self, start: int, threshold: float) -> int:
+        """values[start:]에서 threshold 이상인 첫 위치 (없으면 NO_EVENT)"""
+        return self._search(start, threshold, True)
+
+    def first_below(self, start: int, threshold: float) -> int:
+        """values[start:]에서 threshold 미만인 첫 위치 (없으면 NO_EVENT)"""
+        return self._search(start, threshold, False)
+
+
+class SymbolTape:
+    """종목 하나의 1분봉 배열 + 5분봉 매수 체크 후보"""
+
+    def __init__(self, symbol: str, df: pd.DataFrame, take_profit_mode: str):
+        self.symbol = symbol
+        self.ts = np.asarray(df.index.asi8 // 1_000_000, dtype=np.int64)
+        self.open = np.ascontiguousarray(df['open'].to_numpy(dtype=np.float64))
+        self.high = np.ascontiguousarray(df['high'].to_numpy(dtype=np.float64))
+        self.close = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+        self.tp_values = self.high if take_profit_mode == 'tick' else self.close
+        self.tp_index = BlockIndex(self.tp_values)
+
+        # 추가 매수 후보: 5분봉 음봉 마감 시점 (현재가 = 마감 1분봉 종가)
+        ends, bearish = resample_5m(self.ts, self.open, self.close)
+        self.buy_idx = ends[bearish]
+        self.buy_close = self.close[self.buy_idx]
+        self.buy_index = BlockIndex(self.buy_close, block=256)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+@dataclass
+class SimulationResult:
+    """시뮬레이션 결과"""
+    trades: pd.DataFrame
+    equity: pd.Series
+    per_symbol: pd.DataFrame
+    summary: Dict = field(default_factory=dict)
+
+    def report(self) -> str:
+        s = self.summary
+        return f"""📊 MinCoinBot 시뮬레이션 ({s['start']} ~ {s['end']}, 종목 {s['symbols']}개, 1분봉 {s['candles']:,}개, 익절 판단 {s['take_profit_mode']})
+💰 초기 {s['initial_balance']:,.0f}원 → 최종 평가 {s['final_equity']:,.0f}원 ({s['return_pct']:+.2f}%)
+📈 매수 {s['buys']:,}회 / 익절 {s['sells']:,}회 / 실현손익 {s['realized_profit']:+,.0f}원 / 미실현 {s['unrealized_profit']:+,.0f}원
+📉 최대 낙폭 {s['max_drawdown_pct']:.2f}% / 수수료 {s['fees']:,.0f}원 / 최소 현금 {s['min_cash']:,.0f}원
+⏱️ 처리 시간 {s['elapsed']:.2f}초"""
+
+
+class MinCoinSimulator:
+    """MinCoinBot 전략 이벤트 재생 (1분봉 마감 = 봇 루프 1회)"""
+
+    def __init__(self, config: dict, initial_balance: float = 10_000_000, take_profit_mode: str = 'tick'):
+        """
+        Args:
+            config: config.json 형식 (buy_amount, take_profit_rate, 수수료율)
+            initial_balance: 시작 잔고 (원, 전 종목 공유)
+            take_profit_mode: 'tick' (1분봉 고가로 장중 익절) / 'close' (1분봉 종가로만 익절)
+        """
+        if take_profit_mode not in ('tick', 'close'):
+            raise ValueError(f"take_profit_mode는 tick / close 중 하나: {take_profit_mode}")
+        self.config = config
+        self.initial_balance = initial_balance
+        self.take_profit_mode = take_profit_mode
+        self.take_profit_rate = config["take_profit_rate"]
+
+    # ---------- 다음 이벤트 ----------
+    def _next_event(self, tape: SymbolTape, sym_state: dict, start: int) -> Tuple[int, str]:
+        """start 이후 이 종목의 다음 매매 위치와 종류 (first / take_profit / averaging)"""
+        if start >= len(tape):
+            return NO_EVENT, ''
+        if sym_state["is_first_candle"]:
+            return start, 'first'
+
+        avg_price = sym_state["holding_avg_price"]
+        if avg_price <= 0:
+            return NO_EVENT, ''  # 첫 매수가 잔고 부족으로 안 된 종목 (봇과 같이 대기만)
+
+        # 익절: 봇 수익률 계산으로 기준을 넘는 가장 낮은 가격 이상인 첫 위치
+        tp_at = tape.tp_index.first_at_or_above(start, self._tp_target(sym_state))
+
+        # 추가 매수: 음봉 5분봉 마감 중 현재가 < 평단인 첫 위치
+        k = tape.buy_index.first_below(int(np.searchsorted(tape.buy_idx, start)), avg_price)
+        buy_at = int(tape.buy_idx[k]) if k != NO_EVENT else NO_EVENT
+
+        if tp_at <= buy_at:  # 같은 분이면 익절 우선 (봇의 elif 순서)
+            return tp_at, ('take_profit' if tp_at != NO_EVENT else '')
+        return buy_at, 'averaging'
+
+    def _tp_target(self, sym_state: dict) -> float:
+        """
+        익절가 = 봇의 profit_rate가 take_profit_rate 이상이 되는 가장 낮은 가격
+        평단 × (1 + 익절률)은 부동소수 오차로 기준에 살짝 못 미치는 경우가 대부분 (1000 → 1014.9999999999999)
+        → 1 ulp씩 옮겨서 경계를 맞춤 (profit_rate는 가격에 단조라 이후엔 가격 비교만으로 봇과 같은 판단)
+        """
+        target = sym_state["holding_avg_price"] * (1 + self.take_profit_rate / 100)
+        while virtual_account.profit_rate(sym_state, target) < self.take_profit_rate:
+            target = float(np.nextafter(target, np.inf))
+        lower = float(np.nextafter(target, -np.inf))
+        while virtual_account.profit_rate(sym_state, lower) >= self.take_profit_rate:
+            target, lower = lower, float(np.nextafter(lower, -np.inf))
+        return target
+
+    def _tp_price(self, tape: SymbolTape, i: int, target: float) -> float:
+        """익절 체결가 (tick: 익절가, 시가가 이미 위면 시가 / close: 종가)"""
+        if self.take_profit_mode == 'close':
+            return float(tape.close[i])
+        return max(target, float(tape.open[i]))
+
+    # ---------- 실행 ----------
+    def run(self, candles: Dict[str, pd.DataFrame]) -> SimulationResult:
+        """
+        Args:
+            candles: {종목: 1분봉 DataFrame} (config 종목 순서 = 같은 분 처리 순서)
+        """
+        started = time.perf_counter()
+        tapes = [SymbolTape(symbol, df, self.take_profit_mode) for symbol, df in candles.items() if len(df)]
+        state = {"balance": float(self.initial_balance), "total_realized_profit": 0.0, "symbols": {
+            tape.symbol: {"holding_qty": 0.0, "holding_avg_price": 0.0, "total_buy_amount": 0.0,
+                          "is_first_candle": True}
+            for tape in tapes
+        }}
+
+        # (이벤트 시각, 종목 순서) 힙 → 모든 종목 매매를 시간순으로 (잔고 공유 반영)
+        heap = []
+        for order, tape in enumerate(tapes):
+            at, kind = self._next_event(tape, state["symbols"][tape.symbol], 0)
+            if at != NO_EVENT:
+                heapq.heappush(heap, (int(tape.ts[at]), order, at, kind))
+
+        rows = []
+        while heap:
+            ts, order, at, kind = heapq.heappop(heap)
+            tape = tapes[order]
+            symbol = tape.symbol
+            sym_state = state["symbols"][symbol]
+
+            if kind == 'take_profit':
+                price = self._tp_price(tape, at, self._tp_target(sym_state))
+                fill = virtual_account.sell(state, symbol, price, self.config)
+                rows.append((ts, symbol, 'sell', kind, price, fill["amount"], fill["fee"], fill["qty"],
+                             fill["profit"], state["balance"], 0.0, 0.0))
+            else:
+                if kind == 'first':
+                    sym_state["is_first_candle"] = False
+                price = float(tape.close[at])
+                fill = virtual_account.buy(state, symbol, price, self.config)
+                if fill is not None:
+                    rows.append((ts, symbol, 'buy', kind, price, fill["amount"], fill["fee"], fill["qty"],
+                                 0.0, state["balance"], sym_state["holding_qty"], sym_state["total_buy_amount"]))
+
+            next_at, next_kind = self._next_event(tape, sym_state, at + 1)
+            if next_at != NO_EVENT:
+                heapq.heappush(heap, (int(tape.ts[next_at]), order, next_at, next_kind))
+
+        trades = pd.DataFrame(rows, columns=['ts', 'symbol', 'side', 'kind', 'price', 'amount', 'fee', 'qty',
+                                             'profit', 'balance', 'holding_qty', 'invested'])
+        equity = self._equity_curve(tapes, trades)
+        trades.insert(0, 'time', pd.to_datetime(trades['ts'], unit='ms'))
+        per_symbol = self._per_symbol(tapes, trades, state)
+        summary = self._summary(tapes, trades, equity, state, per_symbol, time.perf_counter() - started)
+        return SimulationResult(trades.drop(columns='ts'), equity, per_symbol, summary)
+
+    # ---------- 결과 ----------
+    def _equity_curve(self, tapes: List[SymbolTape], trades: pd.DataFrame) -> pd.Series:
+        """1분봉 종가 기준 총평가액 (현금 + Σ 보유수량 × 종가), 전 종목 시각 합집합 위에서 벡터 계산"""
+        grid = np.unique(np.concatenate([tape.ts for tape in tapes])) if tapes else np.empty(0, dtype=np.int64)
+        trade_ts = trades['ts'].to_numpy(dtype=np.int64)
+
+        # 현금: 시각별 마지막 매매 후 잔고
+        k = np.searchsorted(trade_ts, grid, side='right') - 1
+        cash = np.where(k >= 0, trades['balance'].to_numpy()[np.maximum(k, 0)], float(self.initial_balance))
+        equity = cash.astype(np.float64)
+
+        for tape in tapes:
+            sub = trades[trades['symbol'] == tape.symbol]
+            # 매도 행의 보유수량은 0 (전량 매도)
+            qty_after = np.where(sub['side'].to_numpy() == 'sell', 0.0, sub['holding_qty'].to_numpy())
+            k = np.searchsorted(sub['ts'].to_numpy(dtype=np.int64), grid, side='right') - 1
+            qty = np.where(k >= 0, qty_after[np.maximum(k, 0)], 0.0)
+            p = np.searchsorted(tape.ts, grid, side='right') - 1
+            mark = np.where(p >= 0, tape.close[np.maximum(p, 0)], 0.0)
+            equity += qty * mark
+
+        return pd.Series(equity, index=pd.to_datetime(grid, unit='ms'), name='equity')
+
+    def _per_symbol(self, tapes: List[SymbolTape], trades: pd.DataFrame, state: dict) -> pd.DataFrame:
+        result = []
+        for tape in tapes:
+            sub = trades[trades['symbol'] == tape.symbol]
+            buys = sub[sub['side'] == 'buy']
+            sells = sub[sub['side'] == 'sell']
+            sym_state = state["symbols"][tape.symbol]
+
+            # 사이클(첫 매수 ~ 익절)별 매수 횟수 → 평단 낮추기 깊이
+            cycle = (sub['side'] == 'sell').cumsum().shift(fill_value=0)
+            depth = buys.groupby(cycle[buys.index]).size()
+            last_price = float(tape.close[-1])
+            unrealized = (sym_state["holding_qty"] * last_price * (1 - self.config["sell_fee_rate"] / 100)
+                          - sym_state["total_buy_amount"])
+
+            result.append({
+                'symbol': tape.symbol,
+                'candles': len(tape),
+                'buys': len(buys),
+                'sells': len(sells),
+                'win_rate': (sells['profit'] > 0).mean() * 100 if len(sells) else 0.0,
+                'realized_profit': sells['profit'].sum(),
+                'unrealized_profit': unrealized,
+                'fees': sub['fee'].sum(),
+                'max_buys_per_cycle': int(depth.max()) if len(depth) else 0,
+                'max_invested': buys['invested'].max() if len(buys) else 0.0,
+                'holding_qty': sym_state["holding_qty"],
+                'avg_price': sym_state["holding_avg_price"],
+                'last_price': last_price
+            })
+        return pd.DataFrame(result).set_index('symbol') if result else pd.DataFrame()
+
+    def _summary(self, tapes: List[SymbolTape], trades: pd.DataFrame, equity: pd.Series, state: dict,
+                 per_symbol: pd.DataFrame, elapsed: float) -> Dict:
+        values = equity.to_numpy()
+        peak = np.maximum.accumulate(values) if len(values) else values
+        drawdown = (values / peak - 1) * 100 if len(values) else values
+        final_equity = float(values[-1]) if len(values) else float(self.initial_balance)
+
+        return {
+            'start': equity.index[0] if len(equity) else None,
+            'end': equity.index[-1] if len(equity) else None,
+            'symbols': len(tapes),
+            'candles': sum(len(tape) for tape in tapes),
+            'take_profit_mode': self.take_profit_mode,
+            'initial_balance': self.initial_balance,
+            'final_equity': final_equity,
+            'final_cash': state["balance"],
+            'return_pct': (final_equity / self.initial_balance - 1) * 100,
+            'realized_profit': state["total_realized_profit"],
+            'unrealized_profit': float(per_symbol['unrealized_profit'].sum()) if len(per_symbol) else 0.0,
+            'buys': int((trades['side'] == 'buy').sum()),
+            'sells': int((trades['side'] == 'sell').sum()),
+            'fees': float(trades['fee'].sum()),
+            'min_cash': float(trades['balance'].min()) if len(trades) else state["balance"],
+            'max_drawdown_pct': -drawdown.min() if len(values) else 0.0,
+            'elapsed': elapsed
+        }
+
+
+def main():
+    with open(CONFIG_PATH, "r") as f:
+        config = json.load(f)
+
+    target = sys.argv[1] if len(sys.argv) > 1 else ",".join(config["symbols"])
+    start = sys.argv[2] if len(sys.argv) > 2 else None
+    end = sys.argv[3] if len(sys.argv) > 3 else None
+    mode = sys.argv[4] if len(sys.argv) > 4 else 'tick'
+    output = sys.argv[5] if len(sys.argv) > 5 else None
+
+    if '=' in target:
+        candles = {}
+        for item in target.split(','):
+            symbol, path = item.split('=', 1)
+            df = load_candles(path)
+            candles[symbol] = df.loc[start:end] if start or end else df
+    else:
+        candles = load_store_candles(target.split(','), start, end)
+
+    for symbol, df in candles.items():
+        print(f"📂 {symbol} 1분봉 {len(df):,}개" + (f" ({df.index[0]} ~ {df.index[-1]})" if len(df) else " (없음)"))
+
+    result = MinCoinSimulator(config, take_profit_mode=mode).run(candles)
+    print(result.report())
+    print(result.per_symbol.to_string(float_format=lambda value: f"{value:,.2f}"))
+
+    if output:
+        result.trades.to_csv(output, index=False)
+        print(f"💾 거래 내역 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
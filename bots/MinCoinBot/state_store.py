@@ -0,0 +1,141 @@
+"""
+MinCoinBot 상태 저장소 - 선기록 저널(WAL) + 원자적 스냅샷
+- 매수/매도마다 저널(state.journal, JSON Lines)에 한 줄 추가 + fsync → 루프당 저장 비용 = 변경 건수
+- 저널 항목에는 변경 후 값(잔고, 누적실현익, 해당 종목 상태)을 그대로 기록
+  → 재생은 덮어쓰기라서 같은 항목을 두 번 적용해도 결과가 같음 (중복 반영 없음)
+- 스냅샷(state.json)은 임시 파일에 쓰고 fsync 후 os.replace로 교체 (쓰다 죽어도 이전 스냅샷 유지)
+- 시작 시 스냅샷 + 스냅샷 이후(seq 초과) 저널 항목 재생, 마지막 줄이 잘렸으면(kill -9) 버림
+"""
+
+import os
+import json
+import time
+from typing import Optional
+
+
+class StateStore:
+    """state.json 스냅샷 + state.journal 저널"""
+
+    def __init__(self, snapshot_path: str, journal_path: Optional[str] = None, checkpoint_every: int = 200):
+        """
+        Args:
+            snapshot_path: 스냅샷 경로 (기존 state.json 형식 + seq)
+            journal_path: 저널 경로 (없으면 스냅샷 이름.journal)
+            checkpoint_every: 저널이 이만큼 쌓이면 스냅샷 갱신 후 저널 비움
+        """
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path or os.path.splitext(snapshot_path)[0] + ".journal"
+        self.checkpoint_every = checkpoint_every
+        self.seq = 0
+        self.pending = 0  # 마지막 스냅샷 이후 저널 항목 수
+        self._journal = None
+
+    # ==================== 로드 ====================
+    def load(self) -> dict:
+        """스냅샷 + 저널 재생 → 현재 state"""
+        with open(self.snapshot_path, "r") as f:
+            state = json.load(f)
+        self.seq = state.pop("seq", 0)
+        self.pending = 0
+
+        if os.path.exists(self.journal_path):
+            valid_bytes = 0
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # 쓰다 만 마지막 줄
+                    if not line.endswith(b"\n"):
+                        break
+                    valid_bytes += len(line)
+                    if entry["seq"] > self.seq:
+                        self._apply(state, entry)
+                        self.seq = entry["seq"]
+                        self.pending += 1
+
+            # 잘린 꼬리 제거 (다음 기록이 깨진 줄 뒤에 붙지 않도록)
+            if valid_bytes != os.path.getsize(self.journal_path):
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(valid_bytes)
+
+        return state
+
+    @staticmethod
+    def _apply(state: dict, entry: dict):
+        state["balance"] = entry["balance"]
+        state["total_realized_profit"] = entry["total_realized_profit"]
+        if entry.get("symbol"):
+            state["symbols"][entry["symbol"]] = dict(entry["symbol_state"])
+
+    # ==================== 기록 ====================
+    def record(self, event: str, symbol: Optional[str], state: dict, **details):
+        """
+        상태 변경 1건 저널 기록 (fsync 후 반환 → 반환되면 kill -9에도 유지)
+
+        Args:
+            event: 이벤트 이름 (buy / sell ...)
+            symbol: 변경된 종목 (없으면 잔고만)
+            state: 변경 후 전체 state (잔고/누적실현익/해당 종목 상태만 기록)
+            details: 참고용 값 (가격, 금액 등, 재생에는 사용 안 함)
+        """
+        self.seq += 1
+        entry = {
+            "seq": self.seq,
+            "ts": round(time.time(), 3),
+            "event": event,
+            "symbol": symbol,
+            "balance": state["balance"],
+            "total_realized_profit": state.get("total_realized_profit", 0),
+            "symbol_state": state["symbols"][symbol] if symbol else None,
+            **details
+        }
+        if self._journal is None:
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+        self.pending += 1
+        if self.pending >= self.checkpoint_every:
+            self.checkpoint(state)
+
+    # ==================== 스냅샷 ====================
+    def checkpoint(self, state: dict):
+        """원자적 스냅샷 저장 후 저널 비움"""
+        snapshot = dict(state)
+        snapshot["seq"] = self.seq
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self._fsync_dir()
+
+        # 스냅샷에 seq까지 반영됨 → 저널 비워도 안전 (비우기 전에 죽어도 재생 시 seq 이하는 건너뜀)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, "w"):
+                pass
+        self.pending = 0
+
+    def _fsync_dir(self):
+        """교체한 파일 이름까지 디스크에 반영 (지원하지 않는 OS는 건너뜀)"""
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(self.snapshot_path)), os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -0,0 +1,340 @@
+"""
+업비트 WebSocket 시세 피드 - 체결/현재가 스트림으로 종목별 1분봉/5분봉 로컬 생성
+- 체결(trade)마다 가격 이벤트 → 익절 판단을 틱 단위로
+- 체결 시각이 분 경계를 넘으면 전 종목의 끝난 캔들을 마감 → 캔들 마감 이벤트
+  (체결이 뜸한 종목도 다른 종목 체결 시각 기준으로 제때 마감, 체결 없던 구간은 직전 종가로 채움)
+- 현재가(ticker) 메시지는 가격 이벤트만 발생 (캔들은 체결 기준)
+- 실서버 대신 로컬 리플레이 서버나 녹화 파일로도 동작 (오프라인 테스트)
+
+사용법:
+    python upbit_feed.py record feed.jsonl 600 BTC,ETH     # 실시간 메시지 600초 녹화
+    python upbit_feed.py serve feed.jsonl 8766             # 녹화 파일 리플레이 서버 (ws://127.0.0.1:8766)
+"""
+
+import os
+import sys
+import json
+import uuid
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+
+PUBLIC_URL = "wss://api.upbit.com/websocket/v1"
+INTERVALS = (1, 5)  # 생성할 분봉 (매도 체크 1분, 매수 체크 5분)
+
+EventHandler = Callable[[Dict], Awaitable[None]]
+
+
+class MinuteCandles:
+    """종목 하나의 N분봉 (마감 캔들 + 진행중 캔들 1개, [timestamp, open, high, low, close, volume])"""
+
+    def __init__(self, minutes: int, max_candles: int = 200):
+        self.minutes = minutes
+        self.interval_ms = minutes * 60_000
+        self.closed = deque(maxlen=max_candles)
+        self.forming: Optional[list] = None
+
+    def seed(self, rows: List[list], now_ms: int):
+        """REST로 받은 캔들로 초기화 (now_ms 기준 마감 여부 판정)"""
+        self.closed.clear()
+        self.forming = None
+        for row in rows:
+            row = [int(row[0])] + [float(value) for value in row[1:6]]
+            if row[0] + self.interval_ms <= now_ms:
+                self.closed.append(row)
+            else:
+                self.forming = row
+
+    def advance(self, ts: int) -> List[list]:
+        """ts 시각 이전에 끝난 캔들 마감 → 새로 마감된 캔들 (체결 없던 구간은 직전 종가, 거래량 0)"""
+        start = ts - ts % self.interval_ms
+        closed = []
+        while self.forming is not None and self.forming[0] < start:
+            self.closed.append(self.forming)
+            closed.append(self.forming)
+            price = self.forming[4]
+            self.forming = [self.forming[0] + self.interval_ms, price, price, price, price, 0.0]
+        return closed
+
+    def on_trade(self, ts: int, price: float, qty: float) -> List[list]:
+        """체결 반영 → 새로 마감된 캔들"""
+        start = ts - ts % self.interval_ms
+        if self.forming is not None and start < self.forming[0]:
+            return []  # 이미 마감된 캔들의 늦은 체결
+
+        closed = self.advance(ts)
+        forming = self.forming
+        if forming is None or forming[5] == 0:
+            # 첫 체결 (직전 종가로 열어둔 캔들이면 첫 체결가로 다시 시작)
+            self.forming = [start, price, price, price, price, qty]
+        else:
+            forming[2] = max(forming[2], price)
+            forming[3] = min(forming[3], price)
+            forming[4] = price
+            forming[5] += qty
+        return closed
+
+
+class UpbitMarketFeed:
+    """업비트 공개 스트림 구독 + 종목별 1분/5분봉 + 이벤트 전달"""
+
+    PING_INTERVAL = 60  # 업비트는 120초간 메시지가 없으면 연결 종료
+
+    def __init__(self, symbols: List[str], url: Optional[str] = None, intervals=INTERVALS,
+                 max_candles: int = 200, record_path: Optional[str] = None):
+        """
+        Args:
+            symbols: 종목 코드 목록 (예: ["BTC", "ETH"], KRW 마켓)
+            url: WebSocket 주소 (없으면 업비트 실서버, 로컬 리플레이 서버 주소 가능)
+            intervals: 생성할 분봉 목록
+            record_path: 지정 시 받은 원본 메시지를 JSON Lines로 녹화
+        """
+        self.symbols = list(symbols)
+        self.url = url or PUBLIC_URL
+        self.record_path = record_path
+        self.logger = logging.getLogger(__name__)
+
+        self.candles: Dict[str, Dict[int, MinuteCandles]] = {
+            symbol: {minutes: MinuteCandles(minutes, max_candles) for minutes in intervals}
+            for symbol in self.symbols
+        }
+        self.handlers: List[EventHandler] = []
+
+        self.last_prices: Dict[str, float] = {}
+        self.clock_ms = 0  # 지금까지 받은 체결 중 가장 늦은 시각
+        self.message_count = 0
+        self._running = False
+
+    # ---------- 구독/이벤트 ----------
+    def codes(self) -> List[str]:
+        return [f"KRW-{symbol}" for symbol in self.symbols]
+
+    def subscribe_message(self) -> str:
+        return json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": "trade", "codes": self.codes()},
+            {"type": "ticker", "codes": self.codes()},
+            {"format": "DEFAULT"}
+        ])
+
+    def add_handler(self, handler: EventHandler):
+        """
+        이벤트 핸들러 등록 (async 함수)
+        이벤트: {'type': 'price', 'symbol', 'price', 'time'} - 체결/현재가 메시지마다
+               {'type': 'candle_closed', 'symbol', 'minutes', 'candle'} - 분봉 마감
+        """
+        self.handlers.append(handler)
+
+    def seed(self, symbol: str, minutes: int, rows: List[list], now_ms: int):
+        """REST 캔들로 종목/분봉 초기화 (진행중 캔들 시가를 공식 값으로 시작)"""
+        self.candles[symbol][minutes].seed(rows, now_ms)
+        if rows:
+            self.last_prices[symbol] = float(rows[-1][4])
+
+    async def _emit(self, event: Dict):
+        for handler in self.handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                self.logger.error(f"피드 이벤트 처리 실패 ({event['type']}): {e}")
+
+    # ---------- 메시지 처리 ----------
+    def _advance_clock(self, ts: int) -> List[Dict]:
+        """분 경계를 넘으면 전 종목의 끝난 캔들 마감"""
+        events = []
+        if ts // 60_000 > self.clock_ms // 60_000:
+            for symbol, by_minutes in self.candles.items():
+                for minutes, candles in by_minutes.items():
+                    for candle in candles.advance(ts):
+                        events.append({'type': 'candle_closed', 'symbol': symbol,
+                                       'minutes': minutes, 'candle': candle})
+        self.clock_ms = max(self.clock_ms, ts)
+        return events
+
+    def parse_message(self, message: Dict) -> List[Dict]:
+        """업비트 메시지 → 로컬 캔들 갱신 후 발생한 이벤트 목록"""
+        msg_type = message.get('type')
+        code = message.get('code', '')
+        symbol = code.split('-', 1)[1] if '-' in code else code
+        if symbol not in self.candles or msg_type not in ('trade', 'ticker'):
+            return []
+
+        price = float(message['trade_price'])
+        ts = int(message.get('trade_timestamp') or message.get('timestamp'))
+        events = []
+
+        if msg_type == 'trade':
+            events.extend(self._advance_clock(ts))
+            qty = float(message['trade_volume'])
+            for minutes, candles in self.candles[symbol].items():
+                for candle in candles.on_trade(ts, price, qty):
+                    events.append({'type': 'candle_closed', 'symbol': symbol, 'minutes': minutes, 'candle': candle})
+
+        self.last_prices[symbol] = price
+        events.append({'type': 'price', 'symbol': symbol, 'price': price, 'time': ts})
+        return events
+
+    async def handle_raw(self, raw):
+        """원본 메시지 1개 처리 (녹화 → 파싱 → 이벤트 전달), 업비트는 바이너리 프레임으로 보냄"""
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        if self.record_path:
+            with open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(raw.strip() + '\n')
+
+        message = json.loads(raw)
+        if 'type' not in message:
+            if 'error' in message:
+                self.logger.error(f"업비트 스트림 오류: {message}")
+            return  # {"status": "UP"} 등 응답
+
+        self.message_count += 1
+        for event in self.parse_message(message):
+            await self._emit(event)
+
+    # ---------- 실행 ----------
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse):
+        while not ws.closed:
+            await asyncio.sleep(self.PING_INTERVAL)
+            await ws.send_str("PING")
+
+    async def run(self, reconnect_delay: float = 3.0):
+        """WebSocket 연결 후 메시지 처리 (끊기면 재연결, stop() 호출 시 종료)"""
+        self._running = True
+        async with aiohttp.ClientSession() as session:
+            while self._running:
+                try:
+                    async with session.ws_connect(self.url) as ws:
+                        await ws.send_str(self.subscribe_message())
+                        self.logger.info(f"업비트 시세 피드 연결: {self.url} ({', '.join(self.codes())})")
+
+                        ping = asyncio.create_task(self._ping(ws))
+                        try:
+                            async for msg in ws:
+                                if msg.type in (aiohttp.WSMsgType.BINARY, aiohttp.WSMsgType.TEXT):
+                                    await self.handle_raw(msg.data)
+                                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                                if not self._running:
+                                    break
+                        finally:
+                            ping.cancel()
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.warning(f"업비트 시세 피드 연결 오류: {e}")
+
+                if self._running:
+                    self.logger.info(f"업비트 시세 피드 {reconnect_delay}초 후 재연결...")
+                    await asyncio.sleep(reconnect_delay)
+
+    def stop(self):
+        self._running = False
+
+    async def replay_file(self, path: str):
+        """녹화 파일(JSON Lines) 재생 - 네트워크 없이 동일한 이벤트 발생"""
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    await self.handle_raw(line)
+
+
+# ==================== 로컬 리플레이 서버 ====================
+async def serve_replay(path: str, host: str = '127.0.0.1', port: int = 8766, speed: float = 0.0):
+    """
+    녹화 파일을 업비트 스트림처럼 보내주는 로컬 WebSocket 서버
+    접속 → 구독 메시지 수신 → 녹화 메시지를 바이너리 프레임으로 순서대로 전송 (PING에는 {"status":"UP"})
+    speed: 0이면 대기 없이 전송, 1이면 실제 시간 간격대로
+
+    Returns: aiohttp AppRunner (runner.cleanup()으로 종료)
+    """
+    from aiohttp import web
+
+    with open(path, encoding='utf-8') as f:
+        messages = [line.strip() for line in f if line.strip()]
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        sender = None
+        async for msg in ws:
+            if msg.type not in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                continue
+            data = msg.data.decode('utf-8') if isinstance(msg.data, bytes) else msg.data
+            if data == "PING":
+                await ws.send_str(json.dumps({"status": "UP"}))
+            elif data.startswith('[') and sender is None:
+                sender = asyncio.create_task(_send_all(ws, messages, speed))
+
+        if sender is not None:
+            sender.cancel()
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def _send_all(ws, messages: List[str], speed: float):
+    last_ts = None
+    for raw in messages:
+        if speed > 0:
+            ts = json.loads(raw).get('timestamp')
+            if ts is not None and last_ts is not None and ts > last_ts:
+                await asyncio.sleep((ts - last_ts) / 1000 / speed)
+            last_ts = ts if ts is not None else last_ts
+        await ws.send_bytes(raw.encode('utf-8'))
+
+
+def main():
+    """녹화 / 리플레이 서버 실행"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ('record', 'serve'):
+        print(__doc__)
+        return
+
+    command, path = sys.argv[1], sys.argv[2]
+
+    if command == 'record':
+        seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 600
+        symbols = sys.argv[4].split(',') if len(sys.argv) > 4 else ["BTC", "ETH", "XRP", "SOL"]
+        if os.path.exists(path):
+            os.remove(path)
+        feed = UpbitMarketFeed(symbols, record_path=path)
+
+        async def record():
+            task = asyncio.create_task(feed.run())
+            await asyncio.sleep(seconds)
+            feed.stop()
+            task.cancel()
+
+        print(f"🎙️ {seconds:.0f}초 녹화 시작: {path}")
+        try:
+            asyncio.run(record())
+        except asyncio.CancelledError:
+            pass
+        print(f"💾 메시지 {feed.message_count}개 녹화 완료")
+
+    else:
+        port = int(sys.argv[3]) if len(sys.argv) > 3 else 8766
+
+        async def serve():
+            runner = await serve_replay(path, port=port, speed=1.0)
+            print(f"📡 리플레이 서버 실행: ws://127.0.0.1:{port}")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    main()
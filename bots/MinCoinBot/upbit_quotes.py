@@ -0,0 +1,181 @@
+"""
+업비트 시세 조회 - 커넥션 풀 세션 + 초당 요청 제한 + 종목 동시 조회
+- 현재가: /v1/ticker 한 번에 전 종목 (markets=KRW-BTC,KRW-ETH,...)
+  없는 마켓(상장폐지 등)이 섞여 요청 전체가 거부되면 목록을 나눠서 그 종목만 빼고 조회
+- 캔들: 종목별 /v1/candles/minutes/{interval}를 스레드 풀로 동시 요청
+- 업비트 시세 API 제한(그룹별 초당 10회)을 넘지 않도록 그룹별 1초 창 제한,
+  Remaining-Req 헤더의 남은 횟수가 0이거나 429를 받으면 다음 1초까지 대기
+"""
+
+import time
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+
+UPBIT_API = "https://api.upbit.com/v1"
+
+
+def parse_candles(data: list) -> dict:
+    """업비트 캔들 응답(최신순 2개) → 현재가/직전 봉 정보"""
+    # data[0] = 현재(진행중) 봉, data[1] = 직전(완성된) 봉
+    current_price = float(data[0]["trade_price"])
+    prev_open = float(data[1]["opening_price"])
+    prev_close = float(data[1]["trade_price"])
+
+    return {
+        "current_price": current_price,
+        "prev_open": prev_open,
+        "prev_close": prev_close,
+        "is_prev_bearish": prev_close < prev_open,
+        "is_prev_bullish": prev_close > prev_open,
+    }
+
+
+class RateLimiter:
+    """
+    초당 요청 수 제한 (스레드 안전)
+    1초 창 안의 요청 수 + 요청 간 최소 간격(1.1/per_second, 10% 여유)을 같이 지켜서
+    네트워크 지연이 들쭉날쭉해도 서버 기준으로 한도를 넘지 않게 함
+    """
+
+    def __init__(self, per_second: int):
+        self.per_second = per_second
+        self.spacing = 1.1 / per_second
+        self.sent = deque()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.sent and now - self.sent[0] >= 1.0:
+                    self.sent.popleft()
+                wait = self.blocked_until - now
+                if self.sent:
+                    wait = max(wait, self.sent[-1] + self.spacing - now)
+                    if len(self.sent) >= self.per_second:
+                        wait = max(wait, self.sent[0] + 1.0 - now)
+                if wait <= 0:
+                    self.sent.append(now)
+                    return
+            time.sleep(wait)
+
+    def pause(self, seconds: float = 1.0):
+        """서버가 남은 횟수 0 / 429를 알려주면 잠시 전체 대기"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+class UpbitQuotes:
+    """업비트 공개 시세 클라이언트 (봇 1개당 1개, 세션/스레드 풀 재사용)"""
+
+    def __init__(self, max_workers: int = 8, per_second: int = 10, timeout: float = 10,
+                 base_url: str = UPBIT_API, logger=None):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.logger = logger
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upbit")
+        self.per_second = per_second
+        self.limiters: Dict[str, RateLimiter] = {}
+        self.limiters_lock = threading.Lock()
+        self.invalid_symbols: Set[str] = set()  # 업비트가 마켓 코드를 거부한 종목 (현재가 조회에서 제외)
+
+    def _limiter(self, group: str) -> RateLimiter:
+        with self.limiters_lock:
+            if group not in self.limiters:
+                self.limiters[group] = RateLimiter(self.per_second)
+            return self.limiters[group]
+
+    def _get(self, path: str, params: dict, group: str, retries: int = 3):
+        limiter = self._limiter(group)
+        for attempt in range(retries + 1):
+            limiter.acquire()
+            resp = self.session.get(f"{self.base_url}{path}", params=params, timeout=self.timeout)
+
+            # Remaining-Req: group=candles; min=1800; sec=9
+            remaining = resp.headers.get("Remaining-Req", "")
+            if "sec=0" in remaining.replace(" ", ""):
+                limiter.pause(1.0)
+
+            if resp.status_code == 429 and attempt < retries:
+                limiter.pause(1.0 * (attempt + 1))
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    # ==================== 현재가 ====================
+    def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        전 종목 현재가 (보통 요청 1번)
+        업비트는 없는 마켓(오타, 상장폐지)이 하나라도 있으면 요청 전체를 4xx로 거부
+        → 목록을 반으로 나눠 다시 조회해서 거부된 종목만 빼고 나머지 현재가는 반환
+          (거부된 종목은 invalid_symbols에 기록 → 다음 조회부터 요청 1번)
+        """
+        return self._fetch_prices([symbol for symbol in symbols if symbol not in self.invalid_symbols])
+
+    def _fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        if not symbols:
+            return {}
+        markets = ",".join(f"KRW-{symbol}" for symbol in symbols)
+        try:
+            data = self._get("/ticker", {"markets": markets}, "ticker")
+        except requests.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            if not 400 <= status < 500 or status == 429:
+                raise
+            if len(symbols) == 1:
+                self.invalid_symbols.add(symbols[0])
+                if self.logger:
+                    self.logger.error(f"[{symbols[0]}] 업비트 마켓 코드 거부 ({status}) → 현재가 조회에서 제외")
+                return {}
+            half = len(symbols) // 2
+            return {**self._fetch_prices(symbols[:half]), **self._fetch_prices(symbols[half:])}
+        return {item["market"].split("-", 1)[1]: float(item["trade_price"]) for item in data}
+
+    # ==================== 캔들 ====================
+    def get_candle(self, symbol: str, interval: int) -> dict:
+        """종목 1개 직전 봉 데이터"""
+        data = self._get(f"/candles/minutes/{interval}", {"market": f"KRW-{symbol}", "count": 2}, "candles")
+        return parse_candles(data)
+
+    def get_candle_rows(self, symbol: str, interval: int, count: int = 2) -> List[list]:
+        """최근 캔들 원본 [[timestamp(ms, 봉 시작), open, high, low, close, volume], ...] (오래된 순)"""
+        data = self._get(f"/candles/minutes/{interval}", {"market": f"KRW-{symbol}", "count": count}, "candles")
+        rows = []
+        for item in reversed(data):
+            start = datetime.strptime(item["candle_date_time_utc"], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+            rows.append([int(start.timestamp() * 1000), float(item["opening_price"]), float(item["high_price"]),
+                         float(item["low_price"]), float(item["trade_price"]), float(item["candle_acc_trade_volume"])])
+        return rows
+
+    def get_candles(self, symbols: List[str], interval: int) -> Dict[str, dict]:
+        """
+        여러 종목 직전 봉 데이터 동시 조회
+        실패한 종목은 결과에서 빠짐 (로그만 남기고 나머지 종목은 계속)
+        """
+        futures = {symbol: self.executor.submit(self.get_candle, symbol, interval) for symbol in symbols}
+        result = {}
+        for symbol, future in futures.items():
+            try:
+                result[symbol] = future.result()
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"[{symbol}] {interval}분봉 조회 실패: {e}")
+        return result
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+        self.session.close()
@@ -0,0 +1,76 @@
+"""
+MinCoinBot 가상 계좌 회계 - 매수/매도 시 state 변경 (로그/시트/슬랙 없음)
+실시간 봇(MinCoinBotStarter)과 시뮬레이터(simulator.py)가 같은 계산을 쓰도록 분리
+"""
+
+from typing import Optional
+
+
+def profit_rate(sym_state: dict, current_price: float) -> float:
+    """평단 대비 수익률(%)"""
+    avg_price = sym_state["holding_avg_price"]
+    if avg_price <= 0:
+        return 0.0
+    return (current_price - avg_price) / avg_price * 100
+
+
+def buy(state: dict, symbol: str, current_price: float, config: dict) -> Optional[dict]:
+    """
+    가상 매수 (buy_amount원어치, 수수료 차감 후 수량 계산, 평단 가중평균)
+
+    Returns: 체결 정보 {amount, fee, qty} (잔고 부족이면 None, state 변경 없음)
+    """
+    buy_amount = config["buy_amount"]
+    sym_state = state["symbols"][symbol]
+
+    # 잔고 부족 체크
+    if state["balance"] < buy_amount:
+        return None
+
+    # 수수료 차감 후 실투자금
+    fee = buy_amount * (config["buy_fee_rate"] / 100)
+    actual_invest = buy_amount - fee
+    buy_qty = actual_invest / current_price
+
+    # 평단 재계산 (가중평균)
+    prev_qty = sym_state["holding_qty"]
+    new_qty = prev_qty + buy_qty
+
+    if new_qty > 0:
+        sym_state["holding_avg_price"] = (prev_qty * sym_state["holding_avg_price"] + actual_invest) / new_qty
+    sym_state["holding_qty"] = new_qty
+    sym_state["total_buy_amount"] = sym_state["total_buy_amount"] + buy_amount
+    state["balance"] -= buy_amount
+
+    return {"amount": buy_amount, "fee": fee, "qty": buy_qty}
+
+
+def sell(state: dict, symbol: str, current_price: float, config: dict) -> dict:
+    """
+    가상 전량 매도 → 종목 상태 리셋 (다시 첫 봉부터)
+
+    Returns: 체결 정보 {amount(수수료 차감 후 매도금), fee, profit, profit_rate, qty}
+    """
+    sym_state = state["symbols"][symbol]
+    holding_qty = sym_state["holding_qty"]
+
+    # 매도 금액 및 수수료
+    gross_sell = holding_qty * current_price
+    fee = gross_sell * (config["sell_fee_rate"] / 100)
+    net_sell = gross_sell - fee
+
+    # 손익 계산
+    profit = net_sell - sym_state["total_buy_amount"]
+    rate = profit_rate(sym_state, current_price)
+
+    # 잔고 반영
+    state["balance"] += net_sell
+    state["total_realized_profit"] = state.get("total_realized_profit", 0) + profit
+
+    # state 리셋 → 다시 첫 봉부터
+    sym_state["holding_qty"] = 0.0
+    sym_state["holding_avg_price"] = 0.0
+    sym_state["total_buy_amount"] = 0.0
+    sym_state["is_first_candle"] = True
+
+    return {"amount": net_sell, "fee": fee, "profit": profit, "profit_rate": rate, "qty": holding_qty}
@@ -0,0 +1,159 @@
+"""
+ObCoin Trading Bot - 멀티 심볼 러너 (BTC/ETH/SOL/XRP 한 프로세스)
+Based on Smart Money Concept (Order Blocks, FVG, Liquidity Sweep)
+
+- 거래소 연결/마켓 정보는 1번만 로드해서 모든 심볼이 공유
+- 포지션은 루프마다 전체 심볼을 한 번에 조회해서 심볼별로 나눠 전달
+- 심볼별 상태(포지션, 캔들 캐시, SMC 증분 상태)는 각 ObCoinBot 인스턴스에 격리
+- 한 심볼에서 오류가 나도 나머지 심볼은 계속 진행
+"""
+
+import os
+import time
+import logging
+from dataclasses import replace
+from datetime import datetime
+from typing import Dict, List
+
+from obcoin_bot import TradingConfig, ObCoinBot, setup_logging, connect_exchange, create_slack, create_outbox
+
+
+class ObCoinRunner:
+    """여러 심볼의 ObCoinBot을 거래소 연결 하나로 순차 실행"""
+
+    def __init__(self, config: TradingConfig):
+        """
+        Args:
+            config: 공통 트레이딩 설정 (config.symbols의 심볼마다 봇 생성)
+        """
+        self.config = config
+        setup_logging(config)
+        self.logger = logging.getLogger(__name__)
+
+        # 거래소 연결 + 마켓 정보 1회 로드 (ccxt가 exchange.markets에 캐시)
+        self.exchange = connect_exchange(config)
+        self.exchange.load_markets()
+
+        # Slack 서비스 (알림용, 전체 공유)
+        self.slack = create_slack(self.logger)
+        self.outbox = create_outbox(self.slack, self.logger)  # 구글시트/슬랙 전송 큐 (전체 공유)
+
+        # 심볼별 봇 (설정은 symbol만 바꿔서 복사)
+        self.bots: Dict[str, ObCoinBot] = {}
+        for symbol in config.symbols:
+            self.bots[symbol] = ObCoinBot(replace(config, symbol=symbol, symbols=[symbol]),
+                                          exchange=self.exchange, slack=self.slack, outbox=self.outbox)
+
+        self.logger.info(f"멀티 심볼 러너 초기화 완료: {', '.join(self.bots)}")
+
+    def fetch_positions(self) -> Dict[str, List[Dict]]:
+        """
+        전체 심볼 포지션 일괄 조회 → 심볼별 분배
+        바이비트는 fetch_positions에 심볼을 2개 이상 넘기면 거부 (ArgumentsRequired)
+        → 심볼 없이 정산 코인(USDT)별 선물 포지션 전체를 1번 조회한 뒤 심볼로 필터
+        """
+        positions = {symbol: [] for symbol in self.bots}
+        settle_coins = sorted({self.exchange.market(symbol).get('settle') or 'USDT' for symbol in self.bots})
+        for settle_coin in settle_coins:
+            for position in self.exchange.fetch_positions(None, {'category': 'linear', 'settleCoin': settle_coin}):
+                if position.get('symbol') in positions:
+                    positions[position['symbol']].append(position)
+        return positions
+
+    def run_once(self, loop_count: int):
+        """모든 심볼 루프 1회 (심볼별 오류는 격리)"""
+        try:
+            positions = self.fetch_positions()
+        except Exception as e:
+            self.logger.error(f"포지션 일괄 조회 실패: {e}")
+            positions = {}
+
+        for symbol, bot in self.bots.items():
+            try:
+                # 일괄 조회 실패 시 봇이 직접 조회
+                bot.run_once(loop_count, positions.get(symbol))
+            except Exception as e:
+                bot.logger.error(f"{symbol} 루프 오류: {e}")
+
+    def send_status_report(self):
+        """심볼별 상태를 묶어서 정기 리포트 1건 전송 (6시간마다)"""
+        try:
+            balance = self.exchange.fetch_balance()
+            usdt_balance = balance.get('USDT', {}).get('total', 0)
+
+            lines = [f"[Argos-ObCoin_Multi] 📊 정기 상태 리포트", "", f"💰 잔고: ${usdt_balance:.2f}"]
+            for bot in self.bots.values():
+                if bot.position:
+                    lines.append(f"📈 {bot.coin}: {bot.position.get('side', 'N/A')} "
+                                 f"PnL {bot.position.get('pnl_percent', 0):.2f}% "
+                                 f"(${bot.position.get('unrealized_pnl', 0):.2f})")
+                else:
+                    lines.append(f"📈 {bot.coin}: 포지션 없음")
+            lines += ["", f"⏰ 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", "✅ 봇 정상 작동 중"]
+
+            self.outbox.send_slack("\n".join(lines))
+
+        except Exception as e:
+            self.logger.error(f"상태 리포트 전송 실패: {e}")
+
+    def run(self):
+        """메인 실행 루프"""
+        self.logger.info("ObCoin 멀티 심볼 러너 시작")
+
+        coins = ', '.join(bot.coin for bot in self.bots.values())
+        self.outbox.send_slack(f"[Argos-ObCoin_Multi] 🤖 ObCoin Bot 가동 시작 ({coins})")
+
+        loop_count = 0
+        while True:
+            try:
+                loop_count += 1
+                started = time.time()
+
+                # 1~3. 심볼별 시장 분석 → 포지션 확인 → 거래 신호 실행
+                self.run_once(loop_count)
+
+                # 4. 정기 상태 리포트 (6시간마다)
+                if loop_count % 360 == 0:  # 60초 * 360 = 6시간
+                    self.send_status_report()
+
+                # 5. 대기 (심볼 처리에 쓴 시간은 제외)
+                elapsed = time.time() - started
+                if self.config.debug_mode:
+                    self.logger.info(f"루프 #{loop_count} 처리 {elapsed:.1f}초, 다음 루프까지 대기...")
+                time.sleep(max(0, self.config.loop_interval - elapsed))
+
+            except KeyboardInterrupt:
+                self.logger.info("사용자 중단 요청")
+                break
+            except Exception as e:
+                self.logger.error(f"메인 루프 오류: {e}")
+                time.sleep(10)
+
+        self.outbox.close()
+        self.logger.info("ObCoin 멀티 심볼 러너 종료")
+
+
+def main():
+    """메인 실행 함수"""
+
+    # 설정 로드 (OBCOIN_SYMBOLS=BTC,ETH 처럼 코인 목록 지정 가능)
+    coins = os.getenv("OBCOIN_SYMBOLS", "BTC,ETH,SOL,XRP").split(",")
+    config = TradingConfig(
+        api_key=os.getenv("BYBIT_API_KEY", ""),
+        api_secret=os.getenv("BYBIT_API_SECRET", ""),
+        symbols=[f"{coin.strip()}/USDT:USDT" for coin in coins if coin.strip()],  # 바이비트 선물
+        debug_mode=False  # 실거래 모드
+    )
+
+    # 러너 생성 및 실행
+    runner = ObCoinRunner(config)
+
+    try:
+        runner.run()
+    except Exception as e:
+        logging.error(f"러너 실행 중 오류 발생: {e}")
+        runner.outbox.send_slack(f"[Argos-ObCoin_Multi] ❌ 봇 오류: {e}")
+        runner.outbox.close()
+
+if __name__ == "__main__":
+    main()
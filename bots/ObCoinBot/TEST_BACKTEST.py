@@ -0,0 +1,153 @@
+"""
+TEST_BACKTEST - 백테스터 고정 캔들 재생 테스트 (네트워크 불필요)
+저장소에 포함된 fixtures/BTCUSDT_4h.csv (HTF는 1d 리샘플링)로 매번 같은 결과인지 확인
+- 거래 내역 / 최종 잔고 고정값 비교 (전략/체결 로직이 바뀌면 여기서 드러남)
+- 회계: 진입 수량 = 잔고 × position_size_percent / 진입가, 수수료/손익 공식, 2% 손절 / 4% 익절 체결가
+- 평가 자산 곡선을 거래 내역 + 종가로 다시 계산해서 비교
+- 미래 참조 없음: 앞부분만 잘라서 돌려도 그 구간에서 끝난 거래는 같음
+- 구조물 캐시 공유(옵티마이저 방식) 결과 = 캐시 없이 돌린 결과
+
+사용법:
+    python TEST_BACKTEST.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Argos 루트 경로를 Python 경로에 추가 (backtest → services.MarketDataService)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from obcoin_bot import TradingConfig
+from backtest import Backtester, load_candles, TAKER_FEE
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "BTCUSDT_4h.csv")
+
+# (진입 시각, 청산 시각, 사유, 진입가, 청산가)
+EXPECTED_TRADES = [
+    ("2024-01-10 16:00", "2024-01-12 00:00", "trailing_stop", 40710.4, 41252.013),
+    ("2024-01-16 12:00", "2024-01-17 08:00", "take_profit", 41343.8, 42997.552),
+    ("2024-01-24 00:00", "2024-01-24 16:00", "take_profit", 44885.4, 46680.816),
+    ("2024-02-02 16:00", "2024-02-03 12:00", "take_profit", 49374.3, 51349.272),
+    ("2024-02-17 16:00", "2024-02-17 20:00", "stop_loss", 52879.7, 51822.106),
+]
+EXPECTED_FINAL_BALANCE = 10216.7786
+
+
+def make_config(**overrides) -> TradingConfig:
+    """4h 진입 / 1d 추세 (고정 캔들 600개 = 100일 구간에서 거래가 나오도록 스윙 구간 5)"""
+    config = TradingConfig(min_confluence_count=2, fvg_min_gap_size=0.0003, **overrides)
+    config.timeframes = {**config.timeframes, 'ltf': '4h', 'htf': '1d'}
+    config.structure_windows = {**config.structure_windows, 'htf': 5}
+    return config
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"  {'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    return ok
+
+
+def trade_keys(trades) -> list:
+    return [(t['entry_time'], t['exit_time'], t['reason'], round(t['entry_price'], 3), round(t['exit_price'], 3))
+            for t in trades]
+
+
+def rebuild_equity(ltf: pd.DataFrame, trades: list, initial_balance: float) -> np.ndarray:
+    """거래 내역 + 종가로 평가 자산 곡선 재계산 (보유 중: 잔고 + 평가손익 - 진입 수수료)"""
+    decision_times = ltf.index + pd.Timedelta('4h')
+    close = ltf['close'].to_numpy()
+    equity = np.full(len(ltf), initial_balance)
+    balance = initial_balance
+    for trade in trades:
+        entry = decision_times.get_loc(trade['entry_time'])
+        exit_ = decision_times.get_loc(trade['exit_time'])
+        entry_fee = trade['entry_price'] * trade['size'] * TAKER_FEE
+        equity[entry:exit_] = balance + (close[entry:exit_] - trade['entry_price']) * trade['size'] - entry_fee
+        balance += trade['pnl']
+        equity[exit_:] = balance
+    return equity
+
+
+def test_fixture_replay(ltf: pd.DataFrame) -> bool:
+    print("\n📼 고정 캔들 재생")
+    result = Backtester(make_config()).run(ltf)
+    expected = [(pd.Timestamp(entry), pd.Timestamp(exit_), reason, entry_price, exit_price)
+                for entry, exit_, reason, entry_price, exit_price in EXPECTED_TRADES]
+    ok = check("거래 내역 고정값", trade_keys(result.trades) == expected, f"{len(result.trades)}건")
+    final = result.summary['final_balance']
+    ok &= check("최종 잔고 고정값", round(final, 4) == EXPECTED_FINAL_BALANCE and result.equity.iloc[-1] == final,
+                f"${final:,.4f}")
+
+    config = make_config()
+    balance, accounting = result.summary['initial_balance'], True
+    decision_index = ltf.index + pd.Timedelta('4h')
+    for trade in result.trades:
+        entry_k = decision_index.get_loc(trade['entry_time'])
+        exit_k = decision_index.get_loc(trade['exit_time'])
+        fee = (trade['entry_price'] + trade['exit_price']) * trade['size'] * TAKER_FEE
+        accounting &= bool(np.isclose(trade['entry_price'], ltf['close'].iloc[entry_k])
+                           and np.isclose(trade['size'], balance * config.position_size_percent / trade['entry_price'])
+                           and np.isclose(trade['fee'], fee)
+                           and np.isclose(trade['pnl'], (trade['exit_price'] - trade['entry_price']) * trade['size'] - fee))
+        exit_open = ltf['open'].iloc[exit_k]
+        if trade['reason'] == 'take_profit':
+            accounting &= bool(np.isclose(trade['exit_price'], max(exit_open, trade['entry_price'] * 1.04)))
+        elif trade['reason'] == 'stop_loss':
+            accounting &= bool(np.isclose(trade['exit_price'], min(exit_open, trade['entry_price'] * 0.98)))
+        balance += trade['pnl']
+    ok &= check("진입 수량 / 수수료 / 손익 / 손절·익절 체결가", accounting and np.isclose(balance, final))
+
+    overlap = any(b['entry_time'] < a['exit_time'] for a, b in zip(result.trades, result.trades[1:]))
+    ok &= check("포지션 겹침 없음", not overlap)
+
+    rebuilt = rebuild_equity(ltf, result.trades, result.summary['initial_balance'])
+    ok &= check("평가 자산 곡선 재계산 일치", np.allclose(rebuilt, result.equity.to_numpy()),
+                f"최대 낙폭 {result.summary['max_drawdown_pct']:.2f}%")
+    return ok
+
+
+def test_no_lookahead(ltf: pd.DataFrame) -> bool:
+    print("\n🔒 미래 참조 없음 (앞부분만 잘라서 재생)")
+    full = trade_keys(Backtester(make_config()).run(ltf).trades)
+    ok = True
+    for cut in (400, 460, 560):
+        cut_time = ltf.index[cut - 1] + pd.Timedelta('4h')
+        partial = [t for t in trade_keys(Backtester(make_config()).run(ltf.iloc[:cut]).trades) if t[2] != 'end']
+        expected = [t for t in full if t[1] <= cut_time]
+        ok &= check(f"캔들 {cut}개까지", partial == expected, f"끝난 거래 {len(expected)}건")
+    return ok
+
+
+def test_shared_cache(ltf: pd.DataFrame) -> bool:
+    print("\n♻️ 구조물 캐시 공유")
+    cache = {}
+    ok = True
+    for trailing in (0.005, 0.01, 0.02):
+        shared = Backtester(make_config(trailing_stop_percent=trailing), cache=cache).run(ltf)
+        alone = Backtester(make_config(trailing_stop_percent=trailing)).run(ltf)
+        ok &= check(f"trailing_stop_percent {trailing}",
+                    trade_keys(shared.trades) == trade_keys(alone.trades)
+                    and shared.summary['final_balance'] == alone.summary['final_balance'],
+                    f"${shared.summary['final_balance']:,.2f}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("🧪 ObCoin 백테스터 테스트")
+    print("=" * 60)
+
+    ltf = load_candles(FIXTURE)
+    ok = test_fixture_replay(ltf)
+    ok &= test_no_lookahead(ltf)
+    ok &= test_shared_cache(ltf)
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
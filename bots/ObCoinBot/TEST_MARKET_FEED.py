@@ -0,0 +1,230 @@
+"""
+TEST_MARKET_FEED - WebSocket 시세 피드 오프라인 테스트
+바이비트 형식의 녹화 메시지(JSON Lines)를 로컬 리플레이 서버로 재생해서
+피드가 만든 로컬 캔들이 체결 기준 정답 캔들과 같은지 확인 (네트워크/API 키 불필요)
+
+사용법:
+    python TEST_MARKET_FEED.py              # 합성 메시지 생성 후 테스트
+    python TEST_MARKET_FEED.py feed.jsonl   # market_feed.py record로 녹화한 파일 재생
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import numpy as np
+import pandas as pd
+
+from market_feed import BybitMarketFeed, CandleAggregator, serve_replay, TIMEFRAME_MS, KLINE_INTERVALS
+from obcoin_bot import TradingConfig
+from smc_state import SMCState
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+RECORD_DIR = os.path.join(BOT_DIR, "recorded_candles")
+SYMBOL = "BTC/USDT:USDT"
+TIMEFRAMES = {"mtf": "5m", "ltf": "1m"}
+PORT = 18765
+
+
+def make_messages(path: str, minutes: int = 180, seed: int = 7) -> pd.DataFrame:
+    """
+    합성 체결 + kline 메시지 생성 (바이비트 v5 public 형식)
+    중간에 체결이 없는 3분 공백 포함, kline은 진행중(10초마다) + 확정(마감 시) 전송
+
+    Returns: 정답 체결 DataFrame (time, price, qty)
+    """
+    rng = np.random.default_rng(seed)
+    start_ms = 1_700_000_000_000 - 1_700_000_000_000 % 3_600_000
+    end_ms = start_ms + minutes * 60_000
+
+    # 체결: 평균 0.2초 간격, 랜덤워크 가격
+    gaps = rng.exponential(200, size=minutes * 400).astype(np.int64) + 1
+    times = start_ms + np.cumsum(gaps)
+    times = times[times < end_ms]
+    gap_start = start_ms + 60 * 60_000
+    times = times[(times < gap_start) | (times >= gap_start + 3 * 60_000)]
+    prices = np.round(30000 + np.cumsum(rng.normal(0, 2, size=len(times))), 1)
+    qtys = np.round(rng.exponential(0.05, size=len(times)) + 0.001, 3)
+    trades = pd.DataFrame({'time': times, 'price': prices, 'qty': qtys})
+
+    market_id = SYMBOL.split(':')[0].replace('/', '')
+    expected = {tf: expected_candles(trades, tf, start_ms, end_ms) for tf in TIMEFRAMES.values()}
+    confirm_at = {tf: {int(ts) + TIMEFRAME_MS[tf]: row for ts, row in zip(df['timestamp'], df.values.tolist())}
+                  for tf, df in expected.items()}
+
+    with open(path, 'w', encoding='utf-8') as f:
+        batch = []
+        next_partial = start_ms + 10_000
+        for t, p, q in zip(times, prices, qtys):
+            # 마감된 캔들 확정 kline (체결보다 먼저 도착)
+            for tf, confirms in confirm_at.items():
+                for close_ms in [c for c in confirms if c <= t]:
+                    row = confirms.pop(close_ms)
+                    f.write(kline_message(market_id, tf, row, True, close_ms) + '\n')
+
+            batch.append({'T': int(t), 's': market_id, 'S': 'Buy', 'v': str(q), 'p': str(p),
+                          'L': 'PlusTick', 'i': str(t), 'BT': False})
+            if len(batch) >= 5:
+                f.write(json.dumps({'topic': f'publicTrade.{market_id}', 'type': 'snapshot',
+                                    'ts': int(t), 'data': batch}) + '\n')
+                batch = []
+
+            # 진행중 kline (10초마다, 지금까지 체결 기준)
+            if t >= next_partial:
+                for tf in TIMEFRAMES.values():
+                    bucket = int(t) - int(t) % TIMEFRAME_MS[tf]
+                    sub = trades[(trades['time'] >= bucket) & (trades['time'] <= t)]
+                    if len(sub):
+                        row = [bucket, sub['price'].iloc[0], sub['price'].max(), sub['price'].min(),
+                               sub['price'].iloc[-1], sub['qty'].sum()]
+                        f.write(kline_message(market_id, tf, row, False, int(t)) + '\n')
+                next_partial += 10_000
+
+        if batch:
+            f.write(json.dumps({'topic': f'publicTrade.{market_id}', 'type': 'snapshot',
+                                'ts': int(batch[-1]['T']), 'data': batch}) + '\n')
+
+    print(f"💾 합성 메시지 생성: 체결 {len(trades)}건 → {path}")
+    return trades
+
+
+def kline_message(market_id: str, timeframe: str, row: list, confirm: bool, ts: int) -> str:
+    interval = KLINE_INTERVALS[timeframe]
+    return json.dumps({
+        'topic': f'kline.{interval}.{market_id}',
+        'type': 'snapshot',
+        'ts': ts,
+        'data': [{
+            'start': int(row[0]), 'end': int(row[0]) + TIMEFRAME_MS[timeframe] - 1, 'interval': interval,
+            'open': str(row[1]), 'high': str(row[2]), 'low': str(row[3]), 'close': str(row[4]),
+            'volume': str(round(row[5], 6)), 'turnover': '0', 'confirm': confirm, 'timestamp': ts
+        }]
+    })
+
+
+def expected_candles(trades: pd.DataFrame, timeframe: str, start_ms: int, end_ms: int) -> pd.DataFrame:
+    """체결로 직접 만든 정답 캔들 (체결 없는 구간은 직전 종가, 거래량 0)"""
+    tf_ms = TIMEFRAME_MS[timeframe]
+    bucket = trades['time'] - trades['time'] % tf_ms
+    grouped = trades.groupby(bucket)
+    df = pd.DataFrame({
+        'open': grouped['price'].first(), 'high': grouped['price'].max(),
+        'low': grouped['price'].min(), 'close': grouped['price'].last(), 'volume': grouped['qty'].sum()
+    }).reindex(range(start_ms, end_ms, tf_ms))
+    df['close'] = df['close'].ffill()
+    for column in ['open', 'high', 'low']:
+        df[column] = df[column].fillna(df['close'])
+    df['volume'] = df['volume'].fillna(0.0)
+    df.index.name = 'timestamp'
+    return df.reset_index()[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
+
+
+def check_candles(feed: BybitMarketFeed, trades: pd.DataFrame) -> bool:
+    """피드의 마감 캔들 vs 정답 캔들"""
+    ok = True
+    start_ms = int(trades['time'].iloc[0]) - int(trades['time'].iloc[0]) % 3_600_000
+    for tf_name, timeframe in TIMEFRAMES.items():
+        agg = feed.aggregators[tf_name]
+        actual = np.array(list(agg.closed), dtype=np.float64)
+        expected = expected_candles(trades, timeframe, start_ms,
+                                    int(actual[-1][0]) + TIMEFRAME_MS[timeframe]).to_numpy(dtype=np.float64)
+        same = actual.shape == expected.shape and np.allclose(actual, expected, rtol=0, atol=1e-6)
+        ok &= same
+        print(f"  {'✅' if same else '❌'} {tf_name}({timeframe}) 마감 캔들 {len(actual)}개 "
+              f"{'일치' if same else f'불일치 (정답 {len(expected)}개)'}")
+    return ok
+
+
+def check_trade_only(trades: pd.DataFrame) -> bool:
+    """kline 없이 체결만으로 만든 캔들도 정답과 같은지 (공백 구간 채움 포함)"""
+    agg = CandleAggregator('1m')
+    for t, p, q in zip(trades['time'], trades['price'], trades['qty']):
+        agg.on_trade(int(t), float(p), float(q))
+    actual = np.array(list(agg.closed), dtype=np.float64)
+    start_ms = int(trades['time'].iloc[0]) - int(trades['time'].iloc[0]) % 3_600_000
+    expected = expected_candles(trades, '1m', start_ms, int(actual[-1][0]) + 60_000).to_numpy(dtype=np.float64)
+    same = actual.shape == expected.shape and np.allclose(actual, expected, rtol=0, atol=1e-6)
+    print(f"  {'✅' if same else '❌'} 체결만으로 만든 1m 캔들 {len(actual)}개 {'일치' if same else '불일치'}")
+    return same
+
+
+async def run_server_replay(path: str) -> tuple:
+    """로컬 리플레이 서버에 접속해서 피드 실행 + 이벤트마다 증분 분석"""
+    runner = await serve_replay(path, port=PORT)
+    feed = BybitMarketFeed(SYMBOL, TIMEFRAMES, url=f"ws://127.0.0.1:{PORT}")
+    state = SMCState(TradingConfig(timeframes=TIMEFRAMES, structure_windows={"mtf": 10, "ltf": 10}))
+
+    with open(path, encoding='utf-8') as f:
+        total = sum(1 for line in f if '"topic"' in line)
+
+    stats = {'price': 0, 'candle_closed': 0, 'analysis_ms': []}
+
+    async def on_event(event):
+        stats[event['type']] += 1
+        if event['type'] == 'candle_closed':
+            start = time.perf_counter()
+            state.update(event['tf_name'], feed.frame(event['tf_name'], 200))
+            stats['analysis_ms'].append((time.perf_counter() - start) * 1000)
+
+    feed.add_handler(on_event)
+    task = asyncio.create_task(feed.run())
+    start = time.perf_counter()
+    while feed.message_count < total and time.perf_counter() - start < 60:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - start
+
+    feed.stop()
+    task.cancel()
+    await runner.cleanup()
+    return feed, stats, elapsed
+
+
+async def run_file_replay(path: str) -> BybitMarketFeed:
+    feed = BybitMarketFeed(SYMBOL, TIMEFRAMES)
+    await feed.replay_file(path)
+    return feed
+
+
+def main():
+    print("=" * 60)
+    print("📡 WebSocket 시세 피드 오프라인 테스트")
+    print("=" * 60)
+
+    if len(sys.argv) > 1:
+        # 실제 녹화 파일: 서버 재생 결과와 파일 재생 결과가 같은지만 확인
+        path, trades = sys.argv[1], None
+        TIMEFRAMES.clear()
+        TIMEFRAMES.update({"htf": "4h", "mtf": "1h", "ltf": "15m"})
+    else:
+        os.makedirs(RECORD_DIR, exist_ok=True)
+        path = os.path.join(RECORD_DIR, "feed_synthetic.jsonl")
+        trades = make_messages(path)
+
+    all_ok = True
+
+    print("\n🔌 로컬 리플레이 서버 재생")
+    feed, stats, elapsed = asyncio.run(run_server_replay(path))
+    print(f"  📨 메시지 {feed.message_count}개 / {elapsed:.2f}초 "
+          f"(메시지당 {elapsed / max(feed.message_count, 1) * 1000:.3f}ms)")
+    print(f"  📈 가격 이벤트 {stats['price']}개, 캔들 마감 이벤트 {stats['candle_closed']}개")
+    if stats['analysis_ms']:
+        print(f"  ⏱️ 캔들 마감 시 증분 분석 평균 {np.mean(stats['analysis_ms']):.2f}ms")
+    if trades is not None:
+        all_ok &= check_candles(feed, trades)
+        all_ok &= check_trade_only(trades)
+
+    print("\n📂 녹화 파일 직접 재생")
+    file_feed = asyncio.run(run_file_replay(path))
+    for tf_name in TIMEFRAMES:
+        same = feed.frame(tf_name).equals(file_feed.frame(tf_name))
+        all_ok &= same
+        print(f"  {'✅' if same else '❌'} {tf_name} 서버 재생 = 파일 재생")
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 일치!" if all_ok else "❌ 불일치 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+TEST_MULTI_POSITIONS - 멀티 심볼 러너 포지션 일괄 조회 오프라인 테스트
+바이비트 규칙(fetch_positions에 심볼 2개 이상 불가)을 그대로 지키는 가짜 거래소로
+러너가 요청 1번으로 전체 포지션을 받아 심볼별로 나눠 주는지 확인 (네트워크/API 키 불필요)
+
+사용법:
+    python TEST_MULTI_POSITIONS.py
+"""
+
+import ccxt
+
+from ObCoinStarter_Multi import ObCoinRunner
+
+SYMBOLS = ["BTC/USDT:USDT", "ETH/USDT:USDT", "SOL/USDT:USDT", "XRP/USDT:USDT"]
+
+
+class FakeBybit:
+    """ccxt bybit.fetch_positions 인자 규칙만 흉내낸 가짜 거래소"""
+
+    def __init__(self, positions):
+        self.positions = positions
+        self.calls = []
+
+    def market(self, symbol):
+        return {'symbol': symbol, 'settle': symbol.split(':')[1]}
+
+    def fetch_positions(self, symbols=None, params={}):
+        self.calls.append((symbols, dict(params)))
+        if isinstance(symbols, list) and len(symbols) > 1:
+            raise ccxt.ArgumentsRequired('bybit fetchPositions() does not accept an array with more than one symbol')
+        if symbols:
+            return [p for p in self.positions if p['symbol'] in symbols]
+        return [p for p in self.positions if p['symbol'].endswith(':' + params.get('settleCoin', 'USDT'))]
+
+
+class FakeBot:
+    """러너가 넘겨준 포지션만 기록"""
+
+    def __init__(self):
+        self.received = 'not called'
+
+    def run_once(self, loop_count, positions=None):
+        self.received = positions
+
+
+def make_runner(exchange) -> ObCoinRunner:
+    """거래소 연결/봇 생성 없이 러너만 구성"""
+    runner = ObCoinRunner.__new__(ObCoinRunner)
+    runner.exchange = exchange
+    runner.bots = {symbol: FakeBot() for symbol in SYMBOLS}
+    runner.logger = __import__('logging').getLogger(__name__)
+    return runner
+
+
+def main():
+    print("=" * 60)
+    print("🔬 멀티 심볼 포지션 일괄 조회 테스트")
+    print("=" * 60)
+
+    positions = [
+        {'symbol': 'BTC/USDT:USDT', 'side': 'long', 'contracts': 0.01},
+        {'symbol': 'XRP/USDT:USDT', 'side': 'short', 'contracts': 100},
+        {'symbol': 'DOGE/USDT:USDT', 'side': 'long', 'contracts': 50},  # 러너 대상 아님
+    ]
+    exchange = FakeBybit(positions)
+    runner = make_runner(exchange)
+
+    ok = True
+
+    # 가짜 거래소가 바이비트와 같은 규칙인지 (심볼 목록 → 오류)
+    try:
+        exchange.fetch_positions(SYMBOLS)
+        print("  ❌ 가짜 거래소가 심볼 여러 개를 허용함")
+        ok = False
+    except ccxt.ArgumentsRequired:
+        print("  ✅ 심볼 여러 개 조회는 거부됨 (바이비트 규칙)")
+    exchange.calls.clear()
+
+    runner.run_once(1)
+
+    if len(exchange.calls) == 1 and exchange.calls[0] == (None, {'category': 'linear', 'settleCoin': 'USDT'}):
+        print(f"  ✅ 포지션 조회 1번: {exchange.calls[0]}")
+    else:
+        print(f"  ❌ 포지션 조회 호출: {exchange.calls}")
+        ok = False
+
+    expected = {
+        'BTC/USDT:USDT': [positions[0]],
+        'ETH/USDT:USDT': [],
+        'SOL/USDT:USDT': [],
+        'XRP/USDT:USDT': [positions[1]],
+    }
+    for symbol, bot in runner.bots.items():
+        if bot.received == expected[symbol]:
+            print(f"  ✅ {symbol}: 포지션 {len(bot.received)}개 전달")
+        else:
+            print(f"  ❌ {symbol}: {bot.received} (예상: {expected[symbol]})")
+            ok = False
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 일치!" if ok else "❌ 불일치 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
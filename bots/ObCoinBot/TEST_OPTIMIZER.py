@@ -0,0 +1,84 @@
+"""
+TEST_OPTIMIZER - 파라미터 최적화 병렬 실행 테스트 (네트워크 불필요)
+고정 캔들(fixtures/BTCUSDT_4h.csv)로 작은 그리드(8개)를 프로세스 2개로 돌려서
+- 순위표의 설정별 결과 = 같은 설정을 현재 프로세스에서 단독 백테스트한 결과
+- return_pct 내림차순 / rank 1부터 / 설정 누락·중복 없음
+- 끝나면 공유 메모리 해제 (unlink)
+
+사용법:
+    python TEST_OPTIMIZER.py
+"""
+
+import os
+import sys
+from multiprocessing import shared_memory
+
+# Argos 루트 경로를 Python 경로에 추가 (backtest → services.MarketDataService)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import optimizer
+from backtest import Backtester, load_candles
+from optimizer import optimize, grid_search_space
+from TEST_BACKTEST import FIXTURE, make_config
+
+GRID = {
+    'ob_min_body_ratio': [1.2, 1.7],
+    'trailing_stop_percent': [0.005, 0.02],
+    'position_size_percent': [0.1, 0.3],
+}
+COMPARED = ['return_pct', 'max_drawdown_pct', 'trades', 'final_balance', 'fees']
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"  {'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    return ok
+
+
+class RecordingSharedCandles(optimizer.SharedCandles):
+    """만든 공유 메모리 이름 기록 (해제 확인용)"""
+    names = []
+
+    def __init__(self, df):
+        super().__init__(df)
+        RecordingSharedCandles.names.append(self.shm.name)
+
+
+def main():
+    print("=" * 60)
+    print("🔍 ObCoin 파라미터 최적화 테스트")
+    print("=" * 60)
+
+    candles = load_candles(FIXTURE)
+    params_list = grid_search_space(GRID)
+    optimizer.SharedCandles = RecordingSharedCandles
+
+    table = optimize(candles, params_list, base_config=make_config(), workers=2)
+    print(table.to_string(columns=list(GRID) + ['return_pct', 'trades'], float_format=lambda v: f"{v:.4f}"))
+
+    ok = check("설정 8개 모두 1번씩", len(table) == len(params_list)
+               and sorted(map(tuple, table[list(GRID)].to_numpy().tolist())) ==
+               sorted(tuple(p[key] for key in GRID) for p in params_list))
+    ok &= check("return_pct 내림차순, rank 1부터", table['return_pct'].is_monotonic_decreasing
+                and list(table.index) == list(range(1, len(params_list) + 1)) and table.index.name == 'rank')
+
+    same = True
+    for _, row in table.iterrows():
+        params = {key: row[key] for key in GRID}
+        summary = Backtester(make_config(**params)).run(candles).summary
+        same &= all(summary[column] == row[column] for column in COMPARED)
+    ok &= check("워커 결과 = 단독 백테스트 결과", bool(same), f"최고 {table['return_pct'].iloc[0]:+.2f}%")
+
+    try:
+        shared_memory.SharedMemory(name=RecordingSharedCandles.names[0]).close()
+        released = False
+    except FileNotFoundError:
+        released = True
+    ok &= check("공유 메모리 해제", released and len(RecordingSharedCandles.names) == 1)
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
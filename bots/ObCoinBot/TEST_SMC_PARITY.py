@@ -0,0 +1,232 @@
+"""
+TEST_SMC_PARITY - SMC 벡터화 엔진 vs 기존 루프 결과 비교 테스트
+저장된 캔들(CSV)로 두 모드의 분석 결과가 같은지 확인
+기본은 저장소에 포함된 고정 캔들 (fixtures/, 시드 고정 합성 데이터 4h/1h/15m 각 600개)
+→ 네트워크 없이 매번 같은 결과
+
+사용법:
+    python TEST_SMC_PARITY.py                 # 고정 캔들 (fixtures/) 사용
+    python TEST_SMC_PARITY.py --record        # 바이비트 공개 API로 최신 캔들 녹화 후 비교 (API 키 불필요)
+    python TEST_SMC_PARITY.py my_candles.csv  # 직접 지정한 CSV 사용
+"""
+
+import os
+import sys
+import time
+import pandas as pd
+
+from obcoin_bot import TradingConfig, SMCAnalyzer
+from smc_state import SMCState
+
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BOT_DIR, "fixtures")
+RECORD_DIR = os.path.join(BOT_DIR, "recorded_candles")
+RECORD_SYMBOL = "BTC/USDT:USDT"
+RECORD_TIMEFRAMES = ["4h", "1h", "15m"]
+
+
+def record_candles(timeframe: str, limit: int = 1000) -> str:
+    """바이비트 공개 API로 캔들 녹화 (CSV 저장)"""
+    import ccxt
+
+    os.makedirs(RECORD_DIR, exist_ok=True)
+    path = os.path.join(RECORD_DIR, f"BTCUSDT_{timeframe}.csv")
+
+    exchange = ccxt.bybit({'options': {'defaultType': 'swap'}})
+    ohlcv = exchange.fetch_ohlcv(RECORD_SYMBOL, timeframe, limit=limit)
+
+    df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df.to_csv(path, index=False)
+    print(f"💾 {timeframe} 캔들 {len(df)}개 녹화: {path}")
+    return path
+
+
+def load_candles(path: str) -> pd.DataFrame:
+    """녹화된 CSV를 봇과 같은 형태의 DataFrame으로 로드"""
+    df = pd.read_csv(path)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df
+
+
+def compare(name: str, expected: list, actual: list, keys=None) -> bool:
+    """dict 리스트 비교 (keys 지정 시 해당 키만 비교)"""
+    if keys is not None:
+        expected = [{k: item[k] for k in keys} for item in expected]
+        actual = [{k: item[k] for k in keys} for item in actual]
+
+    if expected == actual:
+        print(f"  ✅ {name}: {len(actual)}개 일치")
+        return True
+
+    print(f"  ❌ {name}: 불일치 (루프 {len(expected)}개 / 벡터 {len(actual)}개)")
+    for exp, act in zip(expected, actual):
+        if exp != act:
+            print(f"     루프: {exp}")
+            print(f"     벡터: {act}")
+            break
+    return False
+
+
+def check_parity(df: pd.DataFrame) -> bool:
+    """루프 모드와 벡터화 모드 결과 비교"""
+    loop = SMCAnalyzer(TradingConfig(vectorized_engine=False))
+    vector = SMCAnalyzer(TradingConfig(vectorized_engine=True))
+
+    ok = True
+
+    # 오더블럭
+    start = time.perf_counter()
+    loop_bull = loop.detect_order_blocks(df, bullish=True)
+    loop_bear = loop.detect_order_blocks(df, bullish=False)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vec_bull, vec_bear = vector.detect_order_blocks_all(df)
+    vec_time = time.perf_counter() - start
+
+    ok &= compare("상승 오더블럭", loop_bull, vec_bull)
+    ok &= compare("하락 오더블럭", loop_bear, vec_bear)
+    print(f"  ⏱️ 오더블럭: 루프 {loop_time * 1000:.1f}ms / 벡터 {vec_time * 1000:.1f}ms")
+
+    # FVG (filled는 벡터화 엔진만 계산하므로 제외하고 비교)
+    start = time.perf_counter()
+    loop_bull = loop.detect_fvg(df, bullish=True)
+    loop_bear = loop.detect_fvg(df, bullish=False)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vec_bull, vec_bear = vector.detect_fvg_all(df)
+    vec_time = time.perf_counter() - start
+
+    fvg_keys = ['type', 'top', 'bottom', 'time', 'size']
+    ok &= compare("상승 FVG", loop_bull, vec_bull, fvg_keys)
+    ok &= compare("하락 FVG", loop_bear, vec_bear, fvg_keys)
+    ok &= check_fvg_fill(df, vec_bull + vec_bear)
+    print(f"  ⏱️ FVG: 루프 {loop_time * 1000:.1f}ms / 벡터 {vec_time * 1000:.1f}ms")
+
+    # 유동성 스윕 (여러 lookback 동시 평가 포함)
+    lookbacks = [10, 20, 50]
+    start = time.perf_counter()
+    loop_sweeps = loop.detect_liquidity_sweeps(df, lookbacks)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    vec_sweeps = vector.detect_liquidity_sweeps(df, lookbacks)
+    vec_time = time.perf_counter() - start
+
+    sweep_keys = ['type', 'level', 'time', 'wick_size']
+    ok &= compare("유동성 스윕 (lookback 20)",
+                  loop.detect_liquidity_sweep(df), vector.detect_liquidity_sweep(df), sweep_keys)
+    ok &= compare(f"유동성 스윕 (lookback {lookbacks})",
+                  loop_sweeps, vec_sweeps, sweep_keys + ['lookback'])
+    print(f"  ⏱️ 유동성 스윕: 루프 {loop_time * 1000:.1f}ms / 벡터 {vec_time * 1000:.1f}ms")
+
+    # 시장 구조 (스윙 포인트 + 추세)
+    for window in [20, 50]:
+        start = time.perf_counter()
+        loop_structure = loop.calculate_market_structure(df, window)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vec_structure = vector.calculate_market_structure(df, window)
+        vec_time = time.perf_counter() - start
+
+        structure_keys = ['trend', 'highs', 'lows', 'last_swing_high', 'last_swing_low']
+        ok &= compare(f"시장 구조 (window {window})", [loop_structure], [vec_structure], structure_keys)
+        print(f"  ⏱️ 시장 구조: 루프 {loop_time * 1000:.1f}ms / 벡터 {vec_time * 1000:.1f}ms "
+              f"(BOS/CHoCH {len(vec_structure['events'])}개)")
+
+    return ok
+
+
+def check_incremental(df: pd.DataFrame, fetch_limit: int = 200) -> bool:
+    """
+    증분 분석 상태 vs 전체 재계산 비교
+    봇처럼 매 루프 최근 fetch_limit개 캔들(마지막은 진행중)을 넘겨 상태를 누적한 뒤
+    마지막 시점의 전체 재계산 결과와 비교 (상태는 최근 MAX_ITEMS개만 보관)
+    """
+    config = TradingConfig()
+    analyzer = SMCAnalyzer(config)
+    state = SMCState(config)
+
+    start = time.perf_counter()
+    for end in range(fetch_limit, len(df) + 1):
+        result = state.update('ltf', df.iloc[end - fetch_limit:end])
+    loop_time = time.perf_counter() - start
+    ticks = len(df) - fetch_limit + 1
+
+    full = analyzer.analyze_frame(df, 'ltf')
+    ok = True
+
+    def recent(full_items: list, state_items: list) -> tuple:
+        count = min(len(full_items), len(state_items))
+        return full_items[len(full_items) - count:], state_items[len(state_items) - count:]
+
+    for direction in ['bullish', 'bearish']:
+        ok &= compare(f"증분 {direction} 오더블럭",
+                      *recent(full['order_blocks'][direction], result['order_blocks'][direction]))
+        ok &= compare(f"증분 {direction} FVG",
+                      *recent(full['fvgs'][direction], result['fvgs'][direction]))
+    ok &= compare("증분 유동성 스윕", *recent(full['liquidity_sweeps'], result['liquidity_sweeps']))
+
+    full_structure = full['market_structure']
+    state_structure = result['market_structure']
+    ok &= compare("증분 추세/스윙", [full_structure], [state_structure],
+                  ['trend', 'last_swing_high', 'last_swing_low'])
+    ok &= compare("증분 BOS/CHoCH", *recent(full_structure['events'], state_structure['events']))
+
+    print(f"  ⏱️ 증분 분석: {ticks}틱 평균 {loop_time / ticks * 1000:.2f}ms")
+    return ok
+
+
+def check_fvg_fill(df: pd.DataFrame, fvgs: list) -> bool:
+    """FVG 채움 시점을 캔들 단순 순회 결과와 비교 (마지막 진행중 캔들 제외)"""
+    closed = df.iloc[:-1]
+    for fvg in fvgs:
+        # 갭은 가운데 캔들 다음 캔들(3번 캔들)에서 완성 → 그 이후부터 채움 판정
+        after = closed[closed.index > fvg['time']].iloc[1:]
+        if fvg['type'] == 'bullish_fvg':
+            hits = after[after['low'] <= fvg['bottom']]
+        else:
+            hits = after[after['high'] >= fvg['top']]
+
+        expected = hits.index[0] if len(hits) else None
+        if fvg['filled_time'] != expected or fvg['filled'] != (expected is not None):
+            print(f"  ❌ FVG 채움 불일치: {fvg} (예상: {expected})")
+            return False
+
+    filled = sum(1 for fvg in fvgs if fvg['filled'])
+    print(f"  ✅ FVG 채움 판정: {filled}/{len(fvgs)}개 채워짐")
+    return True
+
+
+def main():
+    print("=" * 60)
+    print("🔬 SMC 벡터화 엔진 결과 비교 테스트")
+    print("=" * 60)
+
+    if sys.argv[1:] == ["--record"]:
+        paths = [record_candles(timeframe) for timeframe in RECORD_TIMEFRAMES]
+    elif len(sys.argv) > 1:
+        paths = sys.argv[1:]
+    else:
+        paths = [os.path.join(FIXTURE_DIR, f"BTCUSDT_{timeframe}.csv") for timeframe in RECORD_TIMEFRAMES]
+
+    all_ok = True
+    for path in paths:
+        df = load_candles(path)
+        print(f"\n📊 {os.path.basename(path)} ({len(df)}개 캔들)")
+
+        # 전체 구간 + 봇이 실제로 쓰는 200개 구간
+        all_ok &= check_parity(df)
+        all_ok &= check_parity(df.tail(200))
+        all_ok &= check_incremental(df)
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 일치!" if all_ok else "❌ 불일치 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
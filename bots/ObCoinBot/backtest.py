@@ -0,0 +1,392 @@
+"""
+ObCoin 백테스터 - 저장된 캔들로 SMC 전략 이벤트 재생
+- 실거래 봇과 같은 신호 로직(SMCAnalyzer.generate_signals) 사용
+- 구조물은 전체 구간을 벡터화 엔진으로 한 번에 계산한 뒤, 봇이 실제로 알 수 있는 시점
+  (확정 캔들 마감)부터 보이도록 순서대로 공개 → 루프마다 재계산 없이 수년치도 몇 초
+- 시장가 진입, 2%/4% 손절/익절, 트레일링 스탑, 바이비트 taker 수수료 반영
+
+사용법:
+    python backtest.py BTCUSDT_15m.csv               # 15m 캔들 CSV (timestamp ms), HTF는 리샘플링
+    python backtest.py BTCUSDT_15m.csv trades.csv    # 거래 내역 CSV 저장
+    python backtest.py ../../market_data/bybit/BTC_USDT_USDT/15m   # MarketDataService 저장소 폴더
+"""
+
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+import smc_engine
+from smc_state import TimeframeState
+from obcoin_bot import TradingConfig, SMCAnalyzer
+from services.MarketDataService import CandleSeries
+
+TAKER_FEE = 0.00055  # 바이비트 taker 수수료 0.055%
+MIN_ORDER_USDT = 10  # 최소 거래 금액 (execute_trade와 동일)
+
+
+def load_candles(path: str) -> pd.DataFrame:
+    """
+    캔들 CSV(timestamp ms) 또는 MarketDataService 시리즈 폴더 → 봇과 같은 형태의 DataFrame
+    (폴더는 memmap 그대로 감싸서 복사 없이 사용)
+    """
+    if os.path.isdir(path):
+        return CandleSeries(path).frame()
+    df = pd.read_csv(path)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    df.set_index('timestamp', inplace=True)
+    return df[['open', 'high', 'low', 'close', 'volume']].astype('float64')
+
+
+def timeframe_delta(timeframe: str) -> pd.Timedelta:
+    """ccxt 타임프레임 문자열 → Timedelta (예: 15m, 4h, 1d)"""
+    return pd.Timedelta(timeframe.replace('m', 'min'))
+
+
+def resample_candles(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """하위 타임프레임 캔들 → 상위 타임프레임 (예: 15m → 4h, UTC 0시 기준 정렬)"""
+    resampled = df.resample(timeframe_delta(timeframe), origin='epoch', label='left', closed='left').agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'
+    })
+    return resampled.dropna(subset=['open'])
+
+
+@dataclass
+class BacktestResult:
+    """백테스트 결과"""
+    trades: List[Dict]
+    equity: pd.Series
+    summary: Dict = field(default_factory=dict)
+
+    def trades_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.trades)
+
+    def report(self) -> str:
+        s = self.summary
+        return f"""📊 백테스트 결과 ({s['start']} ~ {s['end']}, 캔들 {s['candles']}개)
+💰 초기 ${s['initial_balance']:.2f} → 최종 ${s['final_balance']:.2f} ({s['return_pct']:+.2f}%)
+📈 거래 {s['trades']}회 / 승률 {s['win_rate']:.1f}% / 손익비(PF) {s['profit_factor']:.2f}
+📉 최대 낙폭 {s['max_drawdown_pct']:.2f}% / 수수료 ${s['fees']:.2f}
+⏱️ 처리 시간 {s['elapsed']:.2f}초"""
+
+
+class Backtester:
+    """SMC 전략 이벤트 재생 백테스터 (LTF 캔들 1개 = 봇 루프 1회)"""
+
+    STRUCTURES = ('bullish_obs', 'bearish_obs', 'bullish_fvgs', 'bearish_fvgs', 'sweeps')
+
+    def __init__(self, config: TradingConfig, initial_balance: float = 10000.0,
+                 fee_rate: float = TAKER_FEE, cache: Optional[Dict] = None):
+        """
+        Args:
+            config: 트레이딩 설정 (분석 파라미터 + 리스크 관리)
+            initial_balance: 시작 잔고 (USDT)
+            fee_rate: 진입/청산 수수료율 (시장가 + 조건부 시장가 → 모두 taker)
+            cache: 구조물 계산 결과 캐시 (같은 캔들로 여러 설정을 돌릴 때 공유, 옵티마이저용)
+        """
+        self.config = config
+        self.analyzer = SMCAnalyzer(config)
+        self.initial_balance = initial_balance
+        self.fee_rate = fee_rate
+        self.cache = cache
+
+    # ---------- 구조물 공개 일정 ----------
+    @staticmethod
+    def _positions(index: pd.DatetimeIndex, records: List[Dict], key: str = 'time') -> np.ndarray:
+        return index.get_indexer(pd.Index([r[key] for r in records]))
+
+    def _cached(self, key: tuple, compute):
+        if self.cache is None:
+            return compute()
+        if key not in self.cache:
+            self.cache[key] = compute()
+        return self.cache[key]
+
+    def _ltf_schedule(self, ltf: pd.DataFrame) -> Dict:
+        """
+        LTF 구조물과 공개 시점(캔들 위치) 계산 - SMCState 확정 시점과 동일
+        오더블럭/FVG: 기록 시각 다음 캔들 마감 시, 스윕: 해당 캔들 마감 시, FVG 채움: 채운 캔들 마감 시
+        """
+        index = ltf.index
+        bullish_obs, bearish_obs = smc_engine.detect_order_blocks(ltf, self.config.ob_min_body_ratio)
+        bullish_fvgs, bearish_fvgs = smc_engine.detect_fvgs(ltf, self.config.fvg_min_gap_size, include_last=True)
+        sweeps = smc_engine.detect_liquidity_sweeps(ltf, self.config.sweep_lookbacks)
+
+        # 채움 캔들 위치 → [(목록 이름, FVG 번호, 채움 시각)] (공개 전까지는 미채움 상태로 시작)
+        fills: Dict[int, List] = {}
+        for name, fvgs in (('bullish_fvgs', bullish_fvgs), ('bearish_fvgs', bearish_fvgs)):
+            for i, fvg in enumerate(fvgs):
+                if fvg['filled_time'] is not None:
+                    fills.setdefault(int(index.get_loc(fvg['filled_time'])), []).append(
+                        (name, i, fvg['filled_time']))
+                fvg['filled'] = False
+                fvg['filled_time'] = None
+
+        return {
+            'bullish_obs': (bullish_obs, self._positions(index, bullish_obs) + 1),
+            'bearish_obs': (bearish_obs, self._positions(index, bearish_obs) + 1),
+            'bullish_fvgs': (bullish_fvgs, self._positions(index, bullish_fvgs) + 1),
+            'bearish_fvgs': (bearish_fvgs, self._positions(index, bearish_fvgs) + 1),
+            'sweeps': (sweeps, self._positions(index, sweeps)),
+            'fills': fills
+        }
+
+    def _htf_trend(self, htf: pd.DataFrame, decision_times: np.ndarray) -> np.ndarray:
+        """
+        결정 시각마다 HTF 추세 (HH-HL: bullish, LH-LL: bearish)
+        스윙 i는 구간 마지막 캔들(i+window-1)이 마감된 뒤부터 반영
+        """
+        window = self.config.structure_windows.get('htf', 50)
+        high = htf['high'].to_numpy(dtype=np.float64)
+        low = htf['low'].to_numpy(dtype=np.float64)
+        high_idx, low_idx = smc_engine.swing_points(high, low, window)
+
+        htf_ms = np.int64(timeframe_delta(self.config.timeframes['htf']).value)
+        opens = htf.index.asi8
+
+        # (공개 시각, 종류, 가격) 이벤트를 시각순으로 처리
+        events = sorted([(opens[i + window - 1] + htf_ms, 0, high[i]) for i in high_idx] +
+                        [(opens[i + window - 1] + htf_ms, 1, low[i]) for i in low_idx],
+                        key=lambda event: event[0])
+
+        times, trends = [], []
+        highs, lows = [], []
+        for at, kind, price in events:
+            (highs if kind == 0 else lows).append(price)
+            trend = 'neutral'
+            if len(highs) >= 2 and len(lows) >= 2:
+                if highs[-1] > highs[-2] and lows[-1] > lows[-2]:
+                    trend = 'bullish'
+                elif highs[-1] < highs[-2] and lows[-1] < lows[-2]:
+                    trend = 'bearish'
+            times.append(at)
+            trends.append(trend)
+
+        at = np.searchsorted(np.array(times, dtype=np.int64), decision_times, side='right') - 1
+        trends = np.array(trends + ['neutral'], dtype=object)
+        return trends[at]  # at == -1 → 마지막 'neutral'
+
+    # ---------- 실행 ----------
+    def run(self, ltf: pd.DataFrame, htf: Optional[pd.DataFrame] = None) -> BacktestResult:
+        """
+        Args:
+            ltf: 진입용 캔들 (config.timeframes['ltf'], 모두 마감 캔들)
+            htf: 추세용 캔들 (없으면 ltf를 config.timeframes['htf']로 리샘플링)
+        """
+        started = time.perf_counter()
+        config = self.config
+        if htf is None:
+            htf = self._cached(('resample', id(ltf), len(ltf), config.timeframes['htf']),
+                               lambda: resample_candles(ltf, config.timeframes['htf']))
+
+        n = len(ltf)
+        index = ltf.index
+        open_ = ltf['open'].to_numpy(dtype=np.float64)
+        high = ltf['high'].to_numpy(dtype=np.float64)
+        low = ltf['low'].to_numpy(dtype=np.float64)
+        close = ltf['close'].to_numpy(dtype=np.float64)
+
+        # 봇 루프 시각 = LTF 캔들 마감 시각
+        decision_index = index + timeframe_delta(config.timeframes['ltf'])
+        decision_times = decision_index.asi8
+        now_list = list(decision_index)
+
+        # 구조물/추세는 분석 파라미터가 같으면 재사용 (플래그가 바뀌므로 구조물 dict는 복사)
+        schedule = self._cached(('ltf', id(ltf), n, config.ob_min_body_ratio, config.fvg_min_gap_size,
+                                 tuple(config.sweep_lookbacks)), lambda: self._ltf_schedule(ltf))
+        records = {name: [dict(record) for record in schedule[name][0]] for name in self.STRUCTURES}
+        trends = self._cached(('htf', id(ltf), id(htf), n, config.timeframes['htf'],
+                               config.structure_windows.get('htf', 50)),
+                              lambda: self._htf_trend(htf, decision_times))
+
+        # 봇이 보유한 구조물 (SMCState와 같이 최근 MAX_ITEMS개 유지)
+        max_items = TimeframeState.MAX_ITEMS
+        visible = {name: [] for name in self.STRUCTURES}
+        pointers = {name: 0 for name in visible}
+        ltf_view = {
+            'order_blocks': {'bullish': visible['bullish_obs'], 'bearish': visible['bearish_obs']},
+            'fvgs': {'bullish': visible['bullish_fvgs'], 'bearish': visible['bearish_fvgs']},
+            'liquidity_sweeps': visible['sweeps']
+        }
+        fills = schedule['fills']
+
+        balance = self.initial_balance
+        position: Optional[Dict] = None
+        trades: List[Dict] = []
+        equity = np.empty(n, dtype=np.float64)
+        total_fees = 0.0
+
+        for k in range(n):
+            # 1. 캔들 k 마감으로 새로 확정된 구조물 공개
+            for name, items in visible.items():
+                at = schedule[name][1]
+                revealing = records[name]
+                p = pointers[name]
+                while p < len(revealing) and at[p] <= k:
+                    items.append(revealing[p])
+                    if len(items) > max_items:
+                        del items[0]
+                    p += 1
+                pointers[name] = p
+            for name, i, filled_time in fills.get(k, ()):
+                fvg = records[name][i]
+                if not fvg['filled']:
+                    fvg['filled'] = True
+                    fvg['filled_time'] = filled_time
+
+            # 2. 시장 분석 (포지션 보유 중에도 매 루프 실행 → touched/filled 플래그 소모)
+            analysis = self.analyzer.generate_signals({'trend': trends[k]}, ltf_view, close[k], now_list[k])
+
+            # 3. 보유 포지션: 캔들 k 안에서 손절/익절 체결 여부 → 트레일링 스탑
+            if position is not None:
+                exit_price, reason = self._exit_fill(position, open_[k], high[k], low[k])
+                if exit_price is not None:
+                    trade = self._close(position, exit_price, reason, now_list[k])
+                    balance += trade['pnl']
+                    total_fees += trade['fee']
+                    trades.append(trade)
+                    position = None
+                else:
+                    self._trail(position, close[k])
+
+            # 4. 진입 (포지션 없을 때, 캔들 k 종가 시장가)
+            if position is None and analysis['recommendation'] in ('BUY', 'SELL') and balance >= MIN_ORDER_USDT:
+                price = close[k]
+                amount = balance * config.position_size_percent / price
+                position = {
+                    'side': analysis['recommendation'],
+                    'entry_time': now_list[k],
+                    'entry_price': price,
+                    'size': amount,
+                    'stop_loss': analysis['stop_loss'],
+                    'take_profit': analysis['take_profit'],
+                    'entry_fee': price * amount * self.fee_rate,
+                    'signals': analysis['buy_signals'] if analysis['recommendation'] == 'BUY'
+                    else analysis['sell_signals']
+                }
+
+            # 5. 평가 자산 (보유 포지션은 종가 기준, 진입 수수료는 청산 시 차감)
+            equity[k] = balance
+            if position is not None:
+                direction = 1 if position['side'] == 'BUY' else -1
+                equity[k] += direction * (close[k] - position['entry_price']) * position['size'] - position['entry_fee']
+
+        # 미청산 포지션은 마지막 종가로 정리
+        if position is not None and n:
+            trade = self._close(position, close[-1], 'end', now_list[-1])
+            balance += trade['pnl']
+            total_fees += trade['fee']
+            trades.append(trade)
+            equity[-1] = balance
+
+        equity_series = pd.Series(equity, index=decision_index, name='equity')
+        result = BacktestResult(trades=trades, equity=equity_series)
+        result.summary = self._summary(trades, equity_series, balance, total_fees, index,
+                                       time.perf_counter() - started)
+        return result
+
+    def _exit_fill(self, position: Dict, open_: float, high: float, low: float):
+        """
+        캔들 안 손절/익절 체결가 (없으면 None)
+        손절/익절이 같은 캔들에 모두 닿으면 손절 우선 (보수적), 갭으로 넘어가면 시가 체결
+        """
+        stop, target = position['stop_loss'], position['take_profit']
+        if position['side'] == 'BUY':
+            if low <= stop:
+                return min(open_, stop), 'stop_loss'
+            if high >= target:
+                return max(open_, target), 'take_profit'
+        else:
+            if high >= stop:
+                return max(open_, stop), 'stop_loss'
+            if low <= target:
+                return min(open_, target), 'take_profit'
+        return None, None
+
+    def _trail(self, position: Dict, price: float):
+        """트레일링 스탑 (check_position_status와 동일: 롱, 수익 2% 초과 시 현재가 - trailing_stop_percent)"""
+        if not self.config.trailing_stop or position['side'] != 'BUY':
+            return
+        pnl_percent = (price / position['entry_price'] - 1) * 100 * self.config.leverage
+        if pnl_percent > 2:
+            new_stop = price * (1 - self.config.trailing_stop_percent)
+            if new_stop > position['stop_loss']:
+                position['stop_loss'] = new_stop
+                position['trailed'] = True
+
+    def _close(self, position: Dict, exit_price: float, reason: str, exit_time) -> Dict:
+        """포지션 청산 → 거래 기록"""
+        direction = 1 if position['side'] == 'BUY' else -1
+        size = position['size']
+        exit_fee = exit_price * size * self.fee_rate
+        fee = position['entry_fee'] + exit_fee
+        gross = direction * (exit_price - position['entry_price']) * size
+        if reason == 'stop_loss' and position.get('trailed'):
+            reason = 'trailing_stop'
+
+        return {
+            'side': position['side'],
+            'entry_time': position['entry_time'],
+            'exit_time': exit_time,
+            'entry_price': position['entry_price'],
+            'exit_price': exit_price,
+            'size': size,
+            'fee': fee,
+            'pnl': gross - fee,
+            'pnl_percent': (gross - fee) / (position['entry_price'] * size) * 100,
+            'reason': reason,
+            'signals': ','.join(position['signals'])
+        }
+
+    def _summary(self, trades: List[Dict], equity: pd.Series, balance: float,
+                 fees: float, index: pd.DatetimeIndex, elapsed: float) -> Dict:
+        pnl = np.array([t['pnl'] for t in trades], dtype=np.float64)
+        wins = pnl[pnl > 0]
+        losses = pnl[pnl <= 0]
+        values = equity.to_numpy()
+        peak = np.maximum.accumulate(values) if len(values) else values
+        drawdown = (values / peak - 1) * 100 if len(values) else values
+
+        return {
+            'start': index[0] if len(index) else None,
+            'end': index[-1] if len(index) else None,
+            'candles': len(index),
+            'initial_balance': self.initial_balance,
+            'final_balance': balance,
+            'total_pnl': balance - self.initial_balance,
+            'return_pct': (balance / self.initial_balance - 1) * 100,
+            'trades': len(trades),
+            'wins': len(wins),
+            'win_rate': len(wins) / len(trades) * 100 if trades else 0.0,
+            'profit_factor': wins.sum() / -losses.sum() if losses.sum() < 0 else float('inf') if len(wins) else 0.0,
+            'max_drawdown_pct': -drawdown.min() if len(values) else 0.0,
+            'fees': fees,
+            'elapsed': elapsed
+        }
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    path = sys.argv[1]
+    ltf = load_candles(path)
+    print(f"📂 {os.path.basename(path)} 캔들 {len(ltf)}개 로드")
+
+    result = Backtester(TradingConfig()).run(ltf)
+    print(result.report())
+
+    trades = result.trades_frame()
+    if len(trades):
+        print(trades.tail(10).to_string(index=False))
+    if len(sys.argv) > 2:
+        trades.to_csv(sys.argv[2], index=False)
+        print(f"💾 거래 내역 저장: {sys.argv[2]}")
+
+if __name__ == "__main__":
+    main()
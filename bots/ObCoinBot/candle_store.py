@@ -0,0 +1,182 @@
+"""
+캔들 보관소 - 심볼/타임프레임별 OHLCV 캐시 (메모리 + 디스크)
+- 마지막 마감 캔들 이후 캔들만 since로 받아오고, 진행중 캔들은 갱신
+- 마감 캔들은 CSV에 이어쓰기 → 재시작 시 디스크에서 바로 복원
+- analyze_market에는 바로 쓸 수 있는 DataFrame을 넘김 (마지막 행 = 진행중 캔들)
+"""
+
+import os
+import logging
+import pandas as pd
+from typing import List, Optional
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+class CandleStore:
+    """심볼 하나, 타임프레임 하나의 캔들 캐시"""
+
+    def __init__(self, exchange, symbol: str, timeframe: str, data_dir: str,
+                 max_candles: int = 1000, initial_limit: int = 200, page_limit: int = 1000):
+        """
+        Args:
+            exchange: ccxt 거래소 객체 (fetch_ohlcv 사용)
+            symbol: 심볼 (예: BTC/USDT:USDT)
+            timeframe: 타임프레임 (예: 15m)
+            data_dir: 마감 캔들 CSV 저장 폴더
+            max_candles: 메모리에 유지할 최대 캔들 수
+            initial_limit: 캐시가 비어있을 때 처음 받을 캔들 수
+            page_limit: since 조회 1회당 최대 캔들 수 (공백이 길면 여러 번 조회)
+        """
+        self.exchange = exchange
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.max_candles = max_candles
+        self.initial_limit = initial_limit
+        self.page_limit = page_limit
+        self.logger = logging.getLogger(__name__)
+
+        self.timeframe_ms = exchange.parse_timeframe(timeframe) * 1000
+
+        # BTC/USDT:USDT + 15m → BTCUSDT_15m.csv
+        market_id = symbol.split(':')[0].replace('/', '')
+        os.makedirs(data_dir, exist_ok=True)
+        self.path = os.path.join(data_dir, f"{market_id}_{timeframe}.csv")
+
+        # 마감 캔들 + 진행중 캔들(마지막 행)
+        self.df = self._empty_frame()
+        self.last_closed_ms: Optional[int] = None
+        self.forming_ms: Optional[int] = None
+
+        self.load()
+
+    @staticmethod
+    def _empty_frame() -> pd.DataFrame:
+        df = pd.DataFrame(columns=COLUMNS[1:], dtype='float64')
+        df.index = pd.DatetimeIndex([], name='timestamp')
+        return df
+
+    @staticmethod
+    def _to_frame(rows: List[list]) -> pd.DataFrame:
+        """ccxt OHLCV 리스트 → 봇과 같은 형태의 DataFrame"""
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        return df.astype('float64')
+
+    def load(self):
+        """디스크에 저장된 마감 캔들 복원"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            saved = pd.read_csv(self.path)
+            saved = saved.drop_duplicates('timestamp', keep='last').sort_values('timestamp')
+            saved = saved.tail(self.max_candles)
+            if saved.empty:
+                return
+
+            self.df = self._to_frame(saved[COLUMNS].values.tolist())
+            self.last_closed_ms = int(saved['timestamp'].iloc[-1])
+            self.logger.info(f"캔들 캐시 복원: {self.symbol} {self.timeframe} {len(saved)}개")
+        except Exception as e:
+            self.logger.error(f"캔들 캐시 복원 실패 ({self.path}): {e}")
+
+    def _append_to_disk(self, rows: List[list]):
+        """새 마감 캔들만 CSV에 이어쓰기"""
+        if not rows:
+            return
+        write_header = not os.path.exists(self.path)
+        pd.DataFrame(rows, columns=COLUMNS).to_csv(self.path, mode='a', header=write_header, index=False)
+
+    def _fetch_since(self, since: Optional[int]) -> List[list]:
+        """since 이후 캔들 조회 (공백이 길면 진행중 캔들까지 페이지 단위로 반복)"""
+        if since is None:
+            return self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=self.initial_limit)
+
+        rows = []
+        while True:
+            page = self.exchange.fetch_ohlcv(self.symbol, self.timeframe, since=since, limit=self.page_limit)
+            rows.extend(page)
+            if len(page) < self.page_limit:
+                return rows
+            since = int(page[-1][0]) + self.timeframe_ms
+
+    async def _fetch_since_async(self, since: Optional[int]) -> List[list]:
+        """_fetch_since의 비동기 버전 (ccxt.async_support 거래소용)"""
+        if since is None:
+            return await self.exchange.fetch_ohlcv(self.symbol, self.timeframe, limit=self.initial_limit)
+
+        rows = []
+        while True:
+            page = await self.exchange.fetch_ohlcv(self.symbol, self.timeframe, since=since, limit=self.page_limit)
+            rows.extend(page)
+            if len(page) < self.page_limit:
+                return rows
+            since = int(page[-1][0]) + self.timeframe_ms
+
+    def _needs_fetch(self, now_ms: int, refresh_forming: bool) -> bool:
+        """진행중 캔들이 아직 마감 전이고 갱신도 필요 없으면 조회 생략"""
+        return (refresh_forming or self.forming_ms is None
+                or now_ms >= self.forming_ms + self.timeframe_ms)
+
+    def _next_since(self) -> Optional[int]:
+        return None if self.last_closed_ms is None else self.last_closed_ms + self.timeframe_ms
+
+    def sync(self, refresh_forming: bool = True) -> pd.DataFrame:
+        """
+        거래소와 동기화 후 DataFrame 반환
+
+        Args:
+            refresh_forming: False면 진행중 캔들이 아직 마감 전일 때 조회를 생략
+                             (4h처럼 느린 타임프레임은 새 캔들이 마감될 때만 조회)
+        """
+        now_ms = self.exchange.milliseconds()
+        if not self._needs_fetch(now_ms, refresh_forming):
+            return self.df
+        return self.merge(self._fetch_since(self._next_since()), now_ms)
+
+    async def sync_async(self, refresh_forming: bool = True) -> pd.DataFrame:
+        """sync의 비동기 버전 (ccxt.async_support 거래소용)"""
+        now_ms = self.exchange.milliseconds()
+        if not self._needs_fetch(now_ms, refresh_forming):
+            return self.df
+        return self.merge(await self._fetch_since_async(self._next_since()), now_ms)
+
+    def merge(self, rows: List[list], now_ms: int) -> pd.DataFrame:
+        """
+        조회한 캔들 반영 (마감 캔들은 디스크에 이어쓰기, 진행중 캔들은 마지막 행 갱신)
+
+        Args:
+            rows: ccxt OHLCV 리스트 [[timestamp, open, high, low, close, volume], ...]
+            now_ms: 마감 여부 판정 기준 시각 (ms)
+        """
+        if not rows:
+            return self.df
+
+        # 마감 여부 판정: 캔들 시작 + 타임프레임 길이가 현재 시각 이전이면 마감
+        closed = [row for row in rows
+                  if int(row[0]) + self.timeframe_ms <= now_ms
+                  and (self.last_closed_ms is None or int(row[0]) > self.last_closed_ms)]
+        forming = [row for row in rows if int(row[0]) + self.timeframe_ms > now_ms]
+
+        if closed:
+            self._append_to_disk(closed)
+            self.last_closed_ms = int(closed[-1][0])
+
+        if closed or self.forming_ms is None or (forming and int(forming[-1][0]) != self.forming_ms):
+            # 새 마감 캔들 → 진행중 행을 떼고 이어붙임 (max_candles 유지)
+            base = self.df.iloc[:-1] if self.forming_ms is not None else self.df
+            parts = [frame for frame in (base, self._to_frame(closed), self._to_frame(forming[-1:]))
+                     if not frame.empty]
+            self.df = pd.concat(parts).tail(self.max_candles) if parts else self._empty_frame()
+        elif forming:
+            # 진행중 캔들만 바뀜 → 마지막 행만 갱신 (DataFrame 재생성 없음)
+            self.df.iloc[-1] = [float(value) for value in forming[-1][1:]]
+
+        self.forming_ms = int(forming[-1][0]) if forming else None
+        return self.df
+
+    def frame(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """현재 캔들 DataFrame (limit 지정 시 최근 limit개)"""
+        return self.df if limit is None else self.df.tail(limit)
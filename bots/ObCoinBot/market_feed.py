@@ -0,0 +1,398 @@
+"""
+바이비트 WebSocket 시세 피드 - kline/체결 스트림으로 로컬 캔들 생성
+- 체결(publicTrade)마다 모든 타임프레임의 진행중 캔들을 갱신 → 1초 미만 지연으로 가격 이벤트 전달
+- kline 스트림의 확정(confirm) 캔들로 로컬 캔들을 보정 (거래량 등 공식 값 우선)
+- 마지막 행이 진행중 캔들인 DataFrame 제공 (analyze_data / SMCState에 그대로 사용)
+- 실서버 대신 로컬 리플레이 서버나 녹화 파일로도 동작 (오프라인 테스트)
+
+사용법:
+    python market_feed.py record feed.jsonl 600        # 실시간 메시지 600초 녹화
+    python market_feed.py serve feed.jsonl 8765        # 녹화 파일 리플레이 서버 (ws://127.0.0.1:8765)
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import aiohttp
+import pandas as pd
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+PUBLIC_URL = "wss://stream.bybit.com/v5/public/linear"
+TESTNET_URL = "wss://stream-testnet.bybit.com/v5/public/linear"
+
+# ccxt 타임프레임 → 바이비트 kline interval
+KLINE_INTERVALS = {
+    '1m': '1', '3m': '3', '5m': '5', '15m': '15', '30m': '30',
+    '1h': '60', '2h': '120', '4h': '240', '6h': '360', '12h': '720',
+    '1d': 'D', '1w': 'W'
+}
+
+TIMEFRAME_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000, '12h': 43_200_000,
+    '1d': 86_400_000, '1w': 604_800_000
+}
+
+EventHandler = Callable[[Dict], Awaitable[None]]
+
+
+class CandleAggregator:
+    """타임프레임 하나의 로컬 캔들 (마감 캔들 + 진행중 캔들 1개)"""
+
+    def __init__(self, timeframe: str, max_candles: int = 1000):
+        self.timeframe = timeframe
+        self.timeframe_ms = TIMEFRAME_MS[timeframe]
+        self.closed = deque(maxlen=max_candles)  # [timestamp, open, high, low, close, volume]
+        self.forming: Optional[list] = None
+
+    def seed(self, rows: List[list], now_ms: int):
+        """REST로 받은 과거 캔들로 초기화 (now_ms 기준 마감 여부 판정)"""
+        self.closed.clear()
+        self.forming = None
+        for row in rows:
+            row = [int(row[0])] + [float(value) for value in row[1:6]]
+            if row[0] + self.timeframe_ms <= now_ms:
+                self.closed.append(row)
+            else:
+                self.forming = row
+
+    def _roll(self, start: int) -> List[list]:
+        """start 버킷 이전의 진행중 캔들 마감 (체결 없던 구간은 직전 종가로 채움)"""
+        closed = []
+        while self.forming is not None and self.forming[0] < start:
+            self.closed.append(self.forming)
+            closed.append(self.forming)
+            price = self.forming[4]
+            next_start = self.forming[0] + self.timeframe_ms
+            self.forming = [next_start, price, price, price, price, 0.0] if next_start < start else None
+        return closed
+
+    def on_trade(self, ts: int, price: float, qty: float) -> List[list]:
+        """체결 반영 → 새로 마감된 캔들 반환"""
+        start = ts - ts % self.timeframe_ms
+        if self.forming is not None and start < self.forming[0]:
+            return []  # 이미 마감된 캔들의 늦은 체결 (kline 확정값으로 보정됨)
+
+        closed = self._roll(start)
+        if self.forming is None:
+            self.forming = [start, price, price, price, price, qty]
+        else:
+            forming = self.forming
+            forming[2] = max(forming[2], price)
+            forming[3] = min(forming[3], price)
+            forming[4] = price
+            forming[5] += qty
+        return closed
+
+    def on_kline(self, row: list, confirm: bool) -> List[list]:
+        """kline 반영 (공식 값으로 덮어씀) → 새로 마감된 캔들 반환"""
+        start = row[0]
+
+        # 이미 로컬에서 마감한 캔들 → 확정값으로 보정만
+        if self.forming is not None and start < self.forming[0]:
+            for i in range(len(self.closed) - 1, -1, -1):
+                if self.closed[i][0] == start:
+                    self.closed[i] = row
+                    break
+                if self.closed[i][0] < start:
+                    break
+            return []
+
+        closed = self._roll(start)
+        if not confirm:
+            self.forming = row
+            return closed
+
+        # 확정 캔들 → 마감 후 다음 캔들을 직전 종가로 열어둠 (마지막 행 = 진행중 유지)
+        self.closed.append(row)
+        closed.append(row)
+        price = row[4]
+        self.forming = [start + self.timeframe_ms, price, price, price, price, 0.0]
+        return closed
+
+    def frame(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """마감 캔들 + 진행중 캔들 DataFrame (CandleStore.frame과 같은 형태)"""
+        rows = list(self.closed)
+        if self.forming is not None:
+            rows.append(list(self.forming))
+        if limit is not None:
+            rows = rows[-limit:]
+
+        df = pd.DataFrame(rows, columns=COLUMNS)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        return df.astype('float64')
+
+
+class BybitMarketFeed:
+    """바이비트 공개 스트림 구독 + 타임프레임별 로컬 캔들 + 이벤트 전달"""
+
+    PING_INTERVAL = 20  # 바이비트 권장 ping 주기 (초)
+
+    def __init__(self, symbol: str, timeframes: Dict[str, str], url: Optional[str] = None,
+                 max_candles: int = 1000, record_path: Optional[str] = None):
+        """
+        Args:
+            symbol: ccxt 심볼 (예: BTC/USDT:USDT)
+            timeframes: {tf_name: timeframe} (예: {"htf": "4h", "ltf": "15m"})
+            url: WebSocket 주소 (없으면 바이비트 실서버, 로컬 리플레이 서버 주소 가능)
+            max_candles: 타임프레임별 보관 캔들 수
+            record_path: 지정 시 받은 원본 메시지를 JSON Lines로 녹화
+        """
+        self.symbol = symbol
+        self.market_id = symbol.split(':')[0].replace('/', '')  # BTC/USDT:USDT → BTCUSDT
+        self.timeframes = timeframes
+        self.url = url or PUBLIC_URL
+        self.record_path = record_path
+        self.logger = logging.getLogger(__name__)
+
+        self.aggregators = {tf_name: CandleAggregator(timeframe, max_candles)
+                            for tf_name, timeframe in timeframes.items()}
+        self.handlers: List[EventHandler] = []
+
+        self.last_price: Optional[float] = None
+        self.last_trade_ms: Optional[int] = None
+        self.message_count = 0
+        self._running = False
+
+    # ---------- 구독/이벤트 ----------
+    def topics(self) -> List[str]:
+        """구독할 스트림 목록 (타임프레임별 kline + 체결)"""
+        intervals = sorted({KLINE_INTERVALS[tf] for tf in self.timeframes.values()})
+        return [f"kline.{interval}.{self.market_id}" for interval in intervals] + [f"publicTrade.{self.market_id}"]
+
+    def add_handler(self, handler: EventHandler):
+        """
+        이벤트 핸들러 등록 (async 함수)
+        이벤트: {'type': 'price', 'price', 'time'} - 체결 메시지마다 마지막 체결가
+               {'type': 'candle_closed', 'tf_name', 'candle'} - 타임프레임 캔들 마감
+        """
+        self.handlers.append(handler)
+
+    def seed(self, tf_name: str, df: pd.DataFrame, now_ms: Optional[int] = None):
+        """REST로 받은 캔들 DataFrame으로 타임프레임 초기화"""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        rows = [[int(ts.value // 1_000_000)] + list(values)
+                for ts, values in zip(df.index, df[COLUMNS[1:]].itertuples(index=False))]
+        self.aggregators[tf_name].seed(rows, now_ms)
+
+    def frame(self, tf_name: str, limit: Optional[int] = None) -> pd.DataFrame:
+        return self.aggregators[tf_name].frame(limit)
+
+    def frames(self, limit: Optional[int] = None) -> Dict[str, pd.DataFrame]:
+        """전체 타임프레임 DataFrame (fetch_ohlcv_multi_timeframe과 같은 형태)"""
+        return {tf_name: agg.frame(limit) for tf_name, agg in self.aggregators.items()}
+
+    async def _emit(self, event: Dict):
+        for handler in self.handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                self.logger.error(f"피드 이벤트 처리 실패 ({event['type']}): {e}")
+
+    # ---------- 메시지 처리 ----------
+    def parse_message(self, message: Dict) -> List[Dict]:
+        """바이비트 메시지 → 로컬 캔들 갱신 후 발생한 이벤트 목록"""
+        topic = message.get('topic', '')
+        events = []
+
+        if topic.startswith('publicTrade.'):
+            trades = sorted(message.get('data', []), key=lambda trade: trade['T'])
+            for trade in trades:
+                ts, price, qty = int(trade['T']), float(trade['p']), float(trade['v'])
+                for tf_name, agg in self.aggregators.items():
+                    for candle in agg.on_trade(ts, price, qty):
+                        events.append({'type': 'candle_closed', 'tf_name': tf_name, 'candle': candle})
+            if trades:
+                self.last_price = float(trades[-1]['p'])
+                self.last_trade_ms = int(trades[-1]['T'])
+                events.append({'type': 'price', 'price': self.last_price, 'time': self.last_trade_ms})
+
+        elif topic.startswith('kline.'):
+            interval = topic.split('.')[1]
+            targets = [(tf_name, agg) for tf_name, agg in self.aggregators.items()
+                       if KLINE_INTERVALS[agg.timeframe] == interval]
+            for kline in message.get('data', []):
+                row = [int(kline['start']), float(kline['open']), float(kline['high']),
+                       float(kline['low']), float(kline['close']), float(kline['volume'])]
+                for tf_name, agg in targets:
+                    for candle in agg.on_kline(list(row), bool(kline['confirm'])):
+                        events.append({'type': 'candle_closed', 'tf_name': tf_name, 'candle': candle})
+
+        return events
+
+    async def handle_raw(self, raw: str):
+        """원본 메시지 1개 처리 (녹화 → 파싱 → 이벤트 전달)"""
+        if self.record_path:
+            with open(self.record_path, 'a', encoding='utf-8') as f:
+                f.write(raw.strip() + '\n')
+
+        message = json.loads(raw)
+        if 'topic' not in message:
+            if message.get('op') == 'subscribe' and not message.get('success', True):
+                self.logger.error(f"구독 실패: {message}")
+            return
+
+        self.message_count += 1
+        for event in self.parse_message(message):
+            await self._emit(event)
+
+    # ---------- 실행 ----------
+    async def _ping(self, ws: aiohttp.ClientWebSocketResponse):
+        while not ws.closed:
+            await asyncio.sleep(self.PING_INTERVAL)
+            await ws.send_str(json.dumps({'op': 'ping'}))
+
+    async def run(self, reconnect_delay: float = 3.0):
+        """WebSocket 연결 후 메시지 처리 (끊기면 재연결, stop() 호출 시 종료)"""
+        self._running = True
+        async with aiohttp.ClientSession() as session:
+            while self._running:
+                try:
+                    async with session.ws_connect(self.url) as ws:
+                        await ws.send_str(json.dumps({'op': 'subscribe', 'args': self.topics()}))
+                        self.logger.info(f"시세 피드 연결: {self.url} ({', '.join(self.topics())})")
+
+                        ping = asyncio.create_task(self._ping(ws))
+                        try:
+                            async for msg in ws:
+                                if msg.type == aiohttp.WSMsgType.TEXT:
+                                    await self.handle_raw(msg.data)
+                                elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                    break
+                                if not self._running:
+                                    break
+                        finally:
+                            ping.cancel()
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    self.logger.warning(f"시세 피드 연결 오류: {e}")
+
+                if self._running:
+                    self.logger.info(f"시세 피드 {reconnect_delay}초 후 재연결...")
+                    await asyncio.sleep(reconnect_delay)
+
+    def stop(self):
+        self._running = False
+
+    async def replay_file(self, path: str, speed: float = 0.0):
+        """
+        녹화 파일(JSON Lines) 재생 - 네트워크 없이 동일한 이벤트 발생
+        speed: 0이면 대기 없이 재생, 1이면 실제 시간 간격대로
+        """
+        last_ts = None
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                if speed > 0:
+                    ts = json.loads(line).get('ts')
+                    if ts is not None and last_ts is not None and ts > last_ts:
+                        await asyncio.sleep((ts - last_ts) / 1000 / speed)
+                    last_ts = ts if ts is not None else last_ts
+                await self.handle_raw(line)
+
+
+# ==================== 로컬 리플레이 서버 ====================
+async def serve_replay(path: str, host: str = '127.0.0.1', port: int = 8765, speed: float = 0.0):
+    """
+    녹화 파일을 바이비트 스트림처럼 보내주는 로컬 WebSocket 서버
+    접속 → subscribe 응답 → 녹화 메시지 순서대로 전송 (ping에는 pong 응답)
+
+    Returns: aiohttp AppRunner (runner.cleanup()으로 종료)
+    """
+    from aiohttp import web
+
+    with open(path, encoding='utf-8') as f:
+        messages = [line.strip() for line in f if line.strip()]
+
+    async def handler(request):
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+
+        sender = None
+        async for msg in ws:
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                continue
+            request_msg = json.loads(msg.data)
+            if request_msg.get('op') == 'ping':
+                await ws.send_str(json.dumps({'op': 'pong', 'success': True}))
+            elif request_msg.get('op') == 'subscribe' and sender is None:
+                await ws.send_str(json.dumps({'op': 'subscribe', 'success': True,
+                                              'args': request_msg.get('args', [])}))
+                sender = asyncio.create_task(_send_all(ws, messages, speed))
+
+        if sender is not None:
+            sender.cancel()
+        return ws
+
+    app = web.Application()
+    app.router.add_get('/', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def _send_all(ws, messages: List[str], speed: float):
+    last_ts = None
+    for raw in messages:
+        if speed > 0:
+            ts = json.loads(raw).get('ts')
+            if ts is not None and last_ts is not None and ts > last_ts:
+                await asyncio.sleep((ts - last_ts) / 1000 / speed)
+            last_ts = ts if ts is not None else last_ts
+        await ws.send_str(raw)
+
+
+def main():
+    """녹화 / 리플레이 서버 실행"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if len(sys.argv) < 3 or sys.argv[1] not in ('record', 'serve'):
+        print(__doc__)
+        return
+
+    command, path = sys.argv[1], sys.argv[2]
+
+    if command == 'record':
+        seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 600
+        if os.path.exists(path):
+            os.remove(path)
+        feed = BybitMarketFeed("BTC/USDT:USDT", {"htf": "4h", "mtf": "1h", "ltf": "15m"}, record_path=path)
+
+        async def record():
+            task = asyncio.create_task(feed.run())
+            await asyncio.sleep(seconds)
+            feed.stop()
+            task.cancel()
+
+        print(f"🎙️ {seconds:.0f}초 녹화 시작: {path}")
+        try:
+            asyncio.run(record())
+        except asyncio.CancelledError:
+            pass
+        print(f"💾 메시지 {feed.message_count}개 녹화 완료")
+
+    else:
+        port = int(sys.argv[3]) if len(sys.argv) > 3 else 8765
+
+        async def serve():
+            runner = await serve_replay(path, port=port, speed=1.0)
+            print(f"📡 리플레이 서버 실행: ws://127.0.0.1:{port}")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                await runner.cleanup()
+
+        asyncio.run(serve())
+
+if __name__ == "__main__":
+    main()
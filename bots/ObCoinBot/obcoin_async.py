@@ -0,0 +1,400 @@
+"""
+ObCoin Trading Bot 비동기 실행 모드 - ccxt.async_support 기반
+- 루프마다 타임프레임별 캔들 + 포지션을 동시에 조회 (대기 시간 ≈ 왕복 1회)
+- 진입 체결 직후 손절/익절 주문을 동시에 전송 (신호 후 보호 주문까지 시간 단축)
+- 분석/신호/포지션 관리 로직은 ObCoinBot 그대로 사용 (네트워크 호출만 비동기)
+
+- 스트리밍 모드: WebSocket 시세 피드(market_feed)로 로컬 캔들을 갱신하고 이벤트마다 재분석
+  (REST는 시작 시 과거 캔들 + 주기적 포지션 확인에만 사용)
+
+사용법:
+    python obcoin_async.py                       # BTC
+    OBCOIN_SYMBOLS=BTC,ETH python obcoin_async.py  # 여러 심볼 동시 실행 (거래소 연결 공유)
+    OBCOIN_STREAM=1 python obcoin_async.py         # WebSocket 스트리밍 모드
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import replace
+from typing import Dict, List, Optional
+
+import ccxt.async_support as ccxt_async
+import pandas as pd
+
+from obcoin_bot import TradingConfig, ObCoinBot, setup_logging, create_slack, create_outbox
+from market_feed import BybitMarketFeed
+
+
+def connect_async_exchange(config: TradingConfig) -> ccxt_async.bybit:
+    """Bybit 비동기 거래소 연결 (사용 후 close() 필요)"""
+    exchange = ccxt_async.bybit({
+        'apiKey': config.api_key,
+        'secret': config.api_secret,
+        'enableRateLimit': True,
+        'options': {
+            'defaultType': 'swap',  # 무기한 선물
+        }
+    })
+
+    # 테스트넷 사용 (실거래 전 테스트)
+    if config.debug_mode:
+        exchange.set_sandbox_mode(True)
+
+    return exchange
+
+
+class AsyncObCoinBot(ObCoinBot):
+    """ObCoinBot의 asyncio 버전 (거래소 호출을 동시에 실행)"""
+
+    def __init__(self, config: TradingConfig, exchange: ccxt_async.bybit, slack=None, outbox=None):
+        """
+        Args:
+            config: 트레이딩 설정 (config.symbol 기준으로 동작)
+            exchange: ccxt.async_support 거래소 객체 (여러 봇이 공유 가능)
+            slack: 공유할 Slack 객체 (없으면 새로 생성)
+            outbox: 공유할 구글시트/슬랙 전송 큐 (없으면 새로 생성)
+        """
+        # 기존 포지션 동기화는 이벤트 루프 안에서 (run() 시작 시)
+        super().__init__(config, exchange=exchange, slack=slack, sync_position=False, outbox=outbox)
+
+        # 스트리밍 모드 상태
+        self.feed: Optional[BybitMarketFeed] = None
+        self.last_stream_analysis = 0.0
+
+    async def sync_position_async(self):
+        """거래소에서 포지션 + 미체결 주문을 동시에 조회해서 동기화"""
+        try:
+            self.logger.info("기존 포지션 확인 중...")
+            positions, open_orders = await asyncio.gather(
+                self.exchange.fetch_positions([self.config.symbol]),
+                self.exchange.fetch_open_orders(self.config.symbol)
+            )
+            self._restore_position(positions, open_orders)
+
+        except Exception as e:
+            self.logger.error(f"포지션 동기화 실패: {e}")
+            self.position = None
+
+    async def _fetch_timeframe(self, tf_name: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """타임프레임 하나 조회 (실패 시 None)"""
+        try:
+            if self.config.candle_cache:
+                # 진입용 LTF만 매 루프 진행중 캔들 갱신, 상위 TF는 새 캔들 마감 시에만 조회
+                store = self.get_candle_store(timeframe)
+                await store.sync_async(refresh_forming=(tf_name == 'ltf'))
+                return store.frame(self.config.candle_limit)
+
+            ohlcv = await self.exchange.fetch_ohlcv(
+                self.config.symbol,
+                timeframe,
+                limit=self.config.candle_limit
+            )
+
+            df = pd.DataFrame(
+                ohlcv,
+                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+            )
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df.set_index('timestamp', inplace=True)
+            return df
+
+        except Exception as e:
+            self.logger.error(f"OHLCV 데이터 가져오기 실패 ({timeframe}): {e}")
+            return None
+
+    async def fetch_ohlcv_multi_timeframe_async(self) -> Dict[str, pd.DataFrame]:
+        """멀티 타임프레임 OHLCV 동시 조회"""
+        names = list(self.config.timeframes)
+        frames = await asyncio.gather(*(
+            self._fetch_timeframe(tf_name, self.config.timeframes[tf_name]) for tf_name in names
+        ))
+        return {tf_name: df for tf_name, df in zip(names, frames) if df is not None}
+
+    async def fetch_positions_async(self) -> Optional[List[Dict]]:
+        """포지션 조회 (실패 시 None)"""
+        try:
+            return await self.exchange.fetch_positions([self.config.symbol])
+        except Exception as e:
+            self.logger.error(f"포지션 조회 실패: {e}")
+            return None
+
+    async def check_position_status_async(self, positions: Optional[List[Dict]]):
+        """포지션 상태 확인 및 관리 (check_position_status의 비동기 버전)"""
+        try:
+            if positions is None:
+                positions = await self.exchange.fetch_positions([self.config.symbol])
+
+            current_position = self._apply_positions(positions)
+            if current_position is None:
+                return
+
+            if self.position is None:
+                # 봇 재시작 후 처음 감지된 경우
+                await self.sync_position_async()
+
+            # 트레일링 스탑 업데이트
+            new_stop = self._trailing_stop_price(current_position)
+            if new_stop is not None:
+                await self.exchange.edit_order(
+                    self.position['stop_order_id'],
+                    self.config.symbol,
+                    'stop_loss',
+                    'sell',
+                    self.position['size'],
+                    new_stop
+                )
+                self._on_trailing_stop(new_stop, current_position['percentage'])
+
+        except Exception as e:
+            self.logger.error(f"포지션 상태 확인 실패: {e}")
+
+    async def execute_trade_async(self, signal: str, analysis: Dict) -> bool:
+        """거래 실행 (잔고/레버리지 동시 요청 → 진입 → 손절/익절 동시 전송)"""
+        try:
+            # 이미 포지션이 있는지 확인
+            if self.position is not None:
+                self.logger.info("이미 포지션이 있습니다")
+                return False
+
+            entry_side, exit_side = self._order_sides(signal)
+
+            # 잔고 확인 + 레버리지 설정
+            balance, _ = await asyncio.gather(
+                self.exchange.fetch_balance(),
+                self.exchange.set_leverage(self.config.leverage, self.config.symbol)
+            )
+            usdt_balance = balance['USDT']['free']
+            if not self._has_tradable_balance(usdt_balance):
+                return False
+
+            # 진입 주문
+            amount = self._order_amount(usdt_balance, analysis)
+            order = await self.exchange.create_market_order(
+                self.config.symbol,
+                entry_side,
+                amount
+            )
+
+            # 손절/익절 주문 동시 전송 (하나가 실패해도 나머지는 유지)
+            results = await asyncio.gather(
+                self.exchange.create_order(self.config.symbol, 'stop_loss', exit_side,
+                                           amount, analysis['stop_loss']),
+                self.exchange.create_order(self.config.symbol, 'take_profit', exit_side,
+                                           amount, analysis['take_profit']),
+                return_exceptions=True
+            )
+
+            # 진입은 체결됐으므로 포지션은 항상 기록
+            self._open_position(signal, analysis, amount, order)
+
+            for name, result in zip(['손절', '익절'], results):
+                if isinstance(result, Exception):
+                    self.logger.error(f"{name} 주문 실패: {result}")
+                    self.notify(f"{self.tag} ⚠️ {name} 주문 실패 - 수동 확인 필요: {result}")
+                elif name == '손절':
+                    self.position['stop_order_id'] = result.get('id')
+                else:
+                    self.position['tp_order_id'] = result.get('id')
+            return True
+
+        except Exception as e:
+            self.logger.error(f"거래 실행 실패: {e}")
+            return False
+
+    async def run_once_async(self, loop_count: int) -> Dict:
+        """루프 1회분 처리 (캔들 + 포지션 동시 조회 → 분석 → 포지션 확인 → 거래 실행)"""
+        self.logger.debug(f"루프 #{loop_count}: 시장 분석 중...")
+
+        # 1. 모든 타임프레임 + 포지션 동시 조회
+        mt_data, positions = await asyncio.gather(
+            self.fetch_ohlcv_multi_timeframe_async(),
+            self.fetch_positions_async()
+        )
+
+        # 2. 시장 분석 (CPU 작업, 동기)
+        analysis = self.analyze_data(mt_data)
+
+        # 3. 포지션 확인
+        await self.check_position_status_async(positions)
+
+        # 4. 거래 신호 확인 및 실행
+        await self.act_on_analysis_async(analysis)
+        return analysis
+
+    async def act_on_analysis_async(self, analysis: Dict):
+        """분석 결과에 따라 거래 실행 (포지션이 없을 때만)"""
+        if self.position is None:  # 포지션이 없을 때만
+            if analysis['recommendation'] in ['BUY', 'SELL']:
+                self.logger.info(f"거래 신호 감지: {analysis['recommendation']}")
+                self.logger.info(f"근거 수: {analysis['confluence_count']}")
+
+                success = await self.execute_trade_async(analysis['recommendation'], analysis)
+
+                if success:
+                    self.logger.info("거래 실행 성공")
+                else:
+                    self.logger.debug("거래 실행 조건 미충족")
+        else:
+            self.logger.debug(f"포지션 보유 중... PnL: {self.position.get('pnl_percent', 0):.2f}%")
+
+    async def send_status_report_async(self):
+        """정기 상태 리포트 전송 (6시간마다)"""
+        try:
+            balance = await self.exchange.fetch_balance()
+            usdt_balance = balance.get('USDT', {}).get('total', 0)
+
+            self.notify(self._status_message(usdt_balance))
+
+        except Exception as e:
+            self.logger.error(f"상태 리포트 전송 실패: {e}")
+
+    async def run(self):
+        """메인 실행 루프 (비동기)"""
+        self.logger.info("ObCoin Bot 시작 (asyncio)")
+        await self.sync_position_async()
+
+        self.notify(f"{self.tag} 🤖 ObCoin Bot 가동 시작 (asyncio)")
+
+        loop_count = 0
+        try:
+            while True:
+                try:
+                    loop_count += 1
+                    started = time.time()
+
+                    await self.run_once_async(loop_count)
+
+                    # 정기 상태 리포트 (6시간마다)
+                    if loop_count % 360 == 0:  # 60초 * 360 = 6시간
+                        await self.send_status_report_async()
+
+                    # 대기 (루프 처리 시간은 제외)
+                    elapsed = time.time() - started
+                    self.logger.debug(f"루프 #{loop_count} 처리 {elapsed * 1000:.0f}ms")
+                    await asyncio.sleep(max(0, self.config.loop_interval - elapsed))
+
+                except asyncio.CancelledError:
+                    # 취소는 삼키지 않고 호출자(gather/TaskGroup)에게 그대로 전달
+                    self.logger.info("사용자 중단 요청")
+                    raise
+                except Exception as e:
+                    self.logger.error(f"메인 루프 오류: {e}")
+                    await asyncio.sleep(10)
+        finally:
+            self.logger.info("ObCoin Bot 종료")
+
+
+    # ---------- 스트리밍 모드 ----------
+    async def on_market_event(self, event: Dict):
+        """
+        시세 피드 이벤트 처리 - 로컬 캔들로 재분석 후 신호 시 바로 주문
+        캔들 마감은 즉시, 체결 가격 이벤트는 stream_analysis_interval 간격으로만 재분석
+        """
+        now = time.monotonic()
+        if event['type'] == 'price' and now - self.last_stream_analysis < self.config.stream_analysis_interval:
+            return
+        self.last_stream_analysis = now
+
+        analysis = self.analyze_data(self.feed.frames(self.config.candle_limit))
+        await self.act_on_analysis_async(analysis)
+
+    async def run_streaming(self, feed: Optional[BybitMarketFeed] = None):
+        """
+        WebSocket 스트리밍 실행 루프
+        feed: 사용할 시세 피드 (없으면 config.stream_url로 생성, 테스트 시 리플레이 피드 전달)
+        """
+        self.logger.info("ObCoin Bot 시작 (streaming)")
+        await self.sync_position_async()
+
+        self.feed = feed or BybitMarketFeed(
+            self.config.symbol,
+            self.config.timeframes,
+            url=self.config.stream_url or None,
+            max_candles=max(self.config.candle_limit, 1000)
+        )
+
+        # 과거 캔들은 REST(캔들 캐시)로 한 번만 받아서 피드 초기화
+        mt_data = await self.fetch_ohlcv_multi_timeframe_async()
+        for tf_name, df in mt_data.items():
+            self.feed.seed(tf_name, df, self.exchange.milliseconds())
+        self.feed.add_handler(self.on_market_event)
+
+        self.notify(f"{self.tag} 🤖 ObCoin Bot 가동 시작 (streaming)")
+
+        feed_task = asyncio.create_task(self.feed.run())
+        loop_count = 0
+        try:
+            # 포지션 확인/상태 리포트만 주기적으로 (시세는 피드 이벤트로 처리)
+            while True:
+                try:
+                    loop_count += 1
+                    await asyncio.sleep(self.config.loop_interval)
+
+                    positions = await self.fetch_positions_async()
+                    await self.check_position_status_async(positions)
+
+                    if loop_count % 360 == 0:  # 60초 * 360 = 6시간
+                        await self.send_status_report_async()
+
+                    if feed_task.done():
+                        self.logger.error("시세 피드 종료됨 - 재시작")
+                        feed_task = asyncio.create_task(self.feed.run())
+
+                except asyncio.CancelledError:
+                    # 피드 정리는 finally에서 하고 취소는 그대로 전달
+                    self.logger.info("사용자 중단 요청")
+                    raise
+                except Exception as e:
+                    self.logger.error(f"메인 루프 오류: {e}")
+                    await asyncio.sleep(10)
+        finally:
+            self.feed.stop()
+            feed_task.cancel()
+            self.logger.info("ObCoin Bot 종료")
+
+
+async def run_bots(config: TradingConfig, streaming: bool = False):
+    """
+    config.symbols의 심볼마다 비동기 봇을 만들어 동시에 실행 (거래소 연결 1개 공유)
+    streaming: True면 WebSocket 시세 피드 모드로 실행
+    """
+    setup_logging(config)
+    logger = logging.getLogger(__name__)
+
+    exchange = connect_async_exchange(config)
+    slack = create_slack(logger)
+    outbox = create_outbox(slack, logger)  # 전 심볼 공유 (시트 행은 모아서 1번에)
+    try:
+        await exchange.load_markets()
+        bots = [AsyncObCoinBot(replace(config, symbol=symbol, symbols=[symbol]), exchange, slack, outbox)
+                for symbol in config.symbols]
+        await asyncio.gather(*(bot.run_streaming() if streaming else bot.run() for bot in bots))
+    except Exception as e:
+        logger.error(f"봇 실행 중 오류 발생: {e}")
+        outbox.send_slack(f"[Argos-ObCoin_Async] ❌ 봇 오류: {e}")
+    finally:
+        outbox.close()
+        await exchange.close()
+
+
+def main():
+    """메인 실행 함수"""
+
+    # 설정 로드 (OBCOIN_SYMBOLS=BTC,ETH 처럼 코인 목록 지정 가능)
+    coins = os.getenv("OBCOIN_SYMBOLS", "BTC").split(",")
+    config = TradingConfig(
+        api_key=os.getenv("BYBIT_API_KEY", ""),
+        api_secret=os.getenv("BYBIT_API_SECRET", ""),
+        symbols=[f"{coin.strip()}/USDT:USDT" for coin in coins if coin.strip()],  # 바이비트 선물
+        debug_mode=False  # 실거래 모드
+    )
+
+    try:
+        asyncio.run(run_bots(config, streaming=os.getenv("OBCOIN_STREAM", "") == "1"))
+    except KeyboardInterrupt:
+        logging.info("사용자 중단 요청")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1045 @@
+"""
+ObCoin Trading Bot 공통 모듈 - SMC 기반 코인 선물 24시간 자동매매
+Based on Smart Money Concept (Order Blocks, FVG, Liquidity Sweep)
+심볼별 Starter(ObCoinStarter_BTC 등)와 멀티 심볼 러너(ObCoinStarter_Multi)가 공유
+"""
+
+import ccxt
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta
+import time
+import json
+import logging
+from typing import Dict, List, Tuple, Optional
+import os
+import sys
+from dataclasses import dataclass, asdict
+
+# 상위 디렉토리 경로 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from services.SlackService.simple_slack import SimpleSlack
+from services.OutboxService import Outbox, create_outbox as create_service_outbox
+import smc_engine
+from smc_state import SMCState
+from candle_store import CandleStore
+
+# 현재 파일 기준 디렉토리
+BOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ==================== 설정 클래스 ====================
+@dataclass
+class TradingConfig:
+    """트레이딩 설정"""
+    # API 설정
+    api_key: str = ""
+    api_secret: str = ""
+
+    # 매매 설정
+    symbol: str = "BTC/USDT:USDT"  # 바이비트 선물
+    symbols: List[str] = None  # 멀티 심볼 러너용 심볼 목록 (없으면 symbol 하나)
+    leverage: int = 1  # 레버리지 사용 안함 (현물과 동일)
+    position_size_percent: float = 0.2  # 총 자산의 90%
+    max_positions: int = 1  # 최대 포지션 수
+
+    # 타임프레임 설정 (멀티 타임프레임 분석)
+    timeframes: Dict[str, str] = None
+
+    # 리스크 관리
+    max_loss_per_trade: float = 0.02  # 거래당 최대 손실 2%
+    take_profit_ratio: float = 2.0  # 손익비 1:2
+    trailing_stop: bool = True
+    trailing_stop_percent: float = 0.01  # 1% 트레일링 스탑
+
+    # SMC 분석 파라미터
+    ob_min_body_ratio: float = 1.4  # 오더블럭 최소 몸통 비율 (30% 차이면 충분)
+    fvg_min_gap_size: float = 0.0005  # FVG 최소 갭 크기 (0.05% - 작은 갭도 유효)
+    sweep_lookbacks: List[int] = None  # 유동성 스윕 스윙 구간 (여러 개 동시 평가 가능)
+    structure_windows: Dict[str, int] = None  # 타임프레임별 스윙 포인트 탐색 구간 (±캔들 수)
+    min_confluence_count: int = 3  # 최소 근거 개수 (3개 유지 - SMC 원칙 고수)
+    vectorized_engine: bool = True  # NumPy 벡터화 분석 엔진 사용 (False면 기존 캔들 루프)
+    incremental_analysis: bool = True  # 새 캔들 꼬리만 재계산 + 구조물/플래그 루프 간 유지 (벡터화 엔진 사용)
+
+    # 캔들 데이터 설정
+    candle_limit: int = 200  # 분석에 사용할 캔들 수
+    candle_cache: bool = True  # 캔들 로컬 캐시 사용 (since로 새 캔들만 조회)
+    candle_cache_dir: str = os.path.join(BOT_DIR, "candles")  # 마감 캔들 CSV 저장 폴더
+
+    # 실시간 시세 피드 (obcoin_async 스트리밍 모드)
+    stream_url: str = ""  # WebSocket 주소 (비우면 바이비트 실서버, 로컬 리플레이 서버 주소 가능)
+    stream_analysis_interval: float = 0.5  # 체결 이벤트로 재분석하는 최소 간격 (초, 캔들 마감 시에는 즉시)
+
+    # 시스템 설정
+    loop_interval: int = 60  # 메인 루프 간격 (초)
+    debug_mode: bool = False
+
+    def __post_init__(self):
+        if self.symbols is None:
+            self.symbols = [self.symbol]
+        if self.timeframes is None:
+            self.timeframes = {
+                "htf": "4h",   # Higher Time Frame
+                "mtf": "1h",   # Medium Time Frame
+                "ltf": "15m"   # Lower Time Frame (진입용)
+            }
+        if self.sweep_lookbacks is None:
+            self.sweep_lookbacks = [20]
+        if self.structure_windows is None:
+            self.structure_windows = {
+                "htf": 50,
+                "mtf": 30,
+                "ltf": 20
+            }
+
+# ==================== SMC 분석 엔진 ====================
+class SMCAnalyzer:
+    """Smart Money Concept 분석 엔진"""
+
+    def __init__(self, config: TradingConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+
+    def detect_order_blocks(self, df: pd.DataFrame, bullish: bool = True) -> List[Dict]:
+        """
+        오더블럭 탐지
+        bullish: True = 상승 오더블럭, False = 하락 오더블럭
+        """
+        if self.config.vectorized_engine:
+            bullish_obs, bearish_obs = self.detect_order_blocks_all(df)
+            return bullish_obs if bullish else bearish_obs
+
+        order_blocks = []
+
+        for i in range(2, len(df) - 1):
+            if bullish:
+                # 상승 오더블럭: [음봉] → [양봉(장대)]
+                if (df['close'].iloc[i] > df['open'].iloc[i] and  # 현재 양봉
+                    df['close'].iloc[i-1] < df['open'].iloc[i-1] and  # 이전 음봉
+                    df['close'].iloc[i] > df['open'].iloc[i-1]):  # 반전 확인
+
+                    # 몸통 크기 비율 확인
+                    current_body = abs(df['close'].iloc[i] - df['open'].iloc[i])
+                    prev_body = abs(df['close'].iloc[i-1] - df['open'].iloc[i-1])
+
+                    if prev_body > 0 and current_body / prev_body >= self.config.ob_min_body_ratio:
+                        ob = {
+                            'type': 'bullish_ob',
+                            'top': df['close'].iloc[i-1],
+                            'bottom': df['open'].iloc[i-1],
+                            'time': df.index[i-1],
+                            'strength': current_body / prev_body,
+                            'touched': False
+                        }
+                        order_blocks.append(ob)
+            else:
+                # 하락 오더블럭: [양봉] → [음봉(장대)]
+                if (df['close'].iloc[i] < df['open'].iloc[i] and  # 현재 음봉
+                    df['close'].iloc[i-1] > df['open'].iloc[i-1] and  # 이전 양봉
+                    df['close'].iloc[i] < df['open'].iloc[i-1]):  # 반전 확인
+
+                    # 몸통 크기 비율 확인
+                    current_body = abs(df['open'].iloc[i] - df['close'].iloc[i])
+                    prev_body = abs(df['close'].iloc[i-1] - df['open'].iloc[i-1])
+
+                    if prev_body > 0 and current_body / prev_body >= self.config.ob_min_body_ratio:
+                        ob = {
+                            'type': 'bearish_ob',
+                            'top': df['open'].iloc[i-1],
+                            'bottom': df['close'].iloc[i-1],
+                            'time': df.index[i-1],
+                            'strength': current_body / prev_body,
+                            'touched': False
+                        }
+                        order_blocks.append(ob)
+
+        return order_blocks
+
+    def detect_order_blocks_all(self, df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
+        """
+        상승/하락 오더블럭 동시 탐지
+        벡터화 엔진은 배열 연산 1회로 양방향을 모두 계산
+        """
+        if self.config.vectorized_engine:
+            return smc_engine.detect_order_blocks(df, self.config.ob_min_body_ratio)
+
+        return (self.detect_order_blocks(df, bullish=True),
+                self.detect_order_blocks(df, bullish=False))
+
+    def detect_fvg(self, df: pd.DataFrame, bullish: bool = True) -> List[Dict]:
+        """
+        Fair Value Gap 탐지
+        bullish: True = 상승 FVG, False = 하락 FVG
+        """
+        if self.config.vectorized_engine:
+            bullish_fvgs, bearish_fvgs = self.detect_fvg_all(df)
+            return bullish_fvgs if bullish else bearish_fvgs
+
+        fvgs = []
+
+        for i in range(2, len(df)):
+            if bullish:
+                # 상승 FVG: 1번 캔들 고가와 3번 캔들 저가 사이 갭
+                gap_top = df['low'].iloc[i]
+                gap_bottom = df['high'].iloc[i-2]
+
+                if gap_top > gap_bottom:
+                    gap_size = (gap_top - gap_bottom) / gap_bottom
+                    if gap_size >= self.config.fvg_min_gap_size:
+                        fvg = {
+                            'type': 'bullish_fvg',
+                            'top': gap_top,
+                            'bottom': gap_bottom,
+                            'time': df.index[i-1],
+                            'size': gap_size,
+                            'filled': False
+                        }
+                        fvgs.append(fvg)
+            else:
+                # 하락 FVG: 1번 캔들 저가와 3번 캔들 고가 사이 갭
+                gap_top = df['low'].iloc[i-2]
+                gap_bottom = df['high'].iloc[i]
+
+                if gap_top > gap_bottom:
+                    gap_size = (gap_top - gap_bottom) / gap_bottom
+                    if gap_size >= self.config.fvg_min_gap_size:
+                        fvg = {
+                            'type': 'bearish_fvg',
+                            'top': gap_top,
+                            'bottom': gap_bottom,
+                            'time': df.index[i-1],
+                            'size': gap_size,
+                            'filled': False
+                        }
+                        fvgs.append(fvg)
+
+        return fvgs
+
+    def detect_fvg_all(self, df: pd.DataFrame) -> Tuple[List[Dict], List[Dict]]:
+        """
+        상승/하락 FVG 동시 탐지
+        벡터화 엔진은 이후 캔들로 갭이 채워졌는지(filled)까지 계산
+        """
+        if self.config.vectorized_engine:
+            return smc_engine.detect_fvgs(df, self.config.fvg_min_gap_size)
+
+        return (self.detect_fvg(df, bullish=True),
+                self.detect_fvg(df, bullish=False))
+
+    def detect_liquidity_sweep(self, df: pd.DataFrame, lookback: int = 20) -> List[Dict]:
+        """
+        유동성 스윕 탐지 (스탑 헌팅)
+        """
+        if self.config.vectorized_engine:
+            return smc_engine.detect_liquidity_sweeps(df, [lookback])
+
+        sweeps = []
+
+        for i in range(lookback, len(df)):
+            window = df.iloc[i-lookback:i]
+
+            # 스윙 하이/로우 찾기
+            swing_high = window['high'].max()
+            swing_low = window['low'].min()
+
+            current_high = df['high'].iloc[i]
+            current_low = df['low'].iloc[i]
+            current_close = df['close'].iloc[i]
+
+            # 상방 유동성 스윕 (고점 돌파 후 하락)
+            if current_high > swing_high and current_close < swing_high:
+                sweep = {
+                    'type': 'bullish_sweep',  # 매수 기회
+                    'level': swing_high,
+                    'time': df.index[i],
+                    'wick_size': (current_high - current_close) / current_close
+                }
+                sweeps.append(sweep)
+
+            # 하방 유동성 스윕 (저점 돌파 후 상승)
+            if current_low < swing_low and current_close > swing_low:
+                sweep = {
+                    'type': 'bearish_sweep',  # 매도 기회
+                    'level': swing_low,
+                    'time': df.index[i],
+                    'wick_size': (current_close - current_low) / current_low
+                }
+                sweeps.append(sweep)
+
+        return sweeps
+
+    def detect_liquidity_sweeps(self, df: pd.DataFrame, lookbacks: Optional[List[int]] = None) -> List[Dict]:
+        """
+        여러 lookback 유동성 스윕 동시 탐지 (기본: config.sweep_lookbacks)
+        벡터화 엔진은 rolling 최고/최저가로 lookback당 O(n) 1회 계산
+        """
+        lookbacks = lookbacks or self.config.sweep_lookbacks
+
+        if self.config.vectorized_engine:
+            return smc_engine.detect_liquidity_sweeps(df, lookbacks)
+
+        sweeps = []
+        for lookback in lookbacks:
+            for sweep in self.detect_liquidity_sweep(df, lookback):
+                sweep['lookback'] = lookback
+                sweeps.append(sweep)
+        # 시간순 정렬 (같은 캔들은 lookback 순서 유지)
+        sweeps.sort(key=lambda s: s['time'])
+        return sweeps
+
+    def calculate_market_structure(self, df: pd.DataFrame, window: int = 50) -> Dict:
+        """
+        시장 구조 분석 (추세 파악)
+        벡터화 엔진은 HH/HL/LH/LL 시퀀스와 BOS/CHoCH 이벤트도 함께 반환
+        """
+        if self.config.vectorized_engine:
+            return smc_engine.market_structure(df, window)
+
+        # 최근 고점/저점 찾기
+        highs = []
+        lows = []
+
+        for i in range(window, len(df) - window):
+            # 로컬 고점
+            if df['high'].iloc[i] == df['high'].iloc[i-window:i+window].max():
+                highs.append({'price': df['high'].iloc[i], 'index': i})
+            # 로컬 저점
+            if df['low'].iloc[i] == df['low'].iloc[i-window:i+window].min():
+                lows.append({'price': df['low'].iloc[i], 'index': i})
+
+        # 추세 판단
+        trend = 'neutral'
+        if len(highs) >= 2 and len(lows) >= 2:
+            # HH-HL: 상승 추세
+            if (highs[-1]['price'] > highs[-2]['price'] and
+                lows[-1]['price'] > lows[-2]['price']):
+                trend = 'bullish'
+            # LH-LL: 하락 추세
+            elif (highs[-1]['price'] < highs[-2]['price'] and
+                  lows[-1]['price'] < lows[-2]['price']):
+                trend = 'bearish'
+
+        return {
+            'trend': trend,
+            'highs': highs[-3:] if highs else [],
+            'lows': lows[-3:] if lows else [],
+            'last_swing_high': highs[-1]['price'] if highs else None,
+            'last_swing_low': lows[-1]['price'] if lows else None
+        }
+
+    def analyze_frame(self, df: pd.DataFrame, tf_name: str) -> Dict:
+        """
+        타임프레임 하나의 전체 구조물 계산 (매번 전체 재계산)
+        SMCState.update와 같은 형태로 반환
+        """
+        bullish_obs, bearish_obs = self.detect_order_blocks_all(df)
+        bullish_fvgs, bearish_fvgs = self.detect_fvg_all(df)
+
+        return {
+            'order_blocks': {'bullish': bullish_obs, 'bearish': bearish_obs},
+            'fvgs': {'bullish': bullish_fvgs, 'bearish': bearish_fvgs},
+            'liquidity_sweeps': self.detect_liquidity_sweeps(df),
+            'market_structure': self.calculate_market_structure(
+                df, window=self.config.structure_windows.get(tf_name, 50))
+        }
+
+    def generate_signals(self, market_structure: Dict, ltf: Dict,
+                         current_price: float, now: datetime) -> Dict:
+        """
+        HTF 시장 구조 + LTF 구조물로 매수/매도 신호 판정 (실거래 봇과 백테스터가 공유)
+        신호에 쓰인 오더블럭은 touched, FVG는 filled로 표시 (같은 구조물로 재진입 방지)
+
+        Args:
+            market_structure: HTF 시장 구조 ('trend' 사용)
+            ltf: LTF 구조물 (analyze_frame / SMCState.update 형태)
+            current_price: 현재가
+            now: 현재 시각 (유동성 스윕 경과 시간 기준)
+
+        Returns:
+            {'buy_signals', 'sell_signals', 'confluence_count', 'recommendation'}
+            + 신호 시 'entry_price', 'stop_loss', 'take_profit'
+        """
+        # 오더블럭 / FVG / 유동성 스윕
+        bullish_obs = ltf['order_blocks']['bullish']
+        bearish_obs = ltf['order_blocks']['bearish']
+        bullish_fvgs = ltf['fvgs']['bullish']
+        liquidity_sweeps = ltf['liquidity_sweeps']
+
+        # 매수 신호 체크
+        buy_signals = []
+
+        # 1. 상승 추세 확인
+        if market_structure.get('trend') == 'bullish':
+            buy_signals.append('BULLISH_TREND')
+
+        # 2. 유동성 스윕 발생 (가장 최근 상방 스윕)
+        last_sweep = next((s for s in reversed(liquidity_sweeps) if s['type'] == 'bullish_sweep'), None)
+        if last_sweep is not None:
+            last_sweep_time = last_sweep['time']
+            if (now - last_sweep_time).total_seconds() < 3600:  # 1시간 이내
+                buy_signals.append('LIQUIDITY_SWEEP')
+
+        # 3. 오더블럭 터치
+        for ob in bullish_obs[-5:]:  # 최근 5개만 체크
+            if ob['bottom'] <= current_price <= ob['top'] and not ob['touched']:
+                buy_signals.append('BULLISH_OB_TOUCH')
+                ob['touched'] = True
+                break
+
+        # 4. FVG 진입
+        for fvg in bullish_fvgs[-5:]:  # 최근 5개만 체크
+            if fvg['bottom'] <= current_price <= fvg['top'] and not fvg['filled']:
+                buy_signals.append('BULLISH_FVG_ENTRY')
+                fvg['filled'] = True
+                break
+
+        # 매도 신호 체크 (숏 포지션용)
+        sell_signals = []
+
+        # 1. 하락 추세 확인
+        if market_structure.get('trend') == 'bearish':
+            sell_signals.append('BEARISH_TREND')
+
+        # 2. 하락 오더블럭 터치
+        for ob in bearish_obs[-5:]:
+            if ob['bottom'] <= current_price <= ob['top'] and not ob['touched']:
+                sell_signals.append('BEARISH_OB_TOUCH')
+                ob['touched'] = True
+                break
+
+        result = {
+            'buy_signals': buy_signals,
+            'sell_signals': sell_signals,
+            'confluence_count': max(len(buy_signals), len(sell_signals)),
+            'recommendation': 'WAIT'
+        }
+
+        # 최종 추천
+        if len(buy_signals) >= self.config.min_confluence_count:
+            result['recommendation'] = 'BUY'
+            result['entry_price'] = current_price
+            result['stop_loss'] = current_price * 0.98  # 2% 손절
+            result['take_profit'] = current_price * 1.04  # 4% 익절
+        elif len(sell_signals) >= self.config.min_confluence_count:
+            result['recommendation'] = 'SELL'
+            result['entry_price'] = current_price
+            result['stop_loss'] = current_price * 1.02
+            result['take_profit'] = current_price * 0.96
+
+        return result
+
+# ==================== 공용 리소스 ====================
+def setup_logging(config: TradingConfig):
+    """로깅 설정 (프로세스당 1회만 적용)"""
+    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    log_level = logging.DEBUG if config.debug_mode else logging.INFO
+
+    logging.basicConfig(
+        level=log_level,
+        format=log_format,
+        handlers=[
+            logging.FileHandler(f'obcoin_bot_{datetime.now().strftime("%Y%m%d")}.log'),
+            logging.StreamHandler()
+        ]
+    )
+
+
+def connect_exchange(config: TradingConfig) -> ccxt.bybit:
+    """Bybit 거래소 연결"""
+    exchange = ccxt.bybit({
+        'apiKey': config.api_key,
+        'secret': config.api_secret,
+        'enableRateLimit': True,
+        'options': {
+            'defaultType': 'swap',  # 무기한 선물
+        }
+    })
+
+    # 테스트넷 사용 (실거래 전 테스트)
+    if config.debug_mode:
+        exchange.set_sandbox_mode(True)
+
+    return exchange
+
+
+def create_slack(logger: logging.Logger) -> Optional[SimpleSlack]:
+    """Slack 서비스 생성 (실패 시 None)"""
+    try:
+        return SimpleSlack()
+    except:
+        logger.warning("Slack 서비스를 초기화할 수 없습니다")
+        return None
+
+def create_outbox(slack: Optional[SimpleSlack], logger: logging.Logger, name: str = "outbox") -> Outbox:
+    """구글시트/슬랙 비동기 전송 큐 (미전송분은 봇 폴더 {name}.spill에 보관 → 재시작 시 이어서 전송)"""
+    return create_service_outbox(os.path.join(BOT_DIR, f"{name}.spill"), slack=slack, logger=logger)
+
+# ==================== 트레이딩 봇 메인 클래스 ====================
+class ObCoinBot:
+    """ObCoin Trading Bot 메인 클래스"""
+
+    def __init__(self, config: TradingConfig, exchange: Optional[ccxt.bybit] = None,
+                 slack: Optional[SimpleSlack] = None, sync_position: bool = True,
+                 outbox: Optional[Outbox] = None):
+        """
+        Args:
+            config: 트레이딩 설정 (config.symbol 기준으로 동작)
+            exchange: 공유할 거래소 객체 (없으면 새로 연결)
+            slack: 공유할 Slack 객체 (없으면 새로 생성)
+            outbox: 공유할 구글시트/슬랙 전송 큐 (없으면 심볼별로 새로 생성)
+            sync_position: 생성 시 기존 포지션 동기화 (비동기 봇은 run()에서 따로 동기화)
+        """
+        self.config = config
+        self.coin = config.symbol.split('/')[0]  # BTC/USDT:USDT -> BTC
+        self.tag = f"[Argos-ObCoin_{self.coin}]"  # 알림 접두어
+        setup_logging(config)
+        self.logger = logging.getLogger(f"{__name__}.{self.coin}")
+
+        # Bybit 거래소 연결
+        self.exchange = exchange or connect_exchange(config)
+
+        # SMC 분석기
+        self.analyzer = SMCAnalyzer(config)
+        self.smc_state = SMCState(config)  # 증분 분석 상태 (루프 간 유지)
+        self.candle_stores: Dict[str, CandleStore] = {}  # 타임프레임별 캔들 캐시
+
+        # Slack 서비스 (알림용)
+        self.slack = slack or create_slack(self.logger)
+
+        # 구글시트/슬랙은 전송 큐에 넣기만 (매매 루프가 네트워크를 기다리지 않음)
+        self.outbox = outbox or create_outbox(self.slack, self.logger, f"outbox_{self.coin}")
+
+        # 상태 관리
+        self.position = None
+        self.orders = []
+        self.trade_history = []
+        self.analysis_cache = {}
+
+        # 알림 제한
+        self.last_notification = {}  # 마지막 알림 시간 저장
+        self.notification_cooldown = 3600  # 같은 알림 1시간 쿨다운
+
+        # 기존 포지션 동기화
+        if sync_position:
+            self.sync_position_from_exchange()
+
+        self.logger.info("ObCoin Bot 초기화 완료")
+
+    def notify(self, message: str):
+        """슬랙 알림 (전송 큐에 넣고 바로 반환)"""
+        self.outbox.send_slack(message)
+
+    def sync_position_from_exchange(self):
+        """거래소에서 실제 포지션 정보 가져와서 동기화"""
+        try:
+            self.logger.info("기존 포지션 확인 중...")
+
+            # 바이비트에서 현재 포지션 조회
+            positions = self.exchange.fetch_positions([self.config.symbol])
+
+            open_orders = []
+            if positions and positions[0]['contracts'] > 0:
+                # 스탑/익절 주문 조회
+                open_orders = self.exchange.fetch_open_orders(self.config.symbol)
+
+            self._restore_position(positions, open_orders)
+
+        except Exception as e:
+            self.logger.error(f"포지션 동기화 실패: {e}")
+            self.position = None
+
+    def _restore_position(self, positions: List[Dict], open_orders: List[Dict]):
+        """조회한 포지션/미체결 주문으로 self.position 복원"""
+        if positions and len(positions) > 0:
+            pos = positions[0]
+
+            # 포지션이 있는 경우
+            if pos['contracts'] > 0:
+                self.logger.info(f"기존 포지션 발견: {pos['side']} {pos['contracts']} {self.coin}")
+
+                # 포지션 정보 복원
+                self.position = {
+                    'side': pos['side'].upper(),  # 'long' -> 'BUY', 'short' -> 'SELL'
+                    'entry_price': pos['info'].get('avg_price', pos['markPrice']),
+                    'size': pos['contracts'],
+                    'stop_loss': None,  # 스탑 주문은 별도 조회 필요
+                    'take_profit': None,
+                    'timestamp': datetime.now(),
+                    'pnl_percent': pos['percentage'],
+                    'unrealized_pnl': pos['unrealizedPnl'],
+                    'mark_price': pos['markPrice']
+                }
+
+                # 스탑/익절 주문 반영
+                for order in open_orders:
+                    if order['type'] == 'stop_loss':
+                        self.position['stop_loss'] = order['price']
+                        self.position['stop_order_id'] = order['id']
+                    elif order['type'] == 'take_profit':
+                        self.position['take_profit'] = order['price']
+                        self.position['tp_order_id'] = order['id']
+
+                # 상태 알림
+                message = f"""
+                📊 **기존 포지션 감지**
+                - 방향: {self.position['side']}
+                - 진입가: ${self.position['entry_price']:.2f}
+                - 현재가: ${self.position['mark_price']:.2f}
+                - 수량: {self.position['size']:.4f} {self.coin}
+                - PnL: {self.position['pnl_percent']:.2f}%
+                - 미실현 손익: ${self.position['unrealized_pnl']:.2f}
+                """
+
+                self.notify(f"{self.tag} {message}")
+
+                self.logger.info(f"포지션 복원 완료 - PnL: {self.position['pnl_percent']:.2f}%")
+                return
+
+        self.logger.info("활성 포지션 없음")
+        self.position = None
+
+    def get_candle_store(self, timeframe: str) -> CandleStore:
+        """타임프레임별 캔들 캐시 (처음 사용 시 디스크에서 복원)"""
+        if timeframe not in self.candle_stores:
+            self.candle_stores[timeframe] = CandleStore(
+                self.exchange,
+                self.config.symbol,
+                timeframe,
+                self.config.candle_cache_dir,
+                max_candles=max(self.config.candle_limit, 1000),
+                initial_limit=self.config.candle_limit
+            )
+        return self.candle_stores[timeframe]
+
+    def fetch_ohlcv_multi_timeframe(self) -> Dict[str, pd.DataFrame]:
+        """멀티 타임프레임 OHLCV 데이터 가져오기"""
+        data = {}
+
+        for tf_name, timeframe in self.config.timeframes.items():
+            try:
+                if self.config.candle_cache:
+                    # 진입용 LTF만 매 루프 진행중 캔들 갱신, 상위 TF는 새 캔들 마감 시에만 조회
+                    store = self.get_candle_store(timeframe)
+                    store.sync(refresh_forming=(tf_name == 'ltf'))
+                    data[tf_name] = store.frame(self.config.candle_limit)
+                    continue
+
+                ohlcv = self.exchange.fetch_ohlcv(
+                    self.config.symbol,
+                    timeframe,
+                    limit=self.config.candle_limit
+                )
+
+                df = pd.DataFrame(
+                    ohlcv,
+                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+                )
+                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+                df.set_index('timestamp', inplace=True)
+
+                data[tf_name] = df
+
+            except Exception as e:
+                self.logger.error(f"OHLCV 데이터 가져오기 실패 ({timeframe}): {e}")
+
+        return data
+
+    def analyze_timeframe(self, tf_name: str, df: pd.DataFrame) -> Dict:
+        """타임프레임 구조물 계산 (증분 모드면 누적 상태만 갱신)"""
+        if self.config.incremental_analysis:
+            return self.smc_state.update(tf_name, df)
+        return self.analyzer.analyze_frame(df, tf_name)
+
+    def analyze_market(self) -> Dict:
+        """시장 분석 - SMC 기반"""
+        # 멀티 타임프레임 데이터 가져오기
+        return self.analyze_data(self.fetch_ohlcv_multi_timeframe())
+
+    def analyze_data(self, mt_data: Dict[str, pd.DataFrame]) -> Dict:
+        """가져온 멀티 타임프레임 캔들로 SMC 신호 분석"""
+        analysis = {
+            'timestamp': datetime.now(),
+            'signals': [],
+            'confluence_count': 0,
+            'recommendation': 'WAIT'
+        }
+
+        try:
+            if not mt_data:
+                return analysis
+
+            # 상위 타임프레임 분석 (큰 그림)
+            htf_df = mt_data.get('htf')
+            if htf_df is not None:
+                htf = self.analyze_timeframe('htf', htf_df)
+
+                # 시장 구조
+                analysis['market_structure'] = htf['market_structure']
+
+                # HTF 오더블럭
+                htf_bullish_obs = htf['order_blocks']['bullish']
+                htf_bearish_obs = htf['order_blocks']['bearish']
+
+                analysis['htf_order_blocks'] = {
+                    'bullish': htf_bullish_obs[-3:] if htf_bullish_obs else [],
+                    'bearish': htf_bearish_obs[-3:] if htf_bearish_obs else []
+                }
+
+            # 하위 타임프레임 분석 (진입 타이밍)
+            ltf_df = mt_data.get('ltf')
+            if ltf_df is not None:
+                if 'market_structure' not in analysis:
+                    raise ValueError("상위 타임프레임 데이터 없음")
+
+                current_price = ltf_df['close'].iloc[-1]
+                ltf = self.analyze_timeframe('ltf', ltf_df)
+
+                # 매수/매도 신호 + 최종 추천
+                analysis.update(self.analyzer.generate_signals(
+                    analysis['market_structure'], ltf, current_price, datetime.now()))
+
+                # 분석 정보 저장
+                analysis.update({
+                    'current_price': current_price,
+                    'order_blocks': {'bullish': ltf['order_blocks']['bullish'][-3:],
+                                     'bearish': ltf['order_blocks']['bearish'][-3:]},
+                    'fvgs': {'bullish': ltf['fvgs']['bullish'][-3:], 'bearish': ltf['fvgs']['bearish'][-3:]},
+                    'liquidity_sweeps': ltf['liquidity_sweeps'][-3:]
+                })
+
+        except Exception as e:
+            self.logger.error(f"시장 분석 실패: {e}")
+
+        return analysis
+
+    def execute_trade(self, signal: str, analysis: Dict) -> bool:
+        """거래 실행"""
+        try:
+            # 이미 포지션이 있는지 확인
+            if self.position is not None:
+                self.logger.info("이미 포지션이 있습니다")
+                return False
+
+            # 잔고 확인
+            balance = self.exchange.fetch_balance()
+            usdt_balance = balance['USDT']['free']
+            if not self._has_tradable_balance(usdt_balance):
+                return False
+
+            # 포지션 사이즈 계산
+            amount = self._order_amount(usdt_balance, analysis)
+            entry_side, exit_side = self._order_sides(signal)
+
+            # 레버리지 설정
+            self.exchange.set_leverage(self.config.leverage, self.config.symbol)
+
+            # 주문 실행
+            order = self.exchange.create_market_order(
+                self.config.symbol,
+                entry_side,
+                amount
+            )
+
+            # 손절/익절 주문
+            self.exchange.create_order(
+                self.config.symbol,
+                'stop_loss',
+                exit_side,
+                amount,
+                analysis['stop_loss']
+            )
+
+            self.exchange.create_order(
+                self.config.symbol,
+                'take_profit',
+                exit_side,
+                amount,
+                analysis['take_profit']
+            )
+
+            self._open_position(signal, analysis, amount, order)
+            return True
+
+        except Exception as e:
+            self.logger.error(f"거래 실행 실패: {e}")
+            return False
+
+    def _has_tradable_balance(self, usdt_balance: float) -> bool:
+        """최소 거래 금액(10 USDT) 체크 - 부족하면 1시간에 한 번만 알림"""
+        if usdt_balance >= 10:
+            return True
+
+        current_time = datetime.now()
+        last_balance_warning = self.last_notification.get('low_balance', datetime.min)
+
+        if (current_time - last_balance_warning).total_seconds() > self.notification_cooldown:
+            self.logger.warning(f"잔고 부족: ${usdt_balance:.2f}")
+            self.notify(f"{self.tag} ⚠️ 잔고 부족: ${usdt_balance:.2f}")
+            self.last_notification['low_balance'] = current_time
+        return False
+
+    def _order_amount(self, usdt_balance: float, analysis: Dict) -> float:
+        """주문 수량 (가용 잔고 * 포지션 비율 / 현재가)"""
+        position_size = usdt_balance * self.config.position_size_percent
+        return position_size / analysis['current_price']
+
+    @staticmethod
+    def _order_sides(signal: str) -> Tuple[str, str]:
+        """신호 → (진입 주문 방향, 손절/익절 주문 방향)"""
+        if signal == 'BUY':
+            return 'buy', 'sell'
+        if signal == 'SELL':
+            return 'sell', 'buy'
+        raise ValueError(f"알 수 없는 신호: {signal}")
+
+    def _open_position(self, signal: str, analysis: Dict, amount: float, order: Dict):
+        """진입 체결 후 포지션 정보 저장 및 알림"""
+        # 포지션 정보 저장
+        self.position = {
+            'side': signal,
+            'entry_price': analysis['entry_price'],
+            'size': amount,
+            'stop_loss': analysis['stop_loss'],
+            'take_profit': analysis['take_profit'],
+            'timestamp': datetime.now(),
+            'analysis': analysis
+        }
+
+        # 알림 전송
+        message = f"""
+        🚀 **포지션 오픈**
+        - 방향: {signal}
+        - 진입가: ${analysis['entry_price']:.2f}
+        - 수량: {amount:.4f} {self.coin}
+        - 손절: ${analysis['stop_loss']:.2f}
+        - 익절: ${analysis['take_profit']:.2f}
+        - 근거: {', '.join(analysis.get('buy_signals', []) or analysis.get('sell_signals', []))}
+        """
+
+        self.notify(f"{self.tag} {message}")
+
+        self.logger.info(f"거래 실행 완료: {order}")
+
+    def check_position_status(self, positions: Optional[List[Dict]] = None):
+        """
+        포지션 상태 확인 및 관리
+        positions: 미리 조회한 이 심볼의 포지션 (멀티 심볼 러너가 일괄 조회 후 전달)
+        """
+        try:
+            # 현재 포지션 조회 (항상 실제 거래소 정보 기준)
+            if positions is None:
+                positions = self.exchange.fetch_positions([self.config.symbol])
+
+            current_position = self._apply_positions(positions)
+            if current_position is None:
+                return
+
+            if self.position is None:
+                # 봇 재시작 후 처음 감지된 경우
+                self.sync_position_from_exchange()
+
+            # 트레일링 스탑 업데이트
+            new_stop = self._trailing_stop_price(current_position)
+            if new_stop is not None:
+                self.exchange.edit_order(
+                    self.position['stop_order_id'],
+                    self.config.symbol,
+                    'stop_loss',
+                    'sell',
+                    self.position['size'],
+                    new_stop
+                )
+                self._on_trailing_stop(new_stop, current_position['percentage'])
+
+        except Exception as e:
+            self.logger.error(f"포지션 상태 확인 실패: {e}")
+
+    def _apply_positions(self, positions: List[Dict]) -> Optional[Dict]:
+        """
+        조회한 포지션 반영 (청산 시 기록/알림)
+        Returns: 열려있는 거래소 포지션 (청산/없음이면 None)
+        """
+        if not positions or positions[0]['contracts'] == 0:
+            # 포지션이 청산됨
+            if self.position is not None:
+                self.logger.info("포지션이 청산되었습니다")
+
+                # 구글시트 기록
+                self.write_trade_to_sheet()
+
+                # 청산 알림
+                self.notify(f"{self.tag} ✅ 포지션 청산 완료\n📋 거래내역: https://docs.google.com/spreadsheets/d/161qmtgCq6mDcckqrQj9hyLhGjOTvHtzeJq53Rrry5fo/edit?gid=1185998354#gid=1185998354")
+
+            self.position = None
+            return None
+
+        # 포지션이 있는 경우
+        current_position = positions[0]
+
+        # 기존 포지션 업데이트 (처음 감지된 경우는 호출한 쪽에서 동기화)
+        if self.position is not None:
+            self.position['mark_price'] = current_position['markPrice']
+            self.position['pnl_percent'] = current_position['percentage']
+            self.position['unrealized_pnl'] = current_position['unrealizedPnl']
+
+        return current_position
+
+    def _trailing_stop_price(self, current_position: Dict) -> Optional[float]:
+        """트레일링 스탑 새 가격 (올릴 필요 없으면 None) - 롱 포지션만 적용"""
+        if not self.config.trailing_stop or current_position['percentage'] <= 2:  # 2% 이상 수익
+            return None
+        if self.position is None or current_position['side'] != 'long':
+            return None
+        if not self.position.get('stop_loss') or 'stop_order_id' not in self.position:
+            return None
+
+        new_stop = current_position['markPrice'] * (1 - self.config.trailing_stop_percent)
+        return new_stop if new_stop > self.position['stop_loss'] else None
+
+    def _on_trailing_stop(self, new_stop: float, pnl_percent: float):
+        """스탑로스 수정 주문 후 상태 갱신 및 알림"""
+        self.position['stop_loss'] = new_stop
+        self.logger.info(f"트레일링 스탑 업데이트: ${new_stop:.2f}")
+
+        # 트레일링 스탑 알림 (하루 최대 1번)
+        current_time = datetime.now()
+        last_trail_notify = self.last_notification.get('trailing_stop', datetime.min)
+        if (current_time - last_trail_notify).total_seconds() > 86400:  # 24시간
+            self.notify(f"{self.tag} 📈 트레일링 스탑 업데이트: ${new_stop:.2f} (PnL: +{pnl_percent:.2f}%)")
+            self.last_notification['trailing_stop'] = current_time
+
+    def write_trade_to_sheet(self):
+        """포지션 청산 시 구글시트에 거래 내역 기록"""
+        try:
+            now = datetime.now()
+            date_str = now.strftime('%Y-%m-%d')
+            time_str = now.strftime('%H:%M:%S')
+
+            symbol_name = self.coin
+
+            entry_price = float(self.position.get('entry_price', 0))
+            exit_price = float(self.position.get('mark_price', 0))
+            size = float(self.position.get('size', 0))
+
+            buy_amount = entry_price * size
+            sell_amount = exit_price * size
+            fee = (buy_amount + sell_amount) * 0.00055  # 바이비트 taker 수수료 0.055%
+            profit = sell_amount - buy_amount - fee
+            profit_rate = (profit / buy_amount * 100) if buy_amount > 0 else 0
+
+            sheet_name = os.getenv('GOOGLE_SHEET_NAME_2', '코인거래')
+
+            self.outbox.send_sheet(sheet_name,
+                                   date_str,
+                                   time_str,
+                                   symbol_name,
+                                   f"{buy_amount:.2f}",
+                                   f"{sell_amount:.2f}",
+                                   f"{fee:.2f}",
+                                   f"{profit:.2f}",
+                                   f"{profit_rate:.2f}%")
+
+            self.logger.info(f"구글시트 기록 예약: {symbol_name} 수익 ${profit:.2f} ({profit_rate:.2f}%)")
+
+        except Exception as e:
+            self.logger.error(f"구글시트 기록 실패: {e}")
+
+    def send_status_report(self):
+        """정기 상태 리포트 전송 (6시간마다)"""
+        try:
+            balance = self.exchange.fetch_balance()
+            usdt_balance = balance.get('USDT', {}).get('total', 0)
+
+            self.notify(self._status_message(usdt_balance))
+
+        except Exception as e:
+            self.logger.error(f"상태 리포트 전송 실패: {e}")
+
+    def _status_message(self, usdt_balance: float) -> str:
+        """정기 상태 리포트 메시지"""
+        status_msg = f"""
+{self.tag} 📊 정기 상태 리포트
+
+💰 잔고: ${usdt_balance:.2f}
+📈 포지션: {'있음' if self.position else '없음'}
+"""
+
+        if self.position:
+            status_msg += f"""
+- 방향: {self.position.get('side', 'N/A')}
+- PnL: {self.position.get('pnl_percent', 0):.2f}%
+- 미실현 손익: ${self.position.get('unrealized_pnl', 0):.2f}
+"""
+
+        status_msg += f"""
+⏰ 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+✅ 봇 정상 작동 중
+"""
+        return status_msg
+
+    def run_once(self, loop_count: int, positions: Optional[List[Dict]] = None):
+        """
+        루프 1회분 처리 (분석 → 포지션 확인 → 거래 실행)
+        positions: 미리 조회한 포지션 (없으면 직접 조회)
+        """
+        # 1. 시장 분석 (매 루프)
+        self.logger.debug(f"루프 #{loop_count}: 시장 분석 중...")
+        analysis = self.analyze_market()
+
+        # 2. 포지션 확인
+        self.check_position_status(positions)
+
+        # 3. 거래 신호 확인 및 실행
+        if self.position is None:  # 포지션이 없을 때만
+            if analysis['recommendation'] in ['BUY', 'SELL']:
+                self.logger.info(f"거래 신호 감지: {analysis['recommendation']}")
+                self.logger.info(f"근거 수: {analysis['confluence_count']}")
+
+                # 거래 실행
+                success = self.execute_trade(
+                    analysis['recommendation'],
+                    analysis
+                )
+
+                if success:
+                    self.logger.info("거래 실행 성공")
+                else:
+                    self.logger.debug("거래 실행 조건 미충족")
+        else:
+            self.logger.debug(f"포지션 보유 중... PnL: {self.position.get('pnl_percent', 0):.2f}%")
+
+        return analysis
+
+    def run(self):
+        """메인 실행 루프"""
+        self.logger.info("ObCoin Bot 시작")
+
+        self.notify(f"{self.tag} 🤖 ObCoin Bot 가동 시작")
+
+        loop_count = 0
+        while True:
+            try:
+                loop_count += 1
+
+                # 1~3. 시장 분석 → 포지션 확인 → 거래 신호 실행
+                self.run_once(loop_count)
+
+                # 4. 정기 상태 리포트 (6시간마다)
+                if loop_count % 360 == 0:  # 60초 * 360 = 6시간
+                    self.send_status_report()
+
+                # 5. 대기 (debug 모드가 아니면 상세 로그 생략)
+                if not self.config.debug_mode:
+                    time.sleep(self.config.loop_interval)
+                else:
+                    self.logger.info(f"{self.config.loop_interval}초 대기...")
+                    time.sleep(self.config.loop_interval)
+
+            except KeyboardInterrupt:
+                self.logger.info("사용자 중단 요청")
+                break
+            except Exception as e:
+                self.logger.error(f"메인 루프 오류: {e}")
+                time.sleep(10)
+
+        self.outbox.close()
+        self.logger.info("ObCoin Bot 종료")
@@ -0,0 +1,230 @@
+"""
+ObCoin 파라미터 최적화 - TradingConfig 그리드/랜덤 탐색을 프로세스 풀로 병렬 백테스트
+- 캔들 배열은 공유 메모리(multiprocessing.shared_memory)에 한 번만 올리고
+  워커는 복사/피클 없이 같은 메모리를 DataFrame으로 감싸서 사용
+- 분석 파라미터(ob_min_body_ratio, fvg_min_gap_size)가 같은 설정끼리 묶어서 보내고
+  워커는 구조물 계산 결과를 재사용 (리스크 파라미터만 다른 설정은 재생 루프만 실행)
+- 결과는 순위표(DataFrame)로 정렬
+
+사용법:
+    python optimizer.py BTCUSDT_15m.csv                       # 기본 그리드
+    python optimizer.py BTCUSDT_15m.csv random 500            # 랜덤 500개
+    python optimizer.py BTCUSDT_15m.csv grid 0 result.csv     # 순위표 CSV 저장
+"""
+
+import os
+import sys
+import time
+import random
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from obcoin_bot import TradingConfig
+from backtest import Backtester, load_candles
+
+# 탐색할 TradingConfig 필드 (리스트: 후보값, 튜플: 랜덤 탐색 구간)
+DEFAULT_GRID = {
+    'ob_min_body_ratio': [1.2, 1.4, 1.7, 2.0],
+    'fvg_min_gap_size': [0.0003, 0.0005, 0.001],
+    'min_confluence_count': [2, 3],
+    'trailing_stop_percent': [0.005, 0.01, 0.02],
+    'position_size_percent': [0.1, 0.2, 0.3]
+}
+
+DEFAULT_RANDOM_SPACE = {
+    'ob_min_body_ratio': (1.1, 2.5),
+    'fvg_min_gap_size': (0.0001, 0.002),
+    'min_confluence_count': [2, 3, 4],
+    'trailing_stop_percent': (0.003, 0.03),
+    'position_size_percent': (0.05, 0.5)
+}
+
+# 분석 파라미터 (같으면 워커에서 구조물 재사용 → 정렬/묶음 기준)
+ANALYSIS_KEYS = ('ob_min_body_ratio', 'fvg_min_gap_size')
+COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def grid_search_space(grid: Dict[str, List]) -> List[Dict]:
+    """그리드 탐색 설정 목록 (모든 조합)"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def random_search_space(space: Dict, count: int, seed: int = 42) -> List[Dict]:
+    """
+    랜덤 탐색 설정 목록
+    space 값이 리스트면 그중 하나, (최소, 최대) 튜플이면 구간 균등 분포 (분석 파라미터는 4자리 반올림)
+    """
+    rng = random.Random(seed)
+    params = []
+    for _ in range(count):
+        item = {}
+        for key, candidates in space.items():
+            if isinstance(candidates, tuple):
+                item[key] = round(rng.uniform(*candidates), 4 if key in ANALYSIS_KEYS else 6)
+            else:
+                item[key] = rng.choice(candidates)
+        params.append(item)
+    return params
+
+
+# ==================== 공유 메모리 캔들 ====================
+class SharedCandles:
+    """캔들 배열을 공유 메모리 1블록에 저장 (timestamp int64 n개 + OHLCV float64 n*5개)"""
+
+    def __init__(self, df: pd.DataFrame):
+        n = len(df)
+        self.n = n
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, n * 8 * 6))
+        timestamps, values = self._views(self.shm.buf, n)
+        timestamps[:] = df.index.asi8
+        values[:] = df[COLUMNS].to_numpy(dtype=np.float64)
+
+    @property
+    def spec(self) -> Tuple[str, int]:
+        """워커에 넘길 정보 (공유 메모리 이름, 캔들 수)"""
+        return self.shm.name, self.n
+
+    @staticmethod
+    def _views(buf, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        timestamps = np.ndarray((n,), dtype=np.int64, buffer=buf)
+        values = np.ndarray((n, len(COLUMNS)), dtype=np.float64, buffer=buf, offset=n * 8)
+        return timestamps, values
+
+    @classmethod
+    def attach(cls, spec: Tuple[str, int]) -> Tuple[shared_memory.SharedMemory, pd.DataFrame]:
+        """워커에서 공유 메모리에 붙어서 DataFrame으로 감쌈 (OHLCV 값은 복사하지 않음)"""
+        name, n = spec
+        shm = shared_memory.SharedMemory(name=name)
+        timestamps, values = cls._views(shm.buf, n)
+        values.flags.writeable = False
+        df = pd.DataFrame(values, columns=COLUMNS, index=pd.DatetimeIndex(timestamps.view('datetime64[ns]'),
+                                                                          name='timestamp'), copy=False)
+        return shm, df
+
+    def close(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+# ==================== 워커 ====================
+_worker = {}
+
+
+def _init_worker(spec: Tuple[str, int], base_config: Dict, initial_balance: float):
+    """워커 초기화: 공유 메모리 연결 (프로세스당 1번)"""
+    shm, df = SharedCandles.attach(spec)
+    _worker.update({
+        'shm': shm,  # 참조 유지 (해제되면 버퍼가 닫힘)
+        'candles': df,
+        'base_config': base_config,
+        'initial_balance': initial_balance,
+        'cache': {},
+        'cache_key': None
+    })
+
+
+def _run_one(params: Dict) -> Dict:
+    """설정 1개 백테스트 → 요약 지표"""
+    key = tuple(params.get(name) for name in ANALYSIS_KEYS)
+    if key != _worker['cache_key']:
+        # 분석 파라미터가 바뀌면 이전 구조물 캐시 해제 (메모리 절약)
+        _worker['cache'].clear()
+        _worker['cache_key'] = key
+
+    config = TradingConfig(**{**_worker['base_config'], **params})
+    result = Backtester(config, _worker['initial_balance'], cache=_worker['cache']).run(_worker['candles'])
+
+    summary = result.summary
+    return {
+        **params,
+        'return_pct': summary['return_pct'],
+        'max_drawdown_pct': summary['max_drawdown_pct'],
+        'trades': summary['trades'],
+        'win_rate': summary['win_rate'],
+        'profit_factor': summary['profit_factor'],
+        'final_balance': summary['final_balance'],
+        'fees': summary['fees'],
+        'elapsed': summary['elapsed']
+    }
+
+
+# ==================== 최적화 실행 ====================
+def optimize(candles: pd.DataFrame, params_list: List[Dict], base_config: Optional[TradingConfig] = None,
+             initial_balance: float = 10000.0, workers: Optional[int] = None,
+             sort_by: str = 'return_pct') -> pd.DataFrame:
+    """
+    설정 목록을 병렬 백테스트 후 순위표 반환
+
+    Args:
+        candles: LTF 캔들 DataFrame (backtest.load_candles 형태)
+        params_list: TradingConfig 필드 덮어쓰기 dict 목록 (grid_search_space / random_search_space)
+        base_config: 나머지 필드 기본값
+        workers: 프로세스 수 (없으면 CPU 코어 수)
+        sort_by: 순위 기준 컬럼 (내림차순)
+
+    Returns:
+        순위표 DataFrame (rank 1 = 최고)
+    """
+    base = asdict(base_config or TradingConfig())
+    base['symbols'] = None  # __post_init__이 symbol 기준으로 다시 채움
+    workers = workers or os.cpu_count() or 1
+
+    # 분석 파라미터가 같은 설정끼리 연속 배치 → 워커 캐시 재사용
+    ordered = sorted(params_list, key=lambda p: tuple(p.get(name, 0) for name in ANALYSIS_KEYS))
+    chunksize = max(1, len(ordered) // (workers * 4))
+
+    shared = SharedCandles(candles)
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.spec, base, initial_balance)) as executor:
+            results = list(executor.map(_run_one, ordered, chunksize=chunksize))
+    finally:
+        shared.close()
+
+    table = pd.DataFrame(results).sort_values(sort_by, ascending=False, kind='stable').reset_index(drop=True)
+    table.index = table.index + 1
+    table.index.name = 'rank'
+    return table
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    path = sys.argv[1]
+    mode = sys.argv[2] if len(sys.argv) > 2 else 'grid'
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    output = sys.argv[4] if len(sys.argv) > 4 else None
+
+    candles = load_candles(path)
+    if mode == 'random':
+        params_list = random_search_space(DEFAULT_RANDOM_SPACE, count or 200)
+    else:
+        params_list = grid_search_space(DEFAULT_GRID)
+        if count:
+            params_list = params_list[:count]
+
+    workers = os.cpu_count() or 1
+    print(f"🔍 {os.path.basename(path)} 캔들 {len(candles)}개 / 설정 {len(params_list)}개 / 프로세스 {workers}개")
+
+    started = time.perf_counter()
+    table = optimize(candles, params_list, workers=workers)
+    elapsed = time.perf_counter() - started
+
+    print(f"⏱️ {elapsed:.1f}초 (설정당 {elapsed / len(params_list):.2f}초)")
+    print(table.head(20).to_string(float_format=lambda value: f"{value:.4f}"))
+
+    if output:
+        table.to_csv(output)
+        print(f"💾 순위표 저장: {output}")
+
+if __name__ == "__main__":
+    main()
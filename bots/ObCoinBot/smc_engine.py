@@ -0,0 +1,432 @@
+"""
+SMC 벡터화 분석 엔진
+- SMCAnalyzer의 캔들 단위 루프를 NumPy 배열 연산으로 대체
+- 결과(dict 구조, 순서, 값)는 기존 루프 구현과 동일하게 유지
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    """DataFrame 컬럼을 float64 배열로 변환 (복사 최소화)"""
+    return df[name].to_numpy(dtype=np.float64, copy=False)
+
+
+def order_block_masks(open_: np.ndarray, close: np.ndarray,
+                      min_body_ratio: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    오더블럭 마스크 계산 (반전 캔들 i 기준)
+
+    Returns:
+        (bullish_mask, bearish_mask, strength) - 길이 n 배열
+        i번째 값이 True면 i-1번째 캔들 몸통이 오더블럭
+    """
+    n = len(open_)
+    bullish = np.zeros(n, dtype=bool)
+    bearish = np.zeros(n, dtype=bool)
+    strength = np.zeros(n, dtype=np.float64)
+
+    # 기존 루프와 동일하게 i = 2 ~ n-2 (마지막 진행중 캔들 제외)
+    if n < 4:
+        return bullish, bearish, strength
+
+    cur_o, cur_c = open_[2:n-1], close[2:n-1]
+    prev_o, prev_c = open_[1:n-2], close[1:n-2]
+
+    # 몸통 크기 비율
+    cur_body = np.abs(cur_c - cur_o)
+    prev_body = np.abs(prev_c - prev_o)
+    has_prev = prev_body > 0
+    ratio = np.divide(cur_body, prev_body, out=np.zeros_like(cur_body), where=has_prev)
+    strong = has_prev & (ratio >= min_body_ratio)
+
+    # 상승: [음봉] → [양봉(장대)], 하락: [양봉] → [음봉(장대)]
+    bullish[2:n-1] = (cur_c > cur_o) & (prev_c < prev_o) & (cur_c > prev_o) & strong
+    bearish[2:n-1] = (cur_c < cur_o) & (prev_c > prev_o) & (cur_c < prev_o) & strong
+    strength[2:n-1] = ratio
+
+    return bullish, bearish, strength
+
+
+def detect_order_blocks(df: pd.DataFrame, min_body_ratio: float) -> Tuple[List[Dict], List[Dict]]:
+    """
+    상승/하락 오더블럭을 한 번에 탐지
+
+    Returns:
+        (bullish_obs, bearish_obs) - 기존 detect_order_blocks와 동일한 dict 리스트
+    """
+    open_ = _column(df, 'open')
+    close = _column(df, 'close')
+    bullish, bearish, strength = order_block_masks(open_, close, min_body_ratio)
+
+    index = df.index
+    bullish_obs = [
+        {
+            'type': 'bullish_ob',
+            'top': close[i-1],
+            'bottom': open_[i-1],
+            'time': index[i-1],
+            'strength': strength[i],
+            'touched': False
+        }
+        for i in np.flatnonzero(bullish)
+    ]
+    bearish_obs = [
+        {
+            'type': 'bearish_ob',
+            'top': open_[i-1],
+            'bottom': close[i-1],
+            'time': index[i-1],
+            'strength': strength[i],
+            'touched': False
+        }
+        for i in np.flatnonzero(bearish)
+    ]
+
+    return bullish_obs, bearish_obs
+
+
+def _reached(values: np.ndarray, levels: np.ndarray, below: bool, inclusive: bool) -> np.ndarray:
+    """값이 레벨에 도달했는지 (방향/등호 포함 여부)"""
+    if below:
+        return values <= levels if inclusive else values < levels
+    return values >= levels if inclusive else values > levels
+
+
+def first_crossing(series: np.ndarray, starts: np.ndarray, levels: np.ndarray,
+                   below: bool = True, inclusive: bool = True) -> np.ndarray:
+    """
+    각 시작 위치 이후 series가 처음으로 level에 도달한 위치 (없으면 -1)
+    below=True: series <= level, below=False: series >= level
+    inclusive=False면 같은 값은 도달로 보지 않음 (<, >)
+
+    구간 최소/최대 누적 테이블(2^k 구간)을 만든 뒤 모든 질의를 동시에
+    이진 점프로 처리 → 파이썬 루프 없이 O(n log n)
+    """
+    n = len(series)
+    pos = np.asarray(starts, dtype=np.int64).copy()
+    levels = np.asarray(levels, dtype=np.float64)
+    if n == 0 or len(pos) == 0:
+        return np.full(len(pos), -1, dtype=np.int64)
+
+    # tables[k][j] = series[j : j + 2^k] 구간의 최소(최대)값
+    reduce = np.minimum if below else np.maximum
+    tables = [series]
+    width = 1
+    while width * 2 <= n:
+        prev = tables[-1]
+        tables.append(reduce(prev[:-width], prev[width:]))
+        width *= 2
+
+    # 큰 구간부터 "아직 도달하지 않은 구간"을 건너뜀
+    for k in range(len(tables) - 1, -1, -1):
+        table = tables[k]
+        valid = pos < len(table)
+        values = table[np.where(valid, pos, 0)]
+        pos = np.where(valid & ~_reached(values, levels, below, inclusive), pos + (1 << k), pos)
+
+    found = pos < n
+    values = series[np.where(found, pos, 0)]
+    reached = _reached(values, levels, below, inclusive)
+    return np.where(found & reached, pos, -1)
+
+
+def fvg_masks(high: np.ndarray, low: np.ndarray,
+              min_gap_size: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    FVG 마스크 계산 (세 번째 캔들 i 기준, shift된 고가/저가 배열 비교)
+
+    Returns:
+        (bullish_mask, bearish_mask, bullish_size, bearish_size) - 길이 n 배열
+    """
+    n = len(high)
+    bullish = np.zeros(n, dtype=bool)
+    bearish = np.zeros(n, dtype=bool)
+    bullish_size = np.zeros(n, dtype=np.float64)
+    bearish_size = np.zeros(n, dtype=np.float64)
+
+    if n < 3:
+        return bullish, bearish, bullish_size, bearish_size
+
+    # 상승 FVG: 1번 캔들 고가 < 3번 캔들 저가
+    top, bottom = low[2:], high[:-2]
+    has_gap = top > bottom
+    size = np.divide(top - bottom, bottom, out=np.zeros_like(top), where=has_gap)
+    bullish[2:] = has_gap & (size >= min_gap_size)
+    bullish_size[2:] = size
+
+    # 하락 FVG: 1번 캔들 저가 > 3번 캔들 고가
+    top, bottom = low[:-2], high[2:]
+    has_gap = top > bottom
+    size = np.divide(top - bottom, bottom, out=np.zeros_like(top), where=has_gap)
+    bearish[2:] = has_gap & (size >= min_gap_size)
+    bearish_size[2:] = size
+
+    return bullish, bearish, bullish_size, bearish_size
+
+
+def detect_fvgs(df: pd.DataFrame, min_gap_size: float,
+                include_last: bool = False) -> Tuple[List[Dict], List[Dict]]:
+    """
+    상승/하락 FVG를 한 번에 탐지하고 이후 캔들로 채워졌는지 계산
+
+    채움 기준 (갭 전체를 되돌림):
+        상승 FVG - 이후 캔들 저가 <= 갭 하단
+        하락 FVG - 이후 캔들 고가 >= 갭 상단
+    include_last: False면 마지막(진행중) 캔들은 채움 판정에서 제외
+
+    Returns:
+        (bullish_fvgs, bearish_fvgs) - 기존 dict + 'filled_time' (미채움이면 None)
+    """
+    high = _column(df, 'high')
+    low = _column(df, 'low')
+    bullish, bearish, bullish_size, bearish_size = fvg_masks(high, low, min_gap_size)
+
+    index = df.index
+    end = len(df) if include_last else len(df) - 1
+
+    # 상승 FVG: 갭 하단(1번 캔들 고가)까지 저가가 내려오면 채움
+    bull_idx = np.flatnonzero(bullish)
+    bull_fill = first_crossing(low[:end], bull_idx + 1, high[bull_idx - 2], below=True)
+
+    # 하락 FVG: 갭 상단(1번 캔들 저가)까지 고가가 올라오면 채움
+    bear_idx = np.flatnonzero(bearish)
+    bear_fill = first_crossing(high[:end], bear_idx + 1, low[bear_idx - 2], below=False)
+
+    bullish_fvgs = [
+        {
+            'type': 'bullish_fvg',
+            'top': low[i],
+            'bottom': high[i-2],
+            'time': index[i-1],
+            'size': bullish_size[i],
+            'filled': bool(fill >= 0),
+            'filled_time': index[fill] if fill >= 0 else None
+        }
+        for i, fill in zip(bull_idx, bull_fill)
+    ]
+    bearish_fvgs = [
+        {
+            'type': 'bearish_fvg',
+            'top': low[i-2],
+            'bottom': high[i],
+            'time': index[i-1],
+            'size': bearish_size[i],
+            'filled': bool(fill >= 0),
+            'filled_time': index[fill] if fill >= 0 else None
+        }
+        for i, fill in zip(bear_idx, bear_fill)
+    ]
+
+    return bullish_fvgs, bearish_fvgs
+
+
+def rolling_prior_extremes(high: np.ndarray, low: np.ndarray,
+                           lookback: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    직전 lookback개 캔들의 최고가/최저가 (현재 캔들 제외, 부족하면 NaN)
+    pandas rolling은 단조 deque 방식이라 lookback과 무관하게 O(n)
+    """
+    prior_high = pd.Series(high).rolling(lookback).max().shift(1).to_numpy()
+    prior_low = pd.Series(low).rolling(lookback).min().shift(1).to_numpy()
+    return prior_high, prior_low
+
+
+def detect_liquidity_sweeps(df: pd.DataFrame, lookbacks: List[int]) -> List[Dict]:
+    """
+    유동성 스윕 탐지 (여러 lookback 동시 평가)
+
+    Returns:
+        시간순 스윕 dict 리스트 - 기존 dict + 'lookback'
+        같은 캔들에서는 lookbacks 순서, bullish → bearish 순
+    """
+    high = _column(df, 'high')
+    low = _column(df, 'low')
+    close = _column(df, 'close')
+    index = df.index
+
+    rows, orders, kinds, levels, wicks, used = [], [], [], [], [], []
+
+    for order, lookback in enumerate(lookbacks):
+        if lookback >= len(df):
+            continue
+        swing_high, swing_low = rolling_prior_extremes(high, low, lookback)
+
+        # 상방 유동성 스윕 (고점 돌파 후 하락) - NaN 비교는 False
+        bull = np.flatnonzero((high > swing_high) & (close < swing_high))
+        # 하방 유동성 스윕 (저점 돌파 후 상승)
+        bear = np.flatnonzero((low < swing_low) & (close > swing_low))
+
+        rows += [bull, bear]
+        orders += [np.full(len(bull), order), np.full(len(bear), order)]
+        kinds += [np.zeros(len(bull), dtype=np.int64), np.ones(len(bear), dtype=np.int64)]
+        levels += [swing_high[bull], swing_low[bear]]
+        wicks += [(high[bull] - close[bull]) / close[bull],
+                  (close[bear] - low[bear]) / low[bear]]
+        used += [np.full(len(bull), lookback), np.full(len(bear), lookback)]
+
+    if not rows:
+        return []
+
+    rows = np.concatenate(rows)
+    orders = np.concatenate(orders)
+    kinds = np.concatenate(kinds)
+    levels = np.concatenate(levels)
+    wicks = np.concatenate(wicks)
+    used = np.concatenate(used)
+
+    # 캔들 → lookback → 방향 순 정렬
+    sort = np.lexsort((kinds, orders, rows))
+
+    return [
+        {
+            'type': 'bullish_sweep' if kinds[k] == 0 else 'bearish_sweep',
+            'level': levels[k],
+            'time': index[rows[k]],
+            'wick_size': wicks[k],
+            'lookback': int(used[k])
+        }
+        for k in sort
+    ]
+
+
+def swing_points(high: np.ndarray, low: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    로컬 고점/저점 위치 (centered rolling 최고/최저가)
+    i번째 캔들이 [i-window, i+window) 구간의 최고가(최저가)와 같으면 스윙 포인트
+
+    Returns:
+        (swing_high_idx, swing_low_idx)
+    """
+    n = len(high)
+    if n < 2 * window + 1:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+
+    # rolling(2w)[k] = [k-2w+1, k] 구간 → i+w-1 위치 값이 i 중심 구간
+    span = 2 * window
+    high_max = pd.Series(high).rolling(span).max().to_numpy()[span-1:]
+    low_min = pd.Series(low).rolling(span).min().to_numpy()[span-1:]
+
+    # 후보: i = window ~ n-window-1 (→ rolling 위치 i-window)
+    centers = np.arange(window, n - window)
+    swing_high_idx = centers[high[centers] == high_max[centers - window]]
+    swing_low_idx = centers[low[centers] == low_min[centers - window]]
+
+    return swing_high_idx, swing_low_idx
+
+
+def classify_breaks(breaks: List[Tuple], direction: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    """
+    구조 돌파 목록 → BOS / CHoCH 이벤트
+    - 기존 방향과 같은 쪽 돌파: BOS (Break of Structure)
+    - 기존 방향과 반대 쪽 돌파: CHoCH (Change of Character)
+    같은 캔들에서 여러 스윙을 동시에 돌파하면 가장 바깥 레벨 1건만 기록
+
+    Args:
+        breaks: (돌파 시각, 'bullish'/'bearish', 레벨, 스윙 시각) 리스트
+        direction: 직전까지의 구조 방향 (이어서 계산할 때 사용)
+
+    Returns:
+        (events, 마지막 방향)
+    """
+    outermost = {}
+    for at, side, level, swing_time in breaks:
+        key = (at, side)
+        if key not in outermost:
+            outermost[key] = (level, swing_time)
+        elif level > outermost[key][0] if side == 'bullish' else level < outermost[key][0]:
+            outermost[key] = (level, swing_time)
+
+    events = []
+    for (at, side), (level, swing_time) in sorted(outermost.items()):
+        events.append({
+            'type': 'CHoCH' if direction is not None and direction != side else 'BOS',
+            'direction': side,
+            'level': level,
+            'swing_time': swing_time,
+            'time': at
+        })
+        direction = side
+
+    return events, direction
+
+
+def structure_breaks(close: np.ndarray, index: pd.Index,
+                     swing_high_idx: np.ndarray, swing_high_price: np.ndarray,
+                     swing_low_idx: np.ndarray, swing_low_price: np.ndarray) -> List[Dict]:
+    """
+    BOS / CHoCH 이벤트 계산
+    스윙 고점(저점)을 처음으로 종가가 넘어선(이탈한) 캔들이 구조 돌파 시점
+    """
+    up = first_crossing(close, swing_high_idx + 1, swing_high_price, below=False, inclusive=False)
+    down = first_crossing(close, swing_low_idx + 1, swing_low_price, below=True, inclusive=False)
+
+    breaks = [(index[at], 'bullish', level, index[swing])
+              for at, level, swing in zip(up, swing_high_price, swing_high_idx) if at >= 0]
+    breaks += [(index[at], 'bearish', level, index[swing])
+               for at, level, swing in zip(down, swing_low_price, swing_low_idx) if at >= 0]
+
+    events, _ = classify_breaks(breaks)
+    return events
+
+
+def market_structure(df: pd.DataFrame, window: int, include_last: bool = False) -> Dict:
+    """
+    시장 구조 분석 (스윙 포인트 + HH/HL/LH/LL + BOS/CHoCH)
+    include_last: False면 마지막(진행중) 캔들 종가는 돌파 판정에서 제외
+
+    Returns:
+        기존 calculate_market_structure 결과 + 'sequence', 'events', 'last_event'
+    """
+    high = _column(df, 'high')
+    low = _column(df, 'low')
+    close = _column(df, 'close')
+    index = df.index
+
+    high_idx, low_idx = swing_points(high, low, window)
+    highs = [{'price': high[i], 'index': int(i)} for i in high_idx]
+    lows = [{'price': low[i], 'index': int(i)} for i in low_idx]
+
+    # 추세 판단 (기존 로직 그대로)
+    trend = 'neutral'
+    if len(highs) >= 2 and len(lows) >= 2:
+        # HH-HL: 상승 추세
+        if (highs[-1]['price'] > highs[-2]['price'] and
+            lows[-1]['price'] > lows[-2]['price']):
+            trend = 'bullish'
+        # LH-LL: 하락 추세
+        elif (highs[-1]['price'] < highs[-2]['price'] and
+              lows[-1]['price'] < lows[-2]['price']):
+            trend = 'bearish'
+
+    # HH/LH, HL/LL 라벨 (직전 같은 종류 스윙 대비, 같으면 EH/EL)
+    sequence = []
+    for i in range(1, len(highs)):
+        prev, cur = highs[i-1]['price'], highs[i]['price']
+        label = 'HH' if cur > prev else 'LH' if cur < prev else 'EH'
+        sequence.append({'label': label, 'price': cur, 'index': highs[i]['index'],
+                         'time': index[highs[i]['index']]})
+    for i in range(1, len(lows)):
+        prev, cur = lows[i-1]['price'], lows[i]['price']
+        label = 'HL' if cur > prev else 'LL' if cur < prev else 'EL'
+        sequence.append({'label': label, 'price': cur, 'index': lows[i]['index'],
+                         'time': index[lows[i]['index']]})
+    sequence.sort(key=lambda s: s['index'])
+
+    end = len(df) if include_last else len(df) - 1
+    events = structure_breaks(close[:end], index,
+                              high_idx, high[high_idx], low_idx, low[low_idx])
+
+    return {
+        'trend': trend,
+        'highs': highs[-3:] if highs else [],
+        'lows': lows[-3:] if lows else [],
+        'last_swing_high': highs[-1]['price'] if highs else None,
+        'last_swing_low': lows[-1]['price'] if lows else None,
+        'sequence': sequence,
+        'events': events,
+        'last_event': events[-1] if events else None
+    }
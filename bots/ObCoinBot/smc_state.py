@@ -0,0 +1,272 @@
+"""
+SMC 증분 분석 상태
+- 루프마다 전체 재계산하지 않고, 새로 마감된 캔들이 영향을 주는 꼬리 구간만 다시 계산
+- 탐지된 오더블럭/FVG/스윕/스윙을 루프 간 유지 → touched/filled 플래그가 계속 살아있음
+
+캔들 DataFrame의 마지막 행은 진행중(미마감) 캔들이라고 가정 (ccxt fetch_ohlcv 기본 동작)
+진행중 캔들로 만들어진 구조물은 '임시'로만 반환하고, 마감되면 확정 목록에 추가
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+import smc_engine
+
+
+class TimeframeState:
+    """타임프레임 하나의 누적 SMC 구조물"""
+
+    # 확정 구조물 최대 보관 개수 (오래된 것부터 삭제)
+    MAX_ITEMS = 100
+
+    def __init__(self, ob_min_body_ratio: float, fvg_min_gap_size: float,
+                 sweep_lookbacks: List[int], structure_window: int):
+        self.ob_min_body_ratio = ob_min_body_ratio
+        self.fvg_min_gap_size = fvg_min_gap_size
+        self.sweep_lookbacks = sweep_lookbacks
+        self.structure_window = structure_window
+
+        # 꼬리 재계산 시 앞쪽으로 더 포함할 캔들 수
+        self.margin = max(3, max(sweep_lookbacks) + 1, 2 * structure_window + 2)
+
+        self.last_closed = None  # 마지막으로 반영한 마감 캔들 시각
+
+        # 확정 구조물
+        self.bullish_obs: List[Dict] = []
+        self.bearish_obs: List[Dict] = []
+        self.bullish_fvgs: List[Dict] = []
+        self.bearish_fvgs: List[Dict] = []
+        self.sweeps: List[Dict] = []
+        self.swing_highs: List[Dict] = []
+        self.swing_lows: List[Dict] = []
+        self.events: List[Dict] = []
+        self.direction: Optional[str] = None
+        self._swing_times = set()
+
+        # 진행중 캔들 기준 임시 구조물 (type, time) → dict
+        self.provisional: Dict = {}
+
+    def update(self, df: pd.DataFrame) -> Dict:
+        """
+        새 캔들 반영 후 현재 구조물 반환
+
+        Returns:
+            {'order_blocks', 'fvgs', 'liquidity_sweeps', 'market_structure'}
+            - SMCAnalyzer.analyze_frame과 같은 형태
+        """
+        n = len(df)
+        index = df.index
+        if n < 2:
+            return self.snapshot([], [])
+
+        # 새로 마감된 첫 캔들 위치 (마감 캔들: 0 ~ n-2, 진행중: n-1)
+        first_new = 0 if self.last_closed is None else int(index.searchsorted(self.last_closed, side='right'))
+        first_new = min(first_new, n - 1)
+        start = max(0, first_new - self.margin)
+        tail = df.iloc[start:]
+
+        def anchors(records: List[Dict], offset: int) -> np.ndarray:
+            """구조물 시각 → 해당 구조물을 만든 캔들 위치"""
+            times = pd.Index([r['time'] for r in records])
+            return start + tail.index.searchsorted(times) + offset
+
+        # 기존 미채움 FVG는 새 마감 캔들로만 채움 여부 갱신
+        new_closed = df.iloc[first_new:n-1]
+        if len(new_closed):
+            self._update_fills(new_closed)
+
+        # 스윙 포인트: 구간 전체가 마감 캔들이어야 후보가 되므로 항상 확정
+        self._add_swings(tail)
+        if len(new_closed):
+            self._update_structure_breaks(new_closed)
+
+        provisional = {}
+
+        # 오더블럭: 반전 캔들(i) 마감 시 확정 (엔진이 진행중 캔들은 제외)
+        bullish_obs, bearish_obs = smc_engine.detect_order_blocks(tail, self.ob_min_body_ratio)
+        for records, target in ((bullish_obs, self.bullish_obs), (bearish_obs, self.bearish_obs)):
+            for record, at in zip(records, anchors(records, 1)):
+                if at >= first_new:
+                    target.append(record)
+
+        # FVG: 3번 캔들(i) 마감 시 확정, 진행중이면 임시
+        bullish_fvgs, bearish_fvgs = smc_engine.detect_fvgs(tail, self.fvg_min_gap_size)
+        for records, target in ((bullish_fvgs, self.bullish_fvgs), (bearish_fvgs, self.bearish_fvgs)):
+            for record, at in zip(records, anchors(records, 1)):
+                if at == n - 1:
+                    provisional[(record['type'], record['time'])] = record
+                elif at >= first_new:
+                    target.append(self._carry_flags(record))
+
+        # 유동성 스윕: 해당 캔들(i) 마감 시 확정
+        sweeps = smc_engine.detect_liquidity_sweeps(tail, self.sweep_lookbacks)
+        for record, at in zip(sweeps, anchors(sweeps, 0)):
+            if at == n - 1:
+                provisional[(record['type'], record['time'], record['lookback'])] = record
+            elif at >= first_new:
+                self.sweeps.append(record)
+
+        # 임시 구조물은 같은 키면 이전 dict를 재사용 (플래그 유지)
+        for key, record in provisional.items():
+            previous = self.provisional.get(key)
+            if previous is not None:
+                previous.update({k: v for k, v in record.items() if k not in ('touched', 'filled')})
+                provisional[key] = previous
+        self.provisional = provisional
+
+        self.last_closed = index[n - 2]
+        self._trim()
+
+        return self.snapshot(
+            [r for r in provisional.values() if r['type'].endswith('_fvg')],
+            [r for r in provisional.values() if r['type'].endswith('_sweep')]
+        )
+
+    def _carry_flags(self, record: Dict) -> Dict:
+        """임시였던 구조물이 확정되면 플래그 이어받기"""
+        previous = self.provisional.get((record['type'], record['time']))
+        if previous is not None and previous.get('filled'):
+            record['filled'] = True
+        return record
+
+    def _update_fills(self, new_closed: pd.DataFrame):
+        """미채움 FVG를 새 마감 캔들로 채움 판정"""
+        index = new_closed.index
+        for fvgs, column, level_key, below in ((self.bullish_fvgs, 'low', 'bottom', True),
+                                               (self.bearish_fvgs, 'high', 'top', False)):
+            open_fvgs = [fvg for fvg in fvgs if not fvg['filled']]
+            if not open_fvgs:
+                continue
+            levels = np.array([fvg[level_key] for fvg in open_fvgs])
+            fills = smc_engine.first_crossing(
+                new_closed[column].to_numpy(dtype=np.float64),
+                np.zeros(len(open_fvgs), dtype=np.int64), levels, below=below)
+            for fvg, fill in zip(open_fvgs, fills):
+                if fill >= 0:
+                    fvg['filled'] = True
+                    fvg['filled_time'] = index[fill]
+
+    def _update_structure_breaks(self, new_closed: pd.DataFrame):
+        """미돌파 스윙을 새 마감 캔들 종가로 돌파 판정 → BOS/CHoCH 이벤트 추가"""
+        close = new_closed['close'].to_numpy(dtype=np.float64)
+        index = new_closed.index
+        breaks = []
+
+        for swings, side, below in ((self.swing_highs, 'bullish', False),
+                                    (self.swing_lows, 'bearish', True)):
+            open_swings = [swing for swing in swings if swing['broken_time'] is None]
+            if not open_swings:
+                continue
+            levels = np.array([swing['price'] for swing in open_swings])
+            # 스윙 이후 캔들부터 판정 (첫 분석 시에는 과거 스윙도 함께 들어옴)
+            starts = index.searchsorted(pd.Index([swing['time'] for swing in open_swings]), side='right')
+            hits = smc_engine.first_crossing(close, starts, levels, below=below, inclusive=False)
+            for swing, hit in zip(open_swings, hits):
+                if hit >= 0:
+                    swing['broken_time'] = index[hit]
+                    breaks.append((index[hit], side, swing['price'], swing['time']))
+
+        events, self.direction = smc_engine.classify_breaks(breaks, self.direction)
+        self.events.extend(events)
+
+    def _add_swings(self, tail: pd.DataFrame):
+        """꼬리 구간에서 새로 확정된 스윙 포인트 추가"""
+        high = tail['high'].to_numpy(dtype=np.float64)
+        low = tail['low'].to_numpy(dtype=np.float64)
+        high_idx, low_idx = smc_engine.swing_points(high, low, self.structure_window)
+
+        for idx, prices, target, kind in ((high_idx, high, self.swing_highs, 'high'),
+                                          (low_idx, low, self.swing_lows, 'low')):
+            for i in idx:
+                time = tail.index[i]
+                if (kind, time) in self._swing_times:
+                    continue
+                self._swing_times.add((kind, time))
+                target.append({'price': prices[i], 'time': time, 'broken_time': None})
+            target.sort(key=lambda swing: swing['time'])
+
+    def _trim(self):
+        """오래된 확정 구조물 정리"""
+        for name in ('bullish_obs', 'bearish_obs', 'bullish_fvgs', 'bearish_fvgs',
+                     'sweeps', 'swing_highs', 'swing_lows', 'events'):
+            items = getattr(self, name)
+            if len(items) > self.MAX_ITEMS:
+                del items[:len(items) - self.MAX_ITEMS]
+        if len(self._swing_times) > 4 * self.MAX_ITEMS:
+            self._swing_times = {('high', s['time']) for s in self.swing_highs}
+            self._swing_times |= {('low', s['time']) for s in self.swing_lows}
+
+    def market_structure(self) -> Dict:
+        """누적 스윙 기반 시장 구조 (calculate_market_structure와 같은 키)"""
+        highs, lows = self.swing_highs, self.swing_lows
+
+        trend = 'neutral'
+        if len(highs) >= 2 and len(lows) >= 2:
+            # HH-HL: 상승 추세
+            if (highs[-1]['price'] > highs[-2]['price'] and
+                lows[-1]['price'] > lows[-2]['price']):
+                trend = 'bullish'
+            # LH-LL: 하락 추세
+            elif (highs[-1]['price'] < highs[-2]['price'] and
+                  lows[-1]['price'] < lows[-2]['price']):
+                trend = 'bearish'
+
+        sequence = []
+        for swings, up, down, equal in ((highs, 'HH', 'LH', 'EH'), (lows, 'HL', 'LL', 'EL')):
+            for prev, cur in zip(swings, swings[1:]):
+                label = up if cur['price'] > prev['price'] else down if cur['price'] < prev['price'] else equal
+                sequence.append({'label': label, 'price': cur['price'], 'time': cur['time']})
+        sequence.sort(key=lambda s: s['time'])
+
+        return {
+            'trend': trend,
+            'highs': [{'price': s['price'], 'time': s['time']} for s in highs[-3:]],
+            'lows': [{'price': s['price'], 'time': s['time']} for s in lows[-3:]],
+            'last_swing_high': highs[-1]['price'] if highs else None,
+            'last_swing_low': lows[-1]['price'] if lows else None,
+            'sequence': sequence,
+            'events': list(self.events),
+            'last_event': self.events[-1] if self.events else None
+        }
+
+    def snapshot(self, provisional_fvgs: List[Dict], provisional_sweeps: List[Dict]) -> Dict:
+        """확정 + 임시 구조물 (dict 객체는 상태와 공유 → 플래그 변경이 유지됨)"""
+        return {
+            'order_blocks': {
+                'bullish': list(self.bullish_obs),
+                'bearish': list(self.bearish_obs)
+            },
+            'fvgs': {
+                'bullish': self.bullish_fvgs + [f for f in provisional_fvgs if f['type'] == 'bullish_fvg'],
+                'bearish': self.bearish_fvgs + [f for f in provisional_fvgs if f['type'] == 'bearish_fvg']
+            },
+            'liquidity_sweeps': self.sweeps + provisional_sweeps,
+            'market_structure': self.market_structure()
+        }
+
+
+class SMCState:
+    """타임프레임별 증분 분석 상태 모음"""
+
+    def __init__(self, config):
+        self.config = config
+        self.frames: Dict[str, TimeframeState] = {}
+
+    def update(self, tf_name: str, df: pd.DataFrame) -> Dict:
+        """타임프레임 캔들 반영 후 구조물 반환"""
+        if tf_name not in self.frames:
+            self.frames[tf_name] = TimeframeState(
+                self.config.ob_min_body_ratio,
+                self.config.fvg_min_gap_size,
+                self.config.sweep_lookbacks,
+                self.config.structure_windows.get(tf_name, 50)
+            )
+        return self.frames[tf_name].update(df)
+
+    def reset(self, tf_name: Optional[str] = None):
+        """상태 초기화 (tf_name 없으면 전체)"""
+        if tf_name is None:
+            self.frames.clear()
+        else:
+            self.frames.pop(tf_name, None)
@@ -0,0 +1,145 @@
+"""
+코스피/코스닥 시총 상위 기업 리스트 한번에 생성
+- 기준일 전종목 시세 1번 (로컬 KRX 저장소, 없으면 KRX ALL 1번 조회 후 저장)으로 두 시장 모두 처리
+- 시총 필터/정렬/순위는 pandas 벡터 연산 (종목별 조회/대기 없음)
+- kospi_top_companies.csv / kosdaq_top_companies.csv 저장
+
+사용법:
+    python MarketCapList.py                 # 코스피 + 코스닥
+    python MarketCapList.py KOSDAQ          # 코스닥만
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Argos 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.KrxService.krx_warehouse import get_warehouse
+
+MARKET_NAMES = {'KOSPI': '코스피', 'KOSDAQ': '코스닥'}
+
+
+def get_latest_trading_day():
+    """최근 거래일 구하기"""
+    today = datetime.now()
+
+    # 주말이면 금요일로
+    if today.weekday() == 5:  # 토요일
+        return (today - timedelta(days=1)).strftime('%Y%m%d')
+    elif today.weekday() == 6:  # 일요일
+        return (today - timedelta(days=2)).strftime('%Y%m%d')
+    else:
+        # 평일이면 오늘 or 어제 (장 마감 전후 체크)
+        if today.hour < 16:  # 장 마감 전이면 어제
+            return (today - timedelta(days=1)).strftime('%Y%m%d')
+        else:
+            return today.strftime('%Y%m%d')
+
+
+def rank_market_caps(snapshot, min_market_cap=100_000_000_000, top_n=500):
+    """
+    전종목 시세 → 시총 상위 기업 (벡터 연산)
+
+    Args:
+        snapshot: GetMarketSnapshot 형태 DataFrame (티커 인덱스, 종목명/시가총액 컬럼)
+        min_market_cap: 최소 시가총액 (기본: 1000억원)
+        top_n: 상위 N개 기업 (기본: 500개)
+
+    Returns:
+        DataFrame with columns: rank, ticker, name, market_cap_억
+    """
+    eligible = snapshot[snapshot['시가총액'] >= min_market_cap]
+    top = eligible.sort_values('시가총액', ascending=False, kind='stable').head(top_n)
+
+    return pd.DataFrame({
+        'rank': np.arange(1, len(top) + 1),
+        'ticker': top.index.to_numpy(),
+        'name': top['종목명'].to_numpy(),
+        'market_cap_억': np.round(top['시가총액'].to_numpy() / 100_000_000).astype(np.int64)  # 억 단위
+    })
+
+
+def get_top_companies(markets: Sequence[str] = ('KOSPI', 'KOSDAQ'), target_date: Optional[str] = None,
+                      min_market_cap=100_000_000_000, top_n=500) -> Dict[str, pd.DataFrame]:
+    """
+    시장별 시총 상위 기업 (전종목 시세 1번으로 여러 시장)
+
+    Returns:
+        {시장: DataFrame(rank, ticker, name, market_cap_억)}
+    """
+    target_date = target_date or get_latest_trading_day()
+    print(f"📅 기준일: {target_date}")
+
+    snapshot = get_warehouse().snapshot(target_date, 'ALL')
+    print(f"📡 전종목 시세 {len(snapshot)}개")
+
+    result = {}
+    for market in markets:
+        market = market.upper()
+        market_rows = snapshot[snapshot['시장'] == market]
+        df = rank_market_caps(market_rows, min_market_cap, top_n)
+        print(f"📌 {MARKET_NAMES.get(market, market)} {len(market_rows)}개 종목 → 시총 {min_market_cap / 100_000_000:,.0f}억 이상 {len(df)}개")
+        result[market] = df
+    return result
+
+
+def save_to_csv(df, filename):
+    """DataFrame을 CSV로 저장"""
+
+    if df.empty:
+        print("❌ 저장할 데이터가 없습니다.")
+        return
+
+    # 현재 스크립트의 디렉토리 경로 가져오기
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    filepath = os.path.join(current_dir, filename)
+
+    # CSV 저장
+    df.to_csv(filepath, index=False, encoding='utf-8-sig')
+    print(f"💾 파일 저장 완료: {filepath}")
+
+    # 상위 10개 미리보기
+    print("\n📊 상위 10개 기업:")
+    print("-" * 60)
+    for idx, row in df.head(10).iterrows():
+        print(f"{row['rank']:3d}위 | {row['ticker']} | {row['name']:20s} | {row['market_cap_억']:,}억원")
+
+
+def print_stats(df):
+    """통계 출력"""
+    print("\n📈 통계:")
+    print(f"  - 총 기업 수: {len(df)}개")
+    print(f"  - 최대 시총: {df['market_cap_억'].max():,}억원")
+    print(f"  - 최소 시총: {df['market_cap_억'].min():,}억원")
+    print(f"  - 평균 시총: {df['market_cap_억'].mean():,.0f}억원")
+
+
+def main():
+    """메인 실행 함수"""
+    markets = [market.upper() for market in sys.argv[1:]] or ['KOSPI', 'KOSDAQ']
+
+    print("=" * 60)
+    print(f"🚀 {'/'.join(MARKET_NAMES.get(m, m) for m in markets)} 시총 상위 기업 리스트 생성기")
+    print("=" * 60)
+
+    for market, df in get_top_companies(markets).items():
+        print(f"\n🏷️ {MARKET_NAMES.get(market, market)}")
+        if df.empty:
+            print("❌ 조건에 맞는 기업이 없습니다.")
+            continue
+        save_to_csv(df, f"{market.lower()}_top_companies.csv")
+        print_stats(df)
+
+    print("\n" + "=" * 60)
+    print("✨ 작업 완료!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """
 상따봇 (SangddaBot) - 코스닥 상한가 추적 봇
 실행하면 코스닥 상한가 종목을 찾아 Slack으로 알림 -> 사용자가 따로 스케줄러로 매일 자동실행 시킬거임
+상한가 검사는 전종목 시세 1번 조회 + 벡터 계산 (SANGDDA_SCAN=ticker 이면 기존 종목별 조회)
+SANGDDA_MARKETS=KOSDAQ,KOSPI 로 코스피도 같이 검사 (시장별 *_top_companies.csv 종목만)
 """
 
 import os
@@ -16,9 +18,12 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 
 # 공통 서비스 import
 from services.SlackService import slack
-from services.SimpleGoogleSheetService import Send
+from services.SimpleGoogleSheetService import SendRows
 from services.DartService.dart_service import GetDartData
 from services.KrxService.krx_simple import GetKrxWarnings
+from services.KrxService.krx_history import MarketHistory
+from services.KrxService.krx_warehouse import get_warehouse
+from services.KrxService.krx_price_limit import ClassifyPriceLimits
 
 # .env 파일 로드
 load_dotenv()
@@ -31,6 +36,10 @@ class SangddaBot:
         """초기화"""
         self.current_dir = os.path.dirname(os.path.abspath(__file__))
         self.csv_path = os.path.join(self.current_dir, 'kosdaq_top_companies.csv')
+        self.markets = [m.strip().upper() for m in os.getenv('SANGDDA_MARKETS', 'KOSDAQ').split(',') if m.strip()]
+        self.scan_mode = os.getenv('SANGDDA_SCAN', 'market')  # market: 전종목 1번 조회 / ticker: 종목별 조회
+        # 날짜별 전종목 시세 (상한가 검사 + 10거래일 이력) - 로컬 KRX 저장소에 없는 날만 조회
+        self.history = MarketHistory(fetch=get_warehouse().snapshot)
         self.slack_webhook = os.getenv('SLACK_WEBHOOK')
         self.sheet_id = os.getenv('GOOGLE_SHEET_ID')  # 상한가 시트 ID
         self.sheet_name = os.getenv('GOOGLE_SHEET_NAME_3', '상한가')  # 상한가 시트명 (기본값: 상한가)
@@ -49,75 +58,42 @@ class SangddaBot:
             # (pykrx는 장 마감 후 약 30분~1시간 후부터 데이터 제공)
             return today.strftime('%Y%m%d')
 
-    def get_limit_up_price(self, prev_close):
-        """정확한 상한가 가격 계산"""
-        theoretical = prev_close * 1.3
-
-        # 호가 단위 적용
-        if theoretical < 1000:
-            tick = 1
-        elif theoretical < 5000:
-            tick = 5
-        elif theoretical < 10000:
-            tick = 10
-        elif theoretical < 50000:
-            tick = 50
-        elif theoretical < 100000:
-            tick = 100
-        elif theoretical < 500000:
-            tick = 500
-        else:
-            tick = 1000
-
-        # 호가 단위로 내림
-        return int(theoretical // tick) * tick
-
-    def is_limit_up(self, prev_close, current_price):
-        """상한가 여부 판별"""
-        limit_price = self.get_limit_up_price(prev_close)
-        return current_price == limit_price
-
-    def get_price_history(self, ticker, end_date, days=10):
-        """10거래일 가격 변동률 가져오기 (오늘 제외, 어제부터)"""
+    def load_histories(self, tickers, end_date, days=10):
+        """
+        여러 종목 10거래일 가격 변동률 + 상한가 여부 (오늘 제외, 어제부터)
+        거래일마다 전종목 시세 1번 (캐시) → 종목 수와 무관하게 요청 수 = 거래일 수
+        """
         try:
-            # 어제부터 시작 (오늘 제외)
-            yesterday = (datetime.strptime(end_date, '%Y%m%d') - timedelta(days=1)).strftime('%Y%m%d')
-            # 충분한 기간 설정 (주말 포함 고려, 20일 정도)
-            start_date = (datetime.strptime(yesterday, '%Y%m%d') - timedelta(days=20)).strftime('%Y%m%d')
-
-            # 어제까지의 데이터만 가져오기
-            df = stock.get_market_ohlcv(start_date, yesterday, ticker)
-
-            if len(df) < 2:
-                return []
-
-            # 최근 11거래일 데이터 사용 (10일 등락률 계산용)
-            df = df.tail(11)
-
-            # 등락률 계산 (역순으로 D-1부터 D-10까지)
-            history = []
-            for i in range(len(df)-1, 0, -1):  # 역순 (최근부터)
-                prev_close = df.iloc[i-1]['종가']
-                curr_close = df.iloc[i]['종가']
-                change_rate = ((curr_close - prev_close) / prev_close) * 100
-                history.append(round(change_rate, 2))
-
-            # 10거래일만 반환 (D-1 ~ D-10)
-            return history[:10]
-
+            rates = self.history.change_rates(tickers, end_date, days)
+            limit_ups = self.history.limit_up_flags(tickers, end_date, days)
         except Exception as e:
-            print(f"   ⚠️ {ticker} 가격 이력 조회 실패: {e}")
-            return []
+            print(f"   ⚠️ 가격 이력 조회 실패: {e}")
+            return {ticker: ([], []) for ticker in tickers}
+
+        histories = {}
+        for ticker in tickers:
+            # D-1부터 값 있는 날만 (상장 10거래일 미만 종목은 짧게)
+            rate_row = rates.loc[ticker]
+            has_value = rate_row.notna()
+            histories[ticker] = (
+                [float(rate) for rate in rate_row[has_value]],
+                [bool(flag) for flag in limit_ups.loc[ticker][has_value]],
+            )
+        return histories
+
+    def get_price_history(self, ticker, end_date, days=10):
+        """10거래일 가격 변동률 + 상한가 여부 가져오기 (오늘 제외, 어제부터)"""
+        return self.load_histories([ticker], end_date, days)[ticker]
 
     def load_kosdaq_companies(self):
         """CSV에서 코스닥 기업 목록 로드"""
         try:
             if not os.path.exists(self.csv_path):
                 print("❌ kosdaq_top_companies.csv 파일이 없습니다.")
-                print("   먼저 KosdaqList.py를 실행하세요.")
+                print("   먼저 KosdaqList.py (또는 MarketCapList.py)를 실행하세요.")
                 return None
 
-            df = pd.read_csv(self.csv_path)
+            df = pd.read_csv(self.csv_path, dtype={'ticker': str})
             print(f"✅ {len(df)}개 기업 목록 로드 완료")
             return df
         except Exception as e:
@@ -141,8 +117,91 @@ class SangddaBot:
             print(f"   ⚠️ DART 공시 조회 실패: {e}")
             return []
 
+    def load_universe(self, market):
+        """시장별 검사 대상 (kosdaq/kospi_top_companies.csv, 없으면 None = 시장 전체)"""
+        path = os.path.join(self.current_dir, f'{market.lower()}_top_companies.csv')
+        if not os.path.exists(path):
+            print(f"⚠️ {os.path.basename(path)} 파일이 없어 {market} 전체 종목을 검사합니다.")
+            return None
+        df = pd.read_csv(path, dtype={'ticker': str})
+        print(f"✅ {market} {len(df)}개 기업 목록 로드 완료")
+        return df
+
+    def build_stock_info(self, ticker, name, price, change_rate, history, history_limit_up, market=None):
+        """상한가 종목 상세 (10거래일 이력 + DART/KRX 공시)"""
+        # DART 공시 조회 (모든 공시) - 종목코드도 함께 전달
+        disclosures = self.get_recent_disclosures(name, ticker=ticker)
+
+        # KRX 공시 조회
+        krx_warnings = GetKrxWarnings(ticker)
+
+        info = {
+            'ticker': ticker,
+            'name': name,
+            'price': price,
+            'change_rate': round(change_rate, 2),
+            'history': history,
+            'history_limit_up': history_limit_up,
+            'disclosures': disclosures,
+            'krx_warnings': krx_warnings
+        }
+        if market:
+            info['market'] = market
+        return info
+
+    def scan_market_limit_up(self, target_date):
+        """
+        전종목 시세 1번 조회로 상한가 검사
+        - 전일종가 = 종가 - 대비 (정수, 등락률 역산 없음)
+        - 상한가 가격은 전 종목 한번에 계산, 상세 조회(이력/공시)는 상한가 종목만
+        """
+        try:
+            snapshot = self.history.snapshot(target_date)
+        except Exception as e:
+            print(f"❌ 전종목 시세 조회 실패: {e}")
+            return []
+        if snapshot.empty:
+            print("❌ 전종목 시세가 없습니다. (휴장일 또는 데이터 제공 전)")
+            return []
+        print(f"📡 전종목 시세 {len(snapshot)}개 조회 완료 ({', '.join(self.markets)})")
+
+        # 시장별 검사 대상 (CSV 순서 유지)
+        frames = []
+        for market in self.markets:
+            market_rows = snapshot[snapshot['시장'] == market]
+            universe = self.load_universe(market)
+            if universe is not None:
+                market_rows = market_rows.reindex(universe['ticker']).dropna(subset=['종가'])
+                market_rows['종목명'] = universe.set_index('ticker')['name'].reindex(market_rows.index)
+            frames.append(market_rows.assign(시장=market))
+        rows = pd.concat(frames) if frames else snapshot.iloc[0:0]
+
+        # 전 종목 상한가 판별 (시장별 호가 단위, 정수 비교)
+        flags = ClassifyPriceLimits(rows['전일종가'], rows['종가'], rows['시장'], target_date)
+        hits = rows[flags == 1]
+        print(f"🔍 {len(rows)}개 종목 검사 → 상한가 {len(hits)}개")
+
+        # 10거래일 이력은 상한가 종목 전체를 한번에 (거래일별 전종목 시세 캐시)
+        histories = self.load_histories(list(hits.index), target_date)
+
+        limit_up_stocks = []
+        for ticker, row in hits.iterrows():
+            print(f"   🔥 {ticker} {row['종목명']} | 종가: {int(row['종가']):,} | 등락률: {row['등락률']:+.2f}%")
+            market = row['시장'] if len(self.markets) > 1 else None
+            limit_up_stocks.append(self.build_stock_info(
+                ticker, row['종목명'], int(row['종가']), float(row['등락률']), *histories[ticker], market))
+        return limit_up_stocks
+
     def find_limit_up_stocks(self):
         """상한가 종목 찾기"""
+        if self.scan_mode != 'ticker':
+            target_date = self.get_latest_trading_day()
+            print(f"📅 기준일: {target_date}")
+            started = time.time()
+            limit_up_stocks = self.scan_market_limit_up(target_date)
+            print(f"\n✅ 상한가 종목: {len(limit_up_stocks)}개 발견 ({time.time() - started:.1f}초)")
+            return limit_up_stocks
+
         # 기업 목록 로드
         companies_df = self.load_kosdaq_companies()
         if companies_df is None:
@@ -150,9 +209,10 @@ class SangddaBot:
 
         # 최근 거래일
         target_date = self.get_latest_trading_day()
+        start_date = (datetime.strptime(target_date, '%Y%m%d') - timedelta(days=10)).strftime('%Y%m%d')
         print(f"📅 기준일: {target_date}")
 
-        limit_up_stocks = []
+        hits = []
         total = len(companies_df)
 
         print(f"🔍 상한가 종목 검색 중... (총 {total}개)")
@@ -166,18 +226,18 @@ class SangddaBot:
                 print(f"   처리중: {idx + 1}/{total}")
 
             try:
-                # get_market_ohlcv 사용 (더 안정적)
-                df = stock.get_market_ohlcv(target_date, target_date, ticker)
-                if df.empty:
+                # get_market_ohlcv 사용 (더 안정적) - 전일 종가도 같이 받도록 최근 열흘 조회
+                df = stock.get_market_ohlcv(start_date, target_date, ticker)
+                if df.empty or df.index[-1].strftime('%Y%m%d') != target_date:
                     print(f"{ticker} {name[:10]:10s} | 데이터 없음")
                     continue
 
                 # 현재가와 등락률
-                current_price = df.iloc[0]['종가']
-                change_rate = df.iloc[0]['등락률']
+                current_price = int(df.iloc[-1]['종가'])
+                change_rate = df.iloc[-1]['등락률']
 
-                # 전일 종가 계산 (현재가에서 등락분 빼기)
-                prev_close = current_price / (1 + change_rate/100)
+                # 전일 종가 (등락률 역산 대신 전 거래일 종가 그대로)
+                prev_close = int(df.iloc[-2]['종가']) if len(df) >= 2 else 0
 
                 # 간단히 출력 (종목당 한 줄)
                 print(f"{ticker} {name[:10]:10s} | 종가: {current_price:7.0f} | 등락률: {change_rate:+6.2f}%")
@@ -187,25 +247,8 @@ class SangddaBot:
                     continue
 
                 # 상한가 체크
-                if self.is_limit_up(prev_close, current_price):
-                    # 10거래일 이력
-                    history = self.get_price_history(ticker, target_date)
-
-                    # DART 공시 조회 (모든 공시) - 종목코드도 함께 전달
-                    disclosures = self.get_recent_disclosures(name, ticker=ticker)
-
-                    # KRX 공시 조회
-                    krx_warnings = GetKrxWarnings(ticker)
-
-                    limit_up_stocks.append({
-                        'ticker': ticker,
-                        'name': name,
-                        'price': current_price,
-                        'change_rate': round(change_rate, 2),
-                        'history': history,
-                        'disclosures': disclosures,
-                        'krx_warnings': krx_warnings
-                    })
+                if ClassifyPriceLimits(prev_close, current_price, 'KOSDAQ', target_date) == 1:
+                    hits.append((ticker, name, current_price, change_rate))
 
                     print(f"   🔥 상한가 발견!")
 
@@ -216,29 +259,36 @@ class SangddaBot:
                 # 에러는 조용히 처리
                 continue
 
+        # 10거래일 이력은 상한가 종목 전체를 한번에
+        histories = self.load_histories([hit[0] for hit in hits], target_date)
+        limit_up_stocks = [self.build_stock_info(*hit, *histories[hit[0]]) for hit in hits]
+
         print(f"\n✅ 상한가 종목: {len(limit_up_stocks)}개 발견")
         return limit_up_stocks
 
     def format_slack_message(self, stocks):
         """Slack 메시지 포맷"""
+        market_label = '/'.join({'KOSDAQ': '코스닥', 'KOSPI': '코스피'}.get(m, m) for m in self.markets)
         if not stocks:
-            return "📊 오늘은 코스닥 상한가 종목이 없습니다."
+            return f"📊 오늘은 {market_label} 상한가 종목이 없습니다."
 
         today = datetime.now().strftime('%Y.%m.%d')
         weekday = ['월', '화', '수', '목', '금', '토', '일'][datetime.now().weekday()]
 
-        message = f"📈 코스닥 상한가 [{today} {weekday}]\n\n"
+        message = f"📈 {market_label} 상한가 [{today} {weekday}]\n\n"
 
         for stock in stocks:
-            # 상한가 종목은 불 이모티콘과 볼드 처리
-            message += f"🔥 *{stock['name']}({stock['ticker']}) | {stock['price']:,} | +{stock['change_rate']}%*\n"
+            # 상한가 종목은 불 이모티콘과 볼드 처리 (여러 시장 검사 시 시장 표시)
+            market_tag = f"[{stock['market']}] " if stock.get('market') else ""
+            message += f"🔥 *{market_tag}{stock['name']}({stock['ticker']}) | {stock['price']:,} | +{stock['change_rate']}%*\n"
 
             # 10거래일 이력 (상한가 날짜에 🔥 표시)
             if stock['history']:
                 history_parts = []
-                for h in stock['history']:
-                    # 상한가(+29% 이상)인 날에 🔥 표시
-                    if h >= 29.0:
+                limit_ups = stock.get('history_limit_up') or [h >= 29.0 for h in stock['history']]
+                for h, limit_up in zip(stock['history'], limit_ups):
+                    # 상한가인 날에 🔥 표시
+                    if limit_up:
                         history_parts.append(f"🔥+{h}%")
                     else:
                         history_parts.append(f"{'+' if h > 0 else ''}{h}%")
@@ -288,8 +338,9 @@ class SangddaBot:
             return
 
         try:
-            # 데이터 준비 및 추가
+            # 데이터 준비 (종목당 1행)
             today = datetime.now().strftime('%Y-%m-%d')
+            rows = []
 
             for stock in stocks:
                 # 공시 정보 정리
@@ -320,11 +371,13 @@ class SangddaBot:
                 # 공시 정보 추가
                 data_args.append(disclosure_text)
 
-                # Send 함수로 데이터 전달
-                Send(self.sheet_name, *data_args)
+                rows.append(data_args)
 
-            if stocks:
+            # 전 종목을 한 번의 요청으로 기록
+            if rows and SendRows(self.sheet_name, rows):
                 print(f"✅ 구글 시트 '{self.sheet_name}'에 {len(stocks)}개 종목 기록 완료")
+            elif rows:
+                print(f"❌ 구글 시트 '{self.sheet_name}' 기록 실패")
             else:
                 print("⚠️ 기록할 상한가 종목이 없습니다.")
 
@@ -339,6 +392,12 @@ class SangddaBot:
         print("🚀 상따봇 (SangddaBot) 시작")
         print("=" * 60)
 
+        # 0. 로컬 KRX 저장소 갱신 (최근 30일 중 없는 날만, 거래량 급증 표시용)
+        try:
+            get_warehouse().update()
+        except Exception as e:
+            print(f"⚠️ KRX 저장소 갱신 실패: {e}")
+
         # 1. 상한가 종목 찾기
         stocks = self.find_limit_up_stocks()
 
@@ -0,0 +1,98 @@
+"""
+TEST_MARKET_CAP_LIST - 시총 상위 기업 리스트 오프라인 테스트 (네트워크 불필요)
+- rank_market_caps: 시총 내림차순, 같은 시총은 원래 순서 유지, 최소 시총 / top_n 컷, 억 단위 반올림
+- get_top_companies: 가짜 전종목 시세를 넣은 임시 KRX 저장소 1번 조회로 코스피/코스닥 분리
+
+사용법:
+    python TEST_MARKET_CAP_LIST.py
+"""
+
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# Argos 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.KrxService import krx_warehouse
+from services.KrxService.krx_warehouse import KrxWarehouse
+from MarketCapList import rank_market_caps, get_top_companies
+
+EOK = 100_000_000  # 1억원
+
+SNAPSHOT = pd.DataFrame(
+    {
+        "종목명": ["가", "나", "다", "라", "마", "바", "사"],
+        "시장": ["KOSDAQ", "KOSPI", "KOSDAQ", "KOSDAQ", "KOSPI", "KOSDAQ", "KONEX"],
+        "시가총액": [3_000 * EOK, 9_000 * EOK, 5_000 * EOK, 999 * EOK + 60_000_000,
+                  3_000 * EOK, 5_000 * EOK, 8_000 * EOK],
+    },
+    index=pd.Index(["000001", "000002", "000003", "000004", "000005", "000006", "000007"], name="티커"),
+)
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"  {'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    return ok
+
+
+def test_rank() -> bool:
+    print("\n🏅 rank_market_caps")
+    df = rank_market_caps(SNAPSHOT, min_market_cap=1_000 * EOK, top_n=10)
+    ok = check("시총 내림차순 + 동률은 원래 순서 (다 > 바, 가 > 마)",
+               df["ticker"].tolist() == ["000002", "000007", "000003", "000006", "000001", "000005"]
+               and df["rank"].tolist() == [1, 2, 3, 4, 5, 6],
+               " / ".join(df["name"]))
+    ok &= check("억 단위 정수", df["market_cap_억"].tolist() == [9_000, 8_000, 5_000, 5_000, 3_000, 3_000])
+
+    low = rank_market_caps(SNAPSHOT, min_market_cap=999 * EOK, top_n=3)
+    ok &= check("top_n 컷 + 억 단위 반올림 (999.6억 → 1000억)",
+                low["ticker"].tolist() == ["000002", "000007", "000003"]
+                and rank_market_caps(SNAPSHOT, 999 * EOK, 10)["market_cap_억"].iloc[-1] == 1_000)
+    ok &= check("조건에 맞는 기업 없음 → 빈 DataFrame",
+                rank_market_caps(SNAPSHOT, min_market_cap=10_000 * EOK).empty)
+    return ok
+
+
+def test_top_companies() -> bool:
+    print("\n📊 get_top_companies (임시 KRX 저장소)")
+    calls = []
+
+    def fetch(date, market):
+        calls.append((date, market))
+        return SNAPSHOT.assign(종가=10_000, 시가=10_000, 고가=10_000, 저가=10_000, 대비=0, 등락률=0.0,
+                               거래량=1, 거래대금=10_000, 상장주식수=1)
+
+    path = os.path.join(tempfile.mkdtemp(prefix="market_cap_"), "daily.sqlite")
+    original, krx_warehouse._warehouse = krx_warehouse._warehouse, KrxWarehouse(path, fetch=fetch)
+    try:
+        result = get_top_companies(["KOSPI", "kosdaq"], "20261015", min_market_cap=1_000 * EOK)
+    finally:
+        krx_warehouse._warehouse = original
+
+    ok = check("전종목 시세 1번 조회", calls == [("20261015", "ALL")])
+    ok &= check("시장별 순위 (코넥스 제외)",
+                list(result) == ["KOSPI", "KOSDAQ"]
+                and result["KOSPI"]["ticker"].tolist() == ["000002", "000005"]
+                and result["KOSDAQ"]["ticker"].tolist() == ["000003", "000006", "000001"]
+                and result["KOSDAQ"]["rank"].tolist() == [1, 2, 3])
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("🏢 시총 상위 기업 리스트 테스트")
+    print("=" * 60)
+
+    ok = test_rank()
+    ok &= test_top_companies()
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+TEST_KRX_WAREHOUSE - KRX 전종목 시세 / 이력 / 로컬 저장소 오프라인 테스트 (네트워크 불필요)
+가짜 전종목 시세(fetch 주입, 전종목시세 교체)와 고정 시각으로 확인
+- krx_market: KOSDAQ GLOBAL → KOSDAQ, '1,234' / '-' 숫자 변환, 전일종가 = 종가 - 대비, 휴장일 빈 DataFrame
+- krx_history: 주말/휴장일(20261009) 건너뛴 D-1 ~ D-10 라벨, 대비 / 전일종가 등락률 (액면분할 날), 상한가 여부
+- krx_warehouse: 장중에 받은 당일은 임시 → 다시 조회, 18시 이후 확정 / 휴장일은 뒤 거래일 확인 후에만 기록
+  (ensure, snapshot 모두) / 조회 실패 시 저장된 임시 데이터 / MarketHistory 두 번째 실행은 요청 0번
+
+사용법:
+    python TEST_KRX_WAREHOUSE.py
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Argos 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.KrxService import krx_market, krx_warehouse
+from services.KrxService.krx_history import MarketHistory
+from services.KrxService.krx_market import GetMarketSnapshot
+from services.KrxService.krx_warehouse import KrxWarehouse
+
+HOLIDAYS = {"20261009"}  # 한글날 (금)
+TRADING_DAYS = [day.strftime("%Y%m%d") for day in pd.bdate_range("2026-09-01", "2026-10-16")
+                if day.strftime("%Y%m%d") not in HOLIDAYS]
+SPLIT_DAY = "20261014"  # 델타 5:1 액면분할 → 기준가 2,000원, 종가 2,600원 (상한가)
+COLUMNS = ["종목명", "시장", "시가", "고가", "저가", "종가", "대비", "등락률",
+           "거래량", "거래대금", "시가총액", "상장주식수", "전일종가"]
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"  {'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    return ok
+
+
+def fake_snapshot(date: str, market="ALL") -> pd.DataFrame:
+    """GetMarketSnapshot 형태 가짜 전종목 시세 (휴장일/주말은 빈 DataFrame)"""
+    if date not in TRADING_DAYS:
+        return pd.DataFrame(columns=COLUMNS)
+    i = TRADING_DAYS.index(date)
+    rows = {
+        # 알파: 매일 +50원
+        "000001": ("알파", "KOSDAQ", 1_000 + 50 * (i + 1), 50),
+        # 베타: 보합
+        "000002": ("베타", "KOSPI", 70_000, 0),
+        # 델타: SPLIT_DAY에 액면분할 (전날 종가 10,000원 → 기준가 2,000원)
+        "000004": ("델타", "KOSDAQ", 10_000 if date < SPLIT_DAY else 2_600,
+                   600 if date == SPLIT_DAY else 0),
+    }
+    if date >= "20261012":
+        rows["000003"] = ("감마", "KOSDAQ", 5_000, 0)  # 20261012 신규 상장
+    df = pd.DataFrame.from_dict(rows, orient="index", columns=["종목명", "시장", "종가", "대비"])
+    df.index.name = "티커"
+    df["시가"] = df["고가"] = df["저가"] = df["종가"]
+    df["전일종가"] = df["종가"] - df["대비"]
+    df["등락률"] = (df["대비"] / df["전일종가"] * 100).round(2)
+    df["거래량"] = 1_000
+    df["거래대금"] = df["거래량"] * df["종가"]
+    df["상장주식수"] = 1_000_000
+    df["시가총액"] = df["종가"] * df["상장주식수"]
+    df = df[COLUMNS]
+    markets = [market] if isinstance(market, str) else list(market)
+    return df if "ALL" in markets else df[df["시장"].isin(markets)]
+
+
+class FakeClock(datetime):
+    """krx_warehouse.datetime 교체용 (now만 고정)"""
+    current = datetime(2026, 10, 16, 19, 0)
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current
+
+
+class CountingFetch:
+    """fetch 호출 기록 + 날짜별 빈 응답/오류 주입"""
+
+    def __init__(self):
+        self.calls = []
+        self.empty = set()
+        self.fail = set()
+
+    def __call__(self, date, market="ALL"):
+        self.calls.append(date)
+        if date in self.fail:
+            raise ConnectionError(f"KRX {date} 응답 없음")
+        if date in self.empty:
+            return pd.DataFrame(columns=COLUMNS)
+        return fake_snapshot(date, market)
+
+
+# ---------- krx_market ----------
+RAW_COLUMNS = ["ISU_SRT_CD", "ISU_ABBRV", "MKT_NM", "TDD_OPNPRC", "TDD_HGPRC", "TDD_LWPRC", "TDD_CLSPRC",
+               "CMPPREVDD_PRC", "FLUC_RT", "ACC_TRDVOL", "ACC_TRDVAL", "MKTCAP", "LIST_SHRS"]
+RAW_ROWS = [
+    ("005930", "삼성전자", "KOSPI", "70,000", "71,000", "69,500", "70,500", "500", "0.71",
+     "10,000,000", "705,000,000,000", "420,000,000,000,000", "5,969,782,550"),
+    ("086520", "에코프로", "KOSDAQ GLOBAL", "100,000", "130,000", "99,000", "130,000", "30,000", "30.00",
+     "1,000,000", "120,000,000,000", "3,461,000,000,000", "26,626,480"),
+    ("196170", "알테오젠", "KOSDAQ", "300,000", "301,000", "290,000", "295,000", "-5,000", "-1.67",
+     "200,000", "59,000,000,000", "15,700,000,000,000", "53,265,092"),
+    ("123456", "거래정지", "KOSDAQ", "-", "-", "-", "12,340", "0", "0.00", "0", "0", "12,340,000,000", "1,000,000"),
+    ("278990", "코넥스종목", "KONEX", "5,000", "5,000", "5,000", "5,000", "0", "0.00", "10", "50,000",
+     "5,000,000,000", "1,000,000"),
+]
+
+
+class FakeAllTickers:
+    """pykrx 전종목시세 대체 (시장 ID별 필터, 휴장일 날짜는 가격 0 또는 빈 응답)"""
+    requests = []
+
+    def fetch(self, date, market_id):
+        FakeAllTickers.requests.append((date, market_id))
+        raw = pd.DataFrame(RAW_ROWS, columns=RAW_COLUMNS)
+        if date == "20261009":
+            return raw.assign(TDD_OPNPRC="0", TDD_HGPRC="0", TDD_LWPRC="0", TDD_CLSPRC="0")
+        if date == "20261010":
+            return pd.DataFrame()
+        prefix = {"STK": "KOSPI", "KSQ": "KOSDAQ", "KNX": "KONEX"}.get(market_id)
+        return raw if prefix is None else raw[raw["MKT_NM"].str.startswith(prefix)]
+
+
+def test_market_snapshot() -> bool:
+    print("\n📡 krx_market.GetMarketSnapshot")
+    original, krx_market.전종목시세 = krx_market.전종목시세, FakeAllTickers
+    try:
+        kosdaq = GetMarketSnapshot("2026-10-16", "KOSDAQ")
+        both = GetMarketSnapshot("20261016", ["KOSPI", "KOSDAQ"])
+        holiday = GetMarketSnapshot("20261009", "ALL")
+        empty = GetMarketSnapshot("20261010", "ALL")
+    finally:
+        krx_market.전종목시세 = original
+
+    ok = check("KOSDAQ GLOBAL → KOSDAQ (시장 KOSDAQ 조회에 포함)",
+               list(kosdaq.index) == ["086520", "196170", "123456"] and set(kosdaq["시장"]) == {"KOSDAQ"})
+    ok &= check("여러 시장은 ALL 1번 조회 후 필터 (코넥스 제외)",
+                FakeAllTickers.requests[1] == ("20261016", "ALL")
+                and list(both.index) == ["005930", "086520", "196170", "123456"])
+    eco = both.loc["086520"]
+    ok &= check("'1,234' / '-5,000' / '-' 숫자 변환 + 전일종가 = 종가 - 대비",
+                eco["종가"] == 130_000 and eco["전일종가"] == 100_000 and eco["시가총액"] == 3_461_000_000_000
+                and both.loc["196170", "전일종가"] == 300_000 and both.loc["196170", "등락률"] == -1.67
+                and both.loc["123456", "시가"] == 0 and both["종가"].dtype == np.int64)
+    ok &= check("휴장일 (전종목 가격 0 / 빈 응답) → 빈 DataFrame",
+                holiday.empty and empty.empty and "전일종가" in empty.columns)
+    return ok
+
+
+# ---------- krx_history ----------
+def test_market_history() -> bool:
+    print("\n📅 krx_history.MarketHistory")
+    fetch = CountingFetch()
+    history = MarketHistory(fetch=fetch)
+    tickers = ["000001", "000003", "000004", "999999"]
+    rates = history.change_rates(tickers, "20261016")
+    flags = history.limit_up_flags(tickers, "20261016")
+
+    expected_days = ["20261015", "20261014", "20261013", "20261012", "20261008",
+                     "20261007", "20261006", "20261005", "20261002", "20261001"]
+    labels = [f"D-{i + 1}" for i in range(10)]
+    ok = check("D-1 ~ D-10 = 당일 제외, 휴장일(20261009) 건너뜀",
+               history._history_days("20261016", 10)[::-1] == expected_days and list(rates.columns) == labels)
+    weekend = [date for date in fetch.calls if datetime.strptime(date, "%Y%m%d").weekday() >= 5]
+    ok &= check("주말은 요청 없음, 날짜마다 1번 (캐시)",
+                not weekend and len(fetch.calls) == len(set(fetch.calls)), f"요청 {len(fetch.calls)}번")
+
+    alpha = [round(50 / (1_000 + 50 * TRADING_DAYS.index(day)) * 100, 2) for day in expected_days]
+    ok &= check("등락률 = 대비 / 전일종가", rates.loc["000001"].tolist() == alpha,
+                f"D-1 {rates.loc['000001', 'D-1']}%")
+    split = rates.loc["000004"]
+    ok &= check("액면분할 날은 기준가 대비 +30% (전날 종가 대비 -74% 아님), 상한가",
+                split["D-2"] == 30.0 and (split.drop("D-2") == 0).all()
+                and flags.loc["000004"].tolist() == [False, True] + [False] * 8)
+    gamma = rates.loc["000003"]
+    ok &= check("상장 전 / 없는 종목은 NaN",
+                gamma[:4].tolist() == [0.0] * 4 and gamma[4:].isna().all() and rates.loc["999999"].isna().all())
+    return ok
+
+
+# ---------- krx_warehouse ----------
+def new_warehouse(fetch, path=None) -> KrxWarehouse:
+    return KrxWarehouse(path or os.path.join(tempfile.mkdtemp(prefix="krx_wh_"), "daily.sqlite"), fetch=fetch)
+
+
+def test_warehouse_intraday() -> bool:
+    print("\n⏳ krx_warehouse 장중 임시 데이터")
+    fetch = CountingFetch()
+    FakeClock.current = datetime(2026, 10, 16, 14, 0)
+    warehouse = new_warehouse(fetch)
+    first = warehouse.snapshot("20261016")
+    warehouse.snapshot("20261016")
+    ok = check("장중 조회는 임시 (다시 조회)",
+               len(first) == 4 and fetch.calls == ["20261016"] * 2 and not warehouse.has_day("20261016"))
+
+    reopened = new_warehouse(fetch, warehouse.path)
+    ok &= check("재시작해도 임시 상태 유지", reopened.status()["pending"] == ["20261016"])
+
+    fetch.fail.add("20261016")
+    try:
+        served = reopened.snapshot("20261016")
+    except ConnectionError:
+        served = None
+    ok &= check("조회 실패 → 저장된 임시 데이터 반환", served is not None and len(served) == 4)
+    try:
+        new_warehouse(fetch).snapshot("20261016")
+        raised = False
+    except ConnectionError:
+        raised = True
+    ok &= check("저장된 데이터가 없으면 예외 그대로", raised)
+
+    fetch.fail.clear()
+    fetch.calls.clear()
+    FakeClock.current = datetime(2026, 10, 16, 19, 0)
+    reopened.snapshot("20261016")
+    reopened.snapshot("20261016")
+    ok &= check("18시 이후 조회로 확정 → 이후 요청 없음",
+                fetch.calls == ["20261016"] and reopened.has_day("20261016") and not reopened.status()["pending"])
+    return ok
+
+
+def test_warehouse_holidays() -> bool:
+    print("\n🏖️ krx_warehouse 휴장일 기록")
+    FakeClock.current = datetime(2026, 10, 16, 19, 0)
+    fetch = CountingFetch()
+    warehouse = new_warehouse(fetch)
+
+    fetch.empty.add("20261015")  # 일시 오류로 빈 응답
+    fetched = warehouse.ensure("20261005", "20261015")
+    ok = check("ensure: 뒤 거래일이 받아진 빈 날(20261009)만 휴장일 기록",
+               fetched == 9 and warehouse.has_day("20261009") and warehouse._ingested["20261009"] == 0
+               and not warehouse.has_day("20261015"))
+
+    fetch.empty.clear()
+    fetch.calls.clear()
+    warehouse.ensure("20261005", "20261015")
+    ok &= check("빈 응답이던 마지막 날만 다시 조회", fetch.calls == ["20261015"] and warehouse.has_day("20261015"))
+
+    fetch = CountingFetch()
+    warehouse = new_warehouse(fetch)
+    warehouse.ingest("20261012")
+    warehouse.snapshot("20261009")
+    warehouse.snapshot("20261009")
+    ok &= check("snapshot: 뒤 거래일이 저장돼 있으면 빈 날을 휴장일로 기록 (두 번째는 요청 없음)",
+                fetch.calls == ["20261012", "20261009"] and warehouse.has_day("20261009"))
+
+    fetch.calls.clear()
+    fetch.empty.add("20261013")
+    warehouse.snapshot("20261013")
+    warehouse.snapshot("20261013")
+    ok &= check("snapshot: 뒤 거래일이 없으면 빈 응답을 굳히지 않음",
+                fetch.calls == ["20261013"] * 2 and not warehouse.has_day("20261013"))
+
+    fetch = CountingFetch()
+    warehouse = new_warehouse(fetch)
+    MarketHistory(fetch=warehouse.snapshot).change_rates(["000001"], "20261016")
+    first_run = len(fetch.calls)
+    fetch.calls.clear()
+    rates = MarketHistory(fetch=warehouse.snapshot).change_rates(["000001"], "20261016")
+    ok &= check("MarketHistory(fetch=warehouse.snapshot) 두 번째 실행은 요청 0번",
+                first_run == 11 and not fetch.calls and rates.loc["000001"].notna().all(),
+                f"첫 실행 {first_run}번, 두 번째 {len(fetch.calls)}번")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("🗄️ KRX 시세 / 이력 / 저장소 테스트")
+    print("=" * 60)
+
+    original_datetime, krx_warehouse.datetime = krx_warehouse.datetime, FakeClock
+    try:
+        ok = test_market_snapshot()
+        ok &= test_market_history()
+        ok &= test_warehouse_intraday()
+        ok &= test_warehouse_holidays()
+    finally:
+        krx_warehouse.datetime = original_datetime
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
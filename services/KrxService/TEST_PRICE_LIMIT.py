@@ -0,0 +1,115 @@
+"""
+TEST_PRICE_LIMIT - 상한가 / 하한가 / 호가 단위 계산 오프라인 테스트 (네트워크 불필요)
+- 호가 단위 경계 (2023.01.25 개편 전/후, 코스피 vs 코스닥)
+- 가격제한폭 ±15% → ±30% (2015.06.15), 호가 단위 개편 (2023.01.25) 시행일 전환
+- 상한가는 호가 단위 절사, 하한가는 절상 (손으로 계산한 값과 비교)
+- 빈 입력 / 잘못된 시장명
+
+사용법:
+    python TEST_PRICE_LIMIT.py
+"""
+
+import os
+import sys
+
+import numpy as np
+
+# Argos 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.KrxService.krx_price_limit import (
+    GetTickSizes, GetPriceLimits, ClassifyPriceLimits, GetLimitUpPrice
+)
+
+
+def check(name: str, actual, expected) -> bool:
+    same = np.array_equal(np.asarray(actual), np.asarray(expected))
+    print(f"  {'✅' if same else '❌'} {name}" + ("" if same else f"\n     결과 {actual} / 기대 {expected}"))
+    return same
+
+
+def test_tick_sizes() -> bool:
+    print("\n📏 호가 단위 경계")
+    ok = check(
+        "2023.01.25 이후 (2천/5천/2만/5만/20만/50만)",
+        GetTickSizes([1_999, 2_000, 4_999, 5_000, 19_999, 20_000, 49_999, 50_000,
+                      199_999, 200_000, 499_999, 500_000], "KOSDAQ", "20261016"),
+        [1, 5, 5, 10, 10, 50, 50, 100, 100, 500, 500, 1_000],
+    )
+    before = [999, 1_000, 4_999, 5_000, 9_999, 10_000, 49_999, 50_000, 99_999, 100_000, 499_999, 500_000]
+    ok &= check("2023 이전 코스피 (10만 이상 500원, 50만 이상 1000원)",
+                GetTickSizes(before, "KOSPI", "20220103"),
+                [1, 5, 5, 10, 10, 50, 50, 100, 100, 500, 500, 1_000])
+    ok &= check("2023 이전 코스닥 (5만 이상 100원 고정)",
+                GetTickSizes(before, "KOSDAQ", "20220103"),
+                [1, 5, 5, 10, 10, 50, 50, 100, 100, 100, 100, 100])
+    ok &= check("호가 단위 개편 전날 / 당일 (15,000원 코스닥 50 → 10, 1,500원 코스피 5 → 1)",
+                [GetTickSizes([15_000, 15_000], "KOSDAQ", ["20230124", "20230125"]),
+                 GetTickSizes([1_500, 1_500], "KOSPI", ["20230124", "20230125"])],
+                [[50, 10], [5, 1]])
+    return ok
+
+
+def test_price_limits() -> bool:
+    print("\n📈 상한가 / 하한가")
+    # 3850 × 1.3 = 5005 → 10원 단위 절사 5000 / 3850 × 0.7 = 2695 (5원 단위 그대로)
+    # 1999 × 1.3 = 2598.7 → 5원 단위 절사 2595 / 1999 × 0.7 = 1399.3 → 1원 단위 절상 1400
+    # 9999 × 0.7 = 6999.3 → 10원 단위 절상 7000 / 33333 × 0.7 = 23333.1 → 50원 단위 절상 23350
+    ok = check("경계 근처 (3850 → 5000, 1999 → 2595) + 하한가 절상",
+               GetPriceLimits([3_850, 1_999, 9_999, 33_333], "KOSDAQ", "20261016"),
+               [[5_000, 2_595, 12_990, 43_300], [2_695, 1_400, 7_000, 23_350]])
+    # 1538 × 1.3 = 1999.4 → 1999 / 15385 × 1.3 = 20000.5 → 50원 단위 20000 / 153846 × 1.3 = 199999.8 → 199900
+    ok &= check("2천 / 2만 / 20만 경계",
+                GetPriceLimits([2_000, 20_000, 200_000, 1_538, 15_385, 153_846], "KOSPI", "20261016"),
+                [[2_600, 26_000, 260_000, 1_999, 20_000, 199_900],
+                 [1_400, 14_000, 140_000, 1_077, 10_770, 107_700]])
+    ok &= check("가격제한폭 전환 2015.06.12 ±15% / 2015.06.15 ±30%",
+                GetPriceLimits([10_000, 10_000], "KOSDAQ", ["20150612", "20150615"]),
+                [[11_500, 13_000], [8_500, 7_000]])
+    # 77777 × 1.3 = 101110.1 → 코스피 500원 단위 101000 / 코스닥 100원 단위 101100
+    ok &= check("2023 이전 코스피 vs 코스닥 (77,777원)",
+                GetPriceLimits([77_777, 77_777], ["KOSPI", "KOSDAQ"], "20220103"),
+                [[101_000, 101_100], [54_500, 54_500]])
+    ok &= check("2023 이후 같은 표 (77,777원)",
+                GetPriceLimits([77_777, 77_777], ["KOSPI", "KOSDAQ"], "20261016"),
+                [[101_100, 101_100], [54_500, 54_500]])
+    ok &= check("docstring 예시", GetPriceLimits([10_000, 1_234], "KOSDAQ", "20260102"),
+                [[13_000, 1_604], [7_000, 864]])
+    ok &= check("스칼라 (GetLimitUpPrice)", GetLimitUpPrice(3_850, "KOSDAQ", "20261016"), 5_000)
+    return ok
+
+
+def test_classify() -> bool:
+    print("\n🔍 상한가 / 하한가 판별")
+    ok = check("종목별 시장 배열 (상한가 / 하한가 / 보합 / 전일종가 0)",
+               ClassifyPriceLimits([3_850, 3_850, 10_000, 0], [5_000, 2_695, 10_000, 0],
+                                   ["KOSDAQ", "KOSPI", "KOSDAQ", "KOSPI"], "20261016"),
+               [1, -1, 0, 0])
+    ok &= check("빈 입력 → 빈 배열", ClassifyPriceLimits([], [], [], "20261016"), np.array([], dtype=np.int8))
+    ok &= check("빈 입력 + 시장명 1개", GetPriceLimits([], "KOSPI", "20261016"), [[], []])
+
+    try:
+        GetPriceLimits([1_000], "KOSDQ", "20261016")
+        rejected = False
+    except ValueError:
+        rejected = True
+    print(f"  {'✅' if rejected else '❌'} 잘못된 시장명(KOSDQ) → ValueError")
+    return ok and rejected
+
+
+def main():
+    print("=" * 60)
+    print("🧮 KRX 가격제한폭 / 호가 단위 테스트")
+    print("=" * 60)
+
+    ok = test_tick_sizes()
+    ok &= test_price_limits()
+    ok &= test_classify()
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
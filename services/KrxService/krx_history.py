@@ -0,0 +1,123 @@
+"""
+KRX 최근 N거래일 시세 이력 (날짜 단위 일괄 조회)
+- 거래일마다 전종목 시세 1번 조회 (GetMarketSnapshot) → 날짜별 캐시
+- 종목이 몇 개든 요청 수 = 거래일 수 (상한가 종목이 많은 날도 요청이 늘지 않음)
+- 대비 / 전일종가(KRX 기준가) 행렬(날짜 × 종목)로 D-1 ~ D-N 등락률을 한번에 계산
+  (액면분할/권리락 날도 KRX 등락률과 같은 기준 → 상한가 판별과 기준가 일치)
+"""
+
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from services.KrxService.krx_market import GetMarketSnapshot
+from services.KrxService.krx_price_limit import MARKETS, ClassifyPriceLimits
+
+
+class MarketHistory:
+    """
+    최근 N거래일 전종목 시세 이력
+
+    Examples:
+        history = MarketHistory()
+        rates = history.change_rates(["086520", "196170"], "20261016")        # D-1 ~ D-10 등락률
+        limit_ups = history.limit_up_flags(["086520", "196170"], "20261016")  # D-1 ~ D-10 상한가 여부
+    """
+
+    def __init__(self, market: str = "ALL",
+                 fetch: Optional[Callable[[str, str], pd.DataFrame]] = None,
+                 max_lookback: int = 40):
+        """
+        Args:
+            market: 조회 시장 (ALL이면 코스피/코스닥 함께 1번에)
+            fetch: 하루치 시세 조회 함수 (date, market) → DataFrame (기본: GetMarketSnapshot)
+            max_lookback: 거래일을 찾을 때 거슬러 올라가는 최대 달력일 수
+        """
+        self.market = market
+        self.fetch = fetch or GetMarketSnapshot
+        self.max_lookback = max_lookback
+        self._snapshots: Dict[str, pd.DataFrame] = {}
+
+    def snapshot(self, date: str) -> pd.DataFrame:
+        """하루 전종목 시세 (캐시, 휴장일은 빈 DataFrame)"""
+        date = date.replace("-", "")
+        if date not in self._snapshots:
+            if datetime.strptime(date, "%Y%m%d").weekday() >= 5:
+                self._snapshots[date] = pd.DataFrame()  # 주말은 요청하지 않음
+            else:
+                self._snapshots[date] = self.fetch(date, self.market)
+        return self._snapshots[date]
+
+    def trading_days(self, end_date: str, count: int) -> List[str]:
+        """end_date 포함 이전 거래일 count개 (오래된 순)"""
+        days = []
+        day = datetime.strptime(end_date.replace("-", ""), "%Y%m%d")
+        for _ in range(self.max_lookback + count):
+            date = day.strftime("%Y%m%d")
+            if not self.snapshot(date).empty:
+                days.append(date)
+                if len(days) == count:
+                    break
+            day -= timedelta(days=1)
+        return days[::-1]
+
+    def _history_days(self, end_date: str, days: int) -> List[str]:
+        """end_date 전날부터 거슬러 올라간 거래일 days개 (당일 제외)"""
+        before = datetime.strptime(end_date.replace("-", ""), "%Y%m%d") - timedelta(days=1)
+        return self.trading_days(before.strftime("%Y%m%d"), days)
+
+    def frame(self, column: str, dates: Sequence[str], tickers: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """날짜 × 종목 행렬 (column: 종가, 전일종가, 시장 등 / 그날 없는 종목은 NaN)"""
+        frame = pd.DataFrame({date: self.snapshot(date)[column] for date in dates}).T
+        frame.index = pd.to_datetime(frame.index, format="%Y%m%d")
+        if tickers is not None:
+            frame = frame.reindex(columns=list(tickers))
+        return frame
+
+    def change_rates(self, tickers: Sequence[str], end_date: str, days: int = 10) -> pd.DataFrame:
+        """
+        D-1 ~ D-days 등락률 (%) = 대비 / 전일종가
+        전일 종가끼리 비교하지 않고 그날 기준가(전일종가 = 종가 - 대비)를 써서
+        액면분할/권리락 날의 가짜 급등락이 없음 (limit_up_flags와 같은 기준가)
+
+        Returns:
+            종목 인덱스 × [D-1, D-2, ...] DataFrame (소수 2자리, 상장 전 등 값 없는 날은 NaN)
+        """
+        dates = self._history_days(end_date, days)
+        changes = self.frame("대비", dates, tickers).astype(float)
+        prev_closes = self.frame("전일종가", dates, tickers).astype(float)
+        rates = (changes / prev_closes.where(prev_closes > 0) * 100).round(2)
+        return self._label(rates, days)
+
+    def limit_up_flags(self, tickers: Sequence[str], end_date: str, days: int = 10) -> pd.DataFrame:
+        """
+        D-1 ~ D-days 상한가 여부 (그날 전일종가/호가 단위 기준, 정수 비교)
+
+        Returns:
+            종목 인덱스 × [D-1, D-2, ...] bool DataFrame
+        """
+        dates = self._history_days(end_date, days)
+        closes = self.frame("종가", dates, tickers)
+        prev_closes = self.frame("전일종가", dates, tickers)
+        markets = self.frame("시장", dates, tickers)
+
+        # 값 없는 칸 / 코넥스 등은 전일종가 0 → 판별 안 함
+        valid = closes.notna() & prev_closes.notna() & markets.isin(MARKETS)
+        flags = np.zeros(closes.shape, dtype=np.int8)
+        if closes.size:
+            flags = ClassifyPriceLimits(
+                prev_closes.where(valid, 0).to_numpy(dtype=float).ravel(),
+                closes.where(valid, 0).to_numpy(dtype=float).ravel(),
+                markets.where(valid, "KOSDAQ").to_numpy().ravel(),
+                np.repeat(dates, closes.shape[1]),
+            ).reshape(closes.shape)
+        return self._label(pd.DataFrame(flags == 1, index=closes.index, columns=closes.columns), days)
+
+    @staticmethod
+    def _label(frame: pd.DataFrame, days: int) -> pd.DataFrame:
+        """날짜 × 종목 → 종목 × [D-1, D-2, ...] (최근 날짜가 D-1)"""
+        recent = frame.iloc[::-1].T
+        recent.columns = [f"D-{i + 1}" for i in range(recent.shape[1])]
+        return recent.reindex(columns=[f"D-{i + 1}" for i in range(days)])
@@ -0,0 +1,76 @@
+"""
+KRX 전종목 시세 조회 서비스
+- 하루치 전종목 시세를 요청 1번으로 조회 (종목별 get_market_ohlcv 반복 대신)
+- 전일종가는 종가 - 대비(원 단위 정수)로 정확히 계산 (등락률 역산 반올림 오차 없음)
+"""
+
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+from pykrx.website.krx.market.core import 전종목시세
+
+MARKET_IDS = {"ALL": "ALL", "KOSPI": "STK", "KOSDAQ": "KSQ", "KONEX": "KNX"}
+
+# KRX 원본 컬럼 → pykrx와 같은 한글 컬럼
+COLUMNS = {
+    "ISU_ABBRV": "종목명",
+    "MKT_NM": "시장",
+    "TDD_OPNPRC": "시가",
+    "TDD_HGPRC": "고가",
+    "TDD_LWPRC": "저가",
+    "TDD_CLSPRC": "종가",
+    "CMPPREVDD_PRC": "대비",
+    "FLUC_RT": "등락률",
+    "ACC_TRDVOL": "거래량",
+    "ACC_TRDVAL": "거래대금",
+    "MKTCAP": "시가총액",
+    "LIST_SHRS": "상장주식수",
+}
+INT_COLUMNS = ["시가", "고가", "저가", "종가", "대비", "거래량", "거래대금", "시가총액", "상장주식수"]
+
+
+def _to_number(values: pd.Series, dtype) -> pd.Series:
+    """'1,234' / '-5' / '-' (값 없음) → 숫자"""
+    cleaned = values.astype(str).str.replace(",", "", regex=False).str.strip()
+    cleaned = cleaned.where(~cleaned.isin(["", "-"]), "0")
+    return pd.to_numeric(cleaned, errors="coerce").fillna(0).astype(dtype)
+
+
+def GetMarketSnapshot(date: str, market: Union[str, List[str]] = "KOSDAQ") -> pd.DataFrame:
+    """
+    하루 전종목 시세 (KRX 요청 1번)
+
+    Args:
+        date: 조회 일자 (YYYYMMDD)
+        market: KOSPI / KOSDAQ / KONEX / ALL 또는 목록 (여러 시장이면 ALL 1번 조회 후 필터)
+
+    Returns:
+        티커 인덱스 DataFrame
+        컬럼: 종목명, 시장, 시가, 고가, 저가, 종가, 대비, 등락률, 거래량, 거래대금, 시가총액, 상장주식수, 전일종가
+        (휴장일이면 빈 DataFrame, 거래정지 종목은 시가/고가/저가 0)
+    """
+    markets = [market] if isinstance(market, str) else list(market)
+    markets = [m.upper() for m in markets]
+    market_id = MARKET_IDS[markets[0]] if len(markets) == 1 else "ALL"
+
+    raw = 전종목시세().fetch(date.replace("-", ""), market_id)
+    if raw.empty or "ISU_SRT_CD" not in raw:
+        return pd.DataFrame(columns=list(COLUMNS.values()) + ["전일종가"])
+
+    df = raw.set_index("ISU_SRT_CD")[list(COLUMNS)].rename(columns=COLUMNS)
+    df.index.name = "티커"
+    for column in INT_COLUMNS:
+        df[column] = _to_number(df[column], np.int64)
+    df["등락률"] = _to_number(df["등락률"], np.float64)
+    df["전일종가"] = df["종가"] - df["대비"]
+    # 코스닥 글로벌 세그먼트 등 하위 구분은 상위 시장으로 (KOSDAQ GLOBAL → KOSDAQ)
+    df["시장"] = df["시장"].str.upper().str.split().str[0]
+
+    if market_id == "ALL" and "ALL" not in markets:
+        df = df[df["시장"].isin(markets)]
+
+    # 휴장일: 전종목 시가/고가/저가/종가가 0
+    if (df[["시가", "고가", "저가", "종가"]] == 0).all(axis=None):
+        return df.iloc[0:0]
+    return df
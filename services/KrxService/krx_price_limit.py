@@ -0,0 +1,182 @@
+"""
+KRX 가격제한폭 / 호가 단위 계산 (코스피, 코스닥)
+- 전일종가 배열 → 상한가 / 하한가 / 호가 단위를 한번에 계산 (전종목 ~2,700개도 호출 1번)
+- 원 단위 정수 연산만 사용 (등락률 역산이나 × 1.3 부동소수 오차 없음)
+- 호가 단위 / 가격제한폭은 시행일별 표로 관리 → 과거 날짜 분석에도 그날 기준 적용
+"""
+
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# 호가 단위 표 (시행일, {시장: (구간 경계, 호가단위)})
+# 가격이 경계[i] 미만이면 호가단위[i], 마지막 경계 이상이면 마지막 호가단위
+TICK_TABLES = (
+    ("19000101", {
+        "KOSPI": ((1_000, 5_000, 10_000, 50_000, 100_000, 500_000), (1, 5, 10, 50, 100, 500, 1_000)),
+        "KOSDAQ": ((1_000, 5_000, 10_000, 50_000), (1, 5, 10, 50, 100)),
+    }),
+    # 2023.01.25 호가가격단위 개편 (코스피/코스닥 통일)
+    ("20230125", {
+        "KOSPI": ((2_000, 5_000, 20_000, 50_000, 200_000, 500_000), (1, 5, 10, 50, 100, 500, 1_000)),
+        "KOSDAQ": ((2_000, 5_000, 20_000, 50_000, 200_000, 500_000), (1, 5, 10, 50, 100, 500, 1_000)),
+    }),
+)
+
+# 가격제한폭 (시행일, %) - 2015.06.15 ±15% → ±30%
+PRICE_LIMIT_PCT = (
+    ("19000101", 15),
+    ("20150615", 30),
+)
+
+MARKETS = ("KOSPI", "KOSDAQ")
+
+PriceArray = Union[int, float, Sequence, np.ndarray, pd.Series]
+MarketArg = Union[str, Sequence[str], np.ndarray, pd.Series]
+DateArg = Union[None, str, Sequence, np.ndarray, pd.Series, pd.DatetimeIndex]
+
+_TICK_STARTS = np.array([int(start) for start, _ in TICK_TABLES], dtype=np.int64)
+_LIMIT_STARTS = np.array([int(start) for start, _ in PRICE_LIMIT_PCT], dtype=np.int64)
+_LIMIT_PCTS = np.array([pct for _, pct in PRICE_LIMIT_PCT], dtype=np.int64)
+
+
+def _to_prices(values: PriceArray) -> np.ndarray:
+    """가격 → int64 배열 (float으로 들어온 원 단위 값은 반올림)"""
+    arr = np.asarray(values)
+    if arr.dtype.kind == "f":
+        arr = np.rint(np.nan_to_num(arr))
+    return arr.astype(np.int64)
+
+
+def _to_market_codes(market: MarketArg, shape) -> np.ndarray:
+    """시장명 → MARKETS 인덱스 배열 (시장명 1개면 전체에 적용, 빈 입력이면 빈 배열)"""
+    names = np.asarray(market, dtype=object)
+    upper = np.array([str(name).upper() for name in names.ravel()], dtype=object)
+
+    unknown = set(upper) - set(MARKETS)
+    if unknown:
+        raise ValueError(f"지원하지 않는 시장: {sorted(unknown)} (KOSPI / KOSDAQ만 가능)")
+
+    codes = np.where(upper == "KOSPI", 0, 1).astype(np.int64).reshape(names.shape)
+    return np.broadcast_to(codes, shape)
+
+
+def _to_date_keys(date: DateArg, shape) -> np.ndarray:
+    """날짜 → YYYYMMDD 정수 배열 (None이면 오늘)"""
+    if date is None:
+        date = pd.Timestamp.now()
+    if isinstance(date, (str, pd.Timestamp, np.datetime64)):
+        keys = np.array(int(pd.Timestamp(date).strftime("%Y%m%d")), dtype=np.int64)
+    else:
+        keys = pd.to_datetime(pd.Index(date)).strftime("%Y%m%d").astype(np.int64).to_numpy()
+    return np.broadcast_to(keys, shape)
+
+
+def _tick_for(values_x100: np.ndarray, table_idx: np.ndarray, market_codes: np.ndarray) -> np.ndarray:
+    """가격×100 → 호가 단위 (표/시장 조합별로 searchsorted 1번)"""
+    ticks = np.empty(values_x100.shape, dtype=np.int64)
+    for t in np.unique(table_idx):
+        table = TICK_TABLES[t][1]
+        for code in np.unique(market_codes):
+            bounds, units = table[MARKETS[code]]
+            mask = (table_idx == t) & (market_codes == code)
+            pos = np.searchsorted(np.asarray(bounds, dtype=np.int64) * 100, values_x100[mask], side="right")
+            ticks[mask] = np.asarray(units, dtype=np.int64)[pos]
+    return ticks
+
+
+def _prepare(prices: PriceArray, market: MarketArg, date: DateArg):
+    """입력 정리 → (가격, 시장 코드, 날짜 키) 같은 shape 1차원 배열 + 원래 shape"""
+    arr = _to_prices(prices)
+    shape = arr.shape
+    codes = _to_market_codes(market, shape).ravel()
+    keys = _to_date_keys(date, shape).ravel()
+    return arr.ravel(), codes, keys, shape
+
+
+def GetTickSizes(prices: PriceArray, market: MarketArg = "KOSDAQ", date: DateArg = None) -> np.ndarray:
+    """
+    호가 단위 일괄 계산
+
+    Args:
+        prices: 가격 (스칼라 / 배열 / Series, 원 단위)
+        market: KOSPI / KOSDAQ 또는 종목별 시장 배열
+        date: 기준일 (YYYYMMDD, 날짜 배열 가능, None이면 오늘)
+
+    Returns:
+        prices와 같은 shape의 int64 배열
+    """
+    arr, codes, keys, shape = _prepare(prices, market, date)
+    table_idx = np.searchsorted(_TICK_STARTS, keys, side="right") - 1
+    return _tick_for(arr * 100, table_idx, codes).reshape(shape)
+
+
+def GetPriceLimits(prev_closes: PriceArray, market: MarketArg = "KOSDAQ",
+                   date: DateArg = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    상한가 / 하한가 일괄 계산
+
+    - 상한가: 전일종가 × (1 + 제한폭), 그 가격대 호가 단위 미만 절사
+    - 하한가: 전일종가 × (1 - 제한폭), 그 가격대 호가 단위 미만 절상
+    - 전일종가 × (100 ± 제한폭%) 정수로 계산 후 호가 단위 × 100으로 나눔 (소수점 없음)
+
+    Args:
+        prev_closes: 전일종가 (기준가격)
+        market: KOSPI / KOSDAQ 또는 종목별 시장 배열
+        date: 거래일 (YYYYMMDD, 날짜 배열 가능, None이면 오늘)
+
+    Returns:
+        (상한가, 하한가) prev_closes와 같은 shape의 int64 배열 (전일종가 0 이하는 0)
+
+    Examples:
+        upper, lower = GetPriceLimits([10_000, 1_234], "KOSDAQ", "20260102")
+        # upper = [13000, 1604], lower = [7000, 864]
+    """
+    arr, codes, keys, shape = _prepare(prev_closes, market, date)
+    table_idx = np.searchsorted(_TICK_STARTS, keys, side="right") - 1
+    pct = _LIMIT_PCTS[np.searchsorted(_LIMIT_STARTS, keys, side="right") - 1]
+
+    upper_x100 = arr * (100 + pct)
+    lower_x100 = arr * (100 - pct)
+    upper_tick = _tick_for(upper_x100, table_idx, codes) * 100
+    lower_tick = _tick_for(lower_x100, table_idx, codes) * 100
+
+    upper = upper_x100 // upper_tick * upper_tick // 100
+    lower = -(-lower_x100 // lower_tick) * lower_tick // 100
+
+    valid = arr > 0
+    return np.where(valid, upper, 0).reshape(shape), np.where(valid, lower, 0).reshape(shape)
+
+
+def ClassifyPriceLimits(prev_closes: PriceArray, closes: PriceArray, market: MarketArg = "KOSDAQ",
+                        date: DateArg = None) -> np.ndarray:
+    """
+    상한가 / 하한가 판별 (종가 == 계산된 제한가격, 정수 비교)
+
+    Args:
+        prev_closes: 전일종가
+        closes: 당일 종가
+        market: KOSPI / KOSDAQ 또는 종목별 시장 배열
+        date: 거래일 (YYYYMMDD, 날짜 배열 가능, None이면 오늘)
+
+    Returns:
+        int8 배열 (1: 상한가, -1: 하한가, 0: 그 외 / 전일종가 없음)
+
+    Examples:
+        flags = ClassifyPriceLimits(df['전일종가'], df['종가'], df['시장'], "20261016")
+        limit_up = df[flags == 1]
+    """
+    upper, lower = GetPriceLimits(prev_closes, market, date)
+    close = _to_prices(closes)
+    valid = upper > 0
+    flags = np.zeros(upper.shape, dtype=np.int8)
+    flags[valid & (close == upper)] = 1
+    flags[valid & (close == lower)] = -1
+    return flags
+
+
+def GetLimitUpPrice(prev_close: int, market: str = "KOSDAQ", date: Optional[str] = None) -> int:
+    """종목 1개 상한가 (GetPriceLimits 스칼라 버전)"""
+    upper, _ = GetPriceLimits(prev_close, market, date)
+    return int(upper)
@@ -1,12 +1,11 @@
 """
 KRX 거래소 공시 간단 조회 서비스
-- pykrx 활용 및 웹 데이터 수집
+- 웹 데이터 수집 + 로컬 KRX 일별 시세 저장소 (krx_warehouse)
 """
 
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from pykrx import stock
 import time
 
 def GetKrxWarnings(stock_code: str) -> List[Dict[str, Any]]:
@@ -58,17 +57,20 @@ def GetKrxWarnings(stock_code: str) -> List[Dict[str, Any]]:
                     'type': 'KRX'
                 })
 
-        # 2. pykrx로 거래 정보 확인 (거래량 급증 등)
+        # 2. 로컬 KRX 저장소로 거래 정보 확인 (거래량 급증 등, 조회만 - 수집은 krx_warehouse.py update / 봇 시작 시)
         today = datetime.now().strftime('%Y%m%d')
         try:
+            from services.KrxService.krx_warehouse import get_warehouse
+
+            warehouse = get_warehouse()
+            past_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
+            df_past = warehouse.ohlcv(stock_code, past_date, today)
+
             # 최근 거래량 정보
-            df = stock.get_market_ohlcv(today, today, stock_code)
-            if not df.empty:
-                volume = df.iloc[0]['거래량']
+            if not df_past.empty and df_past.index[-1].strftime('%Y%m%d') == today:
+                volume = df_past.iloc[-1]['거래량']
 
                 # 10일 평균 거래량과 비교
-                past_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%d')
-                df_past = stock.get_market_ohlcv(past_date, today, stock_code)
                 if len(df_past) > 10:
                     avg_volume = df_past.tail(11).head(10)['거래량'].mean()
 
@@ -0,0 +1,357 @@
+"""
+KRX 일별 시세 로컬 저장소 (SQLite)
+- 거래일마다 전종목 시세 1번 조회 (GetMarketSnapshot ALL) → (날짜, 티커) 행으로 저장
+- 확정된 날짜(휴장일 포함)는 다시 요청하지 않음 → 첫 백필 이후 매일 최신 1일만 조회
+  (당일 데이터는 FINAL_HOUR 이후에 받아야 확정, 장중에 받은 건 다음 조회 때 다시 받음)
+- 조회는 로컬 SQLite (날짜/티커 인덱스) → 과거 시세/시가총액을 DataFrame/NumPy로 바로 사용
+
+저장 위치:
+    {MARKET_DATA_DIR 또는 프로젝트 루트/market_data}/krx/daily.sqlite
+
+사용법:
+    python krx_warehouse.py update [일수]            # 최근 N일 (기본 30일) 중 없는 날만 수집
+    python krx_warehouse.py ingest 20250101 [20251231] # 구간 백필
+    python krx_warehouse.py status
+"""
+
+import os
+import sys
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Set
+
+import pandas as pd
+
+try:
+    from services.KrxService.krx_market import GetMarketSnapshot
+except ImportError:
+    # 스크립트로 직접 실행 (python krx_warehouse.py ...)
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from services.KrxService.krx_market import GetMarketSnapshot
+
+# 기본 저장 위치 (MarketDataService와 같은 market_data 폴더, 환경변수로 변경 가능)
+DEFAULT_PATH = os.path.join(
+    os.getenv(
+        'MARKET_DATA_DIR',
+        os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'market_data')
+    ),
+    'krx',
+    'daily.sqlite'
+)
+
+# 당일 시세 확정 시각 (시간외 단일가 18:00 종료 → 거래량/거래대금까지 확정)
+FINAL_HOUR = 18
+
+# DB 컬럼 → GetMarketSnapshot 한글 컬럼
+FIELDS = {
+    'name': '종목명',
+    'market': '시장',
+    'open': '시가',
+    'high': '고가',
+    'low': '저가',
+    'close': '종가',
+    'change': '대비',
+    'change_rate': '등락률',
+    'volume': '거래량',
+    'value': '거래대금',
+    'market_cap': '시가총액',
+    'shares': '상장주식수',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_bars (
+    date TEXT NOT NULL,
+    ticker TEXT NOT NULL,
+    name TEXT,
+    market TEXT,
+    open INTEGER, high INTEGER, low INTEGER, close INTEGER, change INTEGER,
+    change_rate REAL,
+    volume INTEGER, value INTEGER, market_cap INTEGER, shares INTEGER,
+    PRIMARY KEY (date, ticker)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS daily_bars_ticker ON daily_bars (ticker, date);
+CREATE TABLE IF NOT EXISTS ingested_days (
+    date TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    ingested_at TEXT NOT NULL
+);
+"""
+
+
+def _date_key(value) -> str:
+    """날짜 → YYYYMMDD"""
+    if isinstance(value, str):
+        return value.replace('-', '')
+    return pd.Timestamp(value).strftime('%Y%m%d')
+
+
+def _is_final(date: str, ingested_at: str) -> bool:
+    """그날 FINAL_HOUR 이후에 받은 데이터인지 (ingested_at: ISO 문자열, 문자열 비교)"""
+    return ingested_at >= f"{date[:4]}-{date[4:6]}-{date[6:]}T{FINAL_HOUR:02d}:00:00"
+
+
+class KrxWarehouse:
+    """
+    KRX 일별 전종목 시세 저장소
+
+    Examples:
+        warehouse = KrxWarehouse()
+        warehouse.update()                                        # 최근 30일 중 없는 날만 수집
+        df = warehouse.snapshot("20261016", "KOSDAQ")             # 하루 전종목 (GetMarketSnapshot 형태)
+        bars = warehouse.ohlcv("086520", "20260901", "20261016")  # 종목 일봉
+        closes = warehouse.panel("종가", "20260901", "20261016")   # 날짜 × 종목
+    """
+
+    def __init__(self, path: Optional[str] = None,
+                 fetch: Optional[Callable[[str, str], pd.DataFrame]] = None):
+        """
+        Args:
+            path: SQLite 파일 경로 (기본: market_data/krx/daily.sqlite)
+            fetch: 하루치 시세 조회 함수 (date, market) → DataFrame (기본: GetMarketSnapshot)
+        """
+        self.path = path or DEFAULT_PATH
+        self.fetch = fetch or GetMarketSnapshot
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._ingested: Dict[str, int] = {}
+        self._pending: Set[str] = set()  # 저장은 했지만 아직 확정 전 (당일 장중에 받은 날짜)
+        for date, rows, ingested_at in self._conn.execute("SELECT date, rows, ingested_at FROM ingested_days"):
+            self._ingested[date] = rows
+            if not _is_final(date, ingested_at):
+                self._pending.add(date)
+
+    # ---------- 수집 ----------
+    def has_day(self, date) -> bool:
+        """이미 확정된 날짜인지 (휴장일로 기록된 날 포함, 당일 장중 임시 데이터는 제외)"""
+        date = _date_key(date)
+        return date in self._ingested and date not in self._pending
+
+    def ingest(self, date, force: bool = False) -> int:
+        """
+        하루 전종목 시세 저장 (KRX 요청 1번)
+
+        - 주말은 요청 없이 건너뜀
+        - 확정된 날짜는 다시 요청하지 않음 (당일 장중에 받은 데이터는 임시 → 다음 조회 때 다시 받아서 교체)
+        - 비어 있으면 기록하지 않음 (데이터 제공 전 / 일시 오류와 휴장일을 응답만으로 구분할 수 없음)
+          → 휴장일 기록은 뒤 거래일 데이터가 이미 저장돼 있거나 ensure에서 같이 확인된 경우만
+
+        Returns: 저장한 종목 수
+        """
+        date = _date_key(date)
+        if datetime.strptime(date, '%Y%m%d').weekday() >= 5:
+            return 0
+        if not force and self.has_day(date):
+            return self._ingested[date]
+
+        df = self.fetch(date, 'ALL')
+        if df.empty:
+            if self._has_later_trading_day(date):
+                self._record(date, [])
+            return 0
+
+        # 열 단위 tolist → 파이썬 int/float/str (sqlite3 바인딩용)
+        rows = list(zip(
+            [date] * len(df), df.index.tolist(), *(df[label].tolist() for label in FIELDS.values())
+        ))
+        self._record(date, rows)
+        return len(rows)
+
+    def _has_later_trading_day(self, date: str) -> bool:
+        """date 뒤 거래일 데이터가 저장돼 있는지 (있으면 date의 빈 응답은 휴장일)"""
+        return any(rows and day > date for day, rows in self._ingested.items())
+
+    def _record(self, date: str, rows: List[tuple]):
+        """날짜 1개 저장 (그 날짜 기존 행 교체, 휴장일은 rows 없이 기록)"""
+        ingested_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM daily_bars WHERE date = ?", (date,))
+            self._conn.executemany(
+                f"INSERT INTO daily_bars (date, ticker, {', '.join(FIELDS)}) "
+                f"VALUES ({', '.join('?' * (len(FIELDS) + 2))})",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested_days (date, rows, ingested_at) VALUES (?, ?, ?)",
+                (date, len(rows), ingested_at)
+            )
+        self._ingested[date] = len(rows)
+        if _is_final(date, ingested_at):
+            self._pending.discard(date)
+        else:
+            self._pending.add(date)
+
+    def ensure(self, start, end=None) -> int:
+        """
+        [start, end] 구간에서 아직 확정 안 된 평일만 수집 (end 기본: 오늘)
+        비어 있던 지난 평일은 뒤 평일 데이터가 이번 실행에서 받아지면 휴장일로 기록
+        (KRX 일시 오류로 빈 응답이 온 날을 휴장일로 굳히지 않음, 미확정이면 다음 실행 때 다시 조회)
+
+        Returns: 새로 요청한 날짜 수
+        """
+        day = datetime.strptime(_date_key(start), '%Y%m%d')
+        today = datetime.now().strftime('%Y%m%d')
+        last = min(_date_key(end or datetime.now()), today)
+        fetched = 0
+        unconfirmed: List[str] = []
+        while day.strftime('%Y%m%d') <= last:
+            date = day.strftime('%Y%m%d')
+            if day.weekday() < 5 and not self.has_day(date):
+                rows = self.ingest(date)
+                fetched += 1
+                print(f"📥 KRX {date}: {rows}개 종목" if rows else f"📥 KRX {date}: 휴장/데이터 없음")
+                if rows:
+                    for holiday in unconfirmed:
+                        self._record(holiday, [])
+                    unconfirmed = []
+                elif date < today:
+                    unconfirmed.append(date)
+            day += timedelta(days=1)
+
+        if unconfirmed:
+            print(f"⏳ 휴장일 미확정 {', '.join(unconfirmed)} (뒤 거래일 확인 후 기록, 다음 실행 때 다시 조회)")
+        return fetched
+
+    def update(self, days: int = 30) -> int:
+        """최근 days일 중 없는 날만 수집 (매일 실행용)"""
+        return self.ensure(datetime.now() - timedelta(days=days))
+
+    # ---------- 조회 ----------
+    def trading_days(self, start=None, end=None) -> List[str]:
+        """저장된 거래일 목록 (휴장일 제외, 오래된 순)"""
+        start, end = _date_key(start or '19000101'), _date_key(end or '99991231')
+        return sorted(date for date, rows in self._ingested.items() if rows and start <= date <= end)
+
+    def _query(self, sql: str, params: Sequence) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self._conn, params=list(params))
+
+    def snapshot(self, date, market: str = 'ALL') -> pd.DataFrame:
+        """
+        하루 전종목 시세 (GetMarketSnapshot과 같은 형태, 확정 안 된 날짜면 먼저 수집)
+        당일 장중에는 호출할 때마다 다시 받음 (KRX 요청 1번)
+        - 조회 실패 시 저장된 임시 데이터가 있으면 그걸 반환, 저장된 게 없으면 예외 그대로
+        - 빈 응답이어도 뒤 거래일이 저장돼 있으면 휴장일로 기록 (다음부터 요청 없음)
+
+        MarketHistory(fetch=warehouse.snapshot) 로 넘기면 이력 조회도 로컬 저장소 사용
+        """
+        date = _date_key(date)
+        if not self.has_day(date):
+            try:
+                self.ingest(date)
+            except Exception as e:
+                if date not in self._ingested:
+                    raise
+                print(f"⚠️ KRX {date} 조회 실패, 저장된 임시 데이터 사용: {e}")
+
+        sql = f"SELECT ticker, {', '.join(FIELDS)} FROM daily_bars WHERE date = ?"
+        params = [date]
+        markets = [market] if isinstance(market, str) else list(market)
+        markets = [m.upper() for m in markets]
+        if 'ALL' not in markets:
+            sql += f" AND market IN ({', '.join('?' * len(markets))})"
+            params += markets
+
+        df = self._query(sql, params).set_index('ticker').rename(columns=FIELDS)
+        df.index.name = '티커'
+        df['전일종가'] = df['종가'] - df['대비']
+        return df
+
+    def ohlcv(self, ticker: str, start=None, end=None) -> pd.DataFrame:
+        """
+        종목 일봉 (pykrx get_market_ohlcv와 같은 컬럼: 시가 고가 저가 종가 거래량 거래대금 등락률)
+        저장된 날짜만 조회 (필요하면 ensure로 먼저 수집)
+        """
+        start, end = _date_key(start or '19000101'), _date_key(end or '99991231')
+        df = self._query(
+            "SELECT date, open, high, low, close, volume, value, change_rate FROM daily_bars "
+            "WHERE ticker = ? AND date BETWEEN ? AND ? ORDER BY date",
+            (ticker, start, end)
+        )
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop('date'), format='%Y%m%d'), name='날짜')
+        return df.rename(columns=FIELDS)
+
+    def panel(self, column: str, start=None, end=None, tickers: Optional[Sequence[str]] = None,
+              market: Optional[str] = None) -> pd.DataFrame:
+        """
+        날짜 × 종목 행렬 (column: 종가, 거래량, 시가총액 등 한글/영문 컬럼명)
+        NumPy 배열은 .to_numpy()
+
+        Examples:
+            caps = warehouse.panel("시가총액", "20260101", market="KOSDAQ")
+        """
+        field = {label: name for name, label in FIELDS.items()}.get(column, column)
+        if field not in FIELDS:
+            raise ValueError(f"지원하지 않는 컬럼: {column}")
+
+        start, end = _date_key(start or '19000101'), _date_key(end or '99991231')
+        sql = f"SELECT date, ticker, {field} FROM daily_bars WHERE date BETWEEN ? AND ?"
+        params: List = [start, end]
+        if market:
+            sql += " AND market = ?"
+            params.append(market.upper())
+        if tickers is not None:
+            tickers = list(tickers)
+            sql += f" AND ticker IN ({', '.join('?' * len(tickers))})"
+            params += tickers
+
+        df = self._query(sql, params).pivot(index='date', columns='ticker', values=field)
+        df.index = pd.to_datetime(df.index, format='%Y%m%d')
+        df.columns.name = None
+        return df.reindex(columns=tickers) if tickers is not None else df
+
+    def status(self) -> Dict:
+        """저장 현황 (거래일 수, 기간, 행 수)"""
+        days = self.trading_days()
+        rows = self._conn.execute("SELECT COUNT(*) FROM daily_bars").fetchone()[0]
+        return {
+            'path': self.path,
+            'days': len(days),
+            'holidays': sum(1 for rows_ in self._ingested.values() if not rows_),
+            'pending': sorted(self._pending),
+            'start': days[0] if days else None,
+            'end': days[-1] if days else None,
+            'rows': rows,
+        }
+
+    def close(self):
+        self._conn.close()
+
+
+_warehouse: Optional[KrxWarehouse] = None
+
+
+def get_warehouse() -> KrxWarehouse:
+    """기본 저장소 (프로세스 동안 1개)"""
+    global _warehouse
+    if _warehouse is None:
+        _warehouse = KrxWarehouse()
+    return _warehouse
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    warehouse = get_warehouse()
+    command = sys.argv[1]
+
+    if command == 'update':
+        days = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+        fetched = warehouse.update(days)
+        print(f"✅ 새로 조회한 날짜: {fetched}일")
+    elif command == 'ingest':
+        fetched = warehouse.ensure(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"✅ 새로 조회한 날짜: {fetched}일")
+
+    status = warehouse.status()
+    print(f"📦 {status['path']}: 거래일 {status['days']}일 ({status['start']} ~ {status['end']}) / "
+          f"휴장일 {status['holidays']}일 / {status['rows']:,}행")
+    if status['pending']:
+        print(f"⏳ 장중 임시 데이터: {', '.join(status['pending'])} ({FINAL_HOUR}시 이후 다시 조회하면 확정)")
+
+
+if __name__ == "__main__":
+    main()
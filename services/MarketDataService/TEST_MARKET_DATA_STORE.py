@@ -0,0 +1,162 @@
+"""
+TEST_MARKET_DATA_STORE - OHLCV 열 파일 저장소 + 백필 오프라인 테스트 (네트워크 불필요)
+- 이어쓰기 / 과거·중간 캔들 병합 재작성 (기존 값 유지, 같은 시각 중복 없음) / 공백 구간 / 쓰다 죽은 열 길이 복구
+- 재작성 전에 읽어 둔 DataFrame은 그대로, 이후 읽기는 새 파일로 다시 매핑
+- 백필: 가짜 거래소 (상장 전 + 점검 구간 없음) → 빈 구간 기록 후 다음 백필은 새 마감 캔들만 요청
+
+사용법:
+    python TEST_MARKET_DATA_STORE.py
+"""
+
+import os
+import sys
+import glob
+import tempfile
+
+import numpy as np
+
+# Argos 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.MarketDataService import MarketDataStore, backfill
+from services.MarketDataService.backfill import backfill_ranges
+
+HOUR_MS = 3_600_000
+START_MS = 1_767_225_600_000  # 2026-01-01 00:00 UTC
+
+
+def make_rows(start: int, count: int, base: float = 100.0) -> list:
+    """1시간봉 [timestamp, open, high, low, close, volume] (값은 시각으로 결정)"""
+    rows = []
+    for i in range(count):
+        ts = start + i * HOUR_MS
+        price = base + (ts - START_MS) / HOUR_MS
+        rows.append([ts, price, price + 1, price - 1, price + 0.5, 10.0 + i])
+    return rows
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"  {'✅' if ok else '❌'} {name}" + (f" ({detail})" if detail else ""))
+    return ok
+
+
+def same_rows(frame, rows) -> bool:
+    expected = np.array(rows, dtype=np.float64)
+    return (len(frame) == len(rows)
+            and np.array_equal(frame.index.asi8 // 1_000_000, expected[:, 0].astype(np.int64))
+            and np.array_equal(frame[['open', 'high', 'low', 'close', 'volume']].to_numpy(), expected[:, 1:]))
+
+
+def test_round_trip() -> bool:
+    print("\n💾 저장 / 읽기")
+    store = MarketDataStore(tempfile.mkdtemp(prefix="market_data_"))
+    series = store.series('fake', 'BTC/USDT:USDT', '1h')
+    rows = make_rows(START_MS, 300)
+
+    first = store.write('fake', 'BTC/USDT:USDT', '1h', rows[100:200])
+    appended = store.write('fake', 'BTC/USDT:USDT', '1h', rows[200:300])
+    ok = check("이어쓰기 + 읽기", first == 100 and appended == 100
+               and same_rows(store.frame('fake', 'BTC/USDT:USDT', '1h'), rows[100:300]))
+    ok &= check("meta.json / 폴더 이름", series.meta == {'exchange': 'fake', 'symbol': 'BTC/USDT:USDT', 'timeframe': '1h'}
+                and series.path.endswith(os.path.join('fake', 'BTC_USDT_USDT', '1h')))
+
+    before = store.frame('fake', 'BTC/USDT:USDT', '1h')
+    changed = [[row[0], -1.0, -1.0, -1.0, -1.0, -1.0] for row in rows[150:160]]  # 기존 시각 → 기존 값 유지
+    added = store.write('fake', 'BTC/USDT:USDT', '1h', rows[:100] + changed)
+    after = store.frame('fake', 'BTC/USDT:USDT', '1h')
+    ok &= check("과거 캔들 병합 재작성 (기존 시각은 기존 값 유지)",
+                added == 100 and same_rows(after, rows), f"추가 {added}개, 총 {len(after)}개")
+    ok &= check("재작성 전 DataFrame은 그대로, 캐시 memmap은 새 파일로 다시 매핑",
+                same_rows(before, rows[100:300]) and len(series.columns()['close']) == 300
+                and not glob.glob(os.path.join(series.path, '*.tmp')))
+
+    start, end = START_MS + 120 * HOUR_MS, START_MS + 129 * HOUR_MS
+    ok &= check("구간 읽기 (이진 탐색)", same_rows(store.frame('fake', 'BTC/USDT:USDT', '1h', start, end), rows[120:130]))
+
+    holey = store.series('fake', 'ETH/USDT:USDT', '1h')
+    store.write('fake', 'ETH/USDT:USDT', '1h', rows[:10] + rows[15:20] + rows[21:30])
+    expected_gaps = [(rows[10][0], rows[14][0]), (rows[20][0], rows[20][0])]
+    ok &= check("중간 공백 구간", holey.gaps(HOUR_MS) == expected_gaps)
+    filled = store.write('fake', 'ETH/USDT:USDT', '1h', rows[8:22])
+    ok &= check("공백 채움", filled == 6 and not holey.gaps(HOUR_MS) and same_rows(holey.frame(), rows[:30]))
+
+    # 쓰다 죽은 경우: close 열만 캔들 1.5개 분량 더 써짐
+    with open(os.path.join(holey.path, 'close.f8'), 'ab') as f:
+        f.write(b'\x00' * 12)
+    store.write('fake', 'ETH/USDT:USDT', '1h', rows[30:31])
+    sizes = {os.path.getsize(path) for path in glob.glob(os.path.join(holey.path, '*.[if]8'))}
+    ok &= check("열 길이 복구 후 이어쓰기", sizes == {31 * 8} and same_rows(holey.frame(), rows[:31]))
+    return ok
+
+
+class FakeExchange:
+    """ccxt 흉내 (since 이후 있는 캔들부터 limit개, 상장 전 / 점검 구간은 데이터 없음)"""
+    id = 'fake'
+
+    def __init__(self, rows: list, now_ms: int):
+        self.rows = rows
+        self.now_ms = now_ms
+        self.calls = []
+
+    def parse_timeframe(self, timeframe: str) -> int:
+        return 3600
+
+    def milliseconds(self) -> int:
+        return self.now_ms
+
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=1000):
+        self.calls.append(since)
+        return [row for row in self.rows if row[0] >= since and row[0] < self.now_ms - HOUR_MS + 1][:limit]
+
+
+def test_backfill() -> bool:
+    print("\n📥 백필 (빈 구간 기록)")
+    store = MarketDataStore(tempfile.mkdtemp(prefix="market_data_"))
+    listing = START_MS + 24 * HOUR_MS
+    all_rows = make_rows(listing, 200)
+    maintenance = all_rows[50:55]
+    exchange = FakeExchange([row for row in all_rows if row not in maintenance], listing + 150 * HOUR_MS)
+
+    added = backfill(store, exchange, 'BTC/USDT:USDT', '1h', since=START_MS, limit=40)
+    series = store.series('fake', 'BTC/USDT:USDT', '1h')
+    expected_empty = [(START_MS, listing - HOUR_MS), (maintenance[0][0], maintenance[-1][0])]
+    ok = check("첫 백필: 상장 이후 마감 캔들 저장", added == 145 and len(series) == 145, f"{added}개, 요청 {len(exchange.calls)}번")
+    ok &= check("상장 전 / 점검 구간은 빈 구간으로 기록", series.empty_ranges() == expected_empty)
+
+    last_closed = exchange.now_ms // HOUR_MS * HOUR_MS - HOUR_MS
+    ranges = backfill_ranges(store, 'fake', 'BTC/USDT:USDT', '1h', HOUR_MS, START_MS, last_closed)
+    exchange.calls.clear()
+    again = backfill(store, exchange, 'BTC/USDT:USDT', '1h', since=START_MS, limit=40)
+    ok &= check("다음 백필: 빈 구간은 다시 요청하지 않음", ranges == [] and again == 0 and not exchange.calls,
+                f"요청 {len(exchange.calls)}번")
+
+    # 새 캔들 3개 마감, 거래소 반영은 2개만 (마지막은 지연) → 지연 구간은 기록하지 않음
+    exchange.now_ms += 3 * HOUR_MS
+    lagging = all_rows[152]
+    exchange.rows.remove(lagging)
+    exchange.calls.clear()
+    added = backfill(store, exchange, 'BTC/USDT:USDT', '1h', since=START_MS, limit=40)
+    ok &= check("최근 마감 캔들만 요청", added == 2 and exchange.calls[0] == all_rows[150][0], f"요청 {len(exchange.calls)}번")
+    ok &= check("반영 지연 구간은 빈 구간으로 굳히지 않음", series.empty_ranges() == expected_empty)
+
+    exchange.rows.append(lagging)
+    added = backfill(store, exchange, 'BTC/USDT:USDT', '1h', since=START_MS, limit=40)
+    ok &= check("지연됐던 캔들은 다음 백필에서 저장", added == 1 and len(series) == 148)
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("🗃️ MarketDataService 저장소 테스트")
+    print("=" * 60)
+
+    ok = test_round_trip()
+    ok &= test_backfill()
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Market Data Service Package
+거래소 OHLCV 열(column) 파일 저장소 + 백필
+"""
+
+from .market_data_store import (
+    CandleSeries,
+    MarketDataStore,
+    DEFAULT_ROOT
+)
+from .backfill import backfill, create_exchange
+
+__all__ = [
+    'CandleSeries',
+    'MarketDataStore',
+    'DEFAULT_ROOT',
+    'backfill',
+    'create_exchange'
+]
+
+# 패키지 정보
+__version__ = '1.0.0'
+__author__ = 'Argos'
@@ -0,0 +1,141 @@
+"""
+MarketDataService 백필 - exchange.fetch_ohlcv(since=...)를 페이지 단위로 돌면서 저장소 공백 채움
+
+채우는 구간:
+    1. 저장된 첫 캔들보다 이전 (since 지정 시)
+    2. 중간에 빠진 구간 (gaps)
+    3. 마지막 캔들 ~ 최근 마감 캔들
+거래소에도 없는 구간(점검/상장 전)은 뒤 캔들이 저장된 경우 빈 구간으로 기록 → 다음 백필부터 요청하지 않음
+
+사용법:
+    python backfill.py bybit BTC/USDT:USDT 15m 2024-01-01
+    python backfill.py upbit BTC/KRW 1m 2025-06-01 /data/market_data
+    python backfill.py list
+"""
+
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import ccxt
+
+try:
+    from .market_data_store import MarketDataStore, _to_ms
+except ImportError:
+    # 스크립트로 직접 실행 (python backfill.py ...)
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from market_data_store import MarketDataStore, _to_ms
+
+
+def create_exchange(exchange_id: str) -> ccxt.Exchange:
+    """공개 시세용 ccxt 거래소 (API 키 불필요)"""
+    options = {'defaultType': 'swap'} if exchange_id in ('bybit', 'binance', 'okx') else {}
+    return getattr(ccxt, exchange_id)({'enableRateLimit': True, 'options': options})
+
+
+def _subtract(ranges: List[Tuple[int, int]], empty: List[Tuple[int, int]], tf_ms: int) -> List[Tuple[int, int]]:
+    """구간 목록에서 확인된 빈 구간 제외"""
+    result = []
+    for start, end in ranges:
+        for empty_start, empty_end in empty:
+            if empty_end < start or empty_start > end:
+                continue
+            if empty_start > start:
+                result.append((start, empty_start - tf_ms))
+            start = empty_end + tf_ms
+            if start > end:
+                break
+        if start <= end:
+            result.append((start, end))
+    return result
+
+
+def backfill_ranges(store: MarketDataStore, exchange_id: str, symbol: str, timeframe: str,
+                    tf_ms: int, since_ms: Optional[int], last_closed_ms: int) -> List[Tuple[int, int]]:
+    """받아야 할 [(시작 ms, 끝 ms)] 구간 목록 (확인된 빈 구간 제외)"""
+    series = store.series(exchange_id, symbol, timeframe)
+    timestamps = series.timestamps
+    if len(timestamps) == 0:
+        start = since_ms if since_ms is not None else last_closed_ms - 1000 * tf_ms
+        return _subtract([(start, last_closed_ms)], series.empty_ranges(), tf_ms)
+
+    first, last = int(timestamps[0]), int(timestamps[-1])
+    ranges = []
+    if since_ms is not None and since_ms < first:
+        ranges.append((since_ms, first - tf_ms))
+    ranges.extend(series.gaps(tf_ms))
+    if last < last_closed_ms:
+        ranges.append((last + tf_ms, last_closed_ms))
+    return _subtract(ranges, series.empty_ranges(), tf_ms)
+
+
+def backfill(store: MarketDataStore, exchange: ccxt.Exchange, symbol: str, timeframe: str,
+             since: Optional[object] = None, limit: int = 1000) -> int:
+    """
+    저장소 공백을 거래소 REST로 채움 (마감된 캔들만 저장)
+
+    Args:
+        since: 이 시각부터 보장 (ms 정수 또는 날짜 문자열, 없으면 기존 데이터 이후만)
+        limit: fetch_ohlcv 1회 요청 캔들 수
+
+    Returns: 새로 저장된 캔들 수
+    """
+    exchange_id = exchange.id
+    tf_ms = exchange.parse_timeframe(timeframe) * 1000
+    last_closed_ms = exchange.milliseconds() // tf_ms * tf_ms - tf_ms
+    added = 0
+    missing: List[Tuple[int, int]] = []  # 요청했지만 거래소가 돌려주지 않은 구간
+
+    for start, end in backfill_ranges(store, exchange_id, symbol, timeframe, tf_ms, _to_ms(since), last_closed_ms):
+        cursor, rows = start, []
+        while cursor <= end:
+            page = exchange.fetch_ohlcv(symbol, timeframe, since=cursor, limit=limit)
+            page = [row for row in page if cursor <= row[0] <= end]
+            if not page:
+                missing.append((cursor, end))  # 거래소에도 없는 구간 (점검/상장 전)
+                break
+            for row in page:
+                if row[0] > cursor:
+                    missing.append((cursor, row[0] - tf_ms))  # 거래소가 건너뛴 구간
+                cursor = row[0] + tf_ms
+            rows.extend(page)
+            if len(rows) >= 50 * limit:
+                added += store.write(exchange_id, symbol, timeframe, rows)
+                rows = []
+        added += store.write(exchange_id, symbol, timeframe, rows)
+
+    # 뒤 캔들이 저장된 빈 구간만 확정 (최근 구간은 거래소 반영 지연일 수 있어 다음에 다시 요청)
+    series = store.series(exchange_id, symbol, timeframe)
+    if len(series):
+        newest = int(series.timestamps[-1])
+        series.mark_empty([(start, end) for start, end in missing if end < newest])
+    return added
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return
+
+    if sys.argv[1] == 'list':
+        store = MarketDataStore(sys.argv[2] if len(sys.argv) > 2 else None)
+        for item in store.list():
+            print(f"📦 {item.get('exchange')} {item.get('symbol')} {item.get('timeframe')}: "
+                  f"{item['candles']}개 ({item['start']} ~ {item['end']})")
+        return
+
+    exchange_id, symbol, timeframe = sys.argv[1], sys.argv[2], sys.argv[3]
+    since = sys.argv[4] if len(sys.argv) > 4 else None
+    store = MarketDataStore(sys.argv[5] if len(sys.argv) > 5 else None)
+
+    exchange = create_exchange(exchange_id)
+    print(f"📥 {exchange_id} {symbol} {timeframe} 백필 시작 (since={since or '기존 데이터 이후'})")
+    started = time.perf_counter()
+    added = backfill(store, exchange, symbol, timeframe, since)
+    series = store.series(exchange_id, symbol, timeframe)
+    print(f"✅ {added}개 추가 / 총 {len(series)}개 / {time.perf_counter() - started:.1f}초 → {series.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+"""
+MarketDataService - 거래소/심볼/타임프레임별 OHLCV 열(column) 파일 저장소
+
+저장 구조:
+    {root}/{exchange}/{SYMBOL}/{timeframe}/
+        timestamp.i8  open.f8  high.f8  low.f8  close.f8  volume.f8   (리틀엔디언 원시 배열)
+        meta.json                                                      (거래소/심볼/타임프레임, 확인된 빈 구간)
+
+- 새 캔들은 열 파일 끝에 이어쓰기 (과거 구간/중간 공백 채움만 파일 재작성)
+- 읽기는 np.memmap → 수백만 캔들도 파이썬 객체 변환 없이 필요한 구간만 슬라이스
+- 쓰기 도중 종료되어 열 길이가 달라지면 다음 쓰기 시 가장 짧은 길이로 맞춤
+- 파일 교체/자르기 전에 캐시된 memmap을 놓음 (교체 후 다음 읽기에서 새로 매핑)
+"""
+
+import os
+import json
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+DTYPES = {'timestamp': np.dtype('<i8'), 'open': np.dtype('<f8'), 'high': np.dtype('<f8'),
+          'low': np.dtype('<f8'), 'close': np.dtype('<f8'), 'volume': np.dtype('<f8')}
+EXTENSIONS = {'timestamp': 'i8', 'open': 'f8', 'high': 'f8', 'low': 'f8', 'close': 'f8', 'volume': 'f8'}
+
+# 기본 저장 위치 (프로젝트 루트/market_data, 환경변수로 변경 가능)
+DEFAULT_ROOT = os.getenv(
+    'MARKET_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'market_data')
+)
+
+
+def symbol_dir_name(symbol: str) -> str:
+    """심볼 → 폴더 이름 (BTC/USDT:USDT → BTC_USDT_USDT, KRW-BTC → KRW-BTC)"""
+    return symbol.replace('/', '_').replace(':', '_')
+
+
+class CandleSeries:
+    """exchange/symbol/timeframe 하나의 열 파일 묶음"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._maps: Dict[str, np.ndarray] = {}
+        self._mapped_len = -1
+
+    def _file(self, column: str) -> str:
+        return os.path.join(self.path, f"{column}.{EXTENSIONS[column]}")
+
+    def _lengths(self) -> List[int]:
+        lengths = []
+        for column in COLUMNS:
+            path = self._file(column)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths.append(size // DTYPES[column].itemsize)
+        return lengths
+
+    def __len__(self) -> int:
+        return min(self._lengths())
+
+    @property
+    def meta(self) -> Dict:
+        path = os.path.join(self.path, 'meta.json')
+        if not os.path.exists(path):
+            return {}
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, meta: Dict):
+        os.makedirs(self.path, exist_ok=True)
+        path = os.path.join(self.path, 'meta.json')
+        with open(path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(path + '.tmp', path)
+
+    def empty_ranges(self) -> List[Tuple[int, int]]:
+        """거래소에도 없다고 확인된 구간 [(시작 ms, 끝 ms)] (백필에서 다시 요청하지 않음)"""
+        return [tuple(r) for r in self.meta.get('empty_ranges', [])]
+
+    def mark_empty(self, ranges: List[Tuple[int, int]]):
+        """확인된 빈 구간 기록 (겹치는 구간은 합침)"""
+        if not ranges:
+            return
+        merged: List[List[int]] = []
+        for start, end in sorted([list(r) for r in self.empty_ranges()] + [[int(s), int(e)] for s, e in ranges]):
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self._write_meta({**self.meta, 'empty_ranges': merged})
+
+    # ---------- 읽기 (memmap) ----------
+    def columns(self) -> Dict[str, np.ndarray]:
+        """열 이름 → 읽기 전용 memmap (파일 길이가 바뀌면 다시 매핑)"""
+        n = len(self)
+        if n != self._mapped_len:
+            self._maps = {
+                column: (np.memmap(self._file(column), dtype=DTYPES[column], mode='r', shape=(n,))
+                         if n else np.empty(0, dtype=DTYPES[column]))
+                for column in COLUMNS
+            }
+            self._mapped_len = n
+        return self._maps
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self.columns()['timestamp']
+
+    def bounds(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Tuple[int, int]:
+        """[start_ms, end_ms] 구간의 위치 범위 (timestamp memmap 이진 탐색)"""
+        ts = self.timestamps
+        lo = 0 if start_ms is None else int(np.searchsorted(ts, start_ms, side='left'))
+        hi = len(ts) if end_ms is None else int(np.searchsorted(ts, end_ms, side='right'))
+        return lo, hi
+
+    def slice(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """구간 열 배열 (memmap 뷰, 복사 없음)"""
+        lo, hi = self.bounds(start_ms, end_ms)
+        return {column: values[lo:hi] for column, values in self.columns().items()}
+
+    def frame(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> pd.DataFrame:
+        """구간 DataFrame (봇/백테스터와 같은 형태, OHLCV 열은 memmap 뷰를 그대로 사용)"""
+        data = self.slice(start_ms, end_ms)
+        index = pd.DatetimeIndex(pd.to_datetime(np.asarray(data['timestamp']), unit='ms'), name='timestamp')
+        return pd.DataFrame({column: data[column] for column in COLUMNS[1:]}, index=index, copy=False)
+
+    def gaps(self, timeframe_ms: int) -> List[Tuple[int, int]]:
+        """중간에 빠진 캔들 구간 [(첫 누락 시각, 마지막 누락 시각)]"""
+        ts = self.timestamps
+        if len(ts) < 2:
+            return []
+        jumps = np.flatnonzero(np.diff(ts) > timeframe_ms)
+        return [(int(ts[i]) + timeframe_ms, int(ts[i + 1]) - timeframe_ms) for i in jumps]
+
+    # ---------- 쓰기 ----------
+    def _release(self):
+        """캐시된 memmap 해제 (파일 교체/자르기 전, 다음 읽기 때 다시 매핑)"""
+        self._maps = {}
+        self._mapped_len = -1
+
+    def _repair(self):
+        """쓰기 도중 종료로 열 길이가 다르면 가장 짧은 길이로 자름"""
+        lengths = self._lengths()
+        n = min(lengths)
+        if max(lengths) != n:
+            self._release()
+            for column in COLUMNS:
+                path = self._file(column)
+                if os.path.exists(path):
+                    with open(path, 'r+b') as f:
+                        f.truncate(n * DTYPES[column].itemsize)
+
+    def write(self, rows: List[list]) -> int:
+        """
+        캔들 저장 (ccxt OHLCV 리스트, 마감 캔들만 넘길 것)
+        모두 마지막 캔들 이후면 이어쓰기, 과거/중간 캔들이 섞이면 병합 후 파일 재작성
+
+        Returns: 새로 추가된 캔들 수
+        """
+        if not rows:
+            return 0
+        os.makedirs(self.path, exist_ok=True)
+        self._repair()
+
+        new = np.array([row[:6] for row in rows], dtype=np.float64)
+        ts = new[:, 0].astype(np.int64)
+        order = np.argsort(ts, kind='stable')
+        new, ts = new[order], ts[order]
+        keep = np.r_[ts[1:] != ts[:-1], True]  # 같은 시각은 마지막 값 사용
+        new, ts = new[keep], ts[keep]
+
+        existing = self.timestamps
+        if len(existing) == 0 or ts[0] > existing[-1]:
+            self._append(ts, new)
+            return len(ts)
+
+        added = int(np.count_nonzero(~np.isin(ts, existing)))
+        del existing  # _rewrite 전에 memmap 참조 해제
+        if added:
+            self._rewrite(ts, new)
+        return added
+
+    def _append(self, ts: np.ndarray, values: np.ndarray):
+        for i, column in enumerate(COLUMNS):
+            data = ts if column == 'timestamp' else values[:, i]
+            with open(self._file(column), 'ab') as f:
+                f.write(np.ascontiguousarray(data, dtype=DTYPES[column]).tobytes())
+        self._mapped_len = -1
+
+    def _rewrite(self, ts: np.ndarray, values: np.ndarray):
+        """
+        기존 + 새 캔들 병합 → 임시 파일에 쓴 뒤 교체 (기존 시각은 기존 값 유지)
+        병합 결과는 메모리 배열로 만든 뒤 memmap을 놓고 교체 (열린 매핑이 있으면 교체가 막히는 OS 대비)
+        """
+        current = self.columns()
+        fresh = ~np.isin(ts, current['timestamp'])
+        merged_ts = np.concatenate([np.asarray(current['timestamp']), ts[fresh]])
+        order = np.argsort(merged_ts, kind='stable')
+        merged = {
+            column: merged_ts[order] if column == 'timestamp'
+            else np.concatenate([np.asarray(current[column]), values[fresh, i]])[order]
+            for i, column in enumerate(COLUMNS)
+        }
+        del current
+        self._release()
+
+        for column in COLUMNS:
+            tmp = self._file(column) + '.tmp'
+            with open(tmp, 'wb') as f:
+                f.write(np.ascontiguousarray(merged[column], dtype=DTYPES[column]).tobytes())
+        for column in COLUMNS:
+            os.replace(self._file(column) + '.tmp', self._file(column))
+
+
+class MarketDataStore:
+    """거래소/심볼/타임프레임별 CandleSeries 모음"""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or DEFAULT_ROOT
+        self._series: Dict[Tuple[str, str, str], CandleSeries] = {}
+
+    def path(self, exchange_id: str, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, exchange_id, symbol_dir_name(symbol), timeframe)
+
+    def series(self, exchange_id: str, symbol: str, timeframe: str) -> CandleSeries:
+        key = (exchange_id, symbol, timeframe)
+        if key not in self._series:
+            self._series[key] = CandleSeries(self.path(exchange_id, symbol, timeframe))
+        return self._series[key]
+
+    def write(self, exchange_id: str, symbol: str, timeframe: str, rows: List[list]) -> int:
+        """마감 캔들 저장 → 새로 추가된 캔들 수"""
+        series = self.series(exchange_id, symbol, timeframe)
+        if rows and not series.meta:
+            series._write_meta({'exchange': exchange_id, 'symbol': symbol, 'timeframe': timeframe})
+        return series.write(rows)
+
+    def frame(self, exchange_id: str, symbol: str, timeframe: str,
+              start: Optional[object] = None, end: Optional[object] = None) -> pd.DataFrame:
+        """구간 DataFrame (start/end: ms 정수 또는 날짜 문자열/Timestamp)"""
+        return self.series(exchange_id, symbol, timeframe).frame(_to_ms(start), _to_ms(end))
+
+    def list(self) -> List[Dict]:
+        """저장된 시리즈 목록 (meta + 캔들 수 + 기간)"""
+        result = []
+        if not os.path.isdir(self.root):
+            return result
+        for dirpath, _, filenames in os.walk(self.root):
+            if 'meta.json' not in filenames:
+                continue
+            series = CandleSeries(dirpath)
+            ts = series.timestamps
+            result.append({
+                **series.meta,
+                'candles': len(ts),
+                'start': pd.Timestamp(int(ts[0]), unit='ms') if len(ts) else None,
+                'end': pd.Timestamp(int(ts[-1]), unit='ms') if len(ts) else None
+            })
+        return result
+
+
+def _to_ms(value) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).value // 1_000_000)
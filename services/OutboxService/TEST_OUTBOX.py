@@ -0,0 +1,128 @@
+"""
+TEST_OUTBOX - Outbox 재시도 오프라인 테스트 (네트워크 불필요)
+- 구글시트 미설정이면 시트 행은 재시도/.dead 없이 건너뜀
+- 재시도 대기 묶음은 max_retry_items개까지만 메모리에 (나머지는 스필 파일) → 복구 후 순서대로 1번씩 전송
+- 시도 횟수는 항목별 (재시도 중에 들어온 새 항목이 앞 항목과 같이 .dead로 가지 않음)
+
+사용법:
+    python TEST_OUTBOX.py
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+
+# Argos 루트 경로를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from services.OutboxService import Outbox, sheet_handler
+
+
+def wait_until(condition, timeout: float = 10.0) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def read_dead(outbox: Outbox) -> list:
+    if not os.path.exists(outbox.dead_path):
+        return []
+    with open(outbox.dead_path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_sheet_disabled() -> bool:
+    """GOOGLE_SHEET_ID 없음 → 성공 처리 (보낼 곳 없음)"""
+    os.environ["GOOGLE_SHEET_ID"] = ""  # .env가 있어도 덮어쓰지 않음
+    ok = sheet_handler("코인거래", [["2026-10-18", "BTC", "매수"]]) is True
+    print(f"  {'✅' if ok else '❌'} 구글시트 미설정 → 건너뜀 (재시도 없음)")
+    return ok
+
+
+def test_retry_cap() -> bool:
+    """시트 장애 중 500건 → 메모리 재시도 묶음은 20건 이하, 슬랙은 계속 전송, 복구 후 순서대로 1번씩"""
+    work_dir = tempfile.mkdtemp(prefix="outbox_cap_")
+    outbox = Outbox(os.path.join(work_dir, "test.spill"), max_batch=10, batch_window=0.01,
+                    base_backoff=0.02, max_backoff=0.05, max_attempts=1000, max_retry_items=20)
+    sheet_up = threading.Event()
+    delivered, slack = [], []
+    largest = [0]
+
+    def deliver(batch, force_retry=False):
+        deliver_batch(batch, force_retry)
+        largest[0] = max([largest[0]] + [len(group["items"]) for group in outbox._retry.values()])
+
+    deliver_batch, outbox._deliver = outbox._deliver, deliver
+
+    def sheet(key, rows):
+        if not sheet_up.is_set():
+            return False
+        delivered.extend(rows)
+        return True
+
+    outbox.register("sheet", sheet)
+    outbox.register("slack", lambda key, messages: slack.extend(messages) or True)
+    outbox.start()
+
+    for i in range(500):
+        outbox.send_sheet("코인거래", i)
+        if i % 50 == 0:
+            outbox.send_slack(f"알림 {i}")
+    slack_ok = wait_until(lambda: len(slack) == 10, 5)
+    time.sleep(0.3)
+    sheet_up.set()
+    done = wait_until(lambda: outbox.pending() == 0, 20)
+    outbox.close()
+
+    ok = slack_ok and done and largest[0] <= 20 and delivered == [[str(i)] for i in range(500)]
+    print(f"  {'✅' if slack_ok else '❌'} 시트 장애 중에도 슬랙 {len(slack)}/10건 전송")
+    print(f"  {'✅' if largest[0] <= 20 else '❌'} 메모리 재시도 묶음 최대 {largest[0]}건 (한도 20)")
+    print(f"  {'✅' if ok else '❌'} 복구 후 시트 {len(delivered)}/500행 순서대로 1번씩, 남은 항목 {outbox.pending()}건")
+    return ok
+
+
+def test_per_item_attempts() -> bool:
+    """계속 실패하는 키: 먼저 들어온 항목만 max_attempts에서 .dead, 늦게 붙은 항목은 계속 재시도"""
+    work_dir = tempfile.mkdtemp(prefix="outbox_attempts_")
+    outbox = Outbox(os.path.join(work_dir, "test.spill"), batch_window=0.01,
+                    base_backoff=0.05, max_backoff=0.05, max_attempts=5)
+    outbox.register("sheet", lambda key, rows: False)
+    outbox.start()
+
+    group_key = ("sheet", "코인거래")
+    outbox.send_sheet("코인거래", "old")
+    wait_until(lambda: outbox._retry.get(group_key, {"items": [{}]})["items"][0].get("attempts", 0) >= 3)
+    outbox.send_sheet("코인거래", "new")
+    wait_until(lambda: read_dead(outbox), 5)
+    outbox.close()  # 워커 종료 후 재시도 묶음 확인
+
+    dead = [item["payload"] for item in read_dead(outbox)]
+    retrying = [item["payload"] for item in outbox._retry.get(group_key, {"items": []})["items"]]
+
+    ok = dead == [["old"]] and retrying == [["new"]]
+    print(f"  {'✅' if ok else '❌'} .dead {dead} / 재시도 중 {retrying}")
+    return ok
+
+
+def main():
+    print("=" * 60)
+    print("📮 Outbox 재시도 테스트")
+    print("=" * 60)
+
+    ok = test_sheet_disabled()
+    ok &= test_retry_cap()
+    ok &= test_per_item_attempts()
+
+    print("\n" + "=" * 60)
+    print("✨ 모두 통과!" if ok else "❌ 실패 발견")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+"""
+Outbox Service Package
+구글시트/슬랙 등 부수 작업 비동기 전송 큐 (재시도 + 스필 파일)
+"""
+
+from .outbox import (
+    Outbox,
+    create_outbox,
+    sheet_handler,
+    slack_handler
+)
+
+__all__ = [
+    'Outbox',
+    'create_outbox',
+    'sheet_handler',
+    'slack_handler'
+]
+
+# 패키지 정보
+__version__ = '1.0.0'
+__author__ = 'Argos'
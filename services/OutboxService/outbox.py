@@ -0,0 +1,368 @@
+"""
+Outbox - 구글시트/슬랙 같은 부수 작업을 매매 루프 밖에서 처리하는 비동기 전송 큐
+- put()은 스필 파일에 한 줄 추가 + 메모리 큐에 넣고 바로 반환 (네트워크 없음)
+- 워커 스레드가 모아서 (종류, 키)별로 한 번에 전송 (시트별 append_rows 1번, 슬랙 메시지 합쳐서 1번)
+- 실패하면 지수 백오프로 재시도, 항목별로 max_attempts번 실패하면 .dead 파일로 이동 (버리지 않음)
+- 재시도 대기 묶음은 max_retry_items개까지만 메모리에 (넘는 항목은 스필 파일에만 두고 자리가 나면 다시 읽음)
+- 스필 파일(JSON Lines): 항목 줄 + 전송 완료 ack 줄 → 재시작 시 ack 안 된 항목부터 이어서 전송
+- 메모리 큐(maxsize)가 차면 스필 파일에만 남기고, 워커가 따라잡으면 파일에서 다시 읽음 (매매 루프는 안 막힘)
+"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# handler(key, payloads) → 전송 성공 여부 (실패/예외면 재시도)
+Handler = Callable[[Optional[str], List[Any]], bool]
+
+
+class Outbox:
+    """스필 파일 기반 비동기 전송 큐 (워커 스레드 1개)"""
+
+    def __init__(self, spill_path: str, maxsize: int = 1000, max_batch: int = 100,
+                 batch_window: float = 0.5, base_backoff: float = 1.0, max_backoff: float = 300.0,
+                 max_attempts: int = 10, max_retry_items: Optional[int] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Args:
+            spill_path: 스필 파일 경로 (미전송 항목 보관, 재시작 시 이어서 전송)
+            maxsize: 메모리 큐 크기 (넘으면 스필 파일에만 보관)
+            max_batch: 한 번에 모아 보낼 최대 항목 수
+            batch_window: 첫 항목이 들어온 뒤 더 모으는 시간 (초)
+            base_backoff / max_backoff: 재시도 대기 (초, 실패할 때마다 2배)
+            max_attempts: 항목별로 이 횟수만큼 실패하면 .dead 파일로 이동
+            max_retry_items: 재시도 대기 묶음 1개에 메모리로 둘 최대 항목 수 (기본: max_batch)
+        """
+        self.spill_path = spill_path
+        self.dead_path = spill_path + ".dead"
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.max_attempts = max_attempts
+        self.max_retry_items = max_retry_items or max_batch
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.handlers: Dict[str, Handler] = {}
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize)
+        self._retry: "OrderedDict[Tuple[str, Optional[str]], dict]" = OrderedDict()
+        self._parked: Dict[Tuple[str, Optional[str]], int] = {}  # 재시도 묶음이 차서 파일에만 둔 첫 항목 id
+        self._seen_upto = 0  # 워커가 큐에서 꺼낸 마지막 id
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._next_id = 1
+        self._loaded_upto = 0  # 이 id까지는 메모리 큐에 넣음 (그 뒤는 파일에만 있음)
+        self._overflow = False
+        self._unacked = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(spill_path)), exist_ok=True)
+        self._recover()
+        self._spill = open(spill_path, "a", encoding="utf-8")
+        atexit.register(self.close)
+
+    # ==================== 등록 / 넣기 ====================
+    def register(self, kind: str, handler: Handler):
+        """항목 종류별 전송 함수 등록 (start 전에)"""
+        self.handlers[kind] = handler
+
+    def put(self, kind: str, payload: Any, key: Optional[str] = None):
+        """
+        전송할 항목 추가 (즉시 반환)
+
+        Args:
+            kind: 항목 종류 (register한 이름)
+            payload: JSON으로 저장 가능한 값
+            key: 같은 key끼리 묶어서 전송 (예: 시트 이름)
+        """
+        with self._lock:
+            item = {"id": self._next_id, "kind": kind, "key": key, "payload": payload}
+            self._next_id += 1
+            self._spill.write(json.dumps(item, ensure_ascii=False) + "\n")
+            self._spill.flush()
+            self._unacked += 1
+
+            if not self._overflow:
+                try:
+                    self._queue.put_nowait(item)
+                    self._loaded_upto = item["id"]
+                except queue.Full:
+                    self._overflow = True
+                    self.logger.warning(f"Outbox 큐 가득 참 → 스필 파일에 보관 ({self.spill_path})")
+
+    def send_sheet(self, sheet_name: str, *data):
+        """구글시트 행 1개 (Send와 같은 인자, create_outbox로 만든 경우 시트별 append_rows로 모아서 전송)"""
+        self.put("sheet", [str(item) for item in data], key=sheet_name)
+
+    def send_slack(self, message: str):
+        """슬랙 메시지 1개 (create_outbox로 만든 경우 모인 메시지를 한 번에 전송)"""
+        self.put("slack", message)
+
+    def pending(self) -> int:
+        """아직 전송 안 된 항목 수"""
+        return self._unacked
+
+    # ==================== 실행 ====================
+    def start(self) -> "Outbox":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="outbox", daemon=True)
+            self._thread.start()
+        return self
+
+    def close(self, timeout: float = 10.0):
+        """남은 항목 전송 시도 후 종료 (못 보낸 항목은 스필 파일에 남아서 다음 실행 때 전송)"""
+        if self._thread is not None and self._thread.is_alive():
+            self._stop.set()
+            self._thread.join(timeout)
+        self._thread = None
+        with self._lock:
+            if not self._spill.closed:
+                self._spill.close()
+
+    def _run(self):
+        while True:
+            stopping = self._stop.is_set()
+            batch = self._collect(stopping)
+            self._deliver(batch, force_retry=stopping)
+            if stopping:
+                return
+
+    def _collect(self, stopping: bool) -> List[dict]:
+        """큐에서 항목 모으기 (첫 항목을 기다린 뒤 batch_window 동안 더 모음)"""
+        batch = []
+        if not stopping:
+            try:
+                batch.append(self._queue.get(timeout=self._wait_time()))
+            except queue.Empty:
+                self._reload_overflow()
+                return batch
+            deadline = time.time() + self.batch_window
+            while len(batch) < self.max_batch and not self._stop.is_set():
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.time())))
+                except queue.Empty:
+                    break
+
+        while len(batch) < self.max_batch or stopping:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if self._queue.empty():
+            self._reload_overflow()
+        return batch
+
+    def _wait_time(self) -> float:
+        """다음 재시도까지 남은 시간 (없으면 1초마다 깨서 종료/넘친 항목 확인)"""
+        if any(group_key not in self._retry for group_key in self._parked):
+            return 0.01  # 재시도가 끝나서 파일에 둔 항목을 바로 이어서 전송
+        if not self._retry:
+            return 1.0
+        ready_at = min(group["ready_at"] for group in self._retry.values())
+        return min(1.0, max(0.01, ready_at - time.time()))
+
+    # ==================== 전송 ====================
+    def _deliver(self, batch: List[dict], force_retry: bool = False):
+        """
+        (종류, 키)별로 묶어서 전송, 재시도 대기중인 같은 묶음이 있으면 그 뒤에 붙임 (순서 유지)
+        재시도 묶음이 max_retry_items개로 차면 그 뒤 항목은 스필 파일에만 두고 자리가 나면 다시 읽음
+        """
+        groups: "OrderedDict[Tuple[str, Optional[str]], List[dict]]" = OrderedDict()
+        for item in batch:
+            self._seen_upto = max(self._seen_upto, item["id"])
+            group_key = (item["kind"], item["key"])
+            retry = self._retry.get(group_key)
+            if group_key in self._parked:
+                continue  # 앞 항목이 파일에서 기다리는 중 → 순서 유지 (나중에 파일에서 같이 읽음)
+            if retry is None:
+                groups.setdefault(group_key, []).append(item)
+            elif len(retry["items"]) < self.max_retry_items:
+                retry["items"].append(item)
+            else:
+                self._parked[group_key] = item["id"]
+
+        now = time.time()
+        for group_key, group in list(self._retry.items()):
+            if force_retry or group["ready_at"] <= now:
+                del self._retry[group_key]
+                self._send(group_key, group["items"])
+
+        if not force_retry:
+            self._unpark(groups)
+
+        for group_key, items in groups.items():
+            self._send(group_key, items)
+
+    def _unpark(self, groups: "OrderedDict[Tuple[str, Optional[str]], List[dict]]"):
+        """자리가 난 묶음에 파일에만 둔 항목을 다시 채움 (워커가 이미 꺼낸 id까지만, 뒤는 큐로 옴)"""
+        ready = [group_key for group_key in self._parked
+                 if len(self._retry.get(group_key, {"items": []})["items"]) < self.max_retry_items]
+        if not ready:
+            return
+
+        with self._lock:
+            self._spill.flush()
+            unacked = self._read_unacked(after=min(self._parked[group_key] for group_key in ready) - 1)
+
+        for group_key in ready:
+            first_id = self._parked.pop(group_key)
+            items = [item for item in unacked if (item["kind"], item["key"]) == group_key
+                     and first_id <= item["id"] <= self._seen_upto]
+            target = self._retry[group_key]["items"] if group_key in self._retry else groups.setdefault(group_key, [])
+            room = self.max_retry_items - len(target)
+            target.extend(items[:room])
+            if len(items) > room:
+                self._parked[group_key] = items[room]["id"]
+            if not target:
+                groups.pop(group_key, None)
+
+    def _send(self, group_key: Tuple[str, Optional[str]], items: List[dict]):
+        kind, key = group_key
+        handler = self.handlers.get(kind)
+        ok = False
+        if handler is None:
+            self.logger.error(f"Outbox 전송 함수 없음: {kind}")
+        else:
+            for start in range(0, len(items), self.max_batch):
+                chunk = items[start:start + self.max_batch]
+                try:
+                    ok = bool(handler(key, [item["payload"] for item in chunk]))
+                except Exception as e:
+                    self.logger.error(f"Outbox 전송 오류 ({kind}/{key}): {e}")
+                    ok = False
+                if not ok:
+                    items = items[start:]
+                    break
+                self._ack(chunk)
+
+        if ok:
+            return
+
+        # 시도 횟수는 항목별 (재시도 대기 중에 붙은 새 항목은 0회부터)
+        for item in items:
+            item["attempts"] = item.get("attempts", 0) + 1
+        dead = [item for item in items if item["attempts"] >= self.max_attempts]
+        if dead:
+            self.logger.error(f"Outbox {kind}/{key} {len(dead)}건 {self.max_attempts}회 실패 → {self.dead_path}")
+            with open(self.dead_path, "a", encoding="utf-8") as f:
+                for item in dead:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            self._ack(dead)
+            items = [item for item in items if item["attempts"] < self.max_attempts]
+            if not items:
+                return
+
+        attempts = max(item["attempts"] for item in items)
+        backoff = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        self.logger.warning(f"Outbox {kind}/{key} {len(items)}건 전송 실패 → {backoff:.1f}초 후 재시도 ({attempts}회)")
+        self._retry[group_key] = {"items": items, "ready_at": time.time() + backoff}
+
+    # ==================== 스필 파일 ====================
+    def _ack(self, items: List[dict]):
+        """전송 완료 기록 (모두 보냈으면 파일 비움)"""
+        with self._lock:
+            self._unacked -= len(items)
+            if self._unacked == 0:
+                self._spill.truncate(0)
+                self._spill.seek(0)
+            else:
+                self._spill.write(json.dumps({"ack": [item["id"] for item in items]}) + "\n")
+                self._spill.flush()
+
+    def _read_unacked(self, after: int = 0) -> List[dict]:
+        """스필 파일에서 ack 안 된 항목 (id > after, 잘린 마지막 줄 무시)"""
+        if not os.path.exists(self.spill_path):
+            return []
+        items: "OrderedDict[int, dict]" = OrderedDict()
+        acked = set()
+        with open(self.spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if "ack" in entry:
+                    acked.update(entry["ack"])
+                elif entry["id"] > after:
+                    items[entry["id"]] = entry
+        return [item for item_id, item in items.items() if item_id not in acked]
+
+    def _recover(self):
+        """재시작: 이전 실행에서 못 보낸 항목을 다시 큐에 넣고 파일 정리"""
+        items = self._read_unacked()
+        if os.path.exists(self.spill_path):
+            # 미전송 항목만 남긴 파일로 원자적 교체 (정리 중에 죽어도 원래 파일 유지)
+            tmp_path = self.spill_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for item in items:
+                    f.write(json.dumps(item, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.spill_path)
+
+        self._unacked = len(items)
+        if items:
+            self._next_id = items[-1]["id"] + 1
+            self.logger.info(f"Outbox 미전송 {len(items)}건 복구 ({self.spill_path})")
+        for item in items:
+            try:
+                self._queue.put_nowait(item)
+                self._loaded_upto = item["id"]
+            except queue.Full:
+                self._overflow = True
+                break
+
+    def _reload_overflow(self):
+        """큐가 비었을 때 스필 파일에만 있는 항목을 다시 큐로"""
+        if not self._overflow:
+            return
+        with self._lock:
+            self._spill.flush()
+            for item in self._read_unacked(after=self._loaded_upto):
+                try:
+                    self._queue.put_nowait(item)
+                    self._loaded_upto = item["id"]
+                except queue.Full:
+                    return
+            self._overflow = False
+
+
+# ==================== 기본 전송 함수 ====================
+def sheet_handler(sheet_name: Optional[str], rows: List[List[str]]) -> bool:
+    """구글시트: 같은 시트의 행들을 append_rows 1번으로 (시트 ID/인증 파일 미설정이면 보낼 것 없음 = 성공)"""
+    from services.SimpleGoogleSheetService import SendRows, IsConfigured
+    if not IsConfigured():
+        return True
+    return SendRows(sheet_name, rows)
+
+
+def slack_handler(slack) -> Handler:
+    """슬랙: 모인 메시지를 줄바꿈으로 합쳐서 웹훅 1번 (웹훅 미설정이면 보낼 것 없음 = 성공)"""
+    def handle(key: Optional[str], messages: List[str]) -> bool:
+        if slack is None or not slack.enabled:
+            return True
+        return slack.send("\n\n".join(messages))
+    return handle
+
+
+def create_outbox(spill_path: str, slack=None, logger: Optional[logging.Logger] = None, **kwargs) -> Outbox:
+    """
+    구글시트 + 슬랙 전송용 Outbox 생성 후 워커 시작
+
+    Args:
+        spill_path: 스필 파일 경로 (봇 폴더 안 권장)
+        slack: SimpleSlack 객체 (없으면 슬랙 항목은 버림)
+        kwargs: Outbox 옵션 (maxsize, batch_window, max_attempts ...)
+    """
+    outbox = Outbox(spill_path, logger=logger, **kwargs)
+    outbox.register("sheet", sheet_handler)
+    outbox.register("slack", slack_handler(slack))
+    return outbox.start()
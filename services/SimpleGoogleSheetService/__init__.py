@@ -1,12 +1,12 @@
 """
 SimpleGoogleSheetService - 극도로 단순한 구글 시트 서비스
-외부에서는 Send 함수만 사용
+외부에서는 Send 함수만 사용 (여러 행은 SendRows / SheetBatchWriter)
 """
 
-from .simple_google_sheet import Send
+from .simple_google_sheet import Send, SendRows, SheetBatchWriter, IsConfigured
 
-__all__ = ['Send']
+__all__ = ['Send', 'SendRows', 'SheetBatchWriter', 'IsConfigured']
 
 # 패키지 정보
-__version__ = '2.0.0'
+__version__ = '2.2.0'
 __author__ = 'Argos'
\ No newline at end of file
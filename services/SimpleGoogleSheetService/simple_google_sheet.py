@@ -1,12 +1,14 @@
 """
 SimpleGoogleSheetService - 극도로 단순한 구글 시트 기록 서비스
 외부에서는 Send 함수만 사용
+여러 행은 SendRows(한 번에 기록) / SheetBatchWriter(모아서 기록)로 시트별 append_rows 1번
 """
 
 import gspread
 from google.oauth2.service_account import Credentials
 import os
-from typing import Optional
+import threading
+from typing import Dict, List, Optional, Sequence
 from dotenv import load_dotenv
 
 # .env 파일 로드
@@ -14,94 +16,266 @@ load_dotenv()
 
 
 class _GoogleSheetManager:
-    """내부 구글 시트 관리 클래스 (싱글톤)"""
+    """
+    내부 구글 시트 관리 클래스 (싱글톤)
+    - 인증 정보 / 클라이언트 / 스프레드시트 / 시트이름→워크시트 맵을 프로세스 동안 재사용
+      (토큰은 만료됐을 때만 google-auth가 자동 갱신) → 행 기록 = append_rows 요청 1번
+    - GOOGLE_SHEET_ID 값이 바뀌었을 때만 스프레드시트를 다시 엶 (환경변수 비교만, 파일/네트워크 없음)
+    """
 
     _instance = None
-    _initialized = False
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(_GoogleSheetManager, cls).__new__(cls)
+            cls._instance._setup()
         return cls._instance
 
-    def __init__(self):
-        """구글 시트 초기화"""
-        # 매번 .env 다시 확인
-        sheet_id = os.getenv('GOOGLE_SHEET_ID')
-
-        # 이미 초기화되었고 sheet_id가 같으면 스킵
-        if self._initialized and hasattr(self, 'sheet_id') and self.sheet_id == sheet_id:
-            return
-
-        self.sheet_id = sheet_id
+    def _setup(self):
+        """최초 1번만 실행"""
         self.credentials_file = os.path.join(
             os.path.dirname(__file__),
             'credentials.json'
         )
+        self.sheet_id = None
         self.client = None
         self.spreadsheet = None
+        self.worksheets: Dict[str, gspread.Worksheet] = {}
         self.enabled = False
+        self._lock = threading.Lock()
 
-        if not self.sheet_id:
-            print("❌ 구글 시트 ID가 없습니다. .env 파일에 GOOGLE_SHEET_ID를 설정하세요.")
-            return
+    def _env_sheet_id(self) -> Optional[str]:
+        sheet_id = os.getenv('GOOGLE_SHEET_ID')
+        if not sheet_id:
+            # .env가 아직 안 읽힌 경우만 다시 로드 (F5 실행 등 작업 디렉토리 문제)
+            load_dotenv()
+            sheet_id = os.getenv('GOOGLE_SHEET_ID')
+        return sheet_id
 
-        if not os.path.exists(self.credentials_file):
-            print(f"❌ 인증 파일이 없습니다: {self.credentials_file}")
-            return
+    def configured(self) -> bool:
+        """시트 ID와 인증 파일이 모두 있는지 (연결/네트워크 없이 설정만 확인)"""
+        return bool(self._env_sheet_id()) and os.path.exists(self.credentials_file)
 
-        try:
-            self._connect()
-            self.enabled = True
-            self._initialized = True
-            print(f"✅ 구글 시트 연결 성공")
-        except Exception as e:
-            print(f"❌ 구글 시트 연결 실패: {type(e).__name__}: {str(e)}")
+    def ensure(self) -> bool:
+        """설정된 시트 ID로 연결되어 있는지 확인 (처음이거나 ID가 바뀐 경우만 연결)"""
+        sheet_id = self._env_sheet_id()
 
-    def _connect(self):
-        """구글 시트 API 연결"""
-        scope = [
-            'https://www.googleapis.com/auth/spreadsheets',
-            'https://www.googleapis.com/auth/drive'
-        ]
-
-        creds = Credentials.from_service_account_file(
-            self.credentials_file,
-            scopes=scope
-        )
+        if self.enabled and sheet_id == self.sheet_id:
+            return True
+
+        with self._lock:
+            if self.enabled and sheet_id == self.sheet_id:
+                return True
+
+            self.sheet_id = sheet_id
+            self.spreadsheet = None
+            self.worksheets = {}
+            self.enabled = False
+
+            if not self.sheet_id:
+                print("❌ 구글 시트 ID가 없습니다. .env 파일에 GOOGLE_SHEET_ID를 설정하세요.")
+                return False
+
+            if not os.path.exists(self.credentials_file):
+                print(f"❌ 인증 파일이 없습니다: {self.credentials_file}")
+                return False
+
+            try:
+                self._connect()
+                self.enabled = True
+                print(f"✅ 구글 시트 연결 성공")
+            except Exception as e:
+                print(f"❌ 구글 시트 연결 실패: {type(e).__name__}: {str(e)}")
+            return self.enabled
 
-        self.client = gspread.authorize(creds)
+    def _connect(self):
+        """구글 시트 API 연결 (인증은 처음 1번, 시트 ID가 바뀌면 스프레드시트만 다시 열기)"""
+        if self.client is None:
+            scope = [
+                'https://www.googleapis.com/auth/spreadsheets',
+                'https://www.googleapis.com/auth/drive'
+            ]
+
+            creds = Credentials.from_service_account_file(
+                self.credentials_file,
+                scopes=scope
+            )
+
+            self.client = gspread.authorize(creds)
         self.spreadsheet = self.client.open_by_key(self.sheet_id)
 
+    def _worksheet(self, sheet_name: str) -> Optional[gspread.Worksheet]:
+        """시트이름 → 워크시트 (맵에 없을 때만 전체 목록 1번 조회, 새로 만든 시트도 찾음)"""
+        worksheet = self.worksheets.get(sheet_name)
+        if worksheet is None:
+            self.worksheets = {ws.title: ws for ws in self.spreadsheet.worksheets()}
+            worksheet = self.worksheets.get(sheet_name)
+        return worksheet
+
     def send_data(self, sheet_name: str, *data: str) -> bool:
         """시트에 데이터 전송"""
-        if not self.enabled:
+        return self.send_rows(sheet_name, [data])
+
+    def send_rows(self, sheet_name: str, rows: Sequence[Sequence]) -> bool:
+        """시트에 여러 행 전송 (append_rows 요청 1번)"""
+        if not self.ensure():
             return False
 
         try:
             # 시트 찾기
-            try:
-                worksheet = self.spreadsheet.worksheet(sheet_name)
-            except gspread.exceptions.WorksheetNotFound:
+            worksheet = self._worksheet(sheet_name)
+            if worksheet is None:
                 print(f"❌ 시트 '{sheet_name}'이 존재하지 않습니다. 먼저 시트를 생성해주세요.")
                 return False
 
             # 데이터를 문자열로 변환
-            row_data = [str(item) for item in data]
+            row_data = [[str(item) for item in row] for row in rows]
 
-            # 마지막 행에 추가
-            worksheet.append_row(row_data)
+            # 마지막 행 뒤에 한번에 추가
+            worksheet.append_rows(row_data)
 
             # 성공 로그
-            data_str = " | ".join(row_data)
-            print(f"✅ [{sheet_name}] 시트에 기록: {data_str}")
+            if len(row_data) == 1:
+                print(f"✅ [{sheet_name}] 시트에 기록: {' | '.join(row_data[0])}")
+            else:
+                print(f"✅ [{sheet_name}] 시트에 {len(row_data)}행 기록")
             return True
 
         except Exception as e:
+            # 시트가 지워졌거나 이름이 바뀐 경우 대비 → 다음 기록 때 목록 다시 조회
+            self.worksheets.pop(sheet_name, None)
             print(f"❌ 데이터 추가 실패: {e}")
             return False
 
 
+def _get_manager() -> _GoogleSheetManager:
+    """구글 시트 매니저 (프로세스 동안 1개, 연결은 send_rows에서 확인)"""
+    return _GoogleSheetManager()
+
+
+def IsConfigured() -> bool:
+    """
+    구글 시트 기록이 설정되어 있는지 (GOOGLE_SHEET_ID + credentials.json, 네트워크 없음)
+
+    Returns:
+        bool: 둘 다 있으면 True (False면 Send/SendRows는 항상 실패)
+    """
+    return _get_manager().configured()
+
+
+def SendRows(sheet_name: str, rows: Sequence[Sequence]) -> bool:
+    """
+    구글 시트에 여러 행을 한 번에 보내기 (API 요청 1번)
+
+    Args:
+        sheet_name: 시트 이름 (미리 생성되어 있어야 함)
+        rows: 행 목록 (각 행은 기록할 데이터 리스트)
+
+    Returns:
+        bool: 성공 시 True, 실패 시 False
+
+    Examples:
+        SendRows("상한가", [
+            ["2025-01-02", "에코프로", "+29.95%"],
+            ["2025-01-02", "포스코DX", "+29.85%"],
+        ])
+    """
+    rows = [row for row in rows if row]
+    if not rows:
+        print("❌ 기록할 데이터가 없습니다.")
+        return False
+
+    return _get_manager().send_rows(sheet_name, rows)
+
+
+class SheetBatchWriter:
+    """
+    행을 시트별로 모아두었다가 한 번에 기록 (시트당 append_rows 1번)
+    - max_rows개 쌓이면 바로 기록
+    - 첫 행이 들어온 뒤 max_delay초가 지나면 백그라운드 타이머로 기록
+    - flush() / with 블록 종료 시 즉시 기록
+    - 기록 실패한 시트의 행은 버리지 않고 다시 쌓아서 다음 기록 때 재시도 (순서 유지)
+    - 메모리에만 보관 → 프로세스가 죽으면 남은 행은 사라짐 (유실되면 안 되는 기록은 OutboxService 사용)
+
+    Examples:
+        writer = SheetBatchWriter(max_rows=50, max_delay=10)
+        writer.add("코인거래", "BTC", "매수", "140,000,000")
+        writer.flush()
+
+        with SheetBatchWriter() as writer:
+            for stock in stocks:
+                writer.add("상한가", stock['name'], stock['rate'])
+    """
+
+    def __init__(self, max_rows: int = 100, max_delay: float = 5.0):
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self._rows: Dict[str, List[List]] = {}
+        self._count = 0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def add(self, sheet_name: str, *data) -> None:
+        """행 1개 추가 (기록은 size/time/flush 조건에서)"""
+        if not data:
+            print("❌ 기록할 데이터가 없습니다.")
+            return
+
+        with self._lock:
+            self._rows.setdefault(sheet_name, []).append(list(data))
+            self._count += 1
+            full = self._count >= self.max_rows
+            if not full and self._timer is None and self.max_delay is not None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self.flush()
+
+    def pending(self) -> int:
+        """아직 기록 안 된 행 수"""
+        return self._count
+
+    def flush(self) -> bool:
+        """모인 행을 시트별로 한 번에 기록 (실패한 시트의 행은 다시 쌓아 둠, 모두 성공 시 True)"""
+        with self._lock:
+            rows, self._rows, self._count = self._rows, {}, 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+        if not rows:
+            return True
+
+        manager = _get_manager()
+        failed = {sheet_name: sheet_rows for sheet_name, sheet_rows in rows.items()
+                  if not manager.send_rows(sheet_name, sheet_rows)}
+        if failed:
+            self._requeue(failed)
+        return not failed
+
+    def _requeue(self, failed: Dict[str, List[List]]) -> None:
+        """실패한 행을 기록 중에 새로 들어온 행보다 앞에 되돌리고 max_delay 후 재시도 예약"""
+        with self._lock:
+            for sheet_name, sheet_rows in failed.items():
+                self._rows[sheet_name] = sheet_rows + self._rows.get(sheet_name, [])
+                self._count += len(sheet_rows)
+            if self._timer is None and self.max_delay is not None:
+                self._timer = threading.Timer(self.max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def close(self) -> bool:
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+
+
 def Send(sheet_name: str, *data: str) -> bool:
     """
     구글 시트에 데이터를 보내는 유일한 public 함수
@@ -122,19 +296,7 @@ def Send(sheet_name: str, *data: str) -> bool:
         print("❌ 기록할 데이터가 없습니다.")
         return False
 
-    # .env 다시 로드 (경로 문제 해결)
-    from dotenv import load_dotenv
-    load_dotenv()
-
-    # 싱글톤 리셋 (F5 문제 해결)
-    _GoogleSheetManager._instance = None
-    _GoogleSheetManager._initialized = False
-
-    # 싱글톤 인스턴스 가져오기
-    manager = _GoogleSheetManager()
-
-    # 데이터 전송
-    return manager.send_data(sheet_name, *data)
+    return SendRows(sheet_name, [data])
 
 
 # 테스트 코드